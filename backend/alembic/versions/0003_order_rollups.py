@@ -0,0 +1,96 @@
+"""order_rollups
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # --- order_daily_rollups ---
+    op.create_table(
+        "order_daily_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("distributor_id", sa.Uuid(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("tenant_id", sa.Uuid(), nullable=True),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("gmv", sa.Numeric(14, 2), nullable=False),
+        sa.PrimaryKeyConstraint("day", "distributor_id", "status"),
+        sa.ForeignKeyConstraint(["distributor_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"]),
+    )
+    op.create_index("ix_order_daily_rollups_tenant_id", "order_daily_rollups", ["tenant_id"])
+
+    # --- product_daily_rollups ---
+    op.create_table(
+        "product_daily_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("distributor_id", sa.Uuid(), nullable=False),
+        sa.Column("product_id", sa.Uuid(), nullable=False),
+        sa.Column("tenant_id", sa.Uuid(), nullable=True),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Numeric(14, 2), nullable=False),
+        sa.PrimaryKeyConstraint("day", "distributor_id", "product_id"),
+        sa.ForeignKeyConstraint(["distributor_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"]),
+    )
+    op.create_index("ix_product_daily_rollups_tenant_id", "product_daily_rollups", ["tenant_id"])
+
+    # --- order_rollup_marks: each (order, status) the outbox handler has counted ---
+    op.create_table(
+        "order_rollup_marks",
+        sa.Column("order_id", sa.Uuid(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("applied_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("order_id", "status"),
+    )
+    op.create_index("ix_order_rollup_marks_applied_at", "order_rollup_marks", ["applied_at"])
+
+    # Backfill from existing orders (timestamps bucketed in UTC).
+    op.execute(
+        """
+        INSERT INTO order_daily_rollups (day, distributor_id, status, tenant_id, order_count, gmv)
+        SELECT date(timezone('UTC', o.created_at)), o.distributor_id, o.status, u.tenant_id,
+               count(*), sum(o.total)
+        FROM orders o JOIN users u ON u.id = o.distributor_id
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO product_daily_rollups (day, distributor_id, product_id, tenant_id, quantity, revenue)
+        SELECT date(timezone('UTC', o.created_at)), o.distributor_id, oi.product_id, u.tenant_id,
+               sum(oi.quantity), sum(oi.quantity * oi.unit_price)
+        FROM order_items oi
+        JOIN orders o ON o.id = oi.order_id
+        JOIN users u ON u.id = o.distributor_id
+        WHERE o.status <> 'CANCELLED'
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_order_rollup_marks_applied_at", table_name="order_rollup_marks")
+    op.drop_table("order_rollup_marks")
+    op.drop_index("ix_product_daily_rollups_tenant_id", table_name="product_daily_rollups")
+    op.drop_table("product_daily_rollups")
+    op.drop_index("ix_order_daily_rollups_tenant_id", table_name="order_daily_rollups")
+    op.drop_table("order_daily_rollups")
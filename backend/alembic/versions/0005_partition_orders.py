@@ -0,0 +1,113 @@
+"""partition_orders
+
+Convert ``orders`` and ``order_items`` to monthly RANGE partitions on
+``created_at`` (PostgreSQL only; other dialects are left untouched).
+
+Partitioned tables need the partition key in every unique constraint, so
+both primary keys become ``(id, created_at)``. The ``order_items.order_id``
+foreign key is dropped: months are detached and archived independently,
+and items are always written with their order. Item rows take their
+order's ``created_at`` so both halves of a month archive together.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+
+"""
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING
+
+from alembic import op
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+revision: str = "0005"
+down_revision: str | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+PREMAKE_MONTHS = 3
+
+
+def _months(first: datetime.date, last: datetime.date) -> list[datetime.date]:
+    months, month = [], first.replace(day=1)
+    while month <= last:
+        months.append(month)
+        month = (month + datetime.timedelta(days=32)).replace(day=1)
+    return months
+
+
+def _create_partitions(table: str, months: list[datetime.date]) -> None:
+    for month in months:
+        upper = (month + datetime.timedelta(days=32)).replace(day=1)
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') TO ('{upper.isoformat()} 00:00+00')"
+        )
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE order_items DROP CONSTRAINT IF EXISTS order_items_order_id_fkey")
+    for table in ("orders", "order_items"):
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_unpartitioned")
+        op.execute(f"ALTER TABLE {table}_unpartitioned RENAME CONSTRAINT {table}_pkey TO {table}_unpartitioned_pkey")
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {table}_unpartitioned INCLUDING DEFAULTS, "
+            f"PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)"
+        )
+
+    op.execute("ALTER TABLE orders ADD FOREIGN KEY (user_id) REFERENCES users (id)")
+    op.execute("ALTER TABLE orders ADD FOREIGN KEY (distributor_id) REFERENCES users (id)")
+    op.execute("ALTER TABLE order_items ADD FOREIGN KEY (product_id) REFERENCES products (id)")
+    op.create_index("ix_orders_distributor_id_created_at", "orders", ["distributor_id", "created_at"])
+    op.create_index("ix_orders_user_id_created_at", "orders", ["user_id", "created_at"])
+    op.create_index("ix_order_items_order_id", "order_items", ["order_id"])
+
+    oldest = bind.exec_driver_sql("SELECT min(created_at) FROM orders_unpartitioned").scalar()
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    last = (today.replace(day=1) + datetime.timedelta(days=31 * PREMAKE_MONTHS)).replace(day=1)
+    # Partition bounds are UTC; a session time zone must not shift the first month.
+    first = oldest.astimezone(datetime.timezone.utc).date() if oldest else today
+    months = _months(first, last)
+    for table in ("orders", "order_items"):
+        _create_partitions(table, months)
+
+    op.execute("INSERT INTO orders SELECT * FROM orders_unpartitioned")
+    op.execute(
+        """
+        INSERT INTO order_items (id, order_id, product_id, quantity, unit_price, created_at)
+        SELECT oi.id, oi.order_id, oi.product_id, oi.quantity, oi.unit_price, o.created_at
+        FROM order_items_unpartitioned oi JOIN orders_unpartitioned o ON o.id = oi.order_id
+        """
+    )
+    op.execute("DROP TABLE order_items_unpartitioned")
+    op.execute("DROP TABLE orders_unpartitioned")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for table in ("orders", "order_items"):
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+        op.execute(f"ALTER TABLE {table}_partitioned RENAME CONSTRAINT {table}_pkey TO {table}_partitioned_pkey")
+        op.execute(f"CREATE TABLE {table} (LIKE {table}_partitioned INCLUDING DEFAULTS, PRIMARY KEY (id))")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_partitioned")
+    op.execute("DROP TABLE order_items_partitioned")
+    op.execute("DROP TABLE orders_partitioned")
+
+    op.execute("ALTER TABLE orders ADD FOREIGN KEY (user_id) REFERENCES users (id)")
+    op.execute("ALTER TABLE orders ADD FOREIGN KEY (distributor_id) REFERENCES users (id)")
+    op.execute("ALTER TABLE order_items ADD FOREIGN KEY (product_id) REFERENCES products (id)")
+    op.execute(
+        "ALTER TABLE order_items ADD CONSTRAINT order_items_order_id_fkey "
+        "FOREIGN KEY (order_id) REFERENCES orders (id) ON DELETE CASCADE"
+    )
@@ -0,0 +1,63 @@
+"""order_codes
+
+Add the Snowflake ``orders.code`` and backfill existing rows from
+``created_at`` under the reserved worker id 1023, so backfilled codes sort
+with their creation time and never collide with live ones.
+
+A unique index on a partitioned table (0005) must include the partition
+key, so the index is ``(code, created_at)``. New orders take ``created_at``
+from their code (see ``OrderRepository.create_order``), so it still rejects
+a code minted twice.
+
+The backfill is PostgreSQL SQL; other dialects only get the column and
+index, and SQLite keeps the column nullable (it can't ALTER it).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+revision: str = "0006"
+down_revision: str | None = "0005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_EPOCH_MS = 1735689600000  # 2025-01-01T00:00:00Z, app.core.snowflake.EPOCH
+_BACKFILL_WORKER_ID = 1023
+
+
+def upgrade() -> None:
+    op.add_column("orders", sa.Column("code", sa.BigInteger(), nullable=True))
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            f"""
+            UPDATE orders o SET code = numbered.code
+            FROM (
+                SELECT id,
+                       (greatest(floor(extract(epoch FROM created_at) * 1000)::bigint - {_EPOCH_MS}, 0) << 22)
+                       | ({_BACKFILL_WORKER_ID} << 12)
+                       | ((row_number() OVER (PARTITION BY date_trunc('milliseconds', created_at) ORDER BY id) - 1)
+                          % 4096)
+                       AS code
+                FROM orders
+            ) AS numbered
+            WHERE numbered.id = o.id
+            """
+        )
+        op.alter_column("orders", "code", nullable=False)
+    op.create_index("ix_orders_code", "orders", ["code", "created_at"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_orders_code", table_name="orders")
+    op.drop_column("orders", "code")
@@ -0,0 +1,54 @@
+"""product change sequence for delta sync
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+revision: str = "0009"
+down_revision: str | None = "0008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # change_seq is the id of the transaction that last wrote the row. With the
+    # snapshot xmin as the client's cursor, a row from a transaction that was
+    # still running at read time is picked up by the next sync, never skipped.
+    op.add_column("products", sa.Column("change_seq", sa.BigInteger(), nullable=True))
+    op.execute("UPDATE products SET change_seq = pg_current_xact_id()::text::bigint")
+    op.alter_column("products", "change_seq", nullable=False)
+    op.execute(
+        """
+        CREATE FUNCTION products_set_change_seq() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.change_seq := pg_current_xact_id()::text::bigint;
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER products_change_seq BEFORE INSERT OR UPDATE ON products "
+        "FOR EACH ROW EXECUTE FUNCTION products_set_change_seq()"
+    )
+    op.create_index("ix_products_change_seq", "products", ["change_seq"])
+    op.create_index("ix_products_distributor_change_seq", "products", ["distributor_id", "change_seq"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_distributor_change_seq", table_name="products")
+    op.drop_index("ix_products_change_seq", table_name="products")
+    op.execute("DROP TRIGGER products_change_seq ON products")
+    op.execute("DROP FUNCTION products_set_change_seq()")
+    op.drop_column("products", "change_seq")
@@ -0,0 +1,56 @@
+"""product_facets
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19
+
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+revision: str = "0010"
+down_revision: str | None = "0009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Facet refreshes recompute one (distributor, category) group at a time.
+    op.create_index("ix_products_distributor_category", "products", ["distributor_id", "category"])
+
+    op.create_table(
+        "product_facets",
+        sa.Column("distributor_id", sa.Uuid(), nullable=False),
+        sa.Column("category", sa.String(50), nullable=False),
+        sa.Column("tenant_id", sa.Uuid(), nullable=True),
+        sa.Column("active_count", sa.Integer(), nullable=False),
+        sa.Column("min_price", sa.Numeric(10, 2), nullable=False),
+        sa.Column("max_price", sa.Numeric(10, 2), nullable=False),
+        sa.PrimaryKeyConstraint("distributor_id", "category"),
+        sa.ForeignKeyConstraint(["distributor_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"]),
+    )
+    op.create_index("ix_product_facets_tenant_category", "product_facets", ["tenant_id", "category"])
+
+    op.execute(
+        """
+        INSERT INTO product_facets (distributor_id, category, tenant_id, active_count, min_price, max_price)
+        SELECT p.distributor_id, coalesce(p.category, ''), u.tenant_id, count(*), min(p.price), max(p.price)
+        FROM products p JOIN users u ON u.id = p.distributor_id
+        WHERE p.is_active
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_facets_tenant_category", table_name="product_facets")
+    op.drop_table("product_facets")
+    op.drop_index("ix_products_distributor_category", table_name="products")
@@ -0,0 +1,61 @@
+"""price_lists, price_tiers and users.price_segment
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19
+
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+revision: str = "0011"
+down_revision: str | None = "0010"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("price_segment", sa.String(30), nullable=True))
+
+    op.create_table(
+        "price_lists",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("distributor_id", sa.Uuid(), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("segment", sa.String(30), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["distributor_id"], ["users.id"]),
+    )
+    op.create_index("ix_price_lists_distributor_id", "price_lists", ["distributor_id"])
+
+    op.create_table(
+        "price_tiers",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("price_list_id", sa.Uuid(), nullable=False),
+        sa.Column("product_id", sa.Uuid(), nullable=False),
+        sa.Column("min_quantity", sa.Integer(), nullable=False),
+        sa.Column("unit_price", sa.Numeric(10, 2), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["price_list_id"], ["price_lists.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        # Leads with price_list_id, so it also serves the book's join.
+        sa.UniqueConstraint("price_list_id", "product_id", "min_quantity", name="uq_price_tiers_list_product_qty"),
+        sa.CheckConstraint("min_quantity >= 1", name="ck_price_tiers_min_quantity"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("price_tiers")
+    op.drop_index("ix_price_lists_distributor_id", table_name="price_lists")
+    op.drop_table("price_lists")
+    op.drop_column("users", "price_segment")
@@ -0,0 +1,64 @@
+"""stock_levels, stock_reservations and products.track_stock
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19
+
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+revision: str = "0012"
+down_revision: str | None = "0011"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("products", sa.Column("track_stock", sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    op.create_table(
+        "stock_levels",
+        sa.Column("product_id", sa.Uuid(), nullable=False),
+        sa.Column("stripe", sa.Integer(), nullable=False),
+        sa.Column("available", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("product_id", "stripe"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="CASCADE"),
+        sa.CheckConstraint("available >= 0", name="ck_stock_levels_available"),
+    )
+
+    # order_id has no foreign key: orders are partitioned (0005).
+    op.create_table(
+        "stock_reservations",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("order_id", sa.Uuid(), nullable=False),
+        sa.Column("product_id", sa.Uuid(), nullable=False),
+        sa.Column("stripe", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(9), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+    )
+    op.create_index("ix_stock_reservations_order_id", "stock_reservations", ["order_id"])
+    op.create_index(
+        "ix_stock_reservations_held",
+        "stock_reservations",
+        ["product_id"],
+        postgresql_where=sa.text("status = 'HELD'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stock_reservations_held", table_name="stock_reservations")
+    op.drop_index("ix_stock_reservations_order_id", table_name="stock_reservations")
+    op.drop_table("stock_reservations")
+    op.drop_table("stock_levels")
+    op.drop_column("products", "track_stock")
@@ -0,0 +1,74 @@
+"""credit_ledger, credit_balance_checkpoints and profile ledger cursors
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19
+
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+revision: str = "0013"
+down_revision: str | None = "0012"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("credit_profiles", sa.Column("ledger_seq", sa.BigInteger(), server_default="0", nullable=False))
+    op.add_column("credit_profiles", sa.Column("checkpoint_seq", sa.BigInteger(), server_default="0", nullable=False))
+
+    # order_id has no foreign key: orders are partitioned (0005).
+    op.create_table(
+        "credit_ledger",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("profile_id", sa.Uuid(), nullable=False),
+        sa.Column("seq", sa.BigInteger(), nullable=False),
+        sa.Column("kind", sa.String(10), nullable=False),
+        sa.Column("amount", sa.Numeric(12, 2), nullable=False),
+        sa.Column("balance_after", sa.Numeric(12, 2), nullable=False),
+        sa.Column("order_id", sa.Uuid(), nullable=True),
+        sa.Column("note", sa.String(255), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["profile_id"], ["credit_profiles.id"]),
+        # Also the index for per-profile history pages and checkpoint sums.
+        sa.UniqueConstraint("profile_id", "seq", name="uq_credit_ledger_profile_seq"),
+    )
+    # Cancellations release a BNPL order's charges by order_id.
+    op.create_index("ix_credit_ledger_order_id", "credit_ledger", ["order_id"])
+    op.create_table(
+        "credit_balance_checkpoints",
+        sa.Column("profile_id", sa.Uuid(), nullable=False),
+        sa.Column("seq", sa.BigInteger(), nullable=False),
+        sa.Column("balance", sa.Numeric(12, 2), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("profile_id", "seq"),
+        sa.ForeignKeyConstraint(["profile_id"], ["credit_profiles.id"]),
+    )
+
+    # Existing balances become an opening adjustment, so the ledger explains every one.
+    op.execute(
+        """
+        INSERT INTO credit_ledger (id, profile_id, seq, kind, amount, balance_after, note)
+        SELECT gen_random_uuid(), id, 1, 'ADJUSTMENT', current_balance, current_balance, 'Opening balance'
+        FROM credit_profiles
+        WHERE current_balance <> 0
+        """
+    )
+    op.execute("UPDATE credit_profiles SET ledger_seq = 1 WHERE current_balance <> 0")
+
+
+def downgrade() -> None:
+    op.drop_table("credit_balance_checkpoints")
+    op.drop_index("ix_credit_ledger_order_id", table_name="credit_ledger")
+    op.drop_table("credit_ledger")
+    op.drop_column("credit_profiles", "checkpoint_seq")
+    op.drop_column("credit_profiles", "ledger_seq")
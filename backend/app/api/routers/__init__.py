@@ -2,12 +2,14 @@
 
 from fastapi import APIRouter
 
+from app.api.routers.analytics import router as analytics_router
 from app.api.routers.auth import router as auth_router
 from app.api.routers.credit import router as credit_router
 from app.api.routers.currencies import router as currencies_router
 from app.api.routers.health import router as health_router
 from app.api.routers.languages import router as languages_router
 from app.api.routers.orders import router as orders_router
+from app.api.routers.price_lists import router as price_lists_router
 from app.api.routers.products import router as products_router
 from app.api.routers.settings import router as settings_router
 from app.api.routers.tenants import router as tenants_router
@@ -22,7 +24,9 @@ api_router.include_router(auth_router, tags=["auth"])
 api_router.include_router(users_router, prefix="/users", tags=["users"])
 api_router.include_router(products_router, prefix="/products", tags=["products"])
 api_router.include_router(orders_router, prefix="/orders", tags=["orders"])
+api_router.include_router(price_lists_router, prefix="/price-lists", tags=["price-lists"])
 api_router.include_router(credit_router, prefix="/credit", tags=["credit"])
+api_router.include_router(analytics_router, prefix="/analytics", tags=["analytics"])
 api_router.include_router(languages_router, prefix="/languages", tags=["languages"])
 api_router.include_router(translations_router, prefix="/translations", tags=["translations"])
 api_router.include_router(currencies_router, prefix="/currencies", tags=["currencies"])
@@ -0,0 +1,53 @@
+"""Analytics endpoints backed by daily rollups."""
+
+from __future__ import annotations
+
+import datetime
+import uuid  # noqa: TC003
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import get_db, require_role
+from app.core.exceptions import ValidationError
+from app.repositories.analytics_repo import AnalyticsRepository
+from app.schemas.analytics import KPIResponse
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.models.user import User
+
+router = APIRouter()
+
+
+@router.get("/kpis", response_model=KPIResponse)
+async def get_kpis(
+    date_from: datetime.date | None = Query(None),
+    date_to: datetime.date | None = Query(None),
+    distributor_id: uuid.UUID | None = Query(None),
+    top_n: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_role("distributor", "admin", "super_admin")),
+) -> KPIResponse:
+    """GMV, order counts by status and top products for a date range (default: last 30 days)."""
+    date_to = date_to or datetime.datetime.now(datetime.timezone.utc).date()
+    date_from = date_from or date_to - datetime.timedelta(days=29)
+    if date_from > date_to:
+        raise ValidationError("date_from must not be after date_to")
+
+    tenant_id = None
+    if current_user.role.value == "distributor":
+        distributor_id = current_user.id
+    elif current_user.role.value != "super_admin":
+        # Admins are tenant-bound.
+        tenant_id = current_user.tenant_id
+
+    repo = AnalyticsRepository(db)
+    return await repo.get_kpis(
+        date_from=date_from,
+        date_to=date_to,
+        distributor_id=distributor_id,
+        tenant_id=tenant_id,
+        top_n=top_n,
+    )
@@ -4,11 +4,18 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from app.api.deps import get_db, require_role
+from app.core.exceptions import NotFoundError
 from app.repositories.credit_repo import CreditRepository
-from app.schemas.credit import CreditLimitResponse, CreditProfileResponse
+from app.schemas.credit import (
+    CreditLedgerEntryResponse,
+    CreditLedgerPost,
+    CreditLedgerResponse,
+    CreditLimitResponse,
+    CreditProfileResponse,
+)
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -38,6 +45,7 @@ async def get_credit_limit(
     current_user: User = Depends(_require_kiosk),  # noqa: B008
     db: AsyncSession = Depends(get_db),  # noqa: B008
 ) -> CreditLimitResponse:
+    """From the balance snapshot on the profile row; the ledger is never summed here."""
     repo = CreditRepository(db)
     profile = await repo.get_credit_profile(current_user.id)
     if profile is None:
@@ -47,3 +55,36 @@ async def get_credit_limit(
         credit_limit=profile.credit_limit,
         available_credit=profile.credit_limit - profile.current_balance,
     )
+
+
+@router.get("/ledger", response_model=CreditLedgerResponse)
+async def get_credit_ledger(
+    before: int | None = Query(None, description="next_before from the previous page."),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(_require_kiosk),  # noqa: B008
+    db: AsyncSession = Depends(get_db),  # noqa: B008
+) -> CreditLedgerResponse:
+    """The caller's charges, repayments and adjustments, newest first."""
+    repo = CreditRepository(db)
+    profile = await repo.get_credit_profile(current_user.id)
+    entries = await repo.list_entries(profile.id, before=before, limit=limit) if profile else []
+    return CreditLedgerResponse(
+        items=[CreditLedgerEntryResponse.model_validate(e) for e in entries],
+        next_before=entries[-1].seq if len(entries) == limit else None,
+    )
+
+
+@router.post("/ledger", response_model=CreditLedgerEntryResponse, status_code=201)
+async def post_credit_entry(
+    body: CreditLedgerPost,
+    current_user: User = Depends(require_role("admin")),  # noqa: B008
+    db: AsyncSession = Depends(get_db),  # noqa: B008
+) -> CreditLedgerEntryResponse:
+    """Record a repayment, adjustment or charge against a kiosk's profile."""
+    repo = CreditRepository(db)
+    profile = await repo.get_credit_profile(body.user_id)
+    if profile is None:
+        raise NotFoundError("Credit profile")
+    entry = await repo.post_entry(profile.id, body.kind, body.amount, order_id=body.order_id, note=body.note)
+    await db.commit()
+    return CreditLedgerEntryResponse.model_validate(entry)
@@ -3,23 +3,37 @@
 from __future__ import annotations
 
 import uuid  # noqa: TC003
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Literal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, Request  # noqa: TC002
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_user, get_db, require_role
 from app.core.exceptions import NotFoundError, ValidationError
+from app.core.snowflake import format_code, parse_code
+from app.db.database import async_session_factory
+from app.repositories.order_read_repo import ORDER_EXPORT_FIELDS, OrderReadRepository
 from app.repositories.order_repo import OrderRepository
 from app.repositories.product_repo import ProductRepository
 from app.schemas.order import (
+    OrderBulkStatusResponse,
+    OrderBulkStatusUpdate,
     OrderCreate,
     OrderItemResponse,
     OrderListResponse,
     OrderResponse,
+    OrderStatusRejection,
+    OrderStatusResult,
     OrderStatusUpdate,
+    ReorderResponse,
 )
+from app.services import order_events, pricing, reorder
+from app.services.export import export_response
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Sequence
+
+    from sqlalchemy import RowMapping
     from sqlalchemy.ext.asyncio import AsyncSession
 
     from app.models.user import User
@@ -27,6 +41,15 @@ if TYPE_CHECKING:
 router = APIRouter()
 
 
+def _order_scope(current_user: User) -> dict[str, Any]:
+    """Filter kwargs limiting a caller to the orders their role may see."""
+    if current_user.role.value == "admin":
+        return {}
+    if current_user.role.value == "distributor":
+        return {"distributor_id": current_user.id}
+    return {"user_id": current_user.id}
+
+
 def _order_to_response(order) -> OrderResponse:
     """Map an Order ORM instance to OrderResponse, resolving product_name."""
     items = []
@@ -43,6 +66,7 @@ def _order_to_response(order) -> OrderResponse:
         )
     return OrderResponse(
         id=order.id,
+        code=format_code(order.code),
         user_id=order.user_id,
         distributor_id=order.distributor_id,
         status=order.status.value if hasattr(order.status, "value") else order.status,
@@ -72,51 +96,164 @@ async def create_order(
 
     order_repo = OrderRepository(db)
     order = await order_repo.create_order(
-        user_id=current_user.id, data=body, products=products
+        user_id=current_user.id,
+        data=body,
+        products=products,
+        prices=await pricing.price_book(db, body.distributor_id),
+        segment=current_user.price_segment,
     )
     await db.commit()
-    await db.refresh(order)
     return _order_to_response(order)
 
 
+@router.post("/reorder", response_model=ReorderResponse, status_code=201)
+async def reorder_last(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> ReorderResponse:
+    """Repeat the caller's most recent order at today's prices.
+
+    Products that are no longer active are left out and listed in
+    ``skipped_product_ids``.
+    """
+    template = await reorder.last_template(db, current_user.id)
+    if template is None:
+        raise NotFoundError("Previous order")
+    repriced = await reorder.reprice(db, template)
+    if repriced.order is None:
+        raise ValidationError("None of the products from your last order are available")
+
+    order = await OrderRepository(db).create_order(
+        user_id=current_user.id,
+        data=repriced.order,
+        products=repriced.products,
+        prices=await pricing.price_book(db, repriced.order.distributor_id),
+        segment=current_user.price_segment,
+    )
+    await db.commit()
+    return ReorderResponse(**_order_to_response(order).model_dump(), skipped_product_ids=repriced.skipped)
+
+
+def _parse_code(code: str) -> int:
+    try:
+        return parse_code(code)
+    except ValueError as exc:
+        raise ValidationError(str(exc)) from None
+
+
 @router.get("", response_model=OrderListResponse)
 async def list_orders(
     status: str | None = Query(None),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Order code from next_cursor; switches to keyset paging."),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> OrderListResponse:
-    repo = OrderRepository(db)
-
-    kwargs: dict = {"status": status, "page": page, "per_page": per_page}
-    if current_user.role.value == "admin":
-        pass
-    elif current_user.role.value == "distributor":
-        kwargs["distributor_id"] = current_user.id
-    else:
-        kwargs["user_id"] = current_user.id
+    repo = OrderReadRepository(db)
 
+    kwargs: dict = {"status": status, "page": page, "per_page": per_page, **_order_scope(current_user)}
+    if cursor is not None:
+        kwargs["before_code"] = _parse_code(cursor)
     items, total = await repo.list_orders(**kwargs)
     return OrderListResponse(
-        items=[_order_to_response(o) for o in items],
+        items=items,
         total=total,
         page=page,
         per_page=per_page,
+        next_cursor=items[-1].code if len(items) == per_page else None,
+    )
+
+
+@router.post("/status:bulk", response_model=OrderBulkStatusResponse)
+async def bulk_update_order_status(
+    body: OrderBulkStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_role("distributor", "admin")),
+) -> OrderBulkStatusResponse:
+    repo = OrderRepository(db)
+    distributor_id = current_user.id if current_user.role.value == "distributor" else None
+    updated, rejected = await repo.bulk_update_order_status(
+        body.order_ids, body.status, distributor_id=distributor_id
+    )
+    await db.commit()
+    return OrderBulkStatusResponse(
+        updated=[OrderStatusResult(id=c.id, status=c.status) for c in updated],
+        rejected=[OrderStatusRejection(id=oid, reason=reason) for oid, reason in rejected],
+    )
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_order_events(
+    request: Request,
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Server-sent events for order creation and status changes.
+
+    Scoped like ``GET /orders``. Reconnecting clients send ``Last-Event-ID``
+    to replay what they missed from the capped stream.
+    """
+    # Authentication is done; release the pooled connection for the stream's lifetime.
+    await db.close()
+    frames = order_events.subscribe(
+        is_disconnected=request.is_disconnected,
+        last_event_id=last_event_id,
+        **_order_scope(current_user),
+    )
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+@router.get("/export", response_class=StreamingResponse)
+async def export_orders(
+    status: str | None = Query(None),
+    fmt: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    gzip: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream every matching order line as CSV or NDJSON, scoped like ``GET /orders``."""
+    scope = _order_scope(current_user)
+    # The export outlives the request session; stream from a dedicated one instead.
+    await db.close()
+
+    async def partitions() -> AsyncIterator[Sequence[RowMapping]]:
+        async with async_session_factory() as session:
+            async for rows in OrderReadRepository(session).stream_order_lines(status=status, **scope):
+                yield rows
+
+    return export_response(partitions(), ORDER_EXPORT_FIELDS, basename="orders", fmt=fmt, compress=gzip)
+
+
+@router.get("/by-code/{code}", response_model=OrderResponse)
+async def get_order_by_code(
+    code: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> OrderResponse:
+    repo = OrderReadRepository(db)
+    order = await repo.get_order_by_code(_parse_code(code), **_order_scope(current_user))
+    if order is None:
+        raise NotFoundError("Order")
+    return order
+
+
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order(
     order_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> OrderResponse:
-    repo = OrderRepository(db)
+    repo = OrderReadRepository(db)
     order = await repo.get_order(order_id)
     if order is None:
         raise NotFoundError("Order")
-    return _order_to_response(order)
+    return order
 
 
 @router.put("/{order_id}/status", response_model=OrderResponse)
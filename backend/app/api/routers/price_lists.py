@@ -0,0 +1,104 @@
+"""Distributor price list endpoints — volume tiers and per-segment prices."""
+
+from __future__ import annotations
+
+import uuid  # noqa: TC003
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import get_db, require_role
+from app.core.exceptions import NotFoundError, ValidationError
+from app.repositories.price_list_repo import PriceListRepository
+from app.schemas.price_list import PriceListCreate, PriceListResponse, PriceListUpdate
+from app.services import pricing
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.models.price_list import PriceList
+    from app.models.user import User
+
+router = APIRouter()
+
+_require_seller = require_role("distributor", "admin")
+
+
+def _own_distributor(current_user: User, distributor_id: uuid.UUID | None) -> uuid.UUID:
+    """Distributors manage their own lists; admins must say whose."""
+    if current_user.role.value == "distributor":
+        return current_user.id
+    if distributor_id is None:
+        raise ValidationError("distributor_id is required")
+    return distributor_id
+
+
+async def _get_owned(repo: PriceListRepository, price_list_id: uuid.UUID, current_user: User) -> PriceList:
+    price_list = await repo.get_price_list(price_list_id)
+    if price_list is None or (
+        current_user.role.value == "distributor" and price_list.distributor_id != current_user.id
+    ):
+        raise NotFoundError("Price list")
+    return price_list
+
+
+@router.get("", response_model=list[PriceListResponse])
+async def list_price_lists(
+    distributor_id: uuid.UUID | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(_require_seller),
+) -> list[PriceListResponse]:
+    repo = PriceListRepository(db)
+    lists = await repo.list_price_lists(_own_distributor(current_user, distributor_id))
+    return [PriceListResponse.model_validate(p) for p in lists]
+
+
+@router.post("", response_model=PriceListResponse, status_code=201)
+async def create_price_list(
+    body: PriceListCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(_require_seller),
+) -> PriceListResponse:
+    distributor_id = _own_distributor(current_user, body.distributor_id)
+    price_list = await PriceListRepository(db).create_price_list(distributor_id, body)
+    await db.commit()
+    await pricing.bump([distributor_id])
+    return PriceListResponse.model_validate(price_list)
+
+
+@router.get("/{price_list_id}", response_model=PriceListResponse)
+async def get_price_list(
+    price_list_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(_require_seller),
+) -> PriceListResponse:
+    price_list = await _get_owned(PriceListRepository(db), price_list_id, current_user)
+    return PriceListResponse.model_validate(price_list)
+
+
+@router.put("/{price_list_id}", response_model=PriceListResponse)
+async def update_price_list(
+    price_list_id: uuid.UUID,
+    body: PriceListUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(_require_seller),
+) -> PriceListResponse:
+    """Rename, retarget, (de)activate, or with ``tiers`` replace every tier of the list."""
+    repo = PriceListRepository(db)
+    price_list = await repo.update_price_list(await _get_owned(repo, price_list_id, current_user), body)
+    await db.commit()
+    await pricing.bump([price_list.distributor_id])
+    return PriceListResponse.model_validate(price_list)
+
+
+@router.delete("/{price_list_id}", status_code=204)
+async def delete_price_list(
+    price_list_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(_require_seller),
+) -> None:
+    repo = PriceListRepository(db)
+    price_list = await _get_owned(repo, price_list_id, current_user)
+    await repo.delete_price_list(price_list)
+    await db.commit()
+    await pricing.bump([price_list.distributor_id])
@@ -3,21 +3,38 @@
 from __future__ import annotations
 
 import uuid  # noqa: TC003
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import get_db, require_role
-from app.core.exceptions import NotFoundError
-from app.repositories.product_repo import ProductRepository
+from app.api.deps import get_current_user, get_db, require_role
+from app.core.exceptions import ForbiddenError, NotFoundError, ValidationError
+from app.db.database import async_session_factory
+from app.repositories.facet_repo import ProductFacetRepository
+from app.repositories.product_repo import PRODUCT_EXPORT_FIELDS, ProductRepository
+from app.repositories.stock_repo import StockRepository
 from app.schemas.product import (
+    ProductBulkResult,
+    ProductBulkUpdate,
+    ProductBulkUpdateResponse,
+    ProductChangesResponse,
     ProductCreate,
+    ProductFacetListResponse,
+    ProductImportResponse,
     ProductListResponse,
     ProductResponse,
     ProductUpdate,
+    StockResponse,
+    StockUpdate,
 )
+from app.services import catalog_cache, product_import
+from app.services.export import export_response
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Sequence
+
+    from sqlalchemy import RowMapping
     from sqlalchemy.ext.asyncio import AsyncSession
 
     from app.models.user import User
@@ -25,6 +42,15 @@ if TYPE_CHECKING:
 router = APIRouter()
 
 
+def _json(body: str, tag: str | None) -> Response:
+    headers = {"ETag": tag, "Cache-Control": "no-cache"} if tag else None
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _not_modified(tag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": tag, "Cache-Control": "no-cache"})
+
+
 @router.get("", response_model=ProductListResponse)
 async def list_products(
     distributor_id: uuid.UUID | None = Query(None),
@@ -32,8 +58,19 @@ async def list_products(
     search: str | None = Query(None),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    if_none_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
-) -> ProductListResponse:
+) -> Response:
+    """Conditional on the catalog revision: a current ``If-None-Match`` gets 304 without a query."""
+    scope = catalog_cache.distributor_scope(distributor_id) if distributor_id else catalog_cache.CATALOG
+    variant = f"{distributor_id}|{category}|{search}|{page}|{per_page}"
+    revision = await catalog_cache.revision(scope)
+    tag = catalog_cache.etag(scope, revision, variant) if revision is not None else None
+    if tag and catalog_cache.matches(if_none_match, tag):
+        return _not_modified(tag)
+    if revision is not None and (body := await catalog_cache.get_page(scope, revision, variant)) is not None:
+        return _json(body, tag)
+
     repo = ProductRepository(db)
     items, total = await repo.list_products(
         distributor_id=distributor_id,
@@ -42,24 +79,220 @@ async def list_products(
         page=page,
         per_page=per_page,
     )
-    return ProductListResponse(
+    body = ProductListResponse(
         items=[ProductResponse.model_validate(p) for p in items],
         total=total,
         page=page,
         per_page=per_page,
+    ).model_dump_json()
+    if revision is not None:
+        await catalog_cache.put_page(scope, revision, variant, body)
+    return _json(body, tag)
+
+
+@router.get("/facets", response_model=ProductFacetListResponse)
+async def product_facets(
+    distributor_id: uuid.UUID | None = Query(None),
+    tenant_id: uuid.UUID | None = Query(None),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Active product count and price range per category, from ``product_facets``.
+
+    Facets are written in the same transaction as the products, so the
+    catalog revision covers them: conditional and cached like ``GET /products``.
+    """
+    scope = catalog_cache.distributor_scope(distributor_id) if distributor_id else catalog_cache.CATALOG
+    variant = f"facets|{distributor_id}|{tenant_id}"
+    revision = await catalog_cache.revision(scope)
+    tag = catalog_cache.etag(scope, revision, variant) if revision is not None else None
+    if tag and catalog_cache.matches(if_none_match, tag):
+        return _not_modified(tag)
+    if revision is not None and (body := await catalog_cache.get_page(scope, revision, variant)) is not None:
+        return _json(body, tag)
+
+    items = await ProductFacetRepository(db).list_facets(distributor_id=distributor_id, tenant_id=tenant_id)
+    body = ProductFacetListResponse(items=items).model_dump_json()
+    if revision is not None:
+        await catalog_cache.put_page(scope, revision, variant, body)
+    return _json(body, tag)
+
+
+def _parse_change_token(token: str) -> tuple[int, uuid.UUID | None]:
+    seq, _, last_id = token.partition(".")
+    try:
+        return int(seq, 16), uuid.UUID(hex=last_id) if last_id else None
+    except ValueError:
+        raise ValidationError(f"Invalid change token: {token!r}") from None
+
+
+@router.get("/changes", response_model=ProductChangesResponse)
+async def product_changes(
+    since: str | None = Query(None, description="next_token from the previous call; omit for a full sync."),
+    distributor_id: uuid.UUID | None = Query(None),
+    limit: int = Query(1000, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+) -> ProductChangesResponse:
+    """Delta-sync feed: products changed since ``since``, deactivated ones as ``deleted`` ids.
+
+    Tokens only move forward. Keep calling while ``has_more``; a row may
+    occasionally come twice, so clients should upsert by id.
+    """
+    after = _parse_change_token(since) if since else None
+    rows, has_more, watermark = await ProductRepository(db).changes_since(
+        after, distributor_id=distributor_id, limit=limit
+    )
+    if has_more:
+        next_token = f"{rows[-1].change_seq:x}.{rows[-1].id.hex}"
+    else:
+        # Caught up: resume from the watermark, or stay put if it is behind the cursor.
+        next_token = f"{max(watermark, after[0] if after else 0):x}"
+    return ProductChangesResponse(
+        upserted=[ProductResponse.model_validate(r) for r in rows if r.is_active],
+        deleted=[r.id for r in rows if not r.is_active],
+        next_token=next_token,
+        has_more=has_more,
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_products(
+    distributor_id: uuid.UUID | None = Query(None),
+    category: str | None = Query(None),
+    search: str | None = Query(None),
+    fmt: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    gzip: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream the filtered catalog as CSV or NDJSON; same filters as ``GET /products``."""
+    # The export outlives the request session; stream from a dedicated one instead.
+    await db.close()
+
+    async def partitions() -> AsyncIterator[Sequence[RowMapping]]:
+        async with async_session_factory() as session:
+            repo = ProductRepository(session)
+            async for rows in repo.stream_products(distributor_id=distributor_id, category=category, search=search):
+                yield rows
+
+    return export_response(partitions(), PRODUCT_EXPORT_FIELDS, basename="products", fmt=fmt, compress=gzip)
+
+
+@router.post("/import", response_model=ProductImportResponse)
+async def import_products(
+    request: Request,
+    fmt: Literal["csv", "ndjson"] | None = Query(None, alias="format"),
+    distributor_id: uuid.UUID | None = Query(None, description="Default for rows without a distributor_id column."),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_role("distributor", "admin")),
+) -> ProductImportResponse:
+    """Upsert products by SKU from a CSV or NDJSON body, streamed; gzip via ``Content-Encoding``.
+
+    The format comes from ``format`` or else the Content-Type. Distributors
+    import into their own catalog only. Each batch commits on its own; the
+    response lists failed rows by line number.
+    """
+    if fmt is None:
+        fmt = "ndjson" if "json" in request.headers.get("content-type", "") else "csv"
+    restrict_to = current_user.id if current_user.role.value == "distributor" else None
+
+    chunks: AsyncIterator[bytes] = request.stream()
+    if request.headers.get("content-encoding", "").lower() == "gzip":
+        chunks = product_import.gunzip_chunks(chunks)
+    records = product_import.csv_records(chunks) if fmt == "csv" else product_import.ndjson_records(chunks)
+    return await product_import.import_products(
+        db, records, distributor_id=distributor_id or restrict_to, restrict_to=restrict_to
+    )
+
+
+@router.patch(":bulk", response_model=ProductBulkUpdateResponse)
+async def bulk_update_products(
+    body: ProductBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_role("distributor", "admin")),
+) -> ProductBulkUpdateResponse:
+    """Change many prices / availabilities in one statement.
+
+    Either ``changes`` (per product, by id or SKU) or ``adjust`` (a
+    percentage across the catalog or one category). Distributors only
+    reach their own products; admins must name the distributor to adjust.
+    """
+    distributor_id: uuid.UUID | None
+    if current_user.role.value == "distributor":
+        if body.adjust is not None and body.adjust.distributor_id not in (None, current_user.id):
+            raise ForbiddenError("Cannot adjust another distributor's prices")
+        distributor_id = current_user.id
+    else:
+        distributor_id = body.adjust.distributor_id if body.adjust is not None else None
+        if body.adjust is not None and distributor_id is None:
+            raise ValidationError("adjust.distributor_id is required")
+
+    repo = ProductRepository(db)
+    not_found: list[str] = []
+    if body.adjust is not None:
+        adjust = body.adjust
+        rows = await repo.adjust_prices(adjust.percent, category=adjust.category, distributor_id=distributor_id)
+    else:
+        # ProductBulkUpdate guarantees changes whenever adjust is absent.
+        rows, not_found = await repo.bulk_update_products(body.changes or [], distributor_id=distributor_id)
+    await db.commit()
+    await catalog_cache.bump([r.id for r in rows], {r.distributor_id for r in rows})
+    return ProductBulkUpdateResponse(
+        updated=[ProductBulkResult(id=r.id, sku=r.sku, price=r.price, is_active=r.is_active) for r in rows],
+        not_found=not_found,
     )
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(
     product_id: uuid.UUID,
+    if_none_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
-) -> ProductResponse:
+) -> Response:
+    scope = catalog_cache.product_scope(product_id)
+    revision = await catalog_cache.revision(scope)
+    tag = catalog_cache.etag(scope, revision, "") if revision is not None else None
+    if tag and catalog_cache.matches(if_none_match, tag):
+        return _not_modified(tag)
+
     repo = ProductRepository(db)
     product = await repo.get_product(product_id)
     if product is None:
         raise NotFoundError("Product")
-    return ProductResponse.model_validate(product)
+    return _json(ProductResponse.model_validate(product).model_dump_json(), tag)
+
+
+@router.get("/{product_id}/stock", response_model=StockResponse)
+async def get_stock(
+    product_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_role("distributor", "admin")),
+) -> StockResponse:
+    """Unreserved and held units; ``stripes`` is 0 for products without stock tracking."""
+    product = await ProductRepository(db).get_product(product_id)
+    if product is None:
+        raise NotFoundError("Product")
+    if current_user.role.value == "distributor" and product.distributor_id != current_user.id:
+        raise ForbiddenError("Cannot view another distributor's stock")
+    return StockResponse(**(await StockRepository(db).get_stock(product_id))._asdict())
+
+
+@router.put("/{product_id}/stock", response_model=StockResponse)
+async def set_stock(
+    product_id: uuid.UUID,
+    body: StockUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_role("distributor", "admin")),
+) -> StockResponse:
+    """Set the unreserved units and turn on stock tracking: orders then reserve or get 409."""
+    product = await ProductRepository(db).get_product(product_id)
+    if product is None:
+        raise NotFoundError("Product")
+    if current_user.role.value == "distributor" and product.distributor_id != current_user.id:
+        raise ForbiddenError("Cannot set another distributor's stock")
+    summary = await StockRepository(db).set_stock(product_id, body.available, stripes=body.stripes)
+    await db.commit()
+    return StockResponse(**summary._asdict())
 
 
 @router.post("", response_model=ProductResponse, status_code=201)
@@ -77,6 +310,7 @@ async def create_product(
         sku=body.sku,
     )
     await db.commit()
+    await catalog_cache.bump([product.id], [product.distributor_id])
     return ProductResponse.model_validate(product)
 
 
@@ -93,6 +327,7 @@ async def update_product(
     if product is None:
         raise NotFoundError("Product")
     await db.commit()
+    await catalog_cache.bump([product.id], [product.distributor_id])
     return ProductResponse.model_validate(product)
 
 
@@ -103,7 +338,8 @@ async def delete_product(
     current_user: User = Depends(require_role("distributor", "admin")),
 ) -> None:
     repo = ProductRepository(db)
-    deleted = await repo.delete_product(product_id)
-    if not deleted:
+    distributor_id = await repo.delete_product(product_id)
+    if distributor_id is None:
         raise NotFoundError("Product")
     await db.commit()
+    await catalog_cache.bump([product_id], [distributor_id])
@@ -15,7 +15,29 @@ class Settings(BaseSettings):
 
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    ORDER_EVENTS_STREAM: str = "souksync:order-events"
+    ORDER_EVENTS_MAXLEN: int = 10000
+    SSE_HEARTBEAT_SECONDS: int = 15
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_LOCK_SECONDS: int = 30
+    LAST_ORDER_TTL_SECONDS: int = 30 * 86400
+    ORDER_CODE_WORKER_ID: int | None = None  # 0..1022, unique per process; leased from Redis when unset
+    ORDER_CODE_WORKER_LEASE_SECONDS: int = 60
+    CATALOG_PAGE_TTL_SECONDS: int = 300
+    PRODUCT_IMPORT_BATCH_SIZE: int = 1000
+    PRODUCT_IMPORT_MAX_ERRORS: int = 1000
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_SECONDS: float = 0.5
+    OUTBOX_LEASE_SECONDS: float = 60
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    OUTBOX_BACKOFF_BASE_SECONDS: float = 2
+    OUTBOX_BACKOFF_MAX_SECONDS: float = 600
+    ORDER_PARTITION_PREMAKE_MONTHS: int = 3
+    ORDER_RETENTION_MONTHS: int = 24
+    ORDER_ARCHIVE_DIR: str = "archive"
+
     TELEGRAM_BOT_TOKEN: str = ""
+    TELEGRAM_NOTIFY_CONCURRENCY: int = 10
 
     JWT_SECRET: str = "change-me-in-production"
     JWT_ALGORITHM: str = "HS256"
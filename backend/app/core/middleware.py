@@ -1,16 +1,27 @@
-"""Application middleware: request ID, timing, CORS."""
+"""Application middleware: request ID, timing, idempotency, CORS."""
 
 from __future__ import annotations
 
 import time
 import uuid
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 
+import structlog
+from fastapi import HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.responses import JSONResponse, Response
+
+from app.core.exceptions import SoukSyncError, ValidationError
+from app.core.security import decode_token
+from app.services import idempotency
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
     from starlette.requests import Request
-    from starlette.responses import Response
+    from starlette.responses import StreamingResponse
+
+logger = structlog.get_logger(__name__)
 
 
 class RequestIdMiddleware(BaseHTTPMiddleware):
@@ -29,3 +40,82 @@ class TimingMiddleware(BaseHTTPMiddleware):
         elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
         response.headers["X-Response-Time-Ms"] = str(elapsed_ms)
         return response
+
+
+class IdempotencyMiddleware(BaseHTTPMiddleware):
+    """Replay the stored response for a repeated ``Idempotency-Key`` instead of re-running the write."""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        key = request.headers.get(idempotency.HEADER)
+        if not key or not idempotency.applies(request.method, request.url.path):
+            return await call_next(request)
+
+        subject = _token_subject(request)
+        if subject is None:
+            # Unauthenticated; let the route reject it.
+            return await call_next(request)
+
+        try:
+            if len(key) > idempotency.MAX_KEY_LENGTH:
+                raise ValidationError(f"{idempotency.HEADER} must be at most {idempotency.MAX_KEY_LENGTH} characters")
+            scoped_key = f"{subject}:{key}"
+            fp = idempotency.fingerprint(request.method, request.url.path, await request.body())
+            store, replay = await idempotency.begin(scoped_key, fp)
+        except SoukSyncError as exc:
+            return JSONResponse(status_code=exc.status_code, content={"detail": exc.message})
+
+        if replay is not None:
+            return _replayed(replay)
+
+        try:
+            # What call_next hands back is always streamed.
+            response = cast("StreamingResponse", await call_next(request))
+            body = b"".join(
+                [chunk.encode() if isinstance(chunk, str) else bytes(chunk) async for chunk in response.body_iterator]
+            )
+        except BaseException:
+            await _settle(store.release(scoped_key))
+            raise
+
+        if response.status_code < 500:
+            headers = tuple((k, v) for k, v in response.headers.items() if k != "content-length")
+            record = idempotency.StoredResponse(
+                fp, response.status_code, body.decode(), response.headers.get("content-type"), headers,
+            )
+            await _settle(store.save(scoped_key, record))
+        else:
+            await _settle(store.release(scoped_key))
+        passed_on = Response(content=body, status_code=response.status_code)
+        passed_on.raw_headers = list(response.raw_headers)
+        return passed_on
+
+
+def _replayed(record: idempotency.StoredResponse) -> Response:
+    # begin() only hands back finished responses.
+    status_code = cast("int", record.status_code)
+    response = Response(content=record.body, status_code=status_code)
+    # Raw headers keep repeated names (Set-Cookie, Link) as they were sent.
+    response.raw_headers = [
+        *((k.encode("latin-1"), v.encode("latin-1")) for k, v in record.headers),
+        (b"content-length", str(len(response.body)).encode("latin-1")),
+        (b"idempotent-replayed", b"true"),
+    ]
+    return response
+
+
+def _token_subject(request: Request) -> str | None:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_token(token).get("sub")
+    except HTTPException:
+        return None
+
+
+async def _settle(op: Awaitable[None]) -> None:
+    """The write already happened; a failure to record it must not fail the response."""
+    try:
+        await op
+    except Exception as exc:
+        logger.warning("idempotency_store_failed", error=str(exc))
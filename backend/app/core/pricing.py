@@ -0,0 +1,82 @@
+"""Compiled price books: tiered and per-segment unit prices without a query.
+
+A distributor's active price lists are flattened into one schedule per
+(segment, product): parallel tuples of quantity breaks and unit prices.
+Pricing a line is a dict lookup plus a ``bisect`` over a handful of
+breaks, so a 50-line order prices in microseconds once the book is built.
+
+Rules, applied at compile time where possible:
+
+- A tier applies from its ``min_quantity`` upwards.
+- Lists without a segment apply to every kiosk; a segment's schedule also
+  includes those general breaks.
+- Where several tiers apply, the lowest price wins, and a tier never
+  raises a price above the product's list price.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import defaultdict
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import Iterable
+    from decimal import Decimal
+
+    Schedule = tuple[tuple[int, ...], tuple[Decimal, ...]]
+
+
+class Tier(NamedTuple):
+    segment: str | None
+    product_id: uuid.UUID
+    min_quantity: int
+    unit_price: Decimal
+
+
+def _schedule(breaks: Iterable[tuple[int, Decimal]]) -> Schedule:
+    """Breaks ascending by quantity with strictly falling prices; dominated breaks are dropped."""
+    quantities: list[int] = []
+    prices: list[Decimal] = []
+    for quantity, price in sorted(breaks):
+        if prices and price >= prices[-1]:
+            continue
+        quantities.append(quantity)
+        prices.append(price)
+    return tuple(quantities), tuple(prices)
+
+
+class PriceBook:
+    """One distributor's active tiers, ready for lookups. Immutable once compiled."""
+
+    __slots__ = ("_schedules",)
+
+    def __init__(self, schedules: dict[tuple[str | None, uuid.UUID], Schedule] | None = None) -> None:
+        self._schedules = schedules or {}
+
+    @classmethod
+    def compile(cls, tiers: Iterable[Tier]) -> PriceBook:
+        breaks: dict[tuple[str | None, uuid.UUID], list[tuple[int, Decimal]]] = defaultdict(list)
+        for tier in tiers:
+            breaks[(tier.segment, tier.product_id)].append((tier.min_quantity, tier.unit_price))
+        for (segment, product_id), own in breaks.items():
+            if segment is not None:
+                own.extend(breaks.get((None, product_id), ()))
+        return cls({key: _schedule(own) for key, own in breaks.items()})
+
+    def __len__(self) -> int:
+        return len(self._schedules)
+
+    def unit_price(
+        self, product_id: uuid.UUID, quantity: int, list_price: Decimal, segment: str | None = None
+    ) -> Decimal:
+        """Unit price for ``quantity`` of a product, given its list price and the buyer's segment."""
+        schedule = self._schedules.get((segment, product_id)) if segment is not None else None
+        if schedule is None:
+            schedule = self._schedules.get((None, product_id))
+            if schedule is None:
+                return list_price
+        quantities, prices = schedule
+        i = bisect_right(quantities, quantity)
+        return min(prices[i - 1], list_price) if i else list_price
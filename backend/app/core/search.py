@@ -0,0 +1,84 @@
+"""Product search ranking and the in-process fallback index.
+
+PostgreSQL ranks with ``ts_rank_cd`` over ``products.search_vector`` plus
+``pg_trgm`` word similarity on ``products.name_folded`` (both GIN-indexed,
+migration 0008). SQLite has neither, so there ``TrigramIndex`` reproduces
+the word-similarity half in Python over the candidate rows. Both sides
+compare ``fold``-ed keys, so results agree on which products match.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from app.core.transliteration import fold
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import Iterable
+
+# pg_trgm's default ``word_similarity_threshold``.
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+
+def trigrams(key: str) -> set[str]:
+    """pg_trgm-style trigrams: each word padded with two leading spaces and one trailing."""
+    grams: set[str] = set()
+    for word in key.split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(query_grams: set[str], key_grams: set[str]) -> float:
+    """Share of the query's trigrams found in the key (close to pg_trgm's ``word_similarity``)."""
+    if not query_grams:
+        return 0.0
+    return len(query_grams & key_grams) / len(query_grams)
+
+
+class TrigramIndex:
+    """Inverted trigram index over folded product names."""
+
+    def __init__(self, entries: Iterable[tuple[uuid.UUID, str]] = ()) -> None:
+        self._postings: dict[str, set[uuid.UUID]] = defaultdict(set)
+        self._keys: dict[uuid.UUID, tuple[str, set[str]]] = {}
+        for doc_id, key in entries:
+            self.add(doc_id, key)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, doc_id: uuid.UUID, key: str) -> None:
+        self.discard(doc_id)
+        grams = trigrams(key)
+        self._keys[doc_id] = (key, grams)
+        for gram in grams:
+            self._postings[gram].add(doc_id)
+
+    def discard(self, doc_id: uuid.UUID) -> None:
+        entry = self._keys.pop(doc_id, None)
+        if entry is None:
+            return
+        for gram in entry[1]:
+            self._postings[gram].discard(doc_id)
+
+    def search(self, query: str, *, threshold: float = WORD_SIMILARITY_THRESHOLD) -> list[tuple[uuid.UUID, float]]:
+        """Matching ids, best first. Substring hits score 1.0 on top of their similarity."""
+        q = fold(query)
+        q_grams = trigrams(q)
+        candidates: set[uuid.UUID] = set()
+        for gram in q_grams:
+            candidates |= self._postings.get(gram, set())
+        scored = []
+        for doc_id in candidates:
+            key, grams = self._keys[doc_id]
+            score = word_similarity(q_grams, grams)
+            if q and q in key:
+                score += 1.0
+            elif score < threshold:
+                continue
+            scored.append((doc_id, score))
+        scored.sort(key=lambda hit: -hit[1])
+        return scored
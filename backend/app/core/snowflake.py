@@ -0,0 +1,106 @@
+"""Snowflake-style order codes rendered in Crockford base32.
+
+A code is a 63-bit integer: 41 bits of milliseconds since ``EPOCH``, 10 bits
+of worker id and 12 bits of per-millisecond sequence. Every process can mint
+codes without talking to the database, and they sort by creation time.
+Two processes must never share a worker id: set ``ORDER_CODE_WORKER_ID`` or
+lease one at startup (``app.services.worker_lease``); until then
+``next_order_code`` refuses to mint.
+Rendered as ``SS-`` plus 13 Crockford base32 characters; fixed width, so the
+string sorts like the integer.
+"""
+
+from __future__ import annotations
+
+import datetime
+import threading
+import time
+
+from app.core.config import settings
+
+EPOCH = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+_EPOCH_MS = int(EPOCH.timestamp() * 1000)
+
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+_MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+PREFIX = "SS-"
+_WIDTH = 13
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DECODE = {c: i for i, c in enumerate(_ALPHABET)} | {"O": 0, "I": 1, "L": 1}
+
+
+class SnowflakeGenerator:
+    def __init__(self, worker_id: int) -> None:
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be in 0..{MAX_WORKER_ID}")
+        self._worker_id = worker_id
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def next_id(self) -> int:
+        with self._lock:
+            # Never step backwards: a clock moved back, or a sequence overflow,
+            # borrows the next millisecond instead of sleeping.
+            now = max(int(time.time() * 1000) - _EPOCH_MS, self._last_ms)
+            if now == self._last_ms:
+                self._sequence += 1
+                if self._sequence > _MAX_SEQUENCE:
+                    now += 1
+                    self._sequence = 0
+            else:
+                self._sequence = 0
+            self._last_ms = now
+            return (now << (WORKER_BITS + SEQUENCE_BITS)) | (self._worker_id << SEQUENCE_BITS) | self._sequence
+
+
+def timestamp_of(code: int) -> datetime.datetime:
+    ms = (code >> (WORKER_BITS + SEQUENCE_BITS)) + _EPOCH_MS
+    return datetime.datetime.fromtimestamp(ms / 1000, tz=datetime.timezone.utc)
+
+
+def format_code(code: int) -> str:
+    chars = []
+    for _ in range(_WIDTH):
+        code, rem = divmod(code, 32)
+        chars.append(_ALPHABET[rem])
+    return PREFIX + "".join(reversed(chars))
+
+
+def parse_code(text: str) -> int:
+    """Inverse of ``format_code``; case-insensitive, ignores hyphens, reads O/I/L as 0/1/1."""
+    body = text.strip().upper()
+    body = body.removeprefix(PREFIX).replace("-", "")
+    if not body or len(body) > _WIDTH:
+        raise ValueError(f"Invalid order code: {text!r}")
+    value = 0
+    for ch in body:
+        if ch not in _DECODE:
+            raise ValueError(f"Invalid order code: {text!r}")
+        value = value * 32 + _DECODE[ch]
+    if value >> 63:
+        raise ValueError(f"Invalid order code: {text!r}")
+    return value
+
+
+_generator: SnowflakeGenerator | None = None
+
+
+def configure(worker_id: int | None) -> None:
+    """Mint this process's codes under ``worker_id``; ``None`` stops minting (lease lost)."""
+    global _generator
+    _generator = SnowflakeGenerator(worker_id) if worker_id is not None else None
+
+
+def next_order_code() -> int:
+    generator = _generator
+    if generator is None:
+        raise RuntimeError("No order-code worker id: set ORDER_CODE_WORKER_ID or lease one at startup")
+    return generator.next_id()
+
+
+if settings.ORDER_CODE_WORKER_ID is not None:
+    configure(settings.ORDER_CODE_WORKER_ID)
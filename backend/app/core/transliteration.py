@@ -0,0 +1,71 @@
+"""Search-key folding for Ge'ez (Ethiopic) and Latin product names.
+
+Shops spell the same product as ``ስኳር``, ``Sukar`` or ``sukkar``. ``fold``
+maps all of them onto one lowercase Latin key: Ethiopic syllables are
+romanized, Latin is stripped of accents, doubled letters are collapsed and
+spellings that are interchangeable in Ethiopian romanization (q/k, ph/f,
+ts/s, ...) are merged. Both stored names and queries go through ``fold``,
+so matching (substring, full-text, trigram) happens between keys.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+
+# Consonant for each 8-codepoint row of the Ethiopic block (U+1200-U+137F).
+# Rows are laid out by vowel order: ä u i a e ə o (wa).
+_ROWS: dict[int, str] = {
+    0x1200: "h", 0x1208: "l", 0x1210: "h", 0x1218: "m", 0x1220: "s", 0x1228: "r", 0x1230: "s", 0x1238: "sh",
+    0x1240: "k", 0x1248: "kw", 0x1250: "k", 0x1258: "kw", 0x1260: "b", 0x1268: "v", 0x1270: "t", 0x1278: "ch",
+    0x1280: "h", 0x1288: "hw", 0x1290: "n", 0x1298: "ny", 0x12A0: "", 0x12A8: "k", 0x12B0: "kw", 0x12B8: "h",
+    0x12C0: "hw", 0x12C8: "w", 0x12D0: "", 0x12D8: "z", 0x12E0: "zh", 0x12E8: "y", 0x12F0: "d", 0x12F8: "d",
+    0x1300: "j", 0x1308: "g", 0x1310: "gw", 0x1318: "g", 0x1320: "t", 0x1328: "ch", 0x1330: "p", 0x1338: "s",
+    0x1340: "s", 0x1348: "f", 0x1350: "p", 0x1358: "mya",
+}
+# Labialized rows (ቈ ኈ ኰ ዀ ጐ) only use orders ä, i, a, e, ə.
+_LABIALIZED = {0x1248, 0x1258, 0x1288, 0x12B0, 0x12C0, 0x1310}
+_VOWELS = ("e", "u", "i", "a", "e", "", "o", "wa")
+_LABIAL_VOWELS = ("e", "", "i", "a", "e", "", "", "")
+
+# Applied in order, after romanization and lowercasing.
+_LATIN_RULES = (
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"q"), "k"),
+    (re.compile(r"c(?!h)"), "k"),
+    (re.compile(r"ts|tz"), "s"),
+    (re.compile(r"x"), "ch"),
+    (re.compile(r"[’'`ʼ]"), ""),
+    (re.compile(r"(?<=[aeiou])y\b"), "i"),
+    (re.compile(r"([a-z])\1+"), r"\1"),
+    (re.compile(r"[^0-9a-z]+"), " "),
+)
+
+
+def _romanize_char(ch: str) -> str:
+    cp = ord(ch)
+    row = cp & ~0x7
+    if row not in _ROWS:
+        return ch
+    order = cp - row
+    consonant = _ROWS[row]
+    vowels = _LABIAL_VOWELS if row in _LABIALIZED else _VOWELS
+    if consonant == "":  # glottal rows: vowel carriers (አ, ዐ); ä is written "a"
+        return ("a", "u", "i", "a", "e", "", "o", "wa")[order]
+    if consonant == "mya":
+        return "mya"
+    return consonant + vowels[order]
+
+
+def romanize(text: str) -> str:
+    """Ethiopic syllables to Latin; everything else passes through."""
+    return "".join(_romanize_char(ch) if "ሀ" <= ch <= "፿" else ch for ch in text)
+
+
+def fold(text: str) -> str:
+    """Script- and spelling-insensitive search key for ``text``."""
+    latin = romanize(unicodedata.normalize("NFC", text))
+    ascii_ish = "".join(c for c in unicodedata.normalize("NFKD", latin) if not unicodedata.combining(c)).lower()
+    for pattern, repl in _LATIN_RULES:
+        ascii_ish = pattern.sub(repl, ascii_ish)
+    return ascii_ish.strip()
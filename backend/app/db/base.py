@@ -1,12 +1,19 @@
 """Import all models here so Alembic can discover them."""
 
+from app.models.analytics import OrderDailyRollup, OrderRollupMark, ProductDailyRollup  # noqa: F401
 from app.models.base import Base  # noqa: F401
+from app.models.credit_ledger import CreditBalanceCheckpoint, CreditLedgerEntry  # noqa: F401
 from app.models.credit_profile import CreditProfile  # noqa: F401
 from app.models.currency import Currency  # noqa: F401
+from app.models.idempotency import IdempotencyKey  # noqa: F401
 from app.models.language import Language  # noqa: F401
 from app.models.order import Order, OrderItem  # noqa: F401
+from app.models.outbox import OutboxMessage  # noqa: F401
+from app.models.price_list import PriceList, PriceTier  # noqa: F401
 from app.models.product import Product  # noqa: F401
+from app.models.product_facet import ProductFacet  # noqa: F401
 from app.models.setting import Setting  # noqa: F401
+from app.models.stock import StockLevel, StockReservation  # noqa: F401
 from app.models.tenant import Tenant  # noqa: F401
 from app.models.translation import Translation  # noqa: F401
 from app.models.user import User  # noqa: F401
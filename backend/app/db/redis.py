@@ -0,0 +1,10 @@
+"""Shared async Redis client."""
+
+from __future__ import annotations
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+# from_url only builds a connection pool; nothing connects until first use.
+redis_client: aioredis.Redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
@@ -24,6 +24,7 @@ from app.models.product import Product
 from app.models.tenant import Tenant
 from app.models.translation import Translation
 from app.models.user import User, UserRole
+from app.repositories.facet_repo import ProductFacetRepository
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -223,6 +224,7 @@ async def seed(session: AsyncSession) -> None:
         session.add(prod)
         product_objs.append(prod)
     await session.flush()
+    await ProductFacetRepository(session).refresh((distributor.id, p.category) for p in product_objs)
 
     # ── Sample Order (3 items) ──
     items_data = [
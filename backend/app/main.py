@@ -13,7 +13,8 @@ from app.api.routers import api_router
 from app.core.config import settings
 from app.core.exceptions import SoukSyncError
 from app.core.logging import setup_logging
-from app.core.middleware import RequestIdMiddleware, TimingMiddleware
+from app.core.middleware import IdempotencyMiddleware, RequestIdMiddleware, TimingMiddleware
+from app.services.worker_lease import order_code_worker
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator
@@ -22,7 +23,8 @@ if TYPE_CHECKING:
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     setup_logging()
-    yield
+    async with order_code_worker():
+        yield
 
 
 def create_app() -> FastAPI:
@@ -40,6 +42,7 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    application.add_middleware(IdempotencyMiddleware)
     application.add_middleware(RequestIdMiddleware)
     application.add_middleware(TimingMiddleware)
 
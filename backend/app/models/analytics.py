@@ -0,0 +1,77 @@
+"""Daily order rollups backing the analytics KPI endpoint."""
+
+from __future__ import annotations
+
+import datetime  # noqa: TC003
+import uuid  # noqa: TC003
+from decimal import Decimal  # noqa: TC003
+
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Integer, Numeric, Uuid, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+from app.models.order import OrderStatus
+
+
+class OrderDailyRollup(Base):
+    """Order count and GMV per day, distributor and current status."""
+
+    __tablename__ = "order_daily_rollups"
+
+    day: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    distributor_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id"), primary_key=True,
+    )
+    status: Mapped[OrderStatus] = mapped_column(
+        Enum(OrderStatus, name="order_status", native_enum=False), primary_key=True,
+    )
+    tenant_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("tenants.id"), nullable=True, index=True,
+    )
+    order_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    gmv: Mapped[Decimal] = mapped_column(Numeric(14, 2), default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<OrderDailyRollup {self.day} {self.distributor_id} {self.status}={self.order_count}>"
+
+
+class ProductDailyRollup(Base):
+    """Units and revenue per day, distributor and product (cancelled orders excluded)."""
+
+    __tablename__ = "product_daily_rollups"
+
+    day: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    distributor_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id"), primary_key=True,
+    )
+    product_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("products.id"), primary_key=True,
+    )
+    tenant_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("tenants.id"), nullable=True, index=True,
+    )
+    quantity: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(14, 2), default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ProductDailyRollup {self.day} {self.product_id} qty={self.quantity}>"
+
+
+class OrderRollupMark(Base):
+    """An (order, status) already counted in the rollups.
+
+    Rollups are applied from the outbox, which delivers at least once; the
+    mark is written in the same transaction as the deltas, so a redelivered
+    event is recognised and skipped. Marks only matter until their message
+    is processed and are purged with the outbox.
+    """
+
+    __tablename__ = "order_rollup_marks"
+
+    order_id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True)
+    status: Mapped[OrderStatus] = mapped_column(
+        Enum(OrderStatus, name="order_status", native_enum=False), primary_key=True,
+    )
+    applied_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True,
+    )
@@ -3,11 +3,44 @@
 from __future__ import annotations
 
 import datetime  # noqa: TC003
-import uuid  # noqa: TC003
+import os
+import threading
+import time
+import uuid
 
 from sqlalchemy import DateTime, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+_uuid7_lock = threading.Lock()
+_uuid7_last_ms = 0
+_uuid7_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """RFC 9562 UUIDv7: 48-bit Unix ms timestamp, then random bits.
+
+    New keys land at the right-hand edge of the primary-key B-tree instead of
+    a random page. Within one millisecond ``rand_a`` is a counter seeded at
+    random (RFC 9562 §6.2, method 1), so keys from one process stay ordered.
+    """
+    global _uuid7_last_ms, _uuid7_counter
+    with _uuid7_lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _uuid7_last_ms:
+            _uuid7_last_ms = ms
+            _uuid7_counter = int.from_bytes(os.urandom(2), "big") & 0x7FF  # leave headroom to count up
+        else:
+            # Same millisecond or clock went back: keep counting from the last timestamp.
+            _uuid7_counter += 1
+            if _uuid7_counter > 0xFFF:
+                _uuid7_last_ms += 1
+                _uuid7_counter = 0
+            ms = _uuid7_last_ms
+        counter = _uuid7_counter
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (ms & ((1 << 48) - 1)) << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | rand_b
+    return uuid.UUID(int=value)
+
 
 class Base(DeclarativeBase):
     pass
@@ -30,5 +63,5 @@ class TimestampMixin:
 class UUIDPrimaryKeyMixin:
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
     )
@@ -0,0 +1,68 @@
+"""Credit ledger — append-only history behind ``CreditProfile.current_balance``."""
+
+from __future__ import annotations
+
+import datetime  # noqa: TC003
+import enum
+import uuid  # noqa: TC003
+from decimal import Decimal  # noqa: TC003
+
+from sqlalchemy import BigInteger, DateTime, Enum, ForeignKey, Numeric, String, UniqueConstraint, Uuid, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, UUIDPrimaryKeyMixin
+
+
+class LedgerKind(str, enum.Enum):
+    CHARGE = "charge"
+    REPAYMENT = "repayment"
+    ADJUSTMENT = "adjustment"
+
+
+class CreditLedgerEntry(UUIDPrimaryKeyMixin, Base):
+    """One balance movement. Never updated or deleted.
+
+    ``seq`` numbers a profile's entries without gaps; ``amount`` is signed
+    (charges add to what the kiosk owes, repayments subtract) and
+    ``balance_after`` is the running balance once it applied.
+    """
+
+    __tablename__ = "credit_ledger"
+    __table_args__ = (UniqueConstraint("profile_id", "seq", name="uq_credit_ledger_profile_seq"),)
+
+    profile_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("credit_profiles.id"), nullable=False,
+    )
+    seq: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    kind: Mapped[LedgerKind] = mapped_column(
+        Enum(LedgerKind, name="ledger_kind", native_enum=False), nullable=False,
+    )
+    amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    balance_after: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    # No foreign key: orders are partitioned by month (see migration 0005).
+    order_id: Mapped[uuid.UUID | None] = mapped_column(Uuid, nullable=True, index=True)
+    note: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<CreditLedgerEntry {self.profile_id}#{self.seq} {self.kind.value} {self.amount}>"
+
+
+class CreditBalanceCheckpoint(Base):
+    """A balance verified against the ledger up to and including entry ``seq``."""
+
+    __tablename__ = "credit_balance_checkpoints"
+
+    profile_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("credit_profiles.id"), primary_key=True,
+    )
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    balance: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<CreditBalanceCheckpoint {self.profile_id}#{self.seq}={self.balance}>"
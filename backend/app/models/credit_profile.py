@@ -6,7 +6,7 @@ import uuid  # noqa: TC003
 from decimal import Decimal  # noqa: TC003
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Float, ForeignKey, Numeric
+from sqlalchemy import BigInteger, Boolean, Float, ForeignKey, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -24,9 +24,14 @@ class CreditProfile(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     credit_limit: Mapped[Decimal] = mapped_column(
         Numeric(12, 2), default=500, nullable=False,
     )
+    # Running-balance snapshot: moved only by CreditRepository's ledger
+    # postings, together with the entry that explains it.
     current_balance: Mapped[Decimal] = mapped_column(
         Numeric(12, 2), default=0, nullable=False,
     )
+    ledger_seq: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    checkpoint_seq: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    # 0 (safest) .. 1, with credit_limit set nightly by app.tasks.risk_scores.
     risk_score: Mapped[float | None] = mapped_column(
         Float, nullable=True,
     )
@@ -35,7 +40,7 @@ class CreditProfile(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     )
 
     user: Mapped[User] = relationship(
-        "User", back_populates="credit_profile", lazy="selectin",
+        "User", back_populates="credit_profile", lazy="raise",
     )
 
     def __repr__(self) -> str:
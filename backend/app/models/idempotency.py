@@ -0,0 +1,32 @@
+"""Idempotency keys — database fallback for replaying write responses."""
+
+from __future__ import annotations
+
+import datetime  # noqa: TC003
+
+from sqlalchemy import JSON, DateTime, Integer, String, Text, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class IdempotencyKey(Base):
+    """One row per caller-scoped key; ``status_code`` is NULL while in flight."""
+
+    __tablename__ = "idempotency_keys"
+
+    key: Mapped[str] = mapped_column(String(320), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_body: Mapped[str | None] = mapped_column(Text, nullable=True)
+    content_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # [[name, value], ...] as the original response sent them, Content-Length aside.
+    response_headers: Mapped[list[list[str]]] = mapped_column(
+        JSON, default=list, server_default=text("'[]'"), nullable=False,
+    )
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False,
+    )
+    expires_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True,
+    )
@@ -8,9 +8,10 @@ import uuid  # noqa: TC003
 from decimal import Decimal  # noqa: TC003
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, Numeric, String, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import BigInteger, DateTime, Enum, ForeignKey, Index, Integer, Numeric, String, Uuid, and_, func
+from sqlalchemy.orm import Mapped, foreign, mapped_column, relationship
 
+from app.core.snowflake import next_order_code
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
 
 if TYPE_CHECKING:
@@ -27,6 +28,10 @@ VALID_TRANSITIONS: dict[str, set[str]] = {
 }
 
 
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
 class OrderStatus(str, enum.Enum):
     PENDING = "pending"
     CONFIRMED = "confirmed"
@@ -36,8 +41,26 @@ class OrderStatus(str, enum.Enum):
 
 
 class Order(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+    # On PostgreSQL orders and order_items are monthly partitions on created_at
+    # (migration 0005); items share their order's created_at, see create_order.
+    # The partition key is part of both tables' primary keys, as in the migration;
+    # the ORM still identifies rows by id alone, which is unique by construction.
     __tablename__ = "orders"
+    __table_args__ = (
+        # A partitioned table's unique indexes must include created_at. create_order
+        # derives created_at from the code, so this still rejects a repeated code.
+        Index("ix_orders_code", "code", "created_at", unique=True),
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
+
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, default=_utcnow, server_default=func.now(), nullable=False,
+    )
 
+    # Snowflake id, shown to people as format_code(code); see app.core.snowflake.
+    code: Mapped[int] = mapped_column(
+        BigInteger, default=next_order_code, nullable=False,
+    )
     user_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.id"), nullable=False,
     )
@@ -66,19 +89,22 @@ class Order(UUIDPrimaryKeyMixin, TimestampMixin, Base):
         "User",
         foreign_keys=[user_id],
         back_populates="orders",
-        lazy="selectin",
+        lazy="raise",
     )
     distributor: Mapped[User] = relationship(
         "User",
         foreign_keys=[distributor_id],
         back_populates="distributed_orders",
-        lazy="selectin",
+        lazy="raise",
     )
     items: Mapped[list[OrderItem]] = relationship(
         "OrderItem",
+        primaryjoin=lambda: and_(
+            Order.id == foreign(OrderItem.order_id), Order.created_at == foreign(OrderItem.created_at)
+        ),
         back_populates="order",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
@@ -87,10 +113,11 @@ class Order(UUIDPrimaryKeyMixin, TimestampMixin, Base):
 
 class OrderItem(UUIDPrimaryKeyMixin, Base):
     __tablename__ = "order_items"
+    __mapper_args__ = {"primary_key": ["id"]}
 
-    order_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("orders.id", ondelete="CASCADE"), nullable=False,
-    )
+    # No foreign key: months are detached and archived independently (migration
+    # 0005); items are written and deleted with their order (cascade below).
+    order_id: Mapped[uuid.UUID] = mapped_column(Uuid, index=True, nullable=False)
     product_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("products.id"), nullable=False,
     )
@@ -100,15 +127,22 @@ class OrderItem(UUIDPrimaryKeyMixin, Base):
     )
     created_at: Mapped[datetime.datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
+        default=_utcnow,
         server_default=func.now(),
         nullable=False,
     )
 
     order: Mapped[Order] = relationship(
-        "Order", back_populates="items", lazy="selectin",
+        "Order",
+        primaryjoin=lambda: and_(
+            Order.id == foreign(OrderItem.order_id), Order.created_at == foreign(OrderItem.created_at)
+        ),
+        back_populates="items",
+        lazy="raise",
     )
     product: Mapped[Product] = relationship(
-        "Product", back_populates="order_items", lazy="selectin",
+        "Product", back_populates="order_items", lazy="raise",
     )
 
     def __repr__(self) -> str:
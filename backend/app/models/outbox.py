@@ -0,0 +1,49 @@
+"""Transactional outbox — side effects recorded alongside the writes that cause them."""
+
+from __future__ import annotations
+
+import datetime  # noqa: TC003
+from typing import Any
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, UUIDPrimaryKeyMixin
+
+ORDER_CREATED = "order.created"
+ORDER_STATUS_CHANGED = "order.status_changed"
+PRODUCT_CHANGED = "product.changed"
+PRICE_LIST_CHANGED = "price_list.changed"
+CREDIT_PROFILE_CREATED = "credit.profile_created"
+
+
+class OutboxMessage(UUIDPrimaryKeyMixin, Base):
+    """One pending side effect; ``processed_at`` is set once every handler succeeded."""
+
+    __tablename__ = "outbox"
+    __table_args__ = (
+        # Dispatchers only ever scan pending rows, oldest first.
+        Index(
+            "ix_outbox_pending",
+            "available_at",
+            postgresql_where=text("processed_at IS NULL"),
+            sqlite_where=text("processed_at IS NULL"),
+        ),
+    )
+
+    topic: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False,
+    )
+    available_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Handlers that already succeeded for this message; a retry runs only the others.
+    handled: Mapped[list[str]] = mapped_column(JSON, default=list, server_default=text("'[]'"), nullable=False)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    processed_at: Mapped[datetime.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<OutboxMessage {self.topic} attempts={self.attempts}>"
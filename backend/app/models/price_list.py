@@ -0,0 +1,63 @@
+"""Distributor price lists — volume tiers and per-segment prices."""
+
+from __future__ import annotations
+
+import uuid  # noqa: TC003
+from decimal import Decimal  # noqa: TC003
+
+from sqlalchemy import Boolean, CheckConstraint, ForeignKey, Integer, Numeric, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+
+
+class PriceList(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+    """A named set of tiers. Without a ``segment`` it applies to every kiosk of the distributor."""
+
+    __tablename__ = "price_lists"
+
+    distributor_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id"), index=True, nullable=False,
+    )
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    segment: Mapped[str | None] = mapped_column(String(30), nullable=True)
+    is_active: Mapped[bool] = mapped_column(
+        Boolean, default=True, nullable=False,
+    )
+
+    tiers: Mapped[list[PriceTier]] = relationship(
+        "PriceTier",
+        back_populates="price_list",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
+    )
+
+    def __repr__(self) -> str:
+        return f"<PriceList {self.name} segment={self.segment}>"
+
+
+class PriceTier(UUIDPrimaryKeyMixin, Base):
+    """Unit price for ``min_quantity`` or more of one product."""
+
+    __tablename__ = "price_tiers"
+    __table_args__ = (
+        UniqueConstraint("price_list_id", "product_id", "min_quantity", name="uq_price_tiers_list_product_qty"),
+        CheckConstraint("min_quantity >= 1", name="ck_price_tiers_min_quantity"),
+    )
+
+    price_list_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("price_lists.id", ondelete="CASCADE"), nullable=False,
+    )
+    product_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("products.id"), nullable=False,
+    )
+    min_quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    unit_price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+
+    price_list: Mapped[PriceList] = relationship(
+        "PriceList", back_populates="tiers", lazy="raise",
+    )
+
+    def __repr__(self) -> str:
+        return f"<PriceTier {self.product_id} {self.min_quantity}+ @ {self.unit_price}>"
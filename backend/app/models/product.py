@@ -6,20 +6,33 @@ import uuid  # noqa: TC003
 from decimal import Decimal  # noqa: TC003
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, ForeignKey, Numeric, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import BigInteger, Boolean, ForeignKey, Index, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
+from app.core.snowflake import SnowflakeGenerator
+from app.core.transliteration import fold
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
 
 if TYPE_CHECKING:
     from app.models.order import OrderItem
     from app.models.user import User
 
+# Stand-in change sequence for databases without the 0009 trigger (SQLite);
+# on PostgreSQL the trigger overwrites it with the writing transaction's id.
+_change_seq = SnowflakeGenerator(0)
+
 
 class Product(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_distributor_change_seq", "distributor_id", "change_seq"),
+        Index("ix_products_distributor_category", "distributor_id", "category"),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # ``fold(name)``, kept in step by ``_fold_name``. On PostgreSQL it has a
+    # trigram GIN index and feeds the generated ``search_vector`` (0008).
+    name_folded: Mapped[str] = mapped_column(String(512), default="", nullable=False)
     sku: Mapped[str | None] = mapped_column(
         String(50), unique=True, nullable=True,
     )
@@ -33,13 +46,26 @@ class Product(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     is_active: Mapped[bool] = mapped_column(
         Boolean, default=True, nullable=False,
     )
+    # Set by StockRepository.set_stock; orders reserve stock only for tracked products.
+    track_stock: Mapped[bool] = mapped_column(
+        Boolean, default=False, nullable=False,
+    )
+    # Delta-sync cursor, see ProductRepository.changes_since.
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, default=_change_seq.next_id, onupdate=_change_seq.next_id, nullable=False, index=True,
+    )
 
     distributor: Mapped[User] = relationship(
-        "User", back_populates="products", lazy="selectin",
+        "User", back_populates="products", lazy="raise",
     )
     order_items: Mapped[list[OrderItem]] = relationship(
-        "OrderItem", back_populates="product", lazy="selectin",
+        "OrderItem", back_populates="product", lazy="raise",
     )
 
+    @validates("name")
+    def _fold_name(self, _key: str, name: str) -> str:
+        self.name_folded = fold(name)
+        return name
+
     def __repr__(self) -> str:
         return f"<Product {self.name} sku={self.sku}>"
@@ -0,0 +1,35 @@
+"""Per-category product facets backing catalog navigation."""
+
+from __future__ import annotations
+
+import uuid  # noqa: TC003
+from decimal import Decimal  # noqa: TC003
+
+from sqlalchemy import ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ProductFacet(Base):
+    """Active product count and price range per distributor and category.
+
+    Uncategorized products are counted under ``category == ""``.
+    """
+
+    __tablename__ = "product_facets"
+    __table_args__ = (Index("ix_product_facets_tenant_category", "tenant_id", "category"),)
+
+    distributor_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id"), primary_key=True,
+    )
+    category: Mapped[str] = mapped_column(String(50), primary_key=True)
+    tenant_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("tenants.id"), nullable=True,
+    )
+    active_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    min_price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    max_price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ProductFacet {self.distributor_id} {self.category!r}={self.active_count}>"
@@ -27,7 +27,7 @@ class Setting(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     value: Mapped[str] = mapped_column(Text, nullable=False)
 
     tenant: Mapped[Tenant | None] = relationship(
-        "Tenant", lazy="selectin",
+        "Tenant", lazy="raise",
     )
 
     def __repr__(self) -> str:
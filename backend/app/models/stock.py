@@ -0,0 +1,77 @@
+"""Stock — striped availability counters and per-order reservations."""
+
+from __future__ import annotations
+
+import datetime  # noqa: TC003
+import enum
+import uuid  # noqa: TC003
+
+from sqlalchemy import CheckConstraint, DateTime, Enum, ForeignKey, Index, Integer, Uuid, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, UUIDPrimaryKeyMixin
+
+
+class StockLevel(Base):
+    """One stripe of a product's unreserved stock.
+
+    A product's stock is the sum of its stripes. A reservation draws from
+    one stripe it can lock without waiting, so concurrent checkouts of a
+    hot product update different rows. A product with no stripes is not
+    stock-tracked.
+    """
+
+    __tablename__ = "stock_levels"
+    __table_args__ = (CheckConstraint("available >= 0", name="ck_stock_levels_available"),)
+
+    product_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), primary_key=True,
+    )
+    stripe: Mapped[int] = mapped_column(Integer, primary_key=True)
+    available: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<StockLevel {self.product_id}#{self.stripe}={self.available}>"
+
+
+class ReservationStatus(str, enum.Enum):
+    HELD = "held"
+    COMMITTED = "committed"
+    RELEASED = "released"
+
+
+class StockReservation(UUIDPrimaryKeyMixin, Base):
+    """Units an order holds from one stripe.
+
+    Held from order creation; committed once the order ships, or released
+    back to the stripe if it is cancelled.
+    """
+
+    __tablename__ = "stock_reservations"
+    __table_args__ = (
+        Index(
+            "ix_stock_reservations_held",
+            "product_id",
+            postgresql_where=text("status = 'HELD'"),
+            sqlite_where=text("status = 'HELD'"),
+        ),
+    )
+
+    # No foreign key: orders are partitioned by month (see migration 0005).
+    order_id: Mapped[uuid.UUID] = mapped_column(Uuid, index=True, nullable=False)
+    product_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("products.id"), nullable=False,
+    )
+    stripe: Mapped[int] = mapped_column(Integer, nullable=False)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[ReservationStatus] = mapped_column(
+        Enum(ReservationStatus, name="reservation_status", native_enum=False),
+        default=ReservationStatus.HELD,
+        nullable=False,
+    )
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<StockReservation {self.order_id} {self.product_id} x{self.quantity} {self.status.value}>"
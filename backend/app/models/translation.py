@@ -35,10 +35,10 @@ class Translation(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     value: Mapped[str] = mapped_column(Text, nullable=False)
 
     language: Mapped[Language] = relationship(
-        "Language", back_populates="translations", lazy="selectin",
+        "Language", back_populates="translations", lazy="raise",
     )
     tenant: Mapped[Tenant | None] = relationship(
-        "Tenant", lazy="selectin",
+        "Tenant", lazy="raise",
     )
 
     def __repr__(self) -> str:
@@ -49,6 +49,8 @@ class User(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     tenant_id: Mapped[uuid.UUID | None] = mapped_column(
         ForeignKey("tenants.id"), nullable=True,
     )
+    # Kiosk pricing segment; price lists with the same segment apply to it.
+    price_segment: Mapped[str | None] = mapped_column(String(30), nullable=True)
     is_active: Mapped[bool] = mapped_column(
         Boolean, default=True, nullable=False,
     )
@@ -58,34 +60,34 @@ class User(UUIDPrimaryKeyMixin, TimestampMixin, Base):
         "User",
         remote_side="User.id",
         back_populates="kiosk_owners",
-        lazy="selectin",
+        lazy="raise",
     )
     kiosk_owners: Mapped[list[User]] = relationship(
         "User",
         back_populates="distributor",
-        lazy="selectin",
+        lazy="raise",
     )
 
     products: Mapped[list[Product]] = relationship(
-        "Product", back_populates="distributor", lazy="selectin",
+        "Product", back_populates="distributor", lazy="raise",
     )
     orders: Mapped[list[Order]] = relationship(
         "Order",
         foreign_keys="Order.user_id",
         back_populates="user",
-        lazy="selectin",
+        lazy="raise",
     )
     distributed_orders: Mapped[list[Order]] = relationship(
         "Order",
         foreign_keys="Order.distributor_id",
         back_populates="distributor",
-        lazy="selectin",
+        lazy="raise",
     )
     credit_profile: Mapped[CreditProfile | None] = relationship(
-        "CreditProfile", back_populates="user", uselist=False, lazy="selectin",
+        "CreditProfile", back_populates="user", uselist=False, lazy="raise",
     )
     tenant: Mapped[Tenant | None] = relationship(
-        "Tenant", back_populates="users", lazy="selectin",
+        "Tenant", back_populates="users", lazy="raise",
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,332 @@
+"""Analytics repository — incremental daily rollups and KPI reads.
+
+Order writes enqueue ``order.created`` / ``order.status_changed`` and the
+outbox handlers turn them into signed deltas on ``order_daily_rollups`` and
+``product_daily_rollups``, so KPI reads only ever touch one row per day ×
+distributor × status/product, however many orders exist, and checkouts
+never wait on those shared rows. ``rebuild`` recomputes a date range from
+the source tables and marks what it counted, so messages still queued for
+those orders are skipped; months whose partitions were archived are left as
+they are.
+"""
+
+from __future__ import annotations
+
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, cast
+
+from sqlalchemy import and_, delete, func, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models.analytics import OrderDailyRollup, OrderRollupMark, ProductDailyRollup
+from app.models.order import VALID_TRANSITIONS, Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.user import User
+from app.repositories.partition_repo import PartitionRepository, add_months, month_start
+from app.schemas.analytics import KPIResponse, TopProduct
+
+if TYPE_CHECKING:
+    import uuid
+
+    from sqlalchemy.engine import CursorResult
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.repositories.order_repo import OrderStatusChange
+
+
+def _utc_day(value: datetime.datetime) -> datetime.date:
+    # SQLite hands back naive timestamps; they are UTC.
+    if value.tzinfo is None:
+        return value.date()
+    return value.astimezone(datetime.timezone.utc).date()
+
+
+def _utc_midnight(day: datetime.date) -> datetime.datetime:
+    return datetime.datetime.combine(day, datetime.time.min, tzinfo=datetime.timezone.utc)
+
+
+def _reachable(status: str) -> set[str]:
+    """``status`` and every status an order can move on to from it."""
+    seen = {status}
+    for nxt in VALID_TRANSITIONS[status]:
+        seen |= _reachable(nxt)
+    return seen
+
+
+class AnalyticsRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    @property
+    def _dialect(self) -> str:
+        return self._session.get_bind().dialect.name
+
+    def _day_expr(self, column: Any) -> Any:
+        """SQL equivalent of ``_utc_day`` for the current dialect."""
+        if self._dialect == "postgresql":
+            return func.date(func.timezone("UTC", column))
+        return func.date(column)
+
+    def _upsert(self, model: Any) -> Any:
+        return (postgresql.insert if self._dialect == "postgresql" else sqlite.insert)(model)
+
+    @staticmethod
+    def _add_on_conflict(stmt: Any, model: Any, key: list[str], additive: list[str]) -> Any:
+        """Turn a key collision into adding the new values onto the existing row."""
+        return stmt.on_conflict_do_update(
+            index_elements=key,
+            set_={col: getattr(model, col) + getattr(stmt.excluded, col) for col in additive},
+        )
+
+    async def _tenants(self, distributor_ids: set[uuid.UUID]) -> dict[uuid.UUID, uuid.UUID | None]:
+        stmt = select(User.id, User.tenant_id).where(User.id.in_(distributor_ids))
+        return {row.id: row.tenant_id for row in (await self._session.execute(stmt)).all()}
+
+    async def _bump_orders(self, deltas: dict[tuple[datetime.date, uuid.UUID, str], list[Any]]) -> None:
+        deltas = {k: v for k, v in deltas.items() if v[0] or v[1]}
+        if not deltas:
+            return
+        tenants = await self._tenants({dist for _, dist, _ in deltas})
+        rows = [
+            {
+                "day": day,
+                "distributor_id": dist,
+                "status": OrderStatus(status),
+                "tenant_id": tenants.get(dist),
+                "order_count": count,
+                "gmv": gmv,
+            }
+            for (day, dist, status), (count, gmv) in deltas.items()
+        ]
+        stmt = self._upsert(OrderDailyRollup).values(rows)
+        await self._session.execute(
+            self._add_on_conflict(stmt, OrderDailyRollup, ["day", "distributor_id", "status"], ["order_count", "gmv"])
+        )
+
+    async def _bump_products(self, order_ids: list[uuid.UUID], sign: int) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) the lines of the given orders."""
+        day = self._day_expr(Order.created_at)
+        lines = (
+            select(
+                day,
+                Order.distributor_id,
+                OrderItem.product_id,
+                User.tenant_id,
+                func.sum(OrderItem.quantity) * sign,
+                func.sum(OrderItem.quantity * OrderItem.unit_price) * sign,
+            )
+            .join(Order, and_(Order.id == OrderItem.order_id, Order.created_at == OrderItem.created_at))
+            .join(User, User.id == Order.distributor_id)
+            .where(Order.id.in_(order_ids))
+            .group_by(day, Order.distributor_id, OrderItem.product_id, User.tenant_id)
+        )
+        stmt = self._upsert(ProductDailyRollup).from_select(
+            ["day", "distributor_id", "product_id", "tenant_id", "quantity", "revenue"], lines,
+        )
+        await self._session.execute(
+            self._add_on_conflict(
+                stmt, ProductDailyRollup, ["day", "distributor_id", "product_id"], ["quantity", "revenue"],
+            )
+        )
+
+    async def _unmarked(self, changes: list[OrderStatusChange]) -> list[OrderStatusChange]:
+        """Mark each (order, status) as counted; only those not marked before come back."""
+        keys = list({(c.id, c.status) for c in changes})
+        marks = [{"order_id": oid, "status": OrderStatus(status)} for oid, status in keys]
+        stmt = (
+            self._upsert(OrderRollupMark)
+            .values(marks)
+            .on_conflict_do_nothing()
+            .returning(OrderRollupMark.order_id, OrderRollupMark.status)
+        )
+        fresh = {(row.order_id, row.status.value) for row in await self._session.execute(stmt)}
+        applied: list[OrderStatusChange] = []
+        for change in changes:
+            if (change.id, change.status) in fresh:
+                fresh.discard((change.id, change.status))
+                applied.append(change)
+        return applied
+
+    async def record_status_changes(self, changes: list[OrderStatusChange]) -> None:
+        """Apply new orders (``previous_status`` None) and transitions to the rollups.
+
+        Each (order, status) counts once, however often it is delivered.
+        """
+        if not changes:
+            return
+        changes = await self._unmarked(changes)
+        deltas: dict[tuple[datetime.date, uuid.UUID, str], list[Any]] = defaultdict(lambda: [0, Decimal("0")])
+        for change in changes:
+            day = _utc_day(change.created_at)
+            if change.previous_status is not None:
+                old = deltas[(day, change.distributor_id, change.previous_status)]
+                old[0] -= 1
+                old[1] -= change.total
+            new = deltas[(day, change.distributor_id, change.status)]
+            new[0] += 1
+            new[1] += change.total
+        await self._bump_orders(deltas)
+
+        created = [c.id for c in changes if c.previous_status is None]
+        if created:
+            await self._bump_products(created, 1)
+        cancelled = [c.id for c in changes if c.status == OrderStatus.CANCELLED.value]
+        if cancelled:
+            await self._bump_products(cancelled, -1)
+
+    async def purge_marks(self, older_than: datetime.timedelta) -> int:
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - older_than
+        stmt = delete(OrderRollupMark).where(OrderRollupMark.applied_at < cutoff)
+        return cast("CursorResult[Any]", await self._session.execute(stmt)).rowcount
+
+    async def _archived_months(self, since: datetime.date, until: datetime.date) -> set[datetime.date]:
+        """Months in range whose order partitions were archived and dropped.
+
+        Their orders are gone, so recomputing them would zero their rollups.
+        """
+        if self._dialect != "postgresql":
+            return set()
+        partitions = PartitionRepository(self._session)
+        if not await partitions.is_partitioned("orders"):
+            return set()
+        attached = await partitions.list_months("orders")
+        if not attached:
+            return set()
+        months = set()
+        month = month_start(since)
+        # Archiving drops the oldest months; anything past the newest partition is in the default one.
+        while month <= until and month < attached[-1]:
+            if month not in attached:
+                months.add(month)
+            month = add_months(month, 1)
+        return months
+
+    async def rebuild(self, since: datetime.date, until: datetime.date) -> list[datetime.date]:
+        """Recompute rollups for ``since``..``until`` (inclusive) from orders.
+
+        Returns the archived months that were skipped.
+        """
+        archived = await self._archived_months(since, until)
+        start: datetime.date | None = None
+        day = since
+        while day <= until:
+            if month_start(day) in archived:
+                if start is not None:
+                    await self._rebuild_span(start, day - datetime.timedelta(days=1))
+                    start = None
+                day = add_months(month_start(day), 1)
+                continue
+            if start is None:
+                start = day
+            day += datetime.timedelta(days=1)
+        if start is not None:
+            await self._rebuild_span(start, until)
+        return sorted(archived)
+
+    async def _rebuild_span(self, since: datetime.date, until: datetime.date) -> None:
+        for model in (OrderDailyRollup, ProductDailyRollup):
+            await self._session.execute(delete(model).where(model.day >= since, model.day <= until))
+
+        in_range = (
+            Order.created_at >= _utc_midnight(since),
+            Order.created_at < _utc_midnight(until + datetime.timedelta(days=1)),
+        )
+        day = self._day_expr(Order.created_at)
+        orders = (
+            select(
+                day, Order.distributor_id, Order.status, User.tenant_id, func.count(), func.sum(Order.total),
+            )
+            .join(User, User.id == Order.distributor_id)
+            .where(*in_range)
+            .group_by(day, Order.distributor_id, Order.status, User.tenant_id)
+        )
+        await self._session.execute(
+            insert(OrderDailyRollup).from_select(
+                ["day", "distributor_id", "status", "tenant_id", "order_count", "gmv"], orders,
+            )
+        )
+        lines = (
+            select(
+                day,
+                Order.distributor_id,
+                OrderItem.product_id,
+                User.tenant_id,
+                func.sum(OrderItem.quantity),
+                func.sum(OrderItem.quantity * OrderItem.unit_price),
+            )
+            .join(Order, and_(Order.id == OrderItem.order_id, Order.created_at == OrderItem.created_at))
+            .join(User, User.id == Order.distributor_id)
+            .where(*in_range, Order.status != OrderStatus.CANCELLED)
+            .group_by(day, Order.distributor_id, OrderItem.product_id, User.tenant_id)
+        )
+        await self._session.execute(
+            insert(ProductDailyRollup).from_select(
+                ["day", "distributor_id", "product_id", "tenant_id", "quantity", "revenue"], lines,
+            )
+        )
+        # Everything an order has been through is now counted; its queued messages must not count it again.
+        for status in OrderStatus:
+            reached = select(Order.id, literal(status, OrderRollupMark.__table__.c.status.type)).where(
+                *in_range, Order.status.in_([OrderStatus(s) for s in _reachable(status.value)]),
+            )
+            await self._session.execute(
+                self._upsert(OrderRollupMark).from_select(["order_id", "status"], reached).on_conflict_do_nothing()
+            )
+
+    async def get_kpis(
+        self,
+        *,
+        date_from: datetime.date,
+        date_to: datetime.date,
+        distributor_id: uuid.UUID | None = None,
+        tenant_id: uuid.UUID | None = None,
+        top_n: int = 10,
+    ) -> KPIResponse:
+        def _scoped(stmt: Any, model: Any) -> Any:
+            stmt = stmt.where(model.day >= date_from, model.day <= date_to)
+            if distributor_id is not None:
+                stmt = stmt.where(model.distributor_id == distributor_id)
+            if tenant_id is not None:
+                stmt = stmt.where(model.tenant_id == tenant_id)
+            return stmt
+
+        by_status = _scoped(
+            select(
+                OrderDailyRollup.status,
+                func.sum(OrderDailyRollup.order_count),
+                func.sum(OrderDailyRollup.gmv),
+            ).group_by(OrderDailyRollup.status),
+            OrderDailyRollup,
+        )
+        counts: dict[str, int] = {}
+        gmv = Decimal("0.00")
+        for status, count, status_gmv in (await self._session.execute(by_status)).all():
+            counts[status.value] = int(count)
+            if status != OrderStatus.CANCELLED:
+                gmv += status_gmv or 0
+
+        revenue = func.sum(ProductDailyRollup.revenue)
+        top = _scoped(
+            select(ProductDailyRollup.product_id, Product.name, func.sum(ProductDailyRollup.quantity), revenue)
+            .join(Product, Product.id == ProductDailyRollup.product_id)
+            .group_by(ProductDailyRollup.product_id, Product.name)
+            .having(revenue > literal(0))
+            .order_by(revenue.desc())
+            .limit(top_n),
+            ProductDailyRollup,
+        )
+        top_products = [
+            TopProduct(product_id=pid, name=name, quantity=int(qty), revenue=rev)
+            for pid, name, qty, rev in (await self._session.execute(top)).all()
+        ]
+
+        return KPIResponse(
+            date_from=date_from,
+            date_to=date_to,
+            gmv=gmv,
+            order_count=sum(counts.values()),
+            orders_by_status=counts,
+            top_products=top_products,
+        )
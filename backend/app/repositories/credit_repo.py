@@ -1,19 +1,64 @@
-"""Credit profile repository."""
+"""Credit profile repository — profiles, the append-only ledger and balance checkpoints.
+
+``CreditProfile.current_balance`` is a running-balance snapshot: every
+ledger entry is posted by one ``UPDATE`` that moves the snapshot and
+hands back the entry's ``seq``, so reading a balance is one row however
+long the history. BNPL checkouts reserve credit with ``reserve_credit``,
+whose limit check is the ``WHERE`` clause of that same ``UPDATE``.
+``checkpoint_balances`` periodically re-derives each
+changed balance from its last checkpoint plus the entries since, which
+keeps verification proportional to new activity rather than history.
+The ``scoring_page`` / ``*_activity`` / ``apply_scores`` methods feed the
+nightly risk job (``app.services.risk_scoring``) one page of kiosks at a time.
+"""
 
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
-from sqlalchemy import select
+import structlog
+from sqlalchemy import and_, case, func, insert, select, text, tuple_, update
 
+from app.core.exceptions import NotFoundError, SoukSyncError, ValidationError
+from app.core.risk import DEFAULT_CREDIT_LIMIT
+from app.models.credit_ledger import CreditBalanceCheckpoint, CreditLedgerEntry, LedgerKind
 from app.models.credit_profile import CreditProfile
+from app.models.order import Order, OrderStatus
+from app.models.outbox import CREDIT_PROFILE_CREATED
+from app.repositories.outbox_repo import OutboxRepository
 
 if TYPE_CHECKING:
+    import datetime
     import uuid
+    from collections.abc import Sequence
 
+    from sqlalchemy import ColumnElement
     from sqlalchemy.ext.asyncio import AsyncSession
 
+logger = structlog.get_logger(__name__)
+
+
+class InsufficientCreditError(SoukSyncError):
+    def __init__(self) -> None:
+        super().__init__(message="Not enough credit available for this order", status_code=409)
+
+
+class CheckpointResult(NamedTuple):
+    checkpointed: int
+    repaired: int
+
+
+def signed_amount(kind: LedgerKind, amount: Decimal) -> Decimal:
+    """Charges and repayments are given as positive amounts; adjustments carry their own sign."""
+    if kind == LedgerKind.ADJUSTMENT:
+        if amount == 0:
+            raise ValidationError("An adjustment must be non-zero")
+        return amount
+    if amount <= 0:
+        raise ValidationError(f"A {kind.value} amount must be positive")
+    return amount if kind == LedgerKind.CHARGE else -amount
+
 
 class CreditRepository:
     def __init__(self, session: AsyncSession) -> None:
@@ -27,10 +72,283 @@ class CreditRepository:
     async def create_default_profile(self, user_id: uuid.UUID) -> CreditProfile:
         profile = CreditProfile(
             user_id=user_id,
-            credit_limit=Decimal("500.00"),
+            credit_limit=DEFAULT_CREDIT_LIMIT,
             current_balance=Decimal("0.00"),
         )
         self._session.add(profile)
         await self._session.flush()
         await self._session.refresh(profile)
+        OutboxRepository(self._session).add(
+            CREDIT_PROFILE_CREATED, {"user_id": user_id, "credit_limit": profile.credit_limit}
+        )
         return profile
+
+    async def post_entry(
+        self,
+        profile_id: uuid.UUID,
+        kind: LedgerKind,
+        amount: Decimal,
+        *,
+        order_id: uuid.UUID | None = None,
+        note: str | None = None,
+    ) -> CreditLedgerEntry:
+        """Append a ledger entry and move the balance snapshot with it.
+
+        The snapshot ``UPDATE`` takes the profile's row lock, so postings for
+        one kiosk apply one at a time and ``seq`` has no gaps.
+        """
+        entry = await self._append(
+            [CreditProfile.id == profile_id], kind, signed_amount(kind, amount), order_id=order_id, note=note
+        )
+        if entry is None:
+            raise NotFoundError("Credit profile")
+        return entry
+
+    async def reserve_credit(
+        self,
+        user_id: uuid.UUID,
+        amount: Decimal,
+        *,
+        order_id: uuid.UUID | None = None,
+        note: str | None = None,
+    ) -> CreditLedgerEntry:
+        """Charge ``amount`` to the kiosk's credit if it fits under the limit; raises ``InsufficientCreditError``.
+
+        The limit check is the ``WHERE`` clause of the charging ``UPDATE``.
+        Concurrent checkouts queue on the profile's row lock and each
+        re-evaluates the condition against the balance the previous one
+        committed, so no interleaving overdraws and nothing else is locked.
+        The charge lives in the caller's transaction and rolls back with it.
+        """
+        delta = signed_amount(LedgerKind.CHARGE, amount)
+        entry = await self._append(
+            [
+                CreditProfile.user_id == user_id,
+                CreditProfile.is_active.is_(True),
+                CreditProfile.current_balance + delta <= CreditProfile.credit_limit,
+            ],
+            LedgerKind.CHARGE,
+            delta,
+            order_id=order_id,
+            note=note,
+        )
+        if entry is None:
+            raise InsufficientCreditError()
+        return entry
+
+    async def release_orders(self, order_ids: Sequence[uuid.UUID]) -> int:
+        """Reverse what is still charged to each order (cancellation); the number of entries posted."""
+        if not order_ids:
+            return 0
+        stmt = (
+            select(CreditLedgerEntry.profile_id, CreditLedgerEntry.order_id, func.sum(CreditLedgerEntry.amount))
+            .where(CreditLedgerEntry.order_id.in_(order_ids))
+            .group_by(CreditLedgerEntry.profile_id, CreditLedgerEntry.order_id)
+            .order_by(CreditLedgerEntry.profile_id, CreditLedgerEntry.order_id)
+        )
+        posted = 0
+        for profile_id, order_id, outstanding in (await self._session.execute(stmt)).all():
+            if outstanding > 0:
+                await self._append(
+                    [CreditProfile.id == profile_id],
+                    LedgerKind.ADJUSTMENT,
+                    -outstanding,
+                    order_id=order_id,
+                    note="Order cancelled",
+                )
+                posted += 1
+        return posted
+
+    async def _append(
+        self,
+        where: Sequence[ColumnElement[bool]],
+        kind: LedgerKind,
+        delta: Decimal,
+        *,
+        order_id: uuid.UUID | None,
+        note: str | None,
+    ) -> CreditLedgerEntry | None:
+        """Move the snapshot of the profile matching ``where`` and record the entry; ``None`` if none matched."""
+        stmt = (
+            update(CreditProfile)
+            .where(*where)
+            .values(
+                current_balance=CreditProfile.current_balance + delta,
+                ledger_seq=CreditProfile.ledger_seq + 1,
+            )
+            .returning(CreditProfile.id, CreditProfile.current_balance, CreditProfile.ledger_seq)
+        )
+        row = (await self._session.execute(stmt)).one_or_none()
+        if row is None:
+            return None
+        entry = CreditLedgerEntry(
+            profile_id=row.id,
+            seq=row.ledger_seq,
+            kind=kind,
+            amount=delta,
+            balance_after=row.current_balance,
+            order_id=order_id,
+            note=note,
+        )
+        self._session.add(entry)
+        await self._session.flush()
+        return entry
+
+    async def list_entries(
+        self, profile_id: uuid.UUID, *, before: int | None = None, limit: int = 50
+    ) -> list[CreditLedgerEntry]:
+        """Newest first; pass the last ``seq`` seen as ``before`` for the next page."""
+        stmt = select(CreditLedgerEntry).where(CreditLedgerEntry.profile_id == profile_id)
+        if before is not None:
+            stmt = stmt.where(CreditLedgerEntry.seq < before)
+        stmt = stmt.order_by(CreditLedgerEntry.seq.desc()).limit(limit)
+        return list((await self._session.execute(stmt)).scalars().all())
+
+    async def checkpoint_balances(self, *, limit: int = 1000) -> CheckpointResult:
+        """Checkpoint up to ``limit`` profiles with entries since their last checkpoint.
+
+        Each balance is re-derived as last checkpoint + entries since. A
+        snapshot that disagrees (a manual SQL fix, say) is logged and reset
+        to the ledger's figure: the ledger is the record, the snapshot a cache.
+        """
+        candidates = (
+            select(
+                CreditProfile.id, CreditProfile.ledger_seq, CreditProfile.checkpoint_seq, CreditProfile.current_balance
+            )
+            .where(CreditProfile.ledger_seq > CreditProfile.checkpoint_seq)
+            .order_by(CreditProfile.id)
+            .limit(limit)
+        )
+        if self._session.get_bind().dialect.name == "postgresql":
+            # Holds off postings to these profiles until commit, so the snapshot can't move under us.
+            candidates = candidates.with_for_update(skip_locked=True)
+        profiles = (await self._session.execute(candidates)).all()
+        if not profiles:
+            return CheckpointResult(0, 0)
+        ids = [p.id for p in profiles]
+
+        bases: dict[uuid.UUID, Decimal] = {}
+        previous = [(p.id, p.checkpoint_seq) for p in profiles if p.checkpoint_seq]
+        if previous:
+            stmt = select(CreditBalanceCheckpoint.profile_id, CreditBalanceCheckpoint.balance).where(
+                tuple_(CreditBalanceCheckpoint.profile_id, CreditBalanceCheckpoint.seq).in_(previous)
+            )
+            bases = dict((await self._session.execute(stmt)).all())
+        since = (
+            select(CreditLedgerEntry.profile_id, func.sum(CreditLedgerEntry.amount))
+            .join(
+                CreditProfile,
+                and_(
+                    CreditProfile.id == CreditLedgerEntry.profile_id,
+                    CreditLedgerEntry.seq > CreditProfile.checkpoint_seq,
+                    CreditLedgerEntry.seq <= CreditProfile.ledger_seq,
+                ),
+            )
+            .where(CreditLedgerEntry.profile_id.in_(ids))
+            .group_by(CreditLedgerEntry.profile_id)
+        )
+        deltas = dict((await self._session.execute(since)).all())
+
+        checkpoints = []
+        changes = []
+        repaired = 0
+        for p in profiles:
+            balance = bases.get(p.id, Decimal("0.00")) + deltas.get(p.id, Decimal("0.00"))
+            change = {"id": p.id, "checkpoint_seq": p.ledger_seq}
+            if balance != p.current_balance:
+                logger.warning(
+                    "credit_balance_drift",
+                    profile_id=str(p.id),
+                    snapshot=str(p.current_balance),
+                    ledger=str(balance),
+                    seq=p.ledger_seq,
+                )
+                change["current_balance"] = balance
+                repaired += 1
+            changes.append(change)
+            checkpoints.append({"profile_id": p.id, "seq": p.ledger_seq, "balance": balance})
+
+        await self._session.execute(insert(CreditBalanceCheckpoint), checkpoints)
+        # Executemany by primary key; repaired rows also reset the snapshot.
+        for keys in ({"id", "checkpoint_seq"}, {"id", "checkpoint_seq", "current_balance"}):
+            batch = [c for c in changes if set(c) == keys]
+            if batch:
+                await self._session.execute(update(CreditProfile), batch)
+        return CheckpointResult(len(profiles), repaired)
+
+    async def scoring_page(self, after: uuid.UUID | None, limit: int) -> list[tuple[uuid.UUID, uuid.UUID]]:
+        """The next ``limit`` active profiles as ``(profile id, user id)``, in user id order."""
+        stmt = select(CreditProfile.id, CreditProfile.user_id).where(CreditProfile.is_active.is_(True))
+        if after is not None:
+            stmt = stmt.where(CreditProfile.user_id > after)
+        stmt = stmt.order_by(CreditProfile.user_id).limit(limit)
+        return list((await self._session.execute(stmt)).all())
+
+    async def order_activity(
+        self, first: uuid.UUID, last: uuid.UUID, since: datetime.datetime
+    ) -> list[tuple[uuid.UUID, int, Decimal, datetime.datetime]]:
+        """``(user id, orders, spend, last order)`` for users in ``first..last`` since ``since``, cancellations aside.
+
+        A range scan of ``ix_orders_user_id_created_at``; on PostgreSQL
+        ``since`` also prunes the monthly partitions outside the window.
+        """
+        stmt = (
+            select(Order.user_id, func.count(), func.sum(Order.total), func.max(Order.created_at))
+            .where(
+                Order.user_id.between(first, last),
+                Order.created_at >= since,
+                Order.status != OrderStatus.CANCELLED,
+            )
+            .group_by(Order.user_id)
+        )
+        return list((await self._session.execute(stmt)).all())
+
+    async def repayment_activity(
+        self, first: uuid.UUID, last: uuid.UUID, since: datetime.datetime, due_before: datetime.datetime
+    ) -> list[tuple[uuid.UUID, Decimal, Decimal]]:
+        """``(user id, due, repaid)`` from the ledger since ``since``.
+
+        Due is what was charged to orders before ``due_before``, net of
+        cancellations; repaid is every repayment in the window.
+        """
+        entry = CreditLedgerEntry
+        charged = and_(entry.order_id.is_not(None), entry.created_at < due_before)
+        stmt = (
+            select(
+                CreditProfile.user_id,
+                func.coalesce(func.sum(case((charged, entry.amount), else_=0)), 0),
+                -func.coalesce(func.sum(case((entry.kind == LedgerKind.REPAYMENT, entry.amount), else_=0)), 0),
+            )
+            .join(CreditProfile, CreditProfile.id == entry.profile_id)
+            .where(CreditProfile.user_id.between(first, last), entry.created_at >= since)
+            .group_by(CreditProfile.user_id)
+        )
+        return list((await self._session.execute(stmt)).all())
+
+    async def apply_scores(
+        self, profile_ids: Sequence[uuid.UUID], risks: Sequence[float], limits: Sequence[float]
+    ) -> None:
+        """Write risk scores and credit limits for a page of profiles: one statement on PostgreSQL."""
+        if not profile_ids:
+            return
+        # Limits are whole multiples of LIMIT_STEP; bind them as Decimal on either dialect.
+        amounts = [Decimal(int(limit)) for limit in limits]
+        if self._session.get_bind().dialect.name == "postgresql":
+            # One UPDATE joined to the arrays, instead of a statement per row.
+            await self._session.execute(
+                text(
+                    "UPDATE credit_profiles AS p SET risk_score = s.risk, credit_limit = s.credit_limit, "
+                    "updated_at = now() "
+                    "FROM unnest(CAST(:ids AS uuid[]), CAST(:risks AS float8[]), CAST(:limits AS numeric[])) "
+                    "AS s(id, risk, credit_limit) WHERE p.id = s.id"
+                ),
+                {"ids": list(profile_ids), "risks": list(risks), "limits": amounts},
+            )
+            return
+        await self._session.execute(
+            update(CreditProfile),
+            [
+                {"id": pid, "risk_score": risk, "credit_limit": amount}
+                for pid, risk, amount in zip(profile_ids, risks, amounts)
+            ],
+        )
@@ -0,0 +1,104 @@
+"""Product facet repository — per-category counts and price ranges.
+
+Product writes call ``refresh`` with the (distributor, category) keys they
+touched, inside the same transaction, so catalog navigation reads one small
+group of ``product_facets`` rows instead of running a COUNT per category.
+Counts alone could be kept with signed deltas like the order rollups, but a
+price range can't (removing the cheapest product needs the next cheapest),
+so each touched key is recomputed from the ``(distributor_id, category)``
+index.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import and_, delete, func, insert, or_, select, tuple_
+
+from app.models.product import Product
+from app.models.product_facet import ProductFacet
+from app.models.user import User
+from app.schemas.product import ProductFacetResponse
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import Iterable
+
+    from sqlalchemy import ColumnElement
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    FacetKey = tuple[uuid.UUID, str | None]
+
+
+def _in_category(category: str) -> ColumnElement[bool]:
+    if category:
+        return Product.category == category
+    return or_(Product.category.is_(None), Product.category == "")
+
+
+class ProductFacetRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def refresh(self, keys: Iterable[FacetKey]) -> None:
+        """Recompute the facets for ``(distributor_id, category)`` keys from their active products."""
+        touched = sorted({(distributor_id, category or "") for distributor_id, category in keys}, key=str)
+        if not touched:
+            return
+        if self._session.get_bind().dialect.name == "postgresql":
+            # Held to commit, in a fixed order: a concurrent writer's recompute
+            # waits, then (read committed) sees this transaction's rows.
+            for distributor_id, category in touched:
+                lock_key = func.hashtextextended(f"product_facets:{distributor_id}:{category}", 0)
+                await self._session.execute(select(func.pg_advisory_xact_lock(lock_key)))
+
+        await self._session.execute(
+            delete(ProductFacet).where(tuple_(ProductFacet.distributor_id, ProductFacet.category).in_(touched))
+        )
+        category_key = func.coalesce(Product.category, "")
+        counts = (
+            select(
+                Product.distributor_id,
+                category_key,
+                User.tenant_id,
+                func.count(),
+                func.min(Product.price),
+                func.max(Product.price),
+            )
+            .join(User, User.id == Product.distributor_id)
+            .where(
+                Product.is_active.is_(True),
+                or_(*(and_(Product.distributor_id == d, _in_category(c)) for d, c in touched)),
+            )
+            .group_by(Product.distributor_id, category_key, User.tenant_id)
+        )
+        await self._session.execute(
+            insert(ProductFacet).from_select(
+                ["distributor_id", "category", "tenant_id", "active_count", "min_price", "max_price"], counts,
+            )
+        )
+
+    async def list_facets(
+        self,
+        *,
+        distributor_id: uuid.UUID | None = None,
+        tenant_id: uuid.UUID | None = None,
+    ) -> list[ProductFacetResponse]:
+        """Categories with active products, alphabetically; uncategorized comes back as ``None``."""
+        stmt = select(
+            ProductFacet.category,
+            func.sum(ProductFacet.active_count).label("count"),
+            func.min(ProductFacet.min_price).label("min_price"),
+            func.max(ProductFacet.max_price).label("max_price"),
+        )
+        if distributor_id is not None:
+            stmt = stmt.where(ProductFacet.distributor_id == distributor_id)
+        if tenant_id is not None:
+            stmt = stmt.where(ProductFacet.tenant_id == tenant_id)
+        stmt = stmt.group_by(ProductFacet.category).order_by(ProductFacet.category)
+        return [
+            ProductFacetResponse(
+                category=row.category or None, count=row.count, min_price=row.min_price, max_price=row.max_price
+            )
+            for row in (await self._session.execute(stmt)).all()
+        ]
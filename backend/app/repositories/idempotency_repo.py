@@ -0,0 +1,81 @@
+"""Idempotency key repository — the database side of the idempotency store."""
+
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING, Any, cast
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models.idempotency import IdempotencyKey
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sqlalchemy import CursorResult
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class IdempotencyRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    def _insert(self) -> Any:
+        dialect = self._session.get_bind().dialect.name
+        return (postgresql.insert if dialect == "postgresql" else sqlite.insert)(IdempotencyKey)
+
+    async def get(self, key: str) -> IdempotencyKey | None:
+        stmt = select(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.expires_at > _now())
+        return (await self._session.execute(stmt)).scalar_one_or_none()
+
+    async def lock(self, key: str, fingerprint: str, ttl_seconds: int) -> bool:
+        """Claim ``key`` as in flight. False if a live row (in flight or done) exists."""
+        now = _now()
+        await self._session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.expires_at <= now)
+        )
+        stmt = self._insert().values(
+            key=key, fingerprint=fingerprint, expires_at=now + datetime.timedelta(seconds=ttl_seconds),
+        )
+        stmt = stmt.on_conflict_do_nothing(index_elements=["key"])
+        result = cast("CursorResult[Any]", await self._session.execute(stmt))
+        return result.rowcount == 1
+
+    async def save(
+        self,
+        key: str,
+        *,
+        status_code: int,
+        body: str,
+        content_type: str | None,
+        headers: Sequence[tuple[str, str]],
+        ttl_seconds: int,
+    ) -> None:
+        await self._session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key)
+            .values(
+                status_code=status_code,
+                response_body=body,
+                content_type=content_type,
+                response_headers=[list(h) for h in headers],
+                expires_at=_now() + datetime.timedelta(seconds=ttl_seconds),
+            )
+        )
+
+    async def release(self, key: str) -> None:
+        await self._session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None))
+        )
+
+    async def purge_expired(self) -> int:
+        result = cast(
+            "CursorResult[Any]",
+            await self._session.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= _now())),
+        )
+        return result.rowcount
@@ -0,0 +1,239 @@
+"""Order read model — ORM-free projections for order listings.
+
+Each query selects the order columns plus a per-order JSON array of its lines
+(``product_name`` joined in), so rows map straight onto ``OrderResponse``
+without hydrating ``Order``/``OrderItem``/``Product``/``User`` identities.
+"""
+
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import JSON, String, and_, cast, func, over, select
+
+from app.core.snowflake import format_code, timestamp_of
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.schemas.order import OrderItemCreate, OrderItemResponse, OrderResponse, OrderTemplate
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import AsyncIterator, Sequence
+
+    from sqlalchemy import RowMapping
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.sql import ColumnElement, Select
+
+_ORDER_COLUMNS = (
+    Order.id,
+    Order.code,
+    Order.user_id,
+    Order.distributor_id,
+    Order.status,
+    Order.total,
+    Order.delivery_fee,
+    Order.payment_method,
+    Order.created_at,
+    Order.updated_at,
+)
+
+ORDER_EXPORT_FIELDS = (
+    "order_id",
+    "created_at",
+    "status",
+    "user_id",
+    "distributor_id",
+    "payment_method",
+    "delivery_fee",
+    "total",
+    "product_id",
+    "product_name",
+    "quantity",
+    "unit_price",
+)
+
+
+def _lines_of(order_id: Any, created_at: Any) -> ColumnElement[bool]:
+    """Join condition for an order's lines; created_at lets PostgreSQL prune to its partition."""
+    return and_(OrderItem.order_id == order_id, OrderItem.created_at == created_at)
+
+
+def _filters(
+    user_id: uuid.UUID | None, distributor_id: uuid.UUID | None, status: str | None
+) -> list[Any]:
+    conditions = []
+    if user_id is not None:
+        conditions.append(Order.user_id == user_id)
+    if distributor_id is not None:
+        conditions.append(Order.distributor_id == distributor_id)
+    if status is not None:
+        conditions.append(Order.status == status)
+    return conditions
+
+
+class OrderReadRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    def _items_agg(self) -> Any:
+        """Aggregate order lines into a JSON array in whatever dialect we run on."""
+        # Prices go out as text: a JSON number would round-trip through float.
+        fields = (
+            "id", OrderItem.id,
+            "product_id", OrderItem.product_id,
+            "product_name", Product.name,
+            "quantity", OrderItem.quantity,
+            "unit_price", cast(OrderItem.unit_price, String),
+        )
+        if self._session.get_bind().dialect.name == "postgresql":
+            agg = func.json_agg(func.json_build_object(*fields), type_=JSON)
+        else:
+            agg = func.json_group_array(func.json_object(*fields), type_=JSON)
+        return agg.filter(OrderItem.id.isnot(None)).label("items")
+
+    def _with_items(self, page: Any) -> Select[Any]:
+        return (
+            select(*page.c, self._items_agg())
+            .select_from(page)
+            .outerjoin(OrderItem, _lines_of(page.c.id, page.c.created_at))
+            .outerjoin(Product, Product.id == OrderItem.product_id)
+            .group_by(*page.c)
+        )
+
+    @staticmethod
+    def _to_response(row: Any) -> OrderResponse:
+        return OrderResponse(
+            id=row.id,
+            code=format_code(row.code),
+            user_id=row.user_id,
+            distributor_id=row.distributor_id,
+            status=row.status.value,
+            total=row.total,
+            delivery_fee=row.delivery_fee,
+            payment_method=row.payment_method,
+            items=[OrderItemResponse.model_validate(item) for item in row.items or []],
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+
+    async def list_orders(
+        self,
+        *,
+        user_id: uuid.UUID | None = None,
+        distributor_id: uuid.UUID | None = None,
+        status: str | None = None,
+        page: int = 1,
+        per_page: int = 20,
+        before_code: int | None = None,
+    ) -> tuple[list[OrderResponse], int]:
+        """One round trip: the page, its lines and the total via ``COUNT(*) OVER ()``.
+
+        With ``before_code`` the page is a keyset page of codes below it (newest
+        first), ``page`` is ignored and the total counts orders from there on.
+        """
+        base = select(*_ORDER_COLUMNS, over(func.count()).label("full_count")).where(
+            *_filters(user_id, distributor_id, status)
+        )
+
+        # Both modes order by code, so a client can switch from offset pages to
+        # before_code with the last code it saw and neither skip nor repeat rows.
+        if before_code is not None:
+            offset = 0
+            base = base.where(Order.code < before_code)
+        else:
+            offset = (page - 1) * per_page
+        page_q = base.order_by(Order.code.desc()).offset(offset).limit(per_page).subquery()
+        stmt = self._with_items(page_q).order_by(page_q.c.code.desc())
+        rows = (await self._session.execute(stmt)).all()
+
+        if rows:
+            total: int = rows[0].full_count
+        elif offset:
+            # Past the last page the window has nothing to report on.
+            count_q = select(func.count()).select_from(base.subquery())
+            total = (await self._session.execute(count_q)).scalar_one()
+        else:
+            total = 0
+        return [self._to_response(r) for r in rows], total
+
+    async def get_order(self, order_id: uuid.UUID) -> OrderResponse | None:
+        page_q = select(*_ORDER_COLUMNS).where(Order.id == order_id).subquery()
+        row = (await self._session.execute(self._with_items(page_q))).first()
+        return self._to_response(row) if row is not None else None
+
+    async def get_order_by_code(
+        self,
+        code: int,
+        *,
+        user_id: uuid.UUID | None = None,
+        distributor_id: uuid.UUID | None = None,
+    ) -> OrderResponse | None:
+        # The code embeds its creation time; bounding created_at lets Postgres
+        # prune to the one or two monthly partitions that can hold it.
+        minted = timestamp_of(code)
+        slack = datetime.timedelta(days=1)
+        page_q = (
+            select(*_ORDER_COLUMNS)
+            .where(
+                Order.code == code,
+                Order.created_at.between(minted - slack, minted + slack),
+                *_filters(user_id, distributor_id, None),
+            )
+            .subquery()
+        )
+        row = (await self._session.execute(self._with_items(page_q))).first()
+        return self._to_response(row) if row is not None else None
+
+    async def last_order_template(self, user_id: uuid.UUID) -> OrderTemplate | None:
+        """Lines of the user's newest order, via the (user_id, created_at) index."""
+        latest = (
+            select(Order.id).where(Order.user_id == user_id).order_by(Order.created_at.desc()).limit(1)
+        ).scalar_subquery()
+        stmt = (
+            select(Order.id, Order.distributor_id, OrderItem.product_id, OrderItem.quantity)
+            .join(OrderItem, _lines_of(Order.id, Order.created_at))
+            .where(Order.id == latest)
+        )
+        rows = (await self._session.execute(stmt)).all()
+        if not rows:
+            return None
+        return OrderTemplate(
+            order_id=rows[0].id,
+            distributor_id=rows[0].distributor_id,
+            items=[OrderItemCreate(product_id=r.product_id, quantity=r.quantity) for r in rows],
+        )
+
+    async def stream_order_lines(
+        self,
+        *,
+        user_id: uuid.UUID | None = None,
+        distributor_id: uuid.UUID | None = None,
+        status: str | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """Yield one flat row per order line (``ORDER_EXPORT_FIELDS``) in server-side batches."""
+        stmt = (
+            select(
+                Order.id.label("order_id"),
+                Order.created_at,
+                Order.status,
+                Order.user_id,
+                Order.distributor_id,
+                Order.payment_method,
+                Order.delivery_fee,
+                Order.total,
+                OrderItem.product_id,
+                Product.name.label("product_name"),
+                OrderItem.quantity,
+                OrderItem.unit_price,
+            )
+            .join(OrderItem, _lines_of(Order.id, Order.created_at))
+            .outerjoin(Product, Product.id == OrderItem.product_id)
+            .where(*_filters(user_id, distributor_id, status))
+            .order_by(Order.created_at, Order.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self._session.stream(stmt)
+        async for partition in result.mappings().partitions():
+            yield partition
@@ -2,24 +2,72 @@
 
 from __future__ import annotations
 
+import datetime
+import uuid
+from collections import Counter
 from decimal import Decimal
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, NamedTuple
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import selectinload
 
 from app.core.exceptions import NotFoundError, ValidationError
+from app.core.snowflake import next_order_code, timestamp_of
 from app.models.order import VALID_TRANSITIONS, Order, OrderItem, OrderStatus
+from app.models.outbox import ORDER_CREATED, ORDER_STATUS_CHANGED
+from app.repositories.credit_repo import CreditRepository
+from app.repositories.outbox_repo import OutboxRepository
+from app.repositories.stock_repo import StockRepository
 
 if TYPE_CHECKING:
-    import uuid
-
     from sqlalchemy.ext.asyncio import AsyncSession
 
+    from app.core.pricing import PriceBook
     from app.models.product import Product
     from app.schemas.order import OrderCreate
 
 
+def _with_lines() -> Any:
+    """Relationships are lazy="raise"; this is what ``OrderResponse`` reads: the lines and their products."""
+    return selectinload(Order.items).selectinload(OrderItem.product)
+
+
+class OrderStatusChange(NamedTuple):
+    id: uuid.UUID
+    status: str
+    # None for a new order.
+    previous_status: str | None
+    user_id: uuid.UUID
+    distributor_id: uuid.UUID
+    total: Decimal
+    created_at: datetime.datetime
+
+
+def _status_changed(change: OrderStatusChange) -> dict[str, Any]:
+    return {
+        "order_id": change.id,
+        "user_id": change.user_id,
+        "distributor_id": change.distributor_id,
+        "status": change.status,
+        "previous_status": change.previous_status,
+        "total": change.total,
+        "created_at": change.created_at,
+    }
+
+
+def change_from_payload(payload: dict[str, Any]) -> OrderStatusChange:
+    """Inverse of the ``order.created`` / ``order.status_changed`` payloads, for the rollup handlers."""
+    return OrderStatusChange(
+        uuid.UUID(payload["order_id"]),
+        payload["status"],
+        payload.get("previous_status"),
+        uuid.UUID(payload["user_id"]),
+        uuid.UUID(payload["distributor_id"]),
+        Decimal(payload["total"]),
+        datetime.datetime.fromisoformat(payload["created_at"]),
+    )
+
+
 class OrderRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
@@ -29,33 +77,80 @@ class OrderRepository:
         user_id: uuid.UUID,
         data: OrderCreate,
         products: dict[uuid.UUID, Product],
+        *,
+        prices: PriceBook | None = None,
+        segment: str | None = None,
     ) -> Order:
+        """Price each line from ``prices`` (the distributor's book) or else the list price.
+
+        Quantity breaks count a product's total across the order, so
+        splitting it over several lines doesn't change its price. Stock is
+        reserved for stock-tracked products and BNPL orders are charged to
+        the kiosk's credit; ``InsufficientStockError`` or
+        ``InsufficientCreditError`` rolls the whole order back.
+        """
         total = Decimal("0.00")
+        # Order and items share created_at, part of both primary keys, so they land in the same
+        # partition; taking it from the code lets ix_orders_code (code, created_at) catch a reused code.
+        code = next_order_code()
+        created_at = timestamp_of(code)
         items: list[OrderItem] = []
+        quantities: Counter[uuid.UUID] = Counter()
+        for item_data in data.items:
+            quantities[item_data.product_id] += item_data.quantity
 
         for item_data in data.items:
             product = products[item_data.product_id]
-            line_total = product.price * item_data.quantity
-            total += line_total
+            unit_price = product.price
+            if prices is not None:
+                unit_price = prices.unit_price(product.id, quantities[product.id], product.price, segment)
+            total += unit_price * item_data.quantity
             items.append(
                 OrderItem(
                     product_id=item_data.product_id,
                     quantity=item_data.quantity,
-                    unit_price=product.price,
+                    unit_price=unit_price,
+                    created_at=created_at,
                 )
             )
 
         order = Order(
+            code=code,
+            created_at=created_at,
             user_id=user_id,
             distributor_id=data.distributor_id,
             status=OrderStatus.PENDING,
             total=total,
             notes=data.notes,
+            payment_method=data.payment_method,
             items=items,
         )
         self._session.add(order)
         await self._session.flush()
         await self._session.refresh(order)
+        if data.payment_method == "bnpl":
+            await CreditRepository(self._session).reserve_credit(user_id, total, order_id=order.id)
+        # Last, so the stripe locks are held for as little of the transaction as possible.
+        await StockRepository(self._session).reserve(
+            order.id, {pid: qty for pid, qty in quantities.items() if products[pid].track_stock}
+        )
+        # The refresh expired the lines; hand back the order as OrderResponse needs it.
+        stmt = select(Order).options(_with_lines()).where(Order.id == order.id)
+        order = (await self._session.execute(stmt)).scalar_one()
+        # Rollups are applied from this message too (app.tasks.handlers): their rows are
+        # shared by every order of a distributor and day, and would serialize checkouts.
+        OutboxRepository(self._session).add(
+            ORDER_CREATED,
+            {
+                "order_id": order.id,
+                "user_id": order.user_id,
+                "distributor_id": order.distributor_id,
+                "status": order.status,
+                "total": order.total,
+                "created_at": order.created_at,
+                "items": [{"product_id": i.product_id, "quantity": i.quantity} for i in items],
+            },
+        )
         return order
 
     async def list_orders(
@@ -67,9 +162,7 @@ class OrderRepository:
         page: int = 1,
         per_page: int = 20,
     ) -> tuple[list[Order], int]:
-        base = select(Order).options(
-            selectinload(Order.items).selectinload(OrderItem.product),
-        )
+        base = select(Order).options(_with_lines())
 
         if user_id is not None:
             base = base.where(Order.user_id == user_id)
@@ -88,13 +181,7 @@ class OrderRepository:
         return list(rows), total
 
     async def get_order(self, order_id: uuid.UUID) -> Order | None:
-        stmt = (
-            select(Order)
-            .options(
-                selectinload(Order.items).selectinload(OrderItem.product),
-            )
-            .where(Order.id == order_id)
-        )
+        stmt = select(Order).options(_with_lines()).where(Order.id == order_id)
         result = await self._session.execute(stmt)
         return result.scalars().first()
 
@@ -116,7 +203,83 @@ class OrderRepository:
                 f"Cannot transition from {order.status.value} to {target.value}"
             )
 
+        previous = order.status
         order.status = target
         await self._session.flush()
-        await self._session.refresh(order)
+        # Only the onupdate column; a full refresh would expire the loaded lines.
+        await self._session.refresh(order, ["updated_at"])
+        change = OrderStatusChange(
+            order.id, target.value, previous.value, order.user_id,
+            order.distributor_id, order.total, order.created_at,
+        )
+        await StockRepository(self._session).settle([order.id], target)
+        if target == OrderStatus.CANCELLED:
+            await CreditRepository(self._session).release_orders([order.id])
+        OutboxRepository(self._session).add(ORDER_STATUS_CHANGED, _status_changed(change))
         return order
+
+    async def bulk_update_order_status(
+        self,
+        order_ids: list[uuid.UUID],
+        new_status: str,
+        *,
+        distributor_id: uuid.UUID | None = None,
+    ) -> tuple[list[OrderStatusChange], list[tuple[uuid.UUID, str]]]:
+        """Transition many orders with set-based UPDATEs.
+
+        The state machine is enforced in the WHERE clause: one UPDATE per
+        status that may move to ``new_status`` (at most two), so each
+        RETURNING row also knows the status it left. Returns
+        ``(updated, rejected)`` where each rejection carries a reason.
+        """
+        try:
+            target = OrderStatus(new_status)
+        except ValueError as err:
+            raise ValidationError(f"Invalid status: {new_status}") from err
+
+        ids = list(dict.fromkeys(order_ids))
+        allowed_from = [
+            OrderStatus(src) for src, targets in VALID_TRANSITIONS.items() if target.value in targets
+        ]
+
+        updated: list[OrderStatusChange] = []
+        for source in allowed_from:
+            stmt = (
+                update(Order)
+                .where(Order.id.in_(ids), Order.status == source)
+                .values(status=target)
+                .returning(Order.id, Order.user_id, Order.distributor_id, Order.total, Order.created_at)
+                .execution_options(synchronize_session=False)
+            )
+            if distributor_id is not None:
+                stmt = stmt.where(Order.distributor_id == distributor_id)
+            result = await self._session.execute(stmt)
+            updated.extend(
+                OrderStatusChange(
+                    row.id, target.value, source.value, row.user_id,
+                    row.distributor_id, row.total, row.created_at,
+                )
+                for row in result.all()
+            )
+
+        updated_ids = {change.id for change in updated}
+        missing = [oid for oid in ids if oid not in updated_ids]
+        rejected: list[tuple[uuid.UUID, str]] = []
+        if missing:
+            # Only pay for the explanation query when something was rejected.
+            current_stmt = select(Order.id, Order.status).where(Order.id.in_(missing))
+            if distributor_id is not None:
+                current_stmt = current_stmt.where(Order.distributor_id == distributor_id)
+            current = {row[0]: row[1] for row in (await self._session.execute(current_stmt)).all()}
+            for oid in missing:
+                status = current.get(oid)
+                if status is None:
+                    rejected.append((oid, "Order not found"))
+                else:
+                    rejected.append((oid, f"Cannot transition from {status.value} to {target.value}"))
+
+        await StockRepository(self._session).settle([c.id for c in updated], target)
+        if target == OrderStatus.CANCELLED:
+            await CreditRepository(self._session).release_orders([c.id for c in updated])
+        OutboxRepository(self._session).add_many(ORDER_STATUS_CHANGED, [_status_changed(c) for c in updated])
+        return updated, rejected
@@ -0,0 +1,123 @@
+"""Outbox repository — enqueue inside the caller's transaction, claim with SKIP LOCKED."""
+
+from __future__ import annotations
+
+import datetime
+import decimal
+import enum
+import uuid
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
+
+from sqlalchemy import delete, select, update
+
+from app.models.outbox import OutboxMessage
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import CursorResult
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class ClaimedMessage(NamedTuple):
+    id: uuid.UUID
+    topic: str
+    payload: dict[str, Any]
+    attempts: int
+    handled: list[str]
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (uuid.UUID, decimal.Decimal)):
+        return str(value)
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+class OutboxRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    def add(self, topic: str, payload: dict[str, Any]) -> None:
+        """Stage a message; it commits or rolls back with the caller's transaction."""
+        self._session.add(OutboxMessage(topic=topic, payload=_jsonable(payload)))
+
+    def add_many(self, topic: str, payloads: list[dict[str, Any]]) -> None:
+        self._session.add_all([OutboxMessage(topic=topic, payload=_jsonable(p)) for p in payloads])
+
+    async def claim(self, *, limit: int, lease_seconds: float, max_attempts: int) -> list[ClaimedMessage]:
+        """Lease up to ``limit`` due messages.
+
+        ``FOR UPDATE SKIP LOCKED`` lets concurrent dispatchers take disjoint
+        batches without blocking each other. The lease (``available_at`` pushed
+        forward) is what keeps a message claimed after this transaction commits;
+        if a dispatcher dies mid-batch the message becomes due again.
+        """
+        now = _now()
+        due = (
+            select(OutboxMessage.id)
+            .where(
+                OutboxMessage.processed_at.is_(None),
+                OutboxMessage.available_at <= now,
+                OutboxMessage.attempts < max_attempts,
+            )
+            .order_by(OutboxMessage.available_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(due))
+            .values(
+                available_at=now + datetime.timedelta(seconds=lease_seconds),
+                attempts=OutboxMessage.attempts + 1,
+            )
+            .returning(
+                OutboxMessage.id,
+                OutboxMessage.topic,
+                OutboxMessage.payload,
+                OutboxMessage.attempts,
+                OutboxMessage.handled,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        rows = (await self._session.execute(stmt)).all()
+        # UUIDv7 ids are time-ordered, so this restores enqueue order.
+        return sorted((ClaimedMessage(*row) for row in rows), key=lambda m: m.id)
+
+    async def mark_processed(self, ids: list[uuid.UUID]) -> None:
+        if ids:
+            await self._session.execute(
+                update(OutboxMessage)
+                .where(OutboxMessage.id.in_(ids))
+                .values(processed_at=_now(), last_error=None)
+                .execution_options(synchronize_session=False)
+            )
+
+    async def reschedule(
+        self, message_id: uuid.UUID, *, error: str, delay_seconds: float, handled: list[str] | None = None
+    ) -> None:
+        """Retry after ``delay_seconds``; ``handled`` names the handlers that need not run again."""
+        await self._session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id == message_id)
+            .values(
+                available_at=_now() + datetime.timedelta(seconds=delay_seconds),
+                last_error=error[:2000],
+                handled=handled or [],
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def purge_processed(self, older_than: datetime.timedelta) -> int:
+        stmt = delete(OutboxMessage).where(OutboxMessage.processed_at < _now() - older_than)
+        return cast("CursorResult[Any]", await self._session.execute(stmt)).rowcount
@@ -0,0 +1,94 @@
+"""Monthly range partitions of ``orders`` / ``order_items`` (PostgreSQL only).
+
+Partitions are named ``<table>_pYYYY_MM`` and cover ``[month, next month)``
+on ``created_at``; each parent also has a ``<table>_default`` catch-all.
+"""
+
+from __future__ import annotations
+
+import datetime
+import re
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import text
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Sequence
+
+    from sqlalchemy import RowMapping
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+PARTITIONED_TABLES = ("orders", "order_items")
+
+_PARTITION_RE = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_start(value: datetime.date) -> datetime.date:
+    return value.replace(day=1)
+
+
+def add_months(month: datetime.date, n: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + n
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: datetime.date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+class PartitionRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def is_partitioned(self, table: str) -> bool:
+        stmt = text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"
+        )
+        return bool((await self._session.execute(stmt, {"table": table})).scalar())
+
+    async def list_months(self, table: str) -> list[datetime.date]:
+        """Months with an attached partition, oldest first."""
+        stmt = text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        )
+        months = []
+        for (name,) in (await self._session.execute(stmt, {"table": table})).all():
+            match = _PARTITION_RE.search(name)
+            if match:
+                months.append(datetime.date(int(match[1]), int(match[2]), 1))
+        return sorted(months)
+
+    async def create_month(self, table: str, month: datetime.date) -> None:
+        # Identifiers cannot be bound; both come from PARTITIONED_TABLES and a date.
+        await self._session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') TO ('{add_months(month, 1).isoformat()} 00:00+00')"
+            )
+        )
+
+    async def drop_month(self, table: str, month: datetime.date) -> None:
+        name = partition_name(table, month)
+        await self._session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        await self._session.execute(text(f"DROP TABLE {name}"))
+
+    async def stream_month(
+        self, table: str, month: datetime.date, batch_size: int = 5000
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        stmt = text(f"SELECT * FROM {partition_name(table, month)}").execution_options(yield_per=batch_size)
+        result = await self._session.stream(stmt)
+        async for partition in result.mappings().partitions():
+            yield partition
+
+    async def column_names(self, table: str) -> list[str]:
+        stmt = text(
+            "SELECT attname FROM pg_attribute WHERE attrelid = to_regclass(:table) "
+            "AND attnum > 0 AND NOT attisdropped ORDER BY attnum"
+        )
+        return list((await self._session.execute(stmt, {"table": table})).scalars())
+
+    async def insert_rows(self, table: Any, rows: list[dict[str, Any]]) -> None:
+        """Insert through the parent so rows route to their partition."""
+        if rows:
+            await self._session.execute(table.insert(), rows)
@@ -0,0 +1,112 @@
+"""Price list repository — tier CRUD and the flat tier scan price books compile from."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import selectinload
+
+from app.core.exceptions import ValidationError
+from app.core.pricing import Tier
+from app.models.outbox import PRICE_LIST_CHANGED
+from app.models.price_list import PriceList, PriceTier
+from app.models.product import Product
+from app.repositories.outbox_repo import OutboxRepository
+
+if TYPE_CHECKING:
+    import uuid
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.sql import Select
+
+    from app.schemas.price_list import PriceListCreate, PriceListUpdate, PriceTierIn
+
+
+def _with_tiers(price_list_id: uuid.UUID) -> Select[PriceList]:
+    return (
+        select(PriceList)
+        .options(selectinload(PriceList.tiers))
+        .where(PriceList.id == price_list_id)
+        .execution_options(populate_existing=True)
+    )
+
+
+class PriceListRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    def _changed(self, price_list_id: uuid.UUID, distributor_id: uuid.UUID) -> None:
+        OutboxRepository(self._session).add(
+            PRICE_LIST_CHANGED, {"price_list_id": price_list_id, "distributor_id": distributor_id}
+        )
+
+    async def _check_products(self, distributor_id: uuid.UUID, tiers: list[PriceTierIn]) -> None:
+        product_ids = {t.product_id for t in tiers}
+        if not product_ids:
+            return
+        stmt = select(func.count()).where(Product.id.in_(product_ids), Product.distributor_id == distributor_id)
+        if (await self._session.execute(stmt)).scalar_one() != len(product_ids):
+            raise ValidationError("Every tier must name one of the distributor's products")
+
+    def _add_tiers(self, price_list_id: uuid.UUID, tiers: list[PriceTierIn]) -> None:
+        self._session.add_all(
+            PriceTier(
+                price_list_id=price_list_id,
+                product_id=t.product_id,
+                min_quantity=t.min_quantity,
+                unit_price=t.unit_price,
+            )
+            for t in tiers
+        )
+
+    async def get_price_list(self, price_list_id: uuid.UUID) -> PriceList | None:
+        return (await self._session.execute(_with_tiers(price_list_id))).scalars().first()
+
+    async def list_price_lists(self, distributor_id: uuid.UUID) -> list[PriceList]:
+        stmt = (
+            select(PriceList)
+            .options(selectinload(PriceList.tiers))
+            .where(PriceList.distributor_id == distributor_id)
+            .order_by(PriceList.created_at)
+        )
+        return list((await self._session.execute(stmt)).scalars().all())
+
+    async def create_price_list(self, distributor_id: uuid.UUID, data: PriceListCreate) -> PriceList:
+        await self._check_products(distributor_id, data.tiers)
+        price_list = PriceList(
+            distributor_id=distributor_id, name=data.name, segment=data.segment, is_active=data.is_active
+        )
+        self._session.add(price_list)
+        await self._session.flush()
+        self._add_tiers(price_list.id, data.tiers)
+        await self._session.flush()
+        self._changed(price_list.id, distributor_id)
+        return (await self._session.execute(_with_tiers(price_list.id))).scalar_one()
+
+    async def update_price_list(self, price_list: PriceList, data: PriceListUpdate) -> PriceList:
+        fields = data.model_dump(exclude_unset=True, exclude={"tiers"})
+        for field, value in fields.items():
+            setattr(price_list, field, value)
+        if data.tiers is not None:
+            await self._check_products(price_list.distributor_id, data.tiers)
+            await self._session.execute(delete(PriceTier).where(PriceTier.price_list_id == price_list.id))
+            self._add_tiers(price_list.id, data.tiers)
+        await self._session.flush()
+        self._changed(price_list.id, price_list.distributor_id)
+        return (await self._session.execute(_with_tiers(price_list.id))).scalar_one()
+
+    async def delete_price_list(self, price_list: PriceList) -> None:
+        # The FK cascades on PostgreSQL; deleting the tiers first keeps SQLite honest too.
+        await self._session.execute(delete(PriceTier).where(PriceTier.price_list_id == price_list.id))
+        await self._session.execute(delete(PriceList).where(PriceList.id == price_list.id))
+        self._changed(price_list.id, price_list.distributor_id)
+
+    async def active_tiers(self, distributor_id: uuid.UUID) -> list[Tier]:
+        """Every tier of the distributor's active lists, in one query."""
+        stmt = (
+            select(PriceList.segment, PriceTier.product_id, PriceTier.min_quantity, PriceTier.unit_price)
+            .join(PriceList, PriceList.id == PriceTier.price_list_id)
+            .where(PriceList.distributor_id == distributor_id, PriceList.is_active.is_(True))
+        )
+        return [Tier(*row) for row in (await self._session.execute(stmt)).all()]
@@ -1,24 +1,100 @@
-"""Product repository — async CRUD with filtering."""
+"""Product repository — async CRUD with filtering and ranked search."""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import func, select, update
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Numeric,
+    String,
+    Uuid,
+    case,
+    cast,
+    column,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
+from app.core.search import TrigramIndex
+from app.core.transliteration import fold
+from app.models.outbox import PRODUCT_CHANGED
 from app.models.product import Product
+from app.repositories.facet_repo import ProductFacetRepository
+from app.repositories.outbox_repo import OutboxRepository
 
 if TYPE_CHECKING:
     import uuid
-    from decimal import Decimal
+    from collections.abc import AsyncIterator, Sequence
 
+    from sqlalchemy import RowMapping
     from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.sql.expression import ColumnClause, ColumnElement
+
+    from app.schemas.product import ProductChange, ProductCreate
+
+_CHANGE_FIELDS = (
+    "id",
+    "name",
+    "sku",
+    "price",
+    "category",
+    "distributor_id",
+    "is_active",
+    "created_at",
+    "change_seq",
+)
+
+PRODUCT_EXPORT_FIELDS = (
+    "id",
+    "sku",
+    "name",
+    "category",
+    "price",
+    "distributor_id",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
+
+# Generated column, PostgreSQL only (migration 0008); not mapped so SQLite can create_all.
+_SEARCH_VECTOR = literal_column("products.search_vector", type_=TSVECTOR)
+
+
+def _filters(distributor_id: uuid.UUID | None, category: str | None) -> list[Any]:
+    conditions: list[ColumnElement[bool]] = [Product.is_active.is_(True)]
+    if distributor_id is not None:
+        conditions.append(Product.distributor_id == distributor_id)
+    if category is not None:
+        conditions.append(Product.category == category)
+    return conditions
+
+
+def _pg_matched(q: str) -> ColumnElement[bool]:
+    return or_(_SEARCH_VECTOR.op("@@")(func.plainto_tsquery("simple", q)), Product.name_folded.op("%>")(q))
 
 
 class ProductRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
+    def _changed(self, product_id: uuid.UUID, action: str, *, distributor_id: uuid.UUID | None = None) -> None:
+        OutboxRepository(self._session).add(
+            PRODUCT_CHANGED, {"product_id": product_id, "distributor_id": distributor_id, "action": action}
+        )
+
     async def list_products(
         self,
         *,
@@ -28,14 +104,12 @@ class ProductRepository:
         page: int = 1,
         per_page: int = 20,
     ) -> tuple[list[Product], int]:
-        base = select(Product).where(Product.is_active.is_(True))
-
-        if distributor_id is not None:
-            base = base.where(Product.distributor_id == distributor_id)
-        if category is not None:
-            base = base.where(Product.category == category)
-        if search is not None:
-            base = base.where(Product.name.ilike(f"%{search}%"))
+        """With ``search``, results are ranked best match first; see ``_search``."""
+        if search is not None and fold(search):
+            return await self._search(
+                search, distributor_id=distributor_id, category=category, page=page, per_page=per_page
+            )
+        base = select(Product).where(*_filters(distributor_id, category))
 
         count_stmt = select(func.count()).select_from(base.subquery())
         total: int = (await self._session.execute(count_stmt)).scalar_one()
@@ -46,6 +120,129 @@ class ProductRepository:
 
         return list(rows), total
 
+    async def _search(
+        self,
+        search: str,
+        *,
+        distributor_id: uuid.UUID | None,
+        category: str | None,
+        page: int,
+        per_page: int,
+    ) -> tuple[list[Product], int]:
+        """Full-text plus trigram search over folded names.
+
+        PostgreSQL matches ``search_vector @@ query`` or ``name_folded %> q``
+        (both GIN-indexed) and ranks by ``ts_rank_cd + word_similarity``.
+        Elsewhere the active rows' folded names go through an in-process
+        ``TrigramIndex``, which is fine at test sizes and nowhere else.
+        """
+        q = fold(search)
+        filters = _filters(distributor_id, category)
+        offset = (page - 1) * per_page
+
+        if self._session.get_bind().dialect.name == "postgresql":
+            matched = _pg_matched(q)
+            tsquery = func.plainto_tsquery("simple", q)
+            rank = func.ts_rank_cd(_SEARCH_VECTOR, tsquery) + func.word_similarity(q, Product.name_folded)
+            count_stmt = select(func.count()).select_from(Product).where(*filters, matched)
+            total: int = (await self._session.execute(count_stmt)).scalar_one()
+            rows_stmt = (
+                select(Product)
+                .where(*filters, matched)
+                .order_by(rank.desc(), Product.created_at.desc())
+                .offset(offset)
+                .limit(per_page)
+            )
+            return list((await self._session.execute(rows_stmt)).scalars().all()), total
+
+        hits = await self._trigram_hits(q, filters)
+        page_ids = [doc_id for doc_id, _ in hits[offset : offset + per_page]]
+        if not page_ids:
+            return [], len(hits)
+        position = case({doc_id: i for i, doc_id in enumerate(page_ids)}, value=Product.id)
+        rows_stmt = select(Product).where(Product.id.in_(page_ids)).order_by(position)
+        return list((await self._session.execute(rows_stmt)).scalars().all()), len(hits)
+
+    async def _trigram_hits(self, q: str, filters: list[Any]) -> list[tuple[uuid.UUID, float]]:
+        keys = await self._session.execute(select(Product.id, Product.name_folded).where(*filters))
+        return TrigramIndex(keys.all()).search(q)
+
+    async def _matched(self, search: str, filters: list[Any]) -> ColumnElement[bool]:
+        """The rows ``_search`` returns for ``search`` within ``filters``, as a predicate."""
+        q = fold(search)
+        if self._session.get_bind().dialect.name == "postgresql":
+            return _pg_matched(q)
+        return Product.id.in_([doc_id for doc_id, _ in await self._trigram_hits(q, filters)])
+
+    async def stream_products(
+        self,
+        *,
+        distributor_id: uuid.UUID | None = None,
+        category: str | None = None,
+        search: str | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """Yield ``PRODUCT_EXPORT_FIELDS`` rows in server-side batches, without ORM hydration.
+
+        ``search`` matches what ``list_products`` matches, in export order.
+        """
+        filters = _filters(distributor_id, category)
+        if search is not None and fold(search):
+            filters.append(await self._matched(search, filters))
+        stmt = (
+            select(*(getattr(Product, f) for f in PRODUCT_EXPORT_FIELDS))
+            .where(*filters)
+            .order_by(Product.created_at, Product.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self._session.stream(stmt)
+        async for partition in result.mappings().partitions():
+            yield partition
+
+    async def changes_since(
+        self,
+        after: tuple[int, uuid.UUID | None] | None,
+        *,
+        distributor_id: uuid.UUID | None = None,
+        limit: int = 1000,
+    ) -> tuple[Sequence[Any], bool, int]:
+        """Rows changed after a delta-sync cursor, in ``(change_seq, id)`` order.
+
+        ``after`` is ``(seq, id)`` to resume mid-page, ``(seq, None)`` for
+        "everything from seq on", or ``None`` for an initial sync (active rows
+        only; there is nothing to tombstone yet). Only rows below the
+        watermark are returned: on PostgreSQL the oldest transaction still
+        running, so a slow writer's rows can't slip behind a cursor. Returns
+        ``(rows, has_more, watermark)``.
+        """
+        if self._session.get_bind().dialect.name == "postgresql":
+            xmin = func.pg_snapshot_xmin(func.pg_current_snapshot())
+            watermark_q = select(cast(cast(xmin, String), BigInteger))
+        else:
+            # SQLite serializes writers; everything committed is settled.
+            watermark_q = select(func.coalesce(func.max(Product.change_seq), 0) + 1)
+        watermark: int = (await self._session.execute(watermark_q)).scalar_one()
+
+        stmt = select(*(getattr(Product, f) for f in _CHANGE_FIELDS)).where(Product.change_seq < watermark)
+        if distributor_id is not None:
+            stmt = stmt.where(Product.distributor_id == distributor_id)
+        if after is None:
+            stmt = stmt.where(Product.is_active.is_(True))
+        elif after[1] is None:
+            stmt = stmt.where(Product.change_seq >= after[0])
+        else:
+            stmt = stmt.where(tuple_(Product.change_seq, Product.id) > tuple_(after[0], after[1]))
+        stmt = stmt.order_by(Product.change_seq, Product.id).limit(limit + 1)
+        rows = (await self._session.execute(stmt)).all()
+        return rows[:limit], len(rows) > limit, watermark
+
+    async def get_active_products(self, product_ids: list[uuid.UUID]) -> dict[uuid.UUID, Product]:
+        """Batched lookup for pricing; inactive or missing products are absent."""
+        if not product_ids:
+            return {}
+        stmt = select(Product).where(Product.id.in_(product_ids), Product.is_active.is_(True))
+        return {p.id: p for p in (await self._session.execute(stmt)).scalars()}
+
     async def get_product(self, product_id: uuid.UUID) -> Product | None:
         return await self._session.get(Product, product_id)
 
@@ -68,8 +265,174 @@ class ProductRepository:
         self._session.add(product)
         await self._session.flush()
         await self._session.refresh(product)
+        self._changed(product.id, "created", distributor_id=product.distributor_id)
+        await ProductFacetRepository(self._session).refresh([(product.distributor_id, product.category)])
         return product
 
+    async def upsert_products(self, products: list[ProductCreate]) -> dict[str, tuple[uuid.UUID, bool]]:
+        """Insert or update by SKU in one statement; SKUs must be unique within the call.
+
+        Returns ``{sku: (product_id, inserted)}``. A SKU already owned by
+        another distributor is left untouched and absent from the result.
+        """
+        owners = select(Product.sku, Product.distributor_id, Product.category).where(
+            Product.sku.in_([p.sku for p in products])
+        )
+        current = (await self._session.execute(owners)).all()
+        existing = {r.sku: r.distributor_id for r in current}
+        rows = [
+            {
+                "name": p.name,
+                "name_folded": fold(p.name),
+                "price": p.price,
+                "category": p.category,
+                "sku": p.sku,
+                "distributor_id": p.distributor_id,
+                "is_active": True,
+            }
+            for p in products
+            if existing.get(p.sku, p.distributor_id) == p.distributor_id
+        ]
+        if not rows:
+            return {}
+
+        insert = (postgresql.insert if self._session.get_bind().dialect.name == "postgresql" else sqlite.insert)
+        upsert = insert(Product).values(rows)
+        stmt = upsert.on_conflict_do_update(
+            index_elements=[Product.sku],
+            set_={
+                "name": upsert.excluded.name,
+                "name_folded": upsert.excluded.name_folded,
+                "price": upsert.excluded.price,
+                "category": upsert.excluded.category,
+                "is_active": True,
+                "updated_at": func.now(),
+            },
+            # Guards the window between the lookup above and this statement.
+            where=Product.distributor_id == upsert.excluded.distributor_id,
+        ).returning(Product.id, Product.sku, Product.distributor_id, Product.category)
+        written = (await self._session.execute(stmt)).all()
+        skus = {r.sku for r in written}
+        await ProductFacetRepository(self._session).refresh(
+            [(r.distributor_id, r.category) for r in written]
+            + [(r.distributor_id, r.category) for r in current if r.sku in skus]
+        )
+
+        OutboxRepository(self._session).add_many(
+            PRODUCT_CHANGED,
+            [
+                {
+                    "product_id": r.id,
+                    "distributor_id": r.distributor_id,
+                    "action": "updated" if r.sku in existing else "created",
+                }
+                for r in written
+            ],
+        )
+        return {r.sku: (r.id, r.sku not in existing) for r in written}
+
+    def _change_set(self, data: list[tuple[uuid.UUID, Decimal | None, bool | None]]) -> Any:
+        """``(id, price, is_active)`` rows as a derived table ``v(id, price, is_active)``.
+
+        PostgreSQL gets a ``VALUES`` list; SQLite cannot name ``VALUES``
+        columns, so there it is an equivalent ``UNION ALL`` of one-row SELECTs.
+        """
+        cols: tuple[ColumnClause[Any], ...] = (
+            column("id", Uuid()),
+            column("price", Numeric(10, 2)),
+            column("is_active", Boolean()),
+        )
+        if self._session.get_bind().dialect.name == "postgresql":
+            return values(*cols, name="v").data(data)
+        selects = [
+            select(*(literal(value, col.type).label(col.name) for value, col in zip(row, cols))) for row in data
+        ]
+        return union_all(*selects).subquery("v")
+
+    def _changed_many(self, rows: list[Any]) -> None:
+        OutboxRepository(self._session).add_many(
+            PRODUCT_CHANGED,
+            [{"product_id": r.id, "distributor_id": r.distributor_id, "action": "updated"} for r in rows],
+        )
+
+    async def bulk_update_products(
+        self, changes: list[ProductChange], *, distributor_id: uuid.UUID | None = None
+    ) -> tuple[list[Any], list[str]]:
+        """Apply per-product price / availability changes as one ``UPDATE ... FROM (VALUES ...)``.
+
+        Returns the updated rows (id, sku, price, is_active, distributor_id, category)
+        and the ids/SKUs that matched nothing (or another distributor's
+        products when ``distributor_id`` is given). SKUs are resolved to ids
+        first; a later change to the same product overrides the fields it
+        gives and keeps the rest.
+        """
+        skus = {change.sku for change in changes if change.id is None}
+        by_sku: dict[str | None, uuid.UUID] = {}
+        if skus:
+            lookup = select(Product.sku, Product.id).where(Product.sku.in_(skus))
+            if distributor_id is not None:
+                lookup = lookup.where(Product.distributor_id == distributor_id)
+            by_sku = dict((await self._session.execute(lookup)).all())
+
+        # One row per product, so the UPDATE joins each at most once; when the same
+        # product is named again (by id or SKU), its fields overlay the earlier ones.
+        merged: dict[uuid.UUID, dict[str, Any]] = {}
+        targets: dict[str, uuid.UUID | None] = {}
+        for change in changes:
+            target = change.id if change.id is not None else by_sku.get(change.sku)
+            targets[str(change.id) if change.id is not None else str(change.sku)] = target
+            if target is not None:
+                merged.setdefault(target, {}).update(
+                    change.model_dump(include={"price", "is_active"}, exclude_none=True)
+                )
+        if not merged:
+            return [], list(targets)
+
+        v = self._change_set([(pid, f.get("price"), f.get("is_active")) for pid, f in merged.items()])
+        stmt = (
+            update(Product)
+            .where(Product.id == v.c.id)
+            .values(
+                price=func.coalesce(v.c.price, Product.price),
+                is_active=func.coalesce(v.c.is_active, Product.is_active),
+            )
+            .returning(
+                Product.id, Product.sku, Product.price, Product.is_active, Product.distributor_id, Product.category
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if distributor_id is not None:
+            stmt = stmt.where(Product.distributor_id == distributor_id)
+        rows = list((await self._session.execute(stmt)).all())
+        self._changed_many(rows)
+        await ProductFacetRepository(self._session).refresh((r.distributor_id, r.category) for r in rows)
+
+        hit = {r.id for r in rows}
+        return rows, [key for key, target in targets.items() if target not in hit]
+
+    async def adjust_prices(
+        self, percent: Decimal, *, category: str | None = None, distributor_id: uuid.UUID | None = None
+    ) -> list[Any]:
+        """Scale active prices by ``percent`` in one UPDATE, rounded to cents and never below 0.01."""
+        scaled = func.round(Product.price * (1 + percent / 100), 2)
+        stmt = (
+            update(Product)
+            .where(Product.is_active.is_(True))
+            .values(price=case((scaled < Decimal("0.01"), Decimal("0.01")), else_=scaled))
+            .returning(
+                Product.id, Product.sku, Product.price, Product.is_active, Product.distributor_id, Product.category
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if category is not None:
+            stmt = stmt.where(Product.category == category)
+        if distributor_id is not None:
+            stmt = stmt.where(Product.distributor_id == distributor_id)
+        rows = list((await self._session.execute(stmt)).all())
+        self._changed_many(rows)
+        await ProductFacetRepository(self._session).refresh((r.distributor_id, r.category) for r in rows)
+        return rows
+
     async def update_product(
         self,
         product_id: uuid.UUID,
@@ -78,19 +441,28 @@ class ProductRepository:
         product = await self.get_product(product_id)
         if product is None:
             return None
+        previous = (product.distributor_id, product.category)
         for key, value in data.items():
             setattr(product, key, value)
         await self._session.flush()
         await self._session.refresh(product)
+        self._changed(product.id, "updated", distributor_id=product.distributor_id)
+        await ProductFacetRepository(self._session).refresh([previous, (product.distributor_id, product.category)])
         return product
 
-    async def delete_product(self, product_id: uuid.UUID) -> bool:
-        """Soft-delete: set is_active=False."""
+    async def delete_product(self, product_id: uuid.UUID) -> uuid.UUID | None:
+        """Soft-delete: set is_active=False. Returns the product's distributor, or None if none was active."""
         stmt = (
             update(Product)
             .where(Product.id == product_id, Product.is_active.is_(True))
             .values(is_active=False)
+            .returning(Product.distributor_id, Product.category)
         )
-        result = await self._session.execute(stmt)
+        row = (await self._session.execute(stmt)).first()
         await self._session.flush()
-        return result.rowcount > 0  # type: ignore[return-value]
+        if row is None:
+            return None
+        distributor_id, category = row
+        self._changed(product_id, "deleted", distributor_id=distributor_id)
+        await ProductFacetRepository(self._session).refresh([(distributor_id, category)])
+        return distributor_id
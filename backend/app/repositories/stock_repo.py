@@ -0,0 +1,211 @@
+"""Stock repository — striped counters and reservations that don't queue behind each other.
+
+A plain ``UPDATE ... SET stock = stock - n`` on one row serializes every
+checkout of a popular product: each waits for the previous transaction to
+commit. Here a product's stock is split over ``stripes`` rows and a
+reservation takes ``n`` from a single stripe, chosen at random among those
+with enough stock and locked with ``FOR UPDATE SKIP LOCKED``. A checkout
+only waits when every stripe that could serve it is held by another open
+transaction. If no single stripe has enough, the slow path locks all of the
+product's stripes in order and draws across them.
+
+Reservations live in the order's transaction: they roll back with it, so
+nothing needs reconciling. Products are locked in id order to rule out
+deadlocks between multi-line orders.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
+
+from sqlalchemy import delete, func, insert, select, update
+
+from app.core.exceptions import SoukSyncError
+from app.models.order import OrderStatus
+from app.models.product import Product
+from app.models.stock import ReservationStatus, StockLevel, StockReservation
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import Mapping, Sequence
+
+    from sqlalchemy.engine import CursorResult
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class InsufficientStockError(SoukSyncError):
+    def __init__(self, product_id: uuid.UUID) -> None:
+        super().__init__(message=f"Not enough stock for product {product_id}", status_code=409)
+
+
+class StockSummary(NamedTuple):
+    product_id: uuid.UUID
+    available: int
+    held: int
+    stripes: int
+
+
+class StockRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    @property
+    def _postgres(self) -> bool:
+        return self._session.get_bind().dialect.name == "postgresql"
+
+    async def get_stock(self, product_id: uuid.UUID) -> StockSummary:
+        levels = (
+            await self._session.execute(
+                select(func.coalesce(func.sum(StockLevel.available), 0), func.count()).where(
+                    StockLevel.product_id == product_id
+                )
+            )
+        ).one()
+        held = (
+            await self._session.execute(
+                select(func.coalesce(func.sum(StockReservation.quantity), 0)).where(
+                    StockReservation.product_id == product_id,
+                    StockReservation.status == ReservationStatus.HELD,
+                )
+            )
+        ).scalar_one()
+        return StockSummary(product_id, levels[0], held, levels[1])
+
+    async def set_stock(self, product_id: uuid.UUID, available: int, *, stripes: int = 1) -> StockSummary:
+        """Replace the product's unreserved stock, spread evenly over ``stripes`` rows; held units stay held.
+
+        One stripe is a plain counter. Give hot products more: each extra
+        stripe is another checkout that can reserve without waiting.
+        """
+        if self._postgres:
+            # Waits out in-flight reservations, so none of their draws are lost.
+            lock = select(StockLevel.stripe).where(StockLevel.product_id == product_id).with_for_update()
+            await self._session.execute(lock)
+        await self._session.execute(delete(StockLevel).where(StockLevel.product_id == product_id))
+        share, extra = divmod(available, stripes)
+        await self._session.execute(
+            insert(StockLevel),
+            [
+                {"product_id": product_id, "stripe": i, "available": share + (1 if i < extra else 0)}
+                for i in range(stripes)
+            ],
+        )
+        await self._session.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(track_stock=True)
+            .execution_options(synchronize_session=False)
+        )
+        return await self.get_stock(product_id)
+
+    async def _take_one(self, product_id: uuid.UUID, quantity: int) -> int | None:
+        """Draw from one stripe with enough stock that no one else holds; its number, or None."""
+        pick = (
+            select(StockLevel.stripe)
+            .where(StockLevel.product_id == product_id, StockLevel.available >= quantity)
+            .order_by(func.random())
+            .limit(1)
+        )
+        if self._postgres:
+            pick = pick.with_for_update(skip_locked=True)
+        stmt = (
+            update(StockLevel)
+            .where(
+                StockLevel.product_id == product_id,
+                StockLevel.stripe == pick.scalar_subquery(),
+                StockLevel.available >= quantity,
+            )
+            .values(available=StockLevel.available - quantity)
+            .returning(StockLevel.stripe)
+            .execution_options(synchronize_session=False)
+        )
+        return (await self._session.execute(stmt)).scalar_one_or_none()
+
+    async def _take_spread(self, product_id: uuid.UUID, quantity: int) -> list[tuple[int, int]]:
+        """Lock every stripe (waiting if need be) and draw across them; ``[(stripe, units)]``."""
+        stmt = (
+            select(StockLevel.stripe, StockLevel.available)
+            .where(StockLevel.product_id == product_id, StockLevel.available > 0)
+            .order_by(StockLevel.stripe)
+        )
+        if self._postgres:
+            stmt = stmt.with_for_update()
+        rows = (await self._session.execute(stmt)).all()
+        if sum(available for _, available in rows) < quantity:
+            raise InsufficientStockError(product_id)
+
+        taken: list[tuple[int, int]] = []
+        remaining = quantity
+        for stripe, available in rows:
+            units = min(available, remaining)
+            await self._session.execute(
+                update(StockLevel)
+                .where(StockLevel.product_id == product_id, StockLevel.stripe == stripe)
+                .values(available=StockLevel.available - units)
+                .execution_options(synchronize_session=False)
+            )
+            taken.append((stripe, units))
+            remaining -= units
+            if not remaining:
+                break
+        return taken
+
+    async def reserve(self, order_id: uuid.UUID, quantities: Mapping[uuid.UUID, int]) -> None:
+        """Hold stock for an order, one draw per stock-tracked product; raises ``InsufficientStockError``."""
+        held: list[dict[str, Any]] = []
+        for product_id in sorted(quantities):
+            quantity = quantities[product_id]
+            stripe = await self._take_one(product_id, quantity)
+            draws = [(stripe, quantity)] if stripe is not None else await self._take_spread(product_id, quantity)
+            held.extend(
+                {"order_id": order_id, "product_id": product_id, "stripe": s, "quantity": units}
+                for s, units in draws
+            )
+        if held:
+            await self._session.execute(insert(StockReservation), held)
+
+    async def settle(self, order_ids: Sequence[uuid.UUID], status: OrderStatus) -> None:
+        """Apply an order status change: shipping commits held stock, cancelling releases it."""
+        if not order_ids:
+            return
+        if status == OrderStatus.SHIPPED:
+            await self._session.execute(
+                update(StockReservation)
+                .where(StockReservation.order_id.in_(order_ids), StockReservation.status == ReservationStatus.HELD)
+                .values(status=ReservationStatus.COMMITTED)
+                .execution_options(synchronize_session=False)
+            )
+        elif status == OrderStatus.CANCELLED:
+            await self._release(order_ids)
+
+    async def _release(self, order_ids: Sequence[uuid.UUID]) -> None:
+        stmt = (
+            update(StockReservation)
+            .where(StockReservation.order_id.in_(order_ids), StockReservation.status == ReservationStatus.HELD)
+            .values(status=ReservationStatus.RELEASED)
+            .returning(StockReservation.product_id, StockReservation.stripe, StockReservation.quantity)
+            .execution_options(synchronize_session=False)
+        )
+        returned: dict[tuple[uuid.UUID, int], int] = defaultdict(int)
+        for product_id, stripe, quantity in (await self._session.execute(stmt)).all():
+            returned[(product_id, stripe)] += quantity
+
+        for (product_id, stripe), quantity in sorted(returned.items()):
+            result = cast(
+                "CursorResult[Any]",
+                await self._session.execute(
+                    update(StockLevel)
+                    .where(StockLevel.product_id == product_id, StockLevel.stripe == stripe)
+                    .values(available=StockLevel.available + quantity)
+                    .execution_options(synchronize_session=False)
+                ),
+            )
+            if result.rowcount == 0:
+                # Re-striped since the hold; stripe 0 exists while the product is tracked.
+                await self._session.execute(
+                    update(StockLevel)
+                    .where(StockLevel.product_id == product_id, StockLevel.stripe == 0)
+                    .values(available=StockLevel.available + quantity)
+                    .execution_options(synchronize_session=False)
+                )
@@ -0,0 +1,25 @@
+"""Analytics response schemas."""
+
+from __future__ import annotations
+
+import uuid  # noqa: TC003
+from datetime import date  # noqa: TC003
+from decimal import Decimal  # noqa: TC003
+
+from pydantic import BaseModel
+
+
+class TopProduct(BaseModel):
+    product_id: uuid.UUID
+    name: str
+    quantity: int
+    revenue: Decimal
+
+
+class KPIResponse(BaseModel):
+    date_from: date
+    date_to: date
+    gmv: Decimal
+    order_count: int
+    orders_by_status: dict[str, int]
+    top_products: list[TopProduct]
@@ -6,7 +6,9 @@ import uuid  # noqa: TC003
 from datetime import datetime  # noqa: TC003
 from decimal import Decimal  # noqa: TC003
 
-from pydantic import BaseModel, ConfigDict, computed_field
+from pydantic import BaseModel, ConfigDict, Field, computed_field
+
+from app.models.credit_ledger import LedgerKind  # noqa: TC001
 
 
 class CreditProfileResponse(BaseModel):
@@ -29,3 +31,30 @@ class CreditProfileResponse(BaseModel):
 class CreditLimitResponse(BaseModel):
     credit_limit: Decimal
     available_credit: Decimal
+
+
+class CreditLedgerPost(BaseModel):
+    """Charges and repayments are positive amounts; an adjustment's sign is its direction."""
+
+    user_id: uuid.UUID
+    kind: LedgerKind
+    amount: Decimal = Field(..., decimal_places=2)
+    order_id: uuid.UUID | None = None
+    note: str | None = Field(None, max_length=255)
+
+
+class CreditLedgerEntryResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    seq: int
+    kind: LedgerKind
+    amount: Decimal
+    balance_after: Decimal
+    order_id: uuid.UUID | None
+    note: str | None
+    created_at: datetime
+
+
+class CreditLedgerResponse(BaseModel):
+    items: list[CreditLedgerEntryResponse]
+    next_before: int | None
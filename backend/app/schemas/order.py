@@ -5,6 +5,7 @@ from __future__ import annotations
 import uuid  # noqa: TC003
 from datetime import datetime  # noqa: TC003
 from decimal import Decimal  # noqa: TC003
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -18,12 +19,42 @@ class OrderCreate(BaseModel):
     items: list[OrderItemCreate] = Field(..., min_length=1)
     distributor_id: uuid.UUID
     notes: str | None = None
+    # "bnpl" charges the total to the kiosk's credit line at checkout.
+    payment_method: Literal["pay_now", "bnpl"] | None = None
+
+
+class OrderTemplate(BaseModel):
+    """The lines of a kiosk's most recent order, cached for one-tap reorder."""
+
+    order_id: uuid.UUID
+    distributor_id: uuid.UUID
+    items: list[OrderItemCreate]
 
 
 class OrderStatusUpdate(BaseModel):
     status: str
 
 
+class OrderBulkStatusUpdate(BaseModel):
+    order_ids: list[uuid.UUID] = Field(..., min_length=1, max_length=5000)
+    status: str
+
+
+class OrderStatusResult(BaseModel):
+    id: uuid.UUID
+    status: str
+
+
+class OrderStatusRejection(BaseModel):
+    id: uuid.UUID
+    reason: str
+
+
+class OrderBulkStatusResponse(BaseModel):
+    updated: list[OrderStatusResult]
+    rejected: list[OrderStatusRejection]
+
+
 class OrderItemResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -38,6 +69,7 @@ class OrderResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     id: uuid.UUID
+    code: str
     user_id: uuid.UUID
     distributor_id: uuid.UUID
     status: str
@@ -54,3 +86,8 @@ class OrderListResponse(BaseModel):
     total: int
     page: int
     per_page: int
+    next_cursor: str | None = None
+
+
+class ReorderResponse(OrderResponse):
+    skipped_product_ids: list[uuid.UUID] = []
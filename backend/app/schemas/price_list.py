@@ -0,0 +1,71 @@
+"""Price list request/response schemas."""
+
+from __future__ import annotations
+
+import uuid  # noqa: TC003
+from datetime import datetime  # noqa: TC003
+from decimal import Decimal  # noqa: TC003
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class PriceTierIn(BaseModel):
+    product_id: uuid.UUID
+    min_quantity: int = Field(1, ge=1)
+    unit_price: Decimal = Field(..., gt=0, decimal_places=2)
+
+
+def _check_unique(tiers: list[PriceTierIn] | None) -> None:
+    if tiers is None:
+        return
+    keys = {(t.product_id, t.min_quantity) for t in tiers}
+    if len(keys) != len(tiers):
+        raise ValueError("one tier per product and min_quantity")
+
+
+class PriceListCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    segment: str | None = Field(None, max_length=30)
+    distributor_id: uuid.UUID | None = Field(None, description="Required for admins; distributors get their own.")
+    is_active: bool = True
+    tiers: list[PriceTierIn] = Field(default_factory=list, max_length=5000)
+
+    @model_validator(mode="after")
+    def _check(self) -> PriceListCreate:
+        _check_unique(self.tiers)
+        return self
+
+
+class PriceListUpdate(BaseModel):
+    """Partial update; ``tiers``, when given, replaces the whole set."""
+
+    name: str | None = Field(None, min_length=1, max_length=100)
+    segment: str | None = Field(None, max_length=30)
+    is_active: bool | None = None
+    tiers: list[PriceTierIn] | None = Field(None, max_length=5000)
+
+    @model_validator(mode="after")
+    def _check(self) -> PriceListUpdate:
+        _check_unique(self.tiers)
+        return self
+
+
+class PriceTierResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    product_id: uuid.UUID
+    min_quantity: int
+    unit_price: Decimal
+
+
+class PriceListResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    distributor_id: uuid.UUID
+    name: str
+    segment: str | None
+    is_active: bool
+    tiers: list[PriceTierResponse]
+    created_at: datetime
+    updated_at: datetime
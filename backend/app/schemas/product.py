@@ -6,7 +6,7 @@ import uuid  # noqa: TC003
 from datetime import datetime  # noqa: TC003
 from decimal import Decimal  # noqa: TC003
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class ProductCreate(BaseModel):
@@ -42,3 +42,102 @@ class ProductListResponse(BaseModel):
     total: int
     page: int
     per_page: int
+
+
+class ProductFacetResponse(BaseModel):
+    category: str | None
+    count: int
+    min_price: Decimal
+    max_price: Decimal
+
+
+class ProductFacetListResponse(BaseModel):
+    items: list[ProductFacetResponse]
+
+
+class ProductChangesResponse(BaseModel):
+    """One page of the delta-sync feed. Apply, then call again with ``next_token``."""
+
+    upserted: list[ProductResponse]
+    deleted: list[uuid.UUID]
+    next_token: str
+    has_more: bool
+
+
+class ProductImportError(BaseModel):
+    line: int
+    sku: str | None
+    message: str
+
+
+class ProductImportResponse(BaseModel):
+    received: int
+    inserted: int
+    updated: int
+    failed: int
+    errors: list[ProductImportError]
+    errors_truncated: bool
+    elapsed_ms: float
+    rows_per_second: float
+
+
+class ProductChange(BaseModel):
+    """One row of a bulk update, addressed by ``id`` or ``sku``."""
+
+    id: uuid.UUID | None = None
+    sku: str | None = Field(None, max_length=50)
+    price: Decimal | None = Field(None, gt=0, decimal_places=2)
+    is_active: bool | None = None
+
+    @model_validator(mode="after")
+    def _check(self) -> ProductChange:
+        if (self.id is None) == (self.sku is None):
+            raise ValueError("give exactly one of id or sku")
+        if self.price is None and self.is_active is None:
+            raise ValueError("nothing to change: give price and/or is_active")
+        return self
+
+
+class ProductPriceAdjustment(BaseModel):
+    """Scale prices by ``percent`` (e.g. 7.5 or -10), optionally within one category."""
+
+    percent: Decimal = Field(..., ge=-90, le=1000, decimal_places=2)
+    category: str | None = Field(None, max_length=50)
+    distributor_id: uuid.UUID | None = None
+
+
+class ProductBulkUpdate(BaseModel):
+    changes: list[ProductChange] | None = Field(None, min_length=1, max_length=5000)
+    adjust: ProductPriceAdjustment | None = None
+
+    @model_validator(mode="after")
+    def _check(self) -> ProductBulkUpdate:
+        if (self.changes is None) == (self.adjust is None):
+            raise ValueError("give exactly one of changes or adjust")
+        return self
+
+
+class ProductBulkResult(BaseModel):
+    id: uuid.UUID
+    sku: str | None
+    price: Decimal
+    is_active: bool
+
+
+class ProductBulkUpdateResponse(BaseModel):
+    updated: list[ProductBulkResult]
+    not_found: list[str]
+
+
+class StockUpdate(BaseModel):
+    """Unreserved units on hand; hot products get more ``stripes`` so checkouts don't queue."""
+
+    available: int = Field(..., ge=0)
+    stripes: int = Field(1, ge=1, le=64)
+
+
+class StockResponse(BaseModel):
+    product_id: uuid.UUID
+    available: int
+    held: int
+    stripes: int
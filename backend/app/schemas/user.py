@@ -5,7 +5,7 @@ from __future__ import annotations
 import uuid  # noqa: TC003
 from datetime import datetime  # noqa: TC003
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.user import UserRole
 
@@ -21,6 +21,7 @@ class UserResponse(BaseModel):
     telegram_chat_id: int | None
     distributor_id: uuid.UUID | None
     tenant_id: uuid.UUID | None
+    price_segment: str | None
     is_active: bool
     created_at: datetime
 
@@ -38,6 +39,7 @@ class UserAdminCreate(BaseModel):
     telegram_chat_id: int | None = None
     distributor_id: uuid.UUID | None = None
     tenant_id: uuid.UUID | None = None
+    price_segment: str | None = Field(None, max_length=30)
     is_active: bool = True
 
 
@@ -48,4 +50,5 @@ class UserAdminUpdate(BaseModel):
     telegram_chat_id: int | None = None
     distributor_id: uuid.UUID | None = None
     tenant_id: uuid.UUID | None = None
+    price_segment: str | None = Field(None, max_length=30)
     is_active: bool | None = None
@@ -2,25 +2,37 @@
 
 from __future__ import annotations
 
-import random
-import string
-from datetime import datetime, timezone
-from typing import Any
+import uuid
+from typing import TYPE_CHECKING, Any
 
 import structlog
 
+from app.core.snowflake import format_code
+from app.db.database import async_session_factory
+from app.repositories.credit_repo import InsufficientCreditError
+from app.repositories.facet_repo import ProductFacetRepository
+from app.repositories.order_repo import OrderRepository
+from app.repositories.product_repo import ProductRepository
+from app.repositories.stock_repo import InsufficientStockError
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.services import pricing, reorder
 from app.services import telegram_bot as tg
 from app.services.conversation import ConversationState, ConversationStep, get_state
 from app.services.copy import LOCATIONS, SAMPLE_PRODUCTS, SHOP_TYPES, t
 
+if TYPE_CHECKING:
+    from app.models.order import Order
+
 logger = structlog.get_logger(__name__)
 
 _LANG_MAP = {"1": "am", "2": "om", "3": "en"}
-_ORDER_INTENTS = {"order", "reorder", "ትዕዛዝ", "ድገም", "ajaja", "irra"}
+_ORDER_INTENTS = {"order", "ትዕዛዝ", "ajaja"}
+_REORDER_INTENTS = {"reorder", "ድገም", "irra"}
 _HELP_INTENTS = {"help", "እገዛ", "gargaarsa"}
 _CREDIT_INTENTS = {"credit", "ክሬዲት", "liqii"}
 _CHECKOUT_INTENTS = {"checkout", "ክፍያ", "kafaltii"}
 _CANCEL_INTENTS = {"cancel", "ይቅር", "haquu"}
+_PRODUCTS_PER_CATEGORY = 10
 
 
 async def handle_update(body: dict[str, Any]) -> None:
@@ -86,6 +98,11 @@ async def _handle_text(chat_id: int, text: str) -> None:
         await tg.send_message(chat_id, t("help", state.language))
         return
 
+    # Before the order intents: "reorder" contains "order".
+    if any(kw in lower for kw in _REORDER_INTENTS):
+        await _start_reorder(chat_id, state)
+        return
+
     if any(kw in lower for kw in _ORDER_INTENTS):
         await _start_order(chat_id, state)
         return
@@ -149,17 +166,80 @@ async def _set_shop_type(chat_id: int, state: ConversationState, text: str) -> N
 async def _start_order(chat_id: int, state: ConversationState) -> None:
     state.step = ConversationStep.BROWSING_CATEGORIES
     state.cart = []
-    await tg.send_message(chat_id, t("categories", state.language))
+    await _category_menu(chat_id, state)
+
+
+async def _category_menu(chat_id: int, state: ConversationState) -> None:
+    """Number the categories from ``product_facets``; the sample menu while there are none."""
+    try:
+        async with async_session_factory() as session:
+            facets = await ProductFacetRepository(session).list_facets()
+    except Exception as exc:
+        logger.warning("category_menu_failed", chat_id=chat_id, error=str(exc))
+        facets = []
+    # Uncategorized products can't be browsed by category, so they stay off the menu.
+    facets = [f for f in facets if f.category]
+    state.data["categories"] = [f.category for f in facets]
+    if not facets:
+        await tg.send_message(chat_id, t("categories", state.language))
+        return
+    lines = "\n".join(f"{i}. {f.category} ({f.count})" for i, f in enumerate(facets, 1))
+    await tg.send_message(chat_id, t("category_menu", state.language, categories=lines))
+
+
+async def _category_products(categories: list[str], choice: str) -> list[dict[str, Any]]:
+    try:
+        idx = int(choice) - 1
+    except ValueError:
+        return []
+    if not 0 <= idx < len(categories):
+        return []
+    async with async_session_factory() as session:
+        products, _ = await ProductRepository(session).list_products(
+            category=categories[idx], per_page=_PRODUCTS_PER_CATEGORY
+        )
+    return [
+        {"product_id": str(p.id), "name": p.name, "price": p.price, "distributor_id": str(p.distributor_id)}
+        for p in products
+    ]
+
+
+async def _start_reorder(chat_id: int, state: ConversationState) -> None:
+    """Fill the cart from the last order at current prices; checkout is one reply away."""
+    async with async_session_factory() as session:
+        user_id = await reorder.user_id_for_chat(session, chat_id)
+        template = await reorder.last_template(session, user_id) if user_id else None
+        repriced = await reorder.reprice(session, template) if template else None
+
+    if repriced is None or repriced.order is None:
+        await tg.send_message(chat_id, t("reorder_empty", state.language))
+        await _start_order(chat_id, state)
+        return
+
+    state.cart = [
+        {
+            "product_id": str(item.product_id),
+            "name": repriced.products[item.product_id].name,
+            "price": repriced.products[item.product_id].price,
+            "distributor_id": str(repriced.order.distributor_id),
+            "qty": item.quantity,
+        }
+        for item in repriced.order.items
+    ]
+    state.data["distributor_id"] = str(repriced.order.distributor_id)
+    await _show_cart(chat_id, state)
 
 
 async def _browse_category(chat_id: int, state: ConversationState, text: str) -> None:
     cat_key = text.strip()
-    products = SAMPLE_PRODUCTS.get(cat_key)
+    categories = state.data.get("categories")
+    products = await _category_products(categories, cat_key) if categories else SAMPLE_PRODUCTS.get(cat_key)
     if not products:
-        await tg.send_message(chat_id, t("categories", state.language))
+        await _category_menu(chat_id, state)
         return
 
     state.current_category = cat_key
+    state.data["products"] = products
     state.step = ConversationStep.BROWSING_PRODUCTS
 
     lines = []
@@ -175,19 +255,26 @@ async def _add_to_cart(chat_id: int, state: ConversationState, text: str) -> Non
 
     if lower == "back":
         state.step = ConversationStep.BROWSING_CATEGORIES
-        await tg.send_message(chat_id, t("categories", state.language))
+        await _category_menu(chat_id, state)
         return
 
     if lower in ("cart", "ጋሪ", "gaarii"):
         await _show_cart(chat_id, state)
         return
 
-    products = SAMPLE_PRODUCTS.get(state.current_category, [])
+    products = state.data.get("products", [])
     try:
         idx = int(text.strip()) - 1
         if 0 <= idx < len(products):
             product = products[idx]
-            state.cart.append({"name": product["name"], "price": product["price"], "qty": 1})
+            # Sample products have no id; catalog products accumulate so quantity breaks can apply.
+            line = None
+            if "product_id" in product:
+                line = next((i for i in state.cart if i.get("product_id") == product["product_id"]), None)
+            if line is None:
+                state.cart.append({**product, "qty": 1})
+            else:
+                line["qty"] += 1
             await tg.send_message(
                 chat_id,
                 f"🛒 Added {product['name']} (ETB {product['price']})\n"
@@ -208,17 +295,38 @@ async def _show_cart(chat_id: int, state: ConversationState) -> None:
     if not state.cart:
         await tg.send_message(chat_id, "Your cart is empty. Browse categories first.")
         state.step = ConversationStep.BROWSING_CATEGORIES
-        await tg.send_message(chat_id, t("categories", state.language))
+        await _category_menu(chat_id, state)
         return
 
-    items_text = "\n".join(f"  • {i['name']} x{i['qty']} — ETB {i['price']}" for i in state.cart)
-    total = sum(i["price"] * i["qty"] for i in state.cart)
+    await _price_cart(chat_id, state)
+    items_text = "\n".join(f"  • {i['name']} x{i['qty']} — ETB {i['unit_price']}" for i in state.cart)
+    total = sum(i["unit_price"] * i["qty"] for i in state.cart)
     state.step = ConversationStep.CART_REVIEW
     await tg.send_message(
         chat_id, t("cart_summary", state.language, items=items_text, total=str(total))
     )
 
 
+async def _price_cart(chat_id: int, state: ConversationState) -> None:
+    """Set each line's ``unit_price`` from its distributor's price book; list prices if that fails."""
+    for line in state.cart:
+        line["unit_price"] = line["price"]
+    distributor_ids = {line["distributor_id"] for line in state.cart if line.get("distributor_id")}
+    if not distributor_ids:
+        return
+    try:
+        async with async_session_factory() as session:
+            segment = await pricing.segment_for_chat(session, chat_id)
+            books = {d: await pricing.price_book(session, uuid.UUID(d)) for d in distributor_ids}
+    except Exception as exc:
+        logger.warning("cart_pricing_failed", chat_id=chat_id, error=str(exc))
+        return
+    for line in state.cart:
+        if book := books.get(line.get("distributor_id")):
+            product_id = uuid.UUID(line["product_id"])
+            line["unit_price"] = book.unit_price(product_id, line["qty"], line["price"], segment)
+
+
 async def _cart_action(chat_id: int, state: ConversationState, lower: str) -> None:
     if any(kw in lower for kw in _CHECKOUT_INTENTS) or lower in ("yes", "አዎ", "eeyyee"):
         state.step = ConversationStep.AWAITING_PAYMENT_CHOICE
@@ -234,7 +342,8 @@ async def _cart_action(chat_id: int, state: ConversationState, lower: str) -> No
     if lower in ("edit", "አርም", "sirreessi"):
         state.step = ConversationStep.BROWSING_CATEGORIES
         state.cart = []
-        await tg.send_message(chat_id, "Cart cleared for editing.\n" + t("categories", state.language))
+        await tg.send_message(chat_id, "Cart cleared for editing.")
+        await _category_menu(chat_id, state)
         return
 
     await _show_cart(chat_id, state)
@@ -246,16 +355,31 @@ async def _payment_choice(chat_id: int, state: ConversationState, text: str) ->
         await tg.send_message(chat_id, "Reply 1 for Pay Now or 2 for BNPL.")
         return
 
-    order_id = _generate_order_id()
-    window = "Tomorrow 8AM-12PM"
+    payment = "pay_now" if choice == "1" else "bnpl"
+    try:
+        orders = await _place_orders(chat_id, state.cart, payment)
+    except InsufficientCreditError:
+        await tg.send_message(chat_id, t("bnpl_declined", state.language))
+        return
+    except _OrderRejectedError as exc:
+        state.cart = []
+        state.step = ConversationStep.REGISTERED
+        await tg.send_message(chat_id, t(exc.copy_key, state.language))
+        return
+    except Exception as exc:
+        logger.exception("bot_order_failed", chat_id=chat_id, payment=payment, error=str(exc))
+        await tg.send_message(chat_id, t("order_failed", state.language))
+        return
 
+    order_id = ", #".join(format_code(o.code) for o in orders)
+    window = "Tomorrow 8AM-12PM"
     logger.info(
         "order_created",
-        chat_id=state.data.get("chat_id"),
+        chat_id=chat_id,
         order_id=order_id,
         items=len(state.cart),
-        total=sum(i["price"] * i["qty"] for i in state.cart),
-        payment="pay_now" if choice == "1" else "bnpl",
+        total=sum(o.total for o in orders),
+        payment=payment,
     )
 
     state.step = ConversationStep.ORDER_CONFIRMED
@@ -268,7 +392,48 @@ async def _payment_choice(chat_id: int, state: ConversationState, text: str) ->
     state.step = ConversationStep.REGISTERED
 
 
-def _generate_order_id() -> str:
-    date_part = datetime.now(tz=timezone.utc).strftime("%Y%m%d")
-    rand_part = "".join(random.choices(string.ascii_uppercase + string.digits, k=4))
-    return f"SS-{date_part}-{rand_part}"
+class _OrderRejectedError(Exception):
+    """The cart can't become an order; ``copy_key`` tells the kiosk why."""
+
+    def __init__(self, copy_key: str) -> None:
+        super().__init__(copy_key)
+        self.copy_key = copy_key
+
+
+async def _place_orders(chat_id: int, cart: list[dict[str, Any]], payment: str) -> list[Order]:
+    """Store the cart as one order per distributor, all in one transaction.
+
+    Goes through ``OrderRepository.create_order`` like the API, so prices,
+    stock and BNPL credit are settled the same way; if any order fails the
+    whole cart rolls back.
+    """
+    lines: dict[uuid.UUID, list[OrderItemCreate]] = {}
+    for line in cart:
+        # Sample products (empty catalog) have no id and can't be ordered.
+        if not line.get("product_id"):
+            raise _OrderRejectedError("order_unavailable")
+        item = OrderItemCreate(product_id=uuid.UUID(line["product_id"]), quantity=line["qty"])
+        lines.setdefault(uuid.UUID(line["distributor_id"]), []).append(item)
+
+    async with async_session_factory() as session:
+        user_id = await reorder.user_id_for_chat(session, chat_id)
+        if user_id is None:
+            raise _OrderRejectedError("order_unlinked")
+        products = await ProductRepository(session).get_active_products(
+            [item.product_id for items in lines.values() for item in items]
+        )
+        if any(products.get(item.product_id) is None for items in lines.values() for item in items):
+            raise _OrderRejectedError("order_unavailable")
+
+        segment = await pricing.segment_for_chat(session, chat_id)
+        repo = OrderRepository(session)
+        orders = []
+        for distributor_id, items in lines.items():
+            data = OrderCreate(distributor_id=distributor_id, items=items, payment_method=payment)
+            prices = await pricing.price_book(session, distributor_id)
+            try:
+                orders.append(await repo.create_order(user_id, data, products, prices=prices, segment=segment))
+            except InsufficientStockError as exc:
+                raise _OrderRejectedError("order_unavailable") from exc
+        await session.commit()
+    return orders
@@ -0,0 +1,132 @@
+"""Catalog revisions, ETags and the serialized page cache.
+
+Every product write bumps Redis counters for the whole catalog, the
+product's distributor and the product itself. A catalog read first reads
+the counter for its scope (one GET): the ETag is derived from it, so a
+matching ``If-None-Match`` is answered without touching the database, and
+a miss on the client is usually a hit on the cached JSON for that
+revision. Old revisions are never invalidated; their pages just expire.
+
+Counters are read before the page is computed, so a write that lands in
+between can only leave newer data under an older revision, never the
+reverse. A revision also carries an epoch, a nonce set the first time one
+is read from an empty Redis, so counters restarting at 0 after a flush or a
+failover never reproduce an ETag a client already holds. When Redis is
+unavailable reads skip all of this.
+
+Scopes are not per tenant, and need not be: catalog reads are public and
+depend only on their query parameters, which all go into the variant (and
+so into both the ETag and the page key). A shared counter only bumps more
+often than one tenant's changes would require.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import secrets
+from typing import TYPE_CHECKING, cast
+
+import structlog
+
+from app.core.config import settings
+from app.db.redis import redis_client
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import Iterable
+
+logger = structlog.get_logger(__name__)
+
+# Bump when the serialized shape of catalog responses changes.
+_FORMAT = "1"
+
+CATALOG = "catalog"
+
+_EPOCH_KEY = "souksync:catalog-epoch"
+
+
+def distributor_scope(distributor_id: uuid.UUID) -> str:
+    return f"distributor:{distributor_id}"
+
+
+def product_scope(product_id: uuid.UUID) -> str:
+    return f"product:{product_id}"
+
+
+def _rev_key(scope: str) -> str:
+    return f"souksync:catalog-rev:{scope}"
+
+
+def _page_key(scope: str, revision: str, variant: str) -> str:
+    digest = hashlib.sha1(variant.encode()).hexdigest()
+    return f"souksync:catalog-page:{scope}:{revision}:{digest}"
+
+
+def etag(scope: str, revision: str, variant: str) -> str:
+    """Strong ETag: the page for one (scope, revision, variant) is byte-for-byte fixed."""
+    digest = hashlib.sha1(f"{_FORMAT}|{scope}|{revision}|{variant}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def matches(if_none_match: str | None, tag: str) -> bool:
+    """``If-None-Match`` evaluation (weak comparison, as RFC 9110 requires for it)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (c.strip().removeprefix("W/") for c in if_none_match.split(","))
+    return tag in candidates
+
+
+async def revision(scope: str) -> str | None:
+    """Current ``<epoch>.<counter>`` of ``scope`` (counter 0 if never bumped), or ``None`` if Redis is down."""
+    try:
+        # decode_responses: str, not bytes.
+        epoch, value = cast("list[str | None]", await redis_client.mget(_EPOCH_KEY, _rev_key(scope)))
+        if epoch is None:
+            # NX: concurrent first readers agree on whichever nonce landed.
+            await redis_client.set(_EPOCH_KEY, secrets.token_hex(8), nx=True)
+            epoch = cast("str | None", await redis_client.get(_EPOCH_KEY))
+    except Exception as exc:
+        logger.warning("catalog_revision_unavailable", error=str(exc), scope=scope)
+        return None
+    return f"{epoch}.{int(value or 0)}"
+
+
+async def get_page(scope: str, revision: str, variant: str) -> str | None:
+    try:
+        # decode_responses: str, not bytes.
+        return cast("str | None", await redis_client.get(_page_key(scope, revision, variant)))
+    except Exception as exc:
+        logger.warning("catalog_page_cache_failed", error=str(exc), scope=scope)
+        return None
+
+
+async def put_page(scope: str, revision: str, variant: str, body: str) -> None:
+    try:
+        await redis_client.set(_page_key(scope, revision, variant), body, ex=settings.CATALOG_PAGE_TTL_SECONDS)
+    except Exception as exc:
+        logger.warning("catalog_page_cache_failed", error=str(exc), scope=scope)
+
+
+async def advance(product_ids: Iterable[uuid.UUID], distributor_ids: Iterable[uuid.UUID | None]) -> None:
+    """Bump every scope a change to these products is visible in, in one round trip; errors propagate."""
+    scopes = {CATALOG}
+    scopes.update(product_scope(pid) for pid in product_ids)
+    scopes.update(distributor_scope(did) for did in distributor_ids if did is not None)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for scope in scopes:
+            pipe.incr(_rev_key(scope))
+        await pipe.execute()
+
+
+async def bump(product_ids: Iterable[uuid.UUID], distributor_ids: Iterable[uuid.UUID | None]) -> None:
+    """Like ``advance``, but failures are logged, never raised.
+
+    The ``product.changed`` outbox handler advances the same counters, so a
+    bump lost here only delays revalidation until the dispatcher catches up.
+    """
+    try:
+        await advance(product_ids, distributor_ids)
+    except Exception as exc:
+        logger.warning("catalog_revision_bump_failed", error=str(exc))
@@ -43,6 +43,11 @@ COPY: dict[str, dict[str, str]] = {
         "am": "\U0001f4c2 \u121d\u12f5\u1266\u127d:\n1\ufe0f\u20e3 \u1218\u1320\u1326\u127d\n2\ufe0f\u20e3 \u1245\u122d\u1235\n3\ufe0f\u20e3 \u12e8\u1260\u1275 \u12d5\u1243\u12ce\u127d\n4\ufe0f\u20e3 \u12e8\u130d\u120d \u1295\u133d\u1205\u1293\n5\ufe0f\u20e3 \u1325\u122b\u1325\u122c \u12a5\u1293 \u12cb\u1293 \u121d\u130d\u1266\u127d\n\n\u1241\u1325\u122d \u12ed\u120b\u12a9\u1362",
         "om": "\U0001f4c2 Ramaddii:\n1\ufe0f\u20e3 Dhugaatii\n2\ufe0f\u20e3 Nyaata salphaa\n3\ufe0f\u20e3 Meeshaa manaa\n4\ufe0f\u20e3 Kunuunsa dhuunfaa\n5\ufe0f\u20e3 Midhaani fi bu\u2019uuraa\n\nLakkoofsa ergaa.",
     },
+    "category_menu": {
+        "en": "\U0001f4c2 Categories:\n{categories}\n\nReply with a number.",
+        "am": "\U0001f4c2 \u121d\u12f5\u1266\u127d:\n{categories}\n\n\u1241\u1325\u122d \u12ed\u120b\u12a9\u1362",
+        "om": "\U0001f4c2 Ramaddii:\n{categories}\n\nLakkoofsa ergaa.",
+    },
     "cart_summary": {
         "en": "\U0001f6d2 Your cart:\n{items}\nTotal: ETB {total}\n\n\u2705 CHECKOUT \u2014 Place order\n\u270f\ufe0f EDIT \u2014 Change items\n\u274c CANCEL \u2014 Clear cart",
         "am": "\U0001f6d2 \u130b\u122a\u12ce:\n{items}\n\u12f5\u121d\u122d: \u1265\u122d {total}\n\n\u2705 \u12ad\u134d\u12eb \u2014 \u1275\u12d5\u12db\u12dd \u12eb\u1235\u1308\u1261\n\u270f\ufe0f \u12a0\u122d\u121d \u2014 \u12ed\u1240\u12ed\u1229\n\u274c \u12ed\u1245\u122d \u2014 \u130b\u122a \u12eb\u1325\u1349",
@@ -63,11 +68,71 @@ COPY: dict[str, dict[str, str]] = {
         "am": "\u26a0\ufe0f \u12ed\u1245\u122d\u1273\u1363 \u12a0\u120d\u1308\u1263\u129d\u121d\u1362\n\u12ed\u121e\u12ad\u1229: \u1275\u12d5\u12db\u12dd\u1363 \u12f5\u1308\u121d\u1363 \u12ad\u122c\u12f2\u1275\u1363 \u12c8\u12ed\u121d \u12a5\u1308\u12db\u1362",
         "om": "\u26a0\ufe0f Dhiifama, hin hubanne.\nYaali: Ajaja, Irra deebi\u2019i, Liqii, ykn Gargaarsa.",
     },
+    "reorder_empty": {
+        "en": "\U0001f4cb No previous order found. Let\u2019s start a new one.",
+        "am": "\U0001f4cb \u12eb\u1208\u1348 \u1275\u12d5\u12db\u12dd \u12a0\u120d\u1270\u1308\u1298\u121d\u1362 \u12a0\u12f2\u1235 \u1275\u12d5\u12db\u12dd \u12a5\u1295\u1300\u121d\u122d\u1362",
+        "om": "\U0001f4cb Ajajni darbe hin argamne. Ajaja haaraa haa jalqabnu.",
+    },
+    "order_status_update": {
+        "en": "\U0001f514 Order {code} \u2014 {status}",
+        "am": "\U0001f514 \u1275\u12d5\u12db\u12dd {code} \u2014 {status}",
+        "om": "\U0001f514 Ajaja {code} \u2014 {status}",
+    },
+    "order_status_updates": {
+        "en": "\U0001f514 {count} orders updated:\n{lines}",
+        "am": "\U0001f514 {count} \u1275\u12d5\u12db\u12de\u127d \u1270\u12d8\u121d\u1290\u12cb\u120d:\n{lines}",
+        "om": "\U0001f514 Ajajoota {count} haaromfamaniiru:\n{lines}",
+    },
+    "order_status_line": {
+        "en": "\u2022 {code} \u2014 {status}",
+        "am": "\u2022 {code} \u2014 {status}",
+        "om": "\u2022 {code} \u2014 {status}",
+    },
+    "status_confirmed": {
+        "en": "\u2705 confirmed",
+        "am": "\u2705 \u1270\u1228\u130b\u130d\u1327\u120d",
+        "om": "\u2705 mirkanaa\u2019eera",
+    },
+    "status_shipped": {
+        "en": "\U0001f69a on its way",
+        "am": "\U0001f69a \u1270\u120d\u12b3\u120d",
+        "om": "\U0001f69a karaa irra jira",
+    },
+    "status_delivered": {
+        "en": "\U0001f4e6 delivered",
+        "am": "\U0001f4e6 \u12f0\u122d\u1237\u120d",
+        "om": "\U0001f4e6 ga\u2019eera",
+    },
+    "status_cancelled": {
+        "en": "\u274c cancelled",
+        "am": "\u274c \u1270\u1230\u122d\u12df\u120d",
+        "om": "\u274c haqameera",
+    },
     "payment_choice": {
         "en": "Pay with:\n1\ufe0f\u20e3 Telebirr / M-Pesa (Pay Now)\n2\ufe0f\u20e3 BNPL (Buy Now, Pay Later)",
         "am": "\u12ad\u134d\u12eb:\n1\ufe0f\u20e3 \u1274\u120c\u1265\u122d / \u12a4\u121d-\u1354\u1233 (\u12a0\u1201\u1295 \u12ed\u12ad\u1348\u1209)\n2\ufe0f\u20e3 \u1283\u120b \u12ed\u12ad\u1348\u1209 (BNPL)",
         "om": "Kafaltii:\n1\ufe0f\u20e3 Telebirr / M-Pesa (Amma kafali)\n2\ufe0f\u20e3 BNPL (Amma fudhu, booda kafali)",
     },
+    "bnpl_declined": {
+        "en": "\U0001f4b3 Not enough credit for BNPL on this order. Reply 1 to Pay Now.",
+        "am": "\U0001f4b3 \u1208\u12da\u1205 \u1275\u12d5\u12db\u12dd \u1260\u1242 \u12ad\u122c\u12f2\u1275 \u12e8\u1208\u121d\u1362 \u12a0\u1201\u1295 \u1208\u1218\u12ad\u1348\u120d 1 \u12ed\u120b\u12a9\u1362",
+        "om": "\U0001f4b3 Ajaja kanaaf liqiin gahaan hin jiru. Amma kafaluuf 1 ergaa.",
+    },
+    "order_unlinked": {
+        "en": "\u26a0\ufe0f This chat isn't linked to a SoukSync shop yet, so we can't place orders from it. Please contact support.",
+        "am": "\u26a0\ufe0f \u12ed\u1205 \u127b\u1275 \u1308\u1293 \u12a8SoukSync \u1231\u1245 \u130b\u122d \u12a0\u120d\u1270\u1308\u1293\u1298\u121d\u1364 \u1275\u12d5\u12db\u12dd \u121b\u1235\u1308\u1263\u1275 \u12a0\u12ed\u127b\u120d\u121d\u1362 \u12a5\u1263\u12ad\u12ce \u12f5\u130b\u134d \u1230\u132a\u1295 \u12eb\u1290\u130b\u130d\u1229\u1362",
+        "om": "\u26a0\ufe0f Chaatiin kun ammallee suuqii SoukSync waliin hin walqabatne, kanaaf ajajni hin galu. Maaloo deeggarsa qunnamaa.",
+    },
+    "order_unavailable": {
+        "en": "\u26a0\ufe0f Some items in your cart aren't available right now. Send Order to start again.",
+        "am": "\u26a0\ufe0f \u1260\u130b\u122a\u12ce \u12cd\u1235\u1325 \u12eb\u1209 \u12a0\u1295\u12f3\u1295\u12f5 \u12d5\u1243\u12ce\u127d \u12a0\u1201\u1295 \u12a0\u12ed\u1308\u1299\u121d\u1362 \u12a5\u1295\u12f0\u1308\u1293 \u1208\u1218\u1300\u1218\u122d \u1275\u12d5\u12db\u12dd \u12ed\u120b\u12a9\u1362",
+        "om": "\u26a0\ufe0f Meeshaaleen gaarii keessanii tokko tokko amma hin jiran. Irra deebiin jalqabuuf Ajaja ergaa.",
+    },
+    "order_failed": {
+        "en": "\u26a0\ufe0f We couldn't place your order. Reply 1 or 2 to try again.",
+        "am": "\u26a0\ufe0f \u1275\u12d5\u12db\u12dd\u12ce\u1295 \u121b\u1235\u1308\u1263\u1275 \u12a0\u120d\u1270\u127b\u1208\u121d\u1362 \u12a5\u1295\u12f0\u1308\u1293 \u1208\u1218\u121e\u12a8\u122d 1 \u12c8\u12ed\u121d 2 \u12ed\u120b\u12a9\u1362",
+        "om": "\u26a0\ufe0f Ajaja keessan galchuu hin dandeenye. Irra deebiin yaaluuf 1 ykn 2 ergaa.",
+    },
 }
 
 
@@ -0,0 +1,88 @@
+"""Streaming CSV / NDJSON encoders for bulk exports.
+
+Rows arrive in partitions from a server-side cursor and leave as byte
+chunks, so memory stays bounded by one partition regardless of row count.
+"""
+
+from __future__ import annotations
+
+import csv
+import enum
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Sequence
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+async def encode_csv(
+    partitions: AsyncIterator[Sequence[Any]], fields: Sequence[str]
+) -> AsyncIterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(fields)
+    yield buf.getvalue().encode()
+    async for rows in partitions:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows([_plain(row[f]) for f in fields] for row in rows)
+        yield buf.getvalue().encode()
+
+
+async def encode_ndjson(
+    partitions: AsyncIterator[Sequence[Any]], fields: Sequence[str]
+) -> AsyncIterator[bytes]:
+    async for rows in partitions:
+        yield "".join(
+            json.dumps({f: _plain(row[f]) for f in fields}, ensure_ascii=False) + "\n" for row in rows
+        ).encode()
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 → gzip container
+    async for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def export_response(
+    partitions: AsyncIterator[Sequence[Any]],
+    fields: Sequence[str],
+    *,
+    basename: str,
+    fmt: str,
+    compress: bool = False,
+) -> StreamingResponse:
+    chunks = encode_csv(partitions, fields) if fmt == "csv" else encode_ndjson(partitions, fields)
+    filename = f"{basename}.{fmt}"
+    media_type = MEDIA_TYPES[fmt]
+    if compress:
+        chunks = gzip_chunks(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,175 @@
+"""Idempotency-Key handling for retried writes.
+
+A key is scoped to the caller and remembers the request fingerprint plus the
+response it produced. The same entry doubles as the in-flight lock: it is
+written with a short TTL before the handler runs and replaced with the full
+response (and the long TTL) afterwards. Redis is the primary store; if it is
+unreachable the request falls back to the ``idempotency_keys`` table.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import asdict, dataclass
+from typing import Any, Protocol
+
+import structlog
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.exceptions import SoukSyncError
+from app.db.database import async_session_factory
+from app.db.redis import redis_client
+from app.repositories.idempotency_repo import IdempotencyRepository
+
+logger = structlog.get_logger(__name__)
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+_ROUTES = tuple(
+    (method, re.compile(f"^{re.escape(settings.API_PREFIX)}{path}$"))
+    for method, path in (
+        ("POST", "/orders"),
+        ("POST", "/orders/reorder"),
+        ("POST", "/orders/status:bulk"),
+        ("PUT", r"/orders/[^/]+/status"),
+        ("POST", "/products"),
+    )
+)
+
+
+class IdempotencyConflictError(SoukSyncError):
+    def __init__(self, message: str = "A request with this Idempotency-Key is still in progress") -> None:
+        super().__init__(message=message, status_code=409)
+
+
+class IdempotencyMismatchError(SoukSyncError):
+    def __init__(self) -> None:
+        super().__init__(message="Idempotency-Key was already used with a different request", status_code=422)
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    fingerprint: str
+    status_code: int | None = None  # None while the original request is in flight
+    body: str | None = None
+    content_type: str | None = None
+    # Every response header but Content-Length.
+    headers: tuple[tuple[str, str], ...] = ()
+
+    def dumps(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def loads(cls, raw: str | bytes) -> StoredResponse:
+        fields: dict[str, Any] = json.loads(raw)
+        fields["headers"] = tuple((name, value) for name, value in fields["headers"])
+        return cls(**fields)
+
+
+class IdempotencyStore(Protocol):
+    async def get(self, key: str) -> StoredResponse | None: ...
+    async def lock(self, key: str, fingerprint: str) -> bool: ...
+    async def save(self, key: str, record: StoredResponse) -> None: ...
+    async def release(self, key: str) -> None: ...
+
+
+def applies(method: str, path: str) -> bool:
+    return any(method == m and pattern.match(path) for m, pattern in _ROUTES)
+
+
+def fingerprint(method: str, path: str, body: bytes) -> str:
+    digest = hashlib.sha256(f"{method} {path}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+class RedisIdempotencyStore:
+    @staticmethod
+    def _key(key: str) -> str:
+        return f"souksync:idempotency:{key}"
+
+    async def get(self, key: str) -> StoredResponse | None:
+        raw = await redis_client.get(self._key(key))
+        return StoredResponse.loads(raw) if raw else None
+
+    async def lock(self, key: str, fingerprint: str) -> bool:
+        marker = StoredResponse(fingerprint).dumps()
+        return bool(await redis_client.set(self._key(key), marker, nx=True, ex=settings.IDEMPOTENCY_LOCK_SECONDS))
+
+    async def save(self, key: str, record: StoredResponse) -> None:
+        await redis_client.set(self._key(key), record.dumps(), ex=settings.IDEMPOTENCY_TTL_SECONDS)
+
+    async def release(self, key: str) -> None:
+        await redis_client.delete(self._key(key))
+
+
+class DatabaseIdempotencyStore:
+    async def get(self, key: str) -> StoredResponse | None:
+        async with async_session_factory() as session:
+            row = await IdempotencyRepository(session).get(key)
+        if row is None:
+            return None
+        headers = tuple((name, value) for name, value in row.response_headers)
+        return StoredResponse(row.fingerprint, row.status_code, row.response_body, row.content_type, headers)
+
+    async def lock(self, key: str, fingerprint: str) -> bool:
+        async with async_session_factory() as session:
+            locked = await IdempotencyRepository(session).lock(key, fingerprint, settings.IDEMPOTENCY_LOCK_SECONDS)
+            await session.commit()
+        return locked
+
+    async def save(self, key: str, record: StoredResponse) -> None:
+        if record.status_code is None or record.body is None:
+            raise ValueError("Only a finished response can be saved")
+        async with async_session_factory() as session:
+            await IdempotencyRepository(session).save(
+                key,
+                status_code=record.status_code,
+                body=record.body,
+                content_type=record.content_type,
+                headers=record.headers,
+                ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+            )
+            await session.commit()
+
+    async def release(self, key: str) -> None:
+        async with async_session_factory() as session:
+            await IdempotencyRepository(session).release(key)
+            await session.commit()
+
+
+redis_store = RedisIdempotencyStore()
+database_store = DatabaseIdempotencyStore()
+
+
+async def _begin_on(store: IdempotencyStore, key: str, fp: str) -> StoredResponse | None:
+    existing = await store.get(key)
+    if existing is None:
+        if await store.lock(key, fp):
+            return None
+        # Lost the race to a concurrent duplicate.
+        existing = await store.get(key)
+        if existing is None:
+            raise IdempotencyConflictError
+    if existing.fingerprint != fp:
+        raise IdempotencyMismatchError
+    if existing.status_code is None:
+        raise IdempotencyConflictError
+    return existing
+
+
+async def begin(key: str, fp: str) -> tuple[IdempotencyStore, StoredResponse | None]:
+    """Return the store holding ``key`` and a response to replay, if any.
+
+    ``None`` means the caller now owns the in-flight lock and must ``save``
+    or ``release`` it on the returned store.
+    """
+    try:
+        return redis_store, await _begin_on(redis_store, key, fp)
+    except RedisError as exc:
+        logger.warning("idempotency_redis_unavailable", error=str(exc))
+    return database_store, await _begin_on(database_store, key, fp)
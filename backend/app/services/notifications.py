@@ -0,0 +1,112 @@
+"""Order status notifications to kiosk owners over Telegram.
+
+Fed by the outbox dispatcher (see ``app.tasks.handlers``), never by the
+request path: a status change only stages an outbox row. One claimed batch
+becomes at most one message per chat, so a bulk update of fifty orders is
+one "50 orders updated" message, not fifty pings.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import structlog
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.snowflake import format_code
+from app.db.database import async_session_factory
+from app.models.order import Order, OrderStatus
+from app.models.user import User
+from app.services import telegram_bot
+from app.services.copy import t
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = structlog.get_logger(__name__)
+
+# Statuses a kiosk owner hears about; ``pending`` is their own doing.
+NOTIFY_STATUSES = frozenset(
+    {OrderStatus.CONFIRMED.value, OrderStatus.SHIPPED.value, OrderStatus.DELIVERED.value, OrderStatus.CANCELLED.value}
+)
+
+
+@dataclass(frozen=True)
+class StatusNotice:
+    chat_id: int
+    lang: str
+    code: str
+    status: str
+
+
+def render(lang: str, notices: list[StatusNotice]) -> str:
+    """One chat's message: a single update, or a list when there are several."""
+    if len(notices) == 1:
+        (notice,) = notices
+        return t("order_status_update", lang, code=notice.code, status=t(f"status_{notice.status}", lang))
+    lines = "\n".join(
+        t("order_status_line", lang, code=n.code, status=t(f"status_{n.status}", lang)) for n in notices
+    )
+    return t("order_status_updates", lang, count=len(notices), lines=lines)
+
+
+async def _recipients(session: AsyncSession, order_ids: list[uuid.UUID]) -> dict[uuid.UUID, Any]:
+    """Order code plus the owner's chat and language, for owners reachable on Telegram."""
+    stmt = (
+        select(Order.id, Order.code, User.telegram_chat_id, User.language_pref)
+        .join(User, User.id == Order.user_id)
+        .where(Order.id.in_(order_ids), User.telegram_chat_id.isnot(None), User.is_active.is_(True))
+    )
+    return {row.id: row for row in (await session.execute(stmt)).all()}
+
+
+async def collect(session: AsyncSession, payloads: list[dict[str, Any]]) -> dict[int, list[StatusNotice]]:
+    """Group ``order.status_changed`` payloads into notices per chat.
+
+    An order that changed twice within the batch is reported once, at its
+    latest status.
+    """
+    latest: dict[uuid.UUID, str] = {}
+    for payload in payloads:
+        order_id = uuid.UUID(payload["order_id"])
+        latest.pop(order_id, None)  # keep batch order by last change
+        latest[order_id] = payload["status"]
+    latest = {oid: status for oid, status in latest.items() if status in NOTIFY_STATUSES}
+    if not latest:
+        return {}
+
+    recipients = await _recipients(session, list(latest))
+    by_chat: dict[int, list[StatusNotice]] = defaultdict(list)
+    for order_id, status in latest.items():
+        row = recipients.get(order_id)
+        if row is not None:
+            by_chat[row.telegram_chat_id].append(
+                StatusNotice(row.telegram_chat_id, row.language_pref, format_code(row.code), status)
+            )
+    return dict(by_chat)
+
+
+async def notify_status_changes(payloads: list[dict[str, Any]]) -> None:
+    """Send one message per chat, at most ``TELEGRAM_NOTIFY_CONCURRENCY`` in flight.
+
+    Telegram failures are logged by ``telegram_bot`` and not retried:
+    retrying the batch would repeat messages to every chat that did get one.
+    """
+    async with async_session_factory() as session:
+        by_chat = await collect(session, payloads)
+    if not by_chat:
+        return
+
+    gate = asyncio.Semaphore(settings.TELEGRAM_NOTIFY_CONCURRENCY)
+
+    async def _send(chat_id: int, notices: list[StatusNotice]) -> None:
+        async with gate:
+            await telegram_bot.send_message(chat_id, render(notices[0].lang, notices))
+
+    await asyncio.gather(*(_send(chat_id, notices) for chat_id, notices in by_chat.items()))
+    logger.info("order_status_notified", chats=len(by_chat), orders=sum(map(len, by_chat.values())))
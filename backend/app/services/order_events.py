@@ -0,0 +1,111 @@
+"""Order event stream — Redis Streams fan-out for server-sent events.
+
+The outbox dispatcher appends ``order.created`` / ``order.status_changed``
+entries to one capped Redis stream. Every API worker tails the same stream, so a subscriber
+sees events no matter which worker handled the write. Stream entry IDs double
+as SSE event IDs, which turns Last-Event-ID resume into a plain XREAD.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, cast
+
+from app.core.config import settings
+from app.db.redis import redis_client
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from redis.typing import EncodableT, FieldT
+
+_STREAM_ID_RE = re.compile(r"^\d+-\d+$")
+
+
+@dataclass(frozen=True)
+class OrderEvent:
+    type: str
+    order_id: uuid.UUID
+    user_id: uuid.UUID
+    distributor_id: uuid.UUID
+    status: str
+
+    def to_fields(self) -> dict[FieldT, EncodableT]:
+        return {
+            "type": self.type,
+            "order_id": str(self.order_id),
+            "user_id": str(self.user_id),
+            "distributor_id": str(self.distributor_id),
+            "status": self.status,
+        }
+
+
+async def append(*events: OrderEvent) -> None:
+    """Append events to the stream in one round trip; errors propagate."""
+    if not events:
+        return
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for event in events:
+            pipe.xadd(
+                settings.ORDER_EVENTS_STREAM,
+                event.to_fields(),
+                maxlen=settings.ORDER_EVENTS_MAXLEN,
+                approximate=True,
+            )
+        await pipe.execute()
+
+
+def is_visible(
+    fields: dict[str, str],
+    *,
+    user_id: uuid.UUID | None = None,
+    distributor_id: uuid.UUID | None = None,
+) -> bool:
+    """Apply the same scoping as ``GET /orders``; no filters means admin."""
+    if distributor_id is not None and fields.get("distributor_id") != str(distributor_id):
+        return False
+    return not (user_id is not None and fields.get("user_id") != str(user_id))
+
+
+def format_sse(event_id: str, fields: dict[str, str]) -> str:
+    return f"id: {event_id}\nevent: {fields.get('type', 'message')}\ndata: {json.dumps(fields)}\n\n"
+
+
+async def _latest_id() -> str:
+    entries = await redis_client.xrevrange(settings.ORDER_EVENTS_STREAM, count=1)
+    return str(entries[0][0]) if entries else "0-0"
+
+
+async def subscribe(
+    *,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    last_event_id: str | None = None,
+    user_id: uuid.UUID | None = None,
+    distributor_id: uuid.UUID | None = None,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for visible events, with a comment heartbeat when idle.
+
+    Without a valid ``last_event_id`` the cursor starts at the current tail
+    rather than ``$`` so nothing is lost between successive XREAD calls.
+    """
+    cursor = last_event_id if last_event_id and _STREAM_ID_RE.match(last_event_id) else await _latest_id()
+    block_ms = settings.SSE_HEARTBEAT_SECONDS * 1000
+
+    yield f"retry: {block_ms}\n\n"
+    while not await is_disconnected():
+        # decode_responses: ids and fields come back as str.
+        response = cast(
+            "list[tuple[str, list[tuple[str, dict[str, str]]]]]",
+            await redis_client.xread({settings.ORDER_EVENTS_STREAM: cursor}, count=100, block=block_ms),
+        )
+        if not response:
+            yield ": heartbeat\n\n"
+            continue
+        for _stream, entries in response:
+            for entry_id, fields in entries:
+                cursor = entry_id
+                if is_visible(fields, user_id=user_id, distributor_id=distributor_id):
+                    yield format_sse(entry_id, fields)
@@ -0,0 +1,83 @@
+"""Per-process price books, recompiled only for the distributor whose lists changed.
+
+Each distributor has a price revision in Redis, bumped after every price
+list write (and again by the ``price_list.changed`` outbox handler). A
+worker keeps each compiled ``PriceBook`` with the revision it was built
+at. Pricing an order costs one GET to confirm the revision, then only
+in-memory lookups. On a revision change only that distributor's book is
+rebuilt, from one query. The revision is read before the tiers are
+loaded, so a concurrent write can leave newer tiers under an older
+revision, never the reverse. When Redis is unavailable, books are built
+fresh on every call.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import structlog
+from sqlalchemy import select
+
+from app.core.pricing import PriceBook
+from app.db.redis import redis_client
+from app.models.user import User
+from app.repositories.price_list_repo import PriceListRepository
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import Iterable
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = structlog.get_logger(__name__)
+
+_books: dict[uuid.UUID, tuple[int, PriceBook]] = {}
+
+
+def _rev_key(distributor_id: uuid.UUID) -> str:
+    return f"souksync:price-rev:{distributor_id}"
+
+
+async def revision(distributor_id: uuid.UUID) -> int | None:
+    """Current price revision (0 if never bumped), or ``None`` if Redis is down."""
+    try:
+        value = await redis_client.get(_rev_key(distributor_id))
+    except Exception as exc:
+        logger.warning("price_revision_unavailable", error=str(exc), distributor_id=str(distributor_id))
+        return None
+    return int(value or 0)
+
+
+async def advance(distributor_ids: Iterable[uuid.UUID]) -> None:
+    """Bump the revisions in one round trip; errors propagate."""
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for distributor_id in set(distributor_ids):
+            pipe.incr(_rev_key(distributor_id))
+        await pipe.execute()
+
+
+async def bump(distributor_ids: Iterable[uuid.UUID]) -> None:
+    """Like ``advance``, but failures are logged, never raised; the outbox handler catches up."""
+    distributor_ids = set(distributor_ids)
+    for distributor_id in distributor_ids:
+        _books.pop(distributor_id, None)
+    try:
+        await advance(distributor_ids)
+    except Exception as exc:
+        logger.warning("price_revision_bump_failed", error=str(exc))
+
+
+async def price_book(session: AsyncSession, distributor_id: uuid.UUID) -> PriceBook:
+    rev = await revision(distributor_id)
+    cached = _books.get(distributor_id)
+    if rev is not None and cached is not None and cached[0] == rev:
+        return cached[1]
+    book = PriceBook.compile(await PriceListRepository(session).active_tiers(distributor_id))
+    if rev is not None:
+        _books[distributor_id] = (rev, book)
+    return book
+
+
+async def segment_for_chat(session: AsyncSession, chat_id: int) -> str | None:
+    stmt = select(User.price_segment).where(User.telegram_chat_id == chat_id, User.is_active.is_(True))
+    return (await session.execute(stmt)).scalar_one_or_none()
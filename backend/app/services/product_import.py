@@ -0,0 +1,225 @@
+"""Streaming CSV / NDJSON product import.
+
+The upload is decoded and split into records chunk by chunk, so memory is
+bounded by one batch (``PRODUCT_IMPORT_BATCH_SIZE``) however large the file.
+Each record is validated with the ``ProductCreate`` rules; valid rows are
+upserted on SKU a batch at a time and committed per batch, so a bad row
+never costs the rows around it: rows naming an unknown distributor fail
+before the upsert, and a batch the database still rejects is rolled back
+and reported line by line. The mirror image of ``app.services.export``.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+import time
+import zlib
+from typing import TYPE_CHECKING, Any
+
+import structlog
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.models.user import User
+from app.repositories.product_repo import ProductRepository
+from app.schemas.product import ProductCreate, ProductImportError, ProductImportResponse
+from app.services import catalog_cache
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import AsyncIterator
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+Record = tuple[int, dict[str, Any] | None, str | None]  # (line, fields, parse error)
+
+_CSV_NULLABLE = ("category", "sku", "distributor_id")
+
+logger = structlog.get_logger(__name__)
+
+
+async def gunzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    decompressor = zlib.decompressobj(31)  # wbits=31 → gzip container
+    try:
+        async for chunk in chunks:
+            out = decompressor.decompress(chunk)
+            if out:
+                yield out
+        tail = decompressor.flush()
+    except zlib.error:
+        raise ValidationError("Request body is not valid gzip") from None
+    if tail:
+        yield tail
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode UTF-8 (BOM tolerated) and yield lines, newline kept, across chunk boundaries."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """One record per CSV row; quoted fields may span lines. Line numbers count the header as 1."""
+    header: list[str] | None = None
+    buffered = ""
+    line_no = start = 0
+    async for line in _lines(chunks):
+        line_no += 1
+        if not buffered:
+            start = line_no
+        buffered += line
+        if buffered.count('"') % 2:  # inside a quoted field: the record continues
+            continue
+        record, buffered = buffered, ""
+        if not record.strip():
+            continue
+        fields = next(csv.reader([record]))
+        if header is None:
+            header = [f.strip().lower() for f in fields]
+            continue
+        if len(fields) != len(header):
+            yield start, None, f"expected {len(header)} columns, got {len(fields)}"
+            continue
+        row: dict[str, Any] = dict(zip(header, fields))
+        for key in _CSV_NULLABLE:
+            if row.get(key) == "":
+                row[key] = None
+        yield start, row, None
+    if buffered.strip():
+        yield start, None, "unterminated quoted field"
+
+
+async def ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    line_no = 0
+    async for line in _lines(chunks):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_no, None, f"invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield line_no, None, "expected a JSON object"
+            continue
+        yield line_no, row, None
+
+
+def _describe(exc: PydanticValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc'])) or 'row'}: {e['msg']}" for e in exc.errors())
+
+
+class _Report:
+    def __init__(self) -> None:
+        self.received = self.inserted = self.updated = self.failed = 0
+        self.errors: list[ProductImportError] = []
+
+    def fail(self, line: int, sku: str | None, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.PRODUCT_IMPORT_MAX_ERRORS:
+            self.errors.append(ProductImportError(line=line, sku=sku, message=message))
+
+
+async def import_products(
+    session: AsyncSession,
+    records: AsyncIterator[Record],
+    *,
+    distributor_id: uuid.UUID | None,
+    restrict_to: uuid.UUID | None = None,
+) -> ProductImportResponse:
+    """Validate and upsert ``records``.
+
+    ``distributor_id`` fills rows that name none; with ``restrict_to`` set
+    (distributor callers) rows for any other distributor are rejected.
+    """
+    repo = ProductRepository(session)
+    report = _Report()
+    batch: dict[str, tuple[int, ProductCreate]] = {}
+    started = time.perf_counter()
+
+    async def _flush() -> None:
+        if not batch:
+            return
+        named = {product.distributor_id for _, product in batch.values()}
+        known = set((await session.execute(select(User.id).where(User.id.in_(named)))).scalars())
+        for sku, (line, product) in list(batch.items()):
+            if product.distributor_id not in known:
+                report.fail(line, sku, "distributor_id: no such distributor")
+                del batch[sku]
+        if not batch:
+            return
+        try:
+            outcome = await repo.upsert_products([product for _, product in batch.values()])
+            await session.commit()
+        except DBAPIError as exc:
+            await session.rollback()
+            logger.warning("product_import_batch_failed", rows=len(batch), error=str(exc.orig))
+            for sku, (line, _) in batch.items():
+                report.fail(line, sku, "rejected by the database")
+            batch.clear()
+            return
+        # Once per batch; the outbox repeats it per product as the durable path.
+        await catalog_cache.bump(
+            [product_id for product_id, _ in outcome.values()],
+            {product.distributor_id for _, product in batch.values()},
+        )
+        for sku, (line, _) in batch.items():
+            result = outcome.get(sku)
+            if result is None:
+                report.fail(line, sku, "SKU belongs to another distributor")
+            elif result[1]:
+                report.inserted += 1
+            else:
+                report.updated += 1
+        batch.clear()
+
+    async for line, row, error in records:
+        report.received += 1
+        if row is None:
+            report.fail(line, None, error or "empty record")
+            continue
+        if row.get("distributor_id") is None and distributor_id is not None:
+            row["distributor_id"] = distributor_id
+        sku = str(row["sku"]) if row.get("sku") is not None else None
+        try:
+            product = ProductCreate.model_validate(row)
+        except PydanticValidationError as exc:
+            report.fail(line, sku, _describe(exc))
+            continue
+        if product.sku is None:
+            report.fail(line, None, "sku: required for import")
+            continue
+        if restrict_to is not None and product.distributor_id != restrict_to:
+            report.fail(line, product.sku, "distributor_id: cannot import for another distributor")
+            continue
+        # A later row for the same SKU wins; the SKU is counted once, from the upsert.
+        batch[product.sku] = (line, product)
+        if len(batch) >= settings.PRODUCT_IMPORT_BATCH_SIZE:
+            await _flush()
+    await _flush()
+
+    elapsed = time.perf_counter() - started
+    return ProductImportResponse(
+        received=report.received,
+        inserted=report.inserted,
+        updated=report.updated,
+        failed=report.failed,
+        errors=report.errors,
+        errors_truncated=report.failed > len(report.errors),
+        elapsed_ms=round(elapsed * 1000, 1),
+        rows_per_second=round(report.received / elapsed, 1) if elapsed > 0 else 0.0,
+    )
@@ -0,0 +1,86 @@
+"""Last-order templates for one-tap reorder.
+
+Every order create overwrites the kiosk's template in Redis (via the
+outbox), so a reorder is one GET plus one batched product lookup for
+current prices. A cache miss (eviction, Redis down) falls back to the
+newest order in the database and re-warms the cache.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import structlog
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.redis import redis_client
+from app.models.user import User
+from app.repositories.order_read_repo import OrderReadRepository
+from app.repositories.product_repo import ProductRepository
+from app.schemas.order import OrderCreate, OrderTemplate
+
+if TYPE_CHECKING:
+    import uuid
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.models.product import Product
+
+logger = structlog.get_logger(__name__)
+
+
+def _key(user_id: uuid.UUID) -> str:
+    return f"souksync:last-order:{user_id}"
+
+
+async def cache_template(user_id: uuid.UUID, template: OrderTemplate) -> None:
+    """Cache ``template`` as the user's last order; errors propagate."""
+    await redis_client.set(_key(user_id), template.model_dump_json(), ex=settings.LAST_ORDER_TTL_SECONDS)
+
+
+async def remember(user_id: uuid.UUID, template: OrderTemplate) -> None:
+    """Like ``cache_template``, but failures are logged, never raised."""
+    try:
+        await cache_template(user_id, template)
+    except Exception as exc:
+        logger.warning("last_order_cache_failed", error=str(exc), user_id=str(user_id))
+
+
+async def user_id_for_chat(session: AsyncSession, chat_id: int) -> uuid.UUID | None:
+    stmt = select(User.id).where(User.telegram_chat_id == chat_id, User.is_active.is_(True))
+    return (await session.execute(stmt)).scalar_one_or_none()
+
+
+async def last_template(session: AsyncSession, user_id: uuid.UUID) -> OrderTemplate | None:
+    try:
+        cached = await redis_client.get(_key(user_id))
+    except Exception as exc:
+        logger.warning("last_order_cache_failed", error=str(exc), user_id=str(user_id))
+        cached = None
+    if cached:
+        return OrderTemplate.model_validate_json(cached)
+
+    template = await OrderReadRepository(session).last_order_template(user_id)
+    if template is not None:
+        await remember(user_id, template)
+    return template
+
+
+@dataclass
+class RepricedOrder:
+    """A template re-priced against the current catalog."""
+
+    order: OrderCreate | None
+    products: dict[uuid.UUID, Product]
+    skipped: list[uuid.UUID] = field(default_factory=list)
+
+
+async def reprice(session: AsyncSession, template: OrderTemplate) -> RepricedOrder:
+    """Look up every line's product in one query; inactive or deleted products are skipped."""
+    products = await ProductRepository(session).get_active_products([i.product_id for i in template.items])
+    items = [i for i in template.items if i.product_id in products]
+    skipped = [i.product_id for i in template.items if i.product_id not in products]
+    order = OrderCreate(items=items, distributor_id=template.distributor_id) if items else None
+    return RepricedOrder(order=order, products=products, skipped=skipped)
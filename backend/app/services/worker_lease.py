@@ -0,0 +1,133 @@
+"""Order-code worker ids leased from Redis.
+
+Each process that mints order codes (``app.core.snowflake``) needs a worker
+id no other live process holds. Unless ``ORDER_CODE_WORKER_ID`` pins one,
+the process claims the first free ``souksync:order-code-worker:{n}`` key with
+``SET NX`` and keeps renewing it. If a renewal is refused, or Redis stays
+unreachable long enough that the key may have expired, minting stops until
+a fresh id is leased: a 500 on checkout is better than a duplicate code.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import structlog
+from redis.exceptions import RedisError
+
+from app.core import snowflake
+from app.core.config import settings
+from app.db.redis import redis_client
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+logger = structlog.get_logger(__name__)
+
+_KEY = "souksync:order-code-worker:{}"
+
+# Extend or delete the key only while it still holds our token.
+_RENEW = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class WorkerIdsExhaustedError(RuntimeError):
+    pass
+
+
+async def acquire(token: str) -> int:
+    """Claim the lowest free worker id for ``token``."""
+    ttl = settings.ORDER_CODE_WORKER_LEASE_SECONDS
+    # MAX_WORKER_ID itself is reserved for codes backfilled by migration 0006.
+    for worker_id in range(snowflake.MAX_WORKER_ID):
+        if await redis_client.set(_KEY.format(worker_id), token, nx=True, ex=ttl):
+            return worker_id
+    raise WorkerIdsExhaustedError("Every order-code worker id is leased")
+
+
+async def renew(worker_id: int, token: str) -> bool:
+    ttl = settings.ORDER_CODE_WORKER_LEASE_SECONDS
+    return bool(await redis_client.eval(_RENEW, 1, _KEY.format(worker_id), token, ttl))
+
+
+async def release(worker_id: int, token: str) -> None:
+    await redis_client.eval(_RELEASE, 1, _KEY.format(worker_id), token)
+
+
+@dataclass
+class _Lease:
+    token: str
+    worker_id: int | None
+
+
+async def _keep(lease: _Lease) -> None:
+    """Renew the lease a few times per TTL; stop minting as soon as it can't be trusted."""
+    ttl = settings.ORDER_CODE_WORKER_LEASE_SECONDS
+    interval = ttl / 3
+    renewed_at = time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if lease.worker_id is None:
+                lease.worker_id = await acquire(lease.token)
+                snowflake.configure(lease.worker_id)
+                logger.info("order_code_worker_leased", worker_id=lease.worker_id)
+            elif not await renew(lease.worker_id, lease.token):
+                _lose(lease)
+                continue
+            renewed_at = time.monotonic()
+        except (RedisError, WorkerIdsExhaustedError) as exc:
+            logger.warning("order_code_worker_renew_failed", worker_id=lease.worker_id, error=str(exc))
+            # The key may expire before the next attempt lands; another process could then take it.
+            if lease.worker_id is not None and time.monotonic() - renewed_at + interval >= ttl:
+                _lose(lease)
+
+
+def _lose(lease: _Lease) -> None:
+    logger.error("order_code_worker_lease_lost", worker_id=lease.worker_id)
+    snowflake.configure(None)
+    lease.worker_id = None
+
+
+@asynccontextmanager
+async def order_code_worker() -> AsyncIterator[None]:
+    """Configure ``app.core.snowflake`` for the life of the block.
+
+    Raises at entry when no id can be leased, so the process fails to start
+    rather than minting codes another process may also mint.
+    """
+    if settings.ORDER_CODE_WORKER_ID is not None:
+        snowflake.configure(settings.ORDER_CODE_WORKER_ID)
+        yield
+        return
+
+    lease = _Lease(uuid.uuid4().hex, None)
+    lease.worker_id = await acquire(lease.token)
+    snowflake.configure(lease.worker_id)
+    logger.info("order_code_worker_leased", worker_id=lease.worker_id)
+    keeper = asyncio.create_task(_keep(lease))
+    try:
+        yield
+    finally:
+        keeper.cancel()
+        snowflake.configure(None)
+        if lease.worker_id is not None:
+            try:
+                await release(lease.worker_id, lease.token)
+            except RedisError as exc:
+                logger.warning("order_code_worker_release_failed", worker_id=lease.worker_id, error=str(exc))
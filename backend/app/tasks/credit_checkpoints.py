@@ -0,0 +1,43 @@
+"""Credit balance compaction: checkpoint every balance that moved since its last checkpoint.
+
+Each run verifies the balance snapshots against the ledger entries added
+since the previous checkpoint (repairing any drift) and records a new
+checkpoint, so the next run starts from there. Run it periodically:
+
+    python -m app.tasks.credit_checkpoints --batch 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from app.db.database import async_session_factory, engine
+from app.repositories.credit_repo import CheckpointResult, CreditRepository
+
+
+async def checkpoint_all(batch: int) -> CheckpointResult:
+    """Work through every due profile, one committed batch at a time."""
+    checkpointed = repaired = 0
+    while True:
+        async with async_session_factory() as session:
+            result = await CreditRepository(session).checkpoint_balances(limit=batch)
+            await session.commit()
+        checkpointed += result.checkpointed
+        repaired += result.repaired
+        if result.checkpointed < batch:
+            return CheckpointResult(checkpointed, repaired)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Checkpoint credit balances.")
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    result = await checkpoint_all(args.batch)
+    await engine.dispose()
+    print(f"Checkpointed {result.checkpointed} profile(s), repaired {result.repaired}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
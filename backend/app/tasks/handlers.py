@@ -0,0 +1,71 @@
+"""Outbox handlers. Each must be idempotent: delivery is at least once."""
+
+from __future__ import annotations
+
+import uuid
+from typing import Any
+
+from app.db.database import async_session_factory
+from app.models.outbox import ORDER_CREATED, ORDER_STATUS_CHANGED, PRICE_LIST_CHANGED, PRODUCT_CHANGED
+from app.repositories.analytics_repo import AnalyticsRepository
+from app.repositories.order_repo import change_from_payload
+from app.schemas.order import OrderItemCreate, OrderTemplate
+from app.services import catalog_cache, notifications, order_events, pricing, reorder
+from app.tasks.outbox import register, register_batch
+
+
+def _event(topic: str, payload: dict[str, Any]) -> order_events.OrderEvent:
+    return order_events.OrderEvent(
+        type=topic,
+        order_id=uuid.UUID(payload["order_id"]),
+        user_id=uuid.UUID(payload["user_id"]),
+        distributor_id=uuid.UUID(payload["distributor_id"]),
+        status=payload["status"],
+    )
+
+
+@register(ORDER_CREATED)
+async def stream_order_created(payload: dict[str, Any]) -> None:
+    await order_events.append(_event(ORDER_CREATED, payload))
+
+
+@register(ORDER_STATUS_CHANGED)
+async def stream_status_changed(payload: dict[str, Any]) -> None:
+    await order_events.append(_event(ORDER_STATUS_CHANGED, payload))
+
+
+@register(ORDER_CREATED)
+async def cache_last_order(payload: dict[str, Any]) -> None:
+    template = OrderTemplate(
+        order_id=payload["order_id"],
+        distributor_id=payload["distributor_id"],
+        items=[OrderItemCreate(**item) for item in payload["items"]],
+    )
+    await reorder.cache_template(uuid.UUID(payload["user_id"]), template)
+
+
+@register_batch(ORDER_STATUS_CHANGED)
+async def notify_kiosk_owners(payloads: list[dict[str, Any]]) -> None:
+    await notifications.notify_status_changes(payloads)
+
+
+@register_batch(ORDER_CREATED)
+@register_batch(ORDER_STATUS_CHANGED)
+async def roll_up_orders(payloads: list[dict[str, Any]]) -> None:
+    changes = [change_from_payload(p) for p in payloads]
+    async with async_session_factory() as session:
+        await AnalyticsRepository(session).record_status_changes(changes)
+        await session.commit()
+
+
+@register_batch(PRODUCT_CHANGED)
+async def advance_catalog_revisions(payloads: list[dict[str, Any]]) -> None:
+    await catalog_cache.advance(
+        [uuid.UUID(p["product_id"]) for p in payloads],
+        [uuid.UUID(p["distributor_id"]) for p in payloads if p.get("distributor_id")],
+    )
+
+
+@register_batch(PRICE_LIST_CHANGED)
+async def advance_price_revisions(payloads: list[dict[str, Any]]) -> None:
+    await pricing.advance(uuid.UUID(p["distributor_id"]) for p in payloads)
@@ -0,0 +1,201 @@
+"""Outbox dispatcher — delivers committed side effects to registered handlers.
+
+Writers stage ``outbox`` rows in the same transaction as the change itself
+(see ``OutboxRepository.add``), so a side effect exists if and only if its
+write committed. Dispatchers lease batches with ``FOR UPDATE SKIP LOCKED``;
+any number of them can run side by side, against Postgres alone.
+
+Delivery is at least once: a message whose handler fails is retried with
+exponential backoff. The message records which handlers already succeeded
+and a retry runs only the others, but a dispatcher that dies mid-batch
+loses that record, so handlers must still be idempotent.
+
+    python -m app.tasks.outbox run --concurrency 4
+    python -m app.tasks.outbox purge --days 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import random
+import signal
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from app.core.config import settings
+from app.db.database import async_session_factory, engine
+from app.repositories.analytics_repo import AnalyticsRepository
+from app.repositories.outbox_repo import OutboxRepository
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import Awaitable, Callable
+
+    from app.repositories.outbox_repo import ClaimedMessage
+
+    Handler = Callable[[dict[str, Any]], Awaitable[None]]
+    BatchHandler = Callable[[list[dict[str, Any]]], Awaitable[None]]
+
+logger = structlog.get_logger(__name__)
+
+_handlers: dict[str, list[Handler]] = defaultdict(list)
+_batch_handlers: dict[str, list[BatchHandler]] = defaultdict(list)
+
+
+def register(topic: str) -> Callable[[Handler], Handler]:
+    """Decorator: run the function for every message on ``topic``."""
+
+    def decorator(fn: Handler) -> Handler:
+        _handlers[topic].append(fn)
+        return fn
+
+    return decorator
+
+
+def register_batch(topic: str) -> Callable[[BatchHandler], BatchHandler]:
+    """Decorator: run the function once per claimed batch with all its ``topic`` payloads.
+
+    For handlers that coalesce (one notification per chat, say). If it
+    raises, it is retried for every message it was given; the messages'
+    other handlers are not.
+    """
+
+    def decorator(fn: BatchHandler) -> BatchHandler:
+        _batch_handlers[topic].append(fn)
+        return fn
+
+    return decorator
+
+
+def handler_name(fn: Callable[..., Awaitable[None]]) -> str:
+    """How ``OutboxMessage.handled`` refers to a handler."""
+    return f"{fn.__module__}.{fn.__qualname__}"
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Exponential with full jitter, capped at ``OUTBOX_BACKOFF_MAX_SECONDS``."""
+    ceiling = min(settings.OUTBOX_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), settings.OUTBOX_BACKOFF_MAX_SECONDS)
+    return random.uniform(ceiling / 2, ceiling)
+
+
+async def dispatch_batch() -> int:
+    """Claim one batch, run its handlers, record the outcome. Returns messages claimed."""
+    async with async_session_factory() as session:
+        repo = OutboxRepository(session)
+        claimed = await repo.claim(
+            limit=settings.OUTBOX_BATCH_SIZE,
+            lease_seconds=settings.OUTBOX_LEASE_SECONDS,
+            max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+        )
+        # Release the row locks now; the lease keeps other dispatchers off the batch.
+        await session.commit()
+
+        # Per (message, handler): a retry skips the handlers that already succeeded.
+        handled = {m.id: set(m.handled) for m in claimed}
+        failed: dict[uuid.UUID, Exception] = {}
+        for message in claimed:
+            for handler in _handlers.get(message.topic, ()):
+                name = handler_name(handler)
+                if name in handled[message.id]:
+                    continue
+                try:
+                    await handler(message.payload)
+                except Exception as exc:
+                    failed.setdefault(message.id, exc)
+                else:
+                    handled[message.id].add(name)
+
+        by_topic: dict[str, list[ClaimedMessage]] = defaultdict(list)
+        for message in claimed:
+            if message.topic in _batch_handlers:
+                by_topic[message.topic].append(message)
+        for topic, messages in by_topic.items():
+            for batch_handler in _batch_handlers[topic]:
+                name = handler_name(batch_handler)
+                pending = [m for m in messages if name not in handled[m.id]]
+                if not pending:
+                    continue
+                try:
+                    await batch_handler([m.payload for m in pending])
+                except Exception as exc:
+                    for m in pending:
+                        failed.setdefault(m.id, exc)
+                else:
+                    for m in pending:
+                        handled[m.id].add(name)
+
+        for message in claimed:
+            error = failed.get(message.id)
+            if error is None:
+                continue
+            dead = message.attempts >= settings.OUTBOX_MAX_ATTEMPTS
+            (logger.error if dead else logger.warning)(
+                "outbox_message_dead" if dead else "outbox_message_failed",
+                id=str(message.id),
+                topic=message.topic,
+                attempts=message.attempts,
+                error=repr(error),
+            )
+            await repo.reschedule(
+                message.id,
+                error=repr(error),
+                delay_seconds=backoff_seconds(message.attempts),
+                handled=sorted(handled[message.id]),
+            )
+        await repo.mark_processed([m.id for m in claimed if m.id not in failed])
+        await session.commit()
+    return len(claimed)
+
+
+async def run_dispatcher(stop: asyncio.Event) -> None:
+    """Drain while there is a backlog; otherwise poll every ``OUTBOX_POLL_SECONDS``."""
+    while not stop.is_set():
+        try:
+            claimed = await dispatch_batch()
+        except Exception as exc:
+            logger.exception("outbox_dispatch_failed", error=str(exc))
+            claimed = 0
+        if claimed < settings.OUTBOX_BATCH_SIZE:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), timeout=settings.OUTBOX_POLL_SECONDS)
+
+
+async def purge(days: int) -> int:
+    """Delete processed messages, and the rollup marks that guarded their redelivery."""
+    async with async_session_factory() as session:
+        removed = await OutboxRepository(session).purge_processed(datetime.timedelta(days=days))
+        await AnalyticsRepository(session).purge_marks(datetime.timedelta(days=days))
+        await session.commit()
+    return removed
+
+
+async def main() -> None:
+    import app.tasks.handlers  # noqa: F401 — registers handlers
+
+    parser = argparse.ArgumentParser(description="Outbox dispatcher.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="Dispatch until SIGINT/SIGTERM.")
+    run.add_argument("--concurrency", type=int, default=1, help="Dispatcher loops in this process.")
+    purge_cmd = sub.add_parser("purge", help="Delete processed messages.")
+    purge_cmd.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.command == "purge":
+        print(f"Purged {await purge(args.days)} processed message(s)")
+    else:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        logger.info("outbox_dispatcher_started", concurrency=args.concurrency)
+        await asyncio.gather(*(run_dispatcher(stop) for _ in range(args.concurrency)))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
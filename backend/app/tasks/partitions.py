@@ -0,0 +1,167 @@
+"""Partition maintenance for ``orders`` / ``order_items``.
+
+``ensure`` pre-creates upcoming monthly partitions. ``archive`` writes every
+month older than the retention window to ``<ORDER_ARCHIVE_DIR>/<table>/YYYY-MM.ndjson.gz``
+and then detaches and drops it; ``restore`` loads one archived month back
+into a fresh partition. Analytics rollups are separate tables and keep
+covering archived months.
+
+    python -m app.tasks.partitions ensure --months 3
+    python -m app.tasks.partitions archive --retention-months 24
+    python -m app.tasks.partitions restore 2024-03
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import gzip
+import json
+import os
+import uuid
+from decimal import Decimal
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import DateTime, Numeric, Uuid
+
+from app.core.config import settings
+from app.db.database import async_session_factory, engine
+from app.models.order import Order, OrderItem
+from app.repositories.partition_repo import PARTITIONED_TABLES, PartitionRepository, add_months, month_start
+from app.services.export import encode_ndjson, gzip_chunks
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator, Sequence
+
+_TABLES = {"orders": Order.__table__, "order_items": OrderItem.__table__}
+
+
+def archive_path(table: str, month: datetime.date) -> Path:
+    return Path(settings.ORDER_ARCHIVE_DIR) / table / f"{month:%Y-%m}.ndjson.gz"
+
+
+async def write_archive(path: Path, partitions: AsyncIterator[Sequence[Any]], fields: Sequence[str]) -> None:
+    """Write atomically: the file only appears once it is complete and on disk."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("wb") as fh:
+        async for chunk in gzip_chunks(encode_ndjson(partitions, fields)):
+            fh.write(chunk)
+        fh.flush()
+        os.fsync(fh.fileno())
+    tmp.replace(path)
+
+
+def read_archive(path: Path, table: Any, batch_size: int = 5000) -> Iterator[list[dict[str, Any]]]:
+    batch: list[dict[str, Any]] = []
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            batch.append(coerce_row(table, json.loads(line)))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def coerce_row(table: Any, row: dict[str, Any]) -> dict[str, Any]:
+    """Turn the archive's JSON strings back into values the driver binds."""
+    out = {}
+    for name, value in row.items():
+        col_type = table.c[name].type
+        if value is not None:
+            if isinstance(col_type, Uuid):
+                value = uuid.UUID(value)
+            elif isinstance(col_type, Numeric):
+                value = Decimal(value)
+            elif isinstance(col_type, DateTime):
+                value = datetime.datetime.fromisoformat(value)
+        out[name] = value
+    return out
+
+
+async def _require_partitioned(repo: PartitionRepository) -> None:
+    for table in PARTITIONED_TABLES:
+        if not await repo.is_partitioned(table):
+            raise SystemExit(f"{table} is not partitioned; run the 0005 migration on PostgreSQL first")
+
+
+async def ensure_partitions(months_ahead: int) -> list[datetime.date]:
+    current = month_start(datetime.datetime.now(datetime.timezone.utc).date())
+    months = [add_months(current, n) for n in range(months_ahead + 1)]
+    async with async_session_factory() as session:
+        repo = PartitionRepository(session)
+        await _require_partitioned(repo)
+        for table in PARTITIONED_TABLES:
+            for month in months:
+                await repo.create_month(table, month)
+        await session.commit()
+    return months
+
+
+async def archive_partitions(retention_months: int, *, dry_run: bool = False) -> list[datetime.date]:
+    cutoff = add_months(month_start(datetime.datetime.now(datetime.timezone.utc).date()), -retention_months)
+    async with async_session_factory() as session:
+        repo = PartitionRepository(session)
+        await _require_partitioned(repo)
+        expired = [m for m in await repo.list_months("orders") if m < cutoff]
+        if dry_run:
+            return expired
+        for month in expired:
+            # Dump while still attached; detach and drop only once every file is durable.
+            for table in PARTITIONED_TABLES:
+                fields = await repo.column_names(table)
+                await write_archive(archive_path(table, month), repo.stream_month(table, month), fields)
+            for table in reversed(PARTITIONED_TABLES):
+                await repo.drop_month(table, month)
+            await session.commit()
+    return expired
+
+
+async def restore_month(month: datetime.date) -> dict[str, int]:
+    restored = {}
+    async with async_session_factory() as session:
+        repo = PartitionRepository(session)
+        await _require_partitioned(repo)
+        for table in PARTITIONED_TABLES:
+            path = archive_path(table, month)
+            if not path.exists():
+                raise SystemExit(f"No archive at {path}")
+            await repo.create_month(table, month)
+            restored[table] = 0
+            for batch in read_archive(path, _TABLES[table]):
+                await repo.insert_rows(_TABLES[table], batch)
+                restored[table] += len(batch)
+        await session.commit()
+    return restored
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain order partitions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ensure = sub.add_parser("ensure", help="Pre-create upcoming monthly partitions.")
+    ensure.add_argument("--months", type=int, default=settings.ORDER_PARTITION_PREMAKE_MONTHS)
+    archive = sub.add_parser("archive", help="Archive and drop partitions past retention.")
+    archive.add_argument("--retention-months", type=int, default=settings.ORDER_RETENTION_MONTHS)
+    archive.add_argument("--dry-run", action="store_true")
+    restore = sub.add_parser("restore", help="Bring an archived month back online.")
+    restore.add_argument("month", type=lambda s: datetime.date.fromisoformat(f"{s}-01"), help="YYYY-MM")
+    args = parser.parse_args()
+
+    if args.command == "ensure":
+        months = await ensure_partitions(args.months)
+        print(f"Partitions present for {months[0]:%Y-%m}..{months[-1]:%Y-%m}")
+    elif args.command == "archive":
+        months = await archive_partitions(args.retention_months, dry_run=args.dry_run)
+        verb = "Would archive" if args.dry_run else "Archived"
+        print(f"{verb} {len(months)} month(s): {', '.join(f'{m:%Y-%m}' for m in months) or '-'}")
+    else:
+        counts = await restore_month(args.month)
+        print(f"Restored {args.month:%Y-%m}: " + ", ".join(f"{t}={n}" for t, n in counts.items()))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
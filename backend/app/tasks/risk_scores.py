@@ -0,0 +1,50 @@
+"""Nightly credit risk scoring: a risk score and credit limit for every active kiosk.
+
+Pages through credit profiles in user id order, committing each page, so
+an interrupted run can be resumed and never holds locks for long. See
+``app.core.risk`` for the model and ``app.services.risk_scoring`` for the
+data flow.
+
+    python -m app.tasks.risk_scores --page-size 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import time
+
+from app.db.database import async_session_factory, engine
+from app.services.risk_scoring import score_page
+
+
+async def score_all(page_size: int) -> tuple[int, int]:
+    """``(profiles scored, profiles updated)``."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    scored = updated = 0
+    after = None
+    while True:
+        async with async_session_factory() as session:
+            result = await score_page(session, after, page_size, now)
+            await session.commit()
+        scored += result.scored
+        updated += result.updated
+        if result.scored < page_size:
+            return scored, updated
+        after = result.last_user_id
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Score credit risk for every active kiosk.")
+    parser.add_argument("--page-size", type=int, default=20000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    scored, updated = await score_all(args.page_size)
+    await engine.dispose()
+    print(f"Scored {scored} credit profile(s), updated {updated}, in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
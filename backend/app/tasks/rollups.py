@@ -0,0 +1,46 @@
+"""Catch-up job for the analytics rollups.
+
+Recomputes ``order_daily_rollups`` and ``product_daily_rollups`` for a date
+range from ``orders``/``order_items``, repairing any drift from the
+incremental updates (e.g. after backfills or manual SQL fixes). Months whose
+order partitions were archived keep their rollups.
+
+    python -m app.tasks.rollups --days 2
+    python -m app.tasks.rollups --since 2026-01-01 --until 2026-01-31
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+
+from app.db.database import async_session_factory, engine
+from app.repositories.analytics_repo import AnalyticsRepository
+
+
+async def rebuild_rollups(since: datetime.date, until: datetime.date) -> list[datetime.date]:
+    async with async_session_factory() as session:
+        skipped = await AnalyticsRepository(session).rebuild(since, until)
+        await session.commit()
+    return skipped
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild analytics rollups.")
+    parser.add_argument("--since", type=datetime.date.fromisoformat)
+    parser.add_argument("--until", type=datetime.date.fromisoformat)
+    parser.add_argument("--days", type=int, default=2, help="Trailing days to rebuild when --since is omitted.")
+    args = parser.parse_args()
+
+    until = args.until or datetime.datetime.now(datetime.timezone.utc).date()
+    since = args.since or until - datetime.timedelta(days=args.days - 1)
+    skipped = await rebuild_rollups(since, until)
+    await engine.dispose()
+    print(f"Rebuilt rollups for {since}..{until}")
+    if skipped:
+        print(f"Kept archived month(s): {', '.join(f'{m:%Y-%m}' for m in skipped)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,119 @@
+"""Benchmark: concurrent BNPL checkouts against one kiosk's credit line.
+
+Needs a PostgreSQL database migrated to 0013. Seeds one kiosk with a
+``--limit`` credit line, then fires ``--checkouts`` reservations of
+``--amount`` at it, ``--concurrency`` at a time. Each checkout is its own
+transaction: the conditional charge, then ``--hold-ms`` of the rest of the
+order before commit, which is how long the profile row stays locked.
+
+Reports throughput, p50/p99 latency and the overdraft check: exactly
+``limit // amount`` checkouts succeed, and the balance equals both
+their sum and the sum of the ledger.
+
+    python scripts/bench_credit_reservations.py --url postgresql+asyncpg://... --checkouts 500 --concurrency 100
+
+The seeded rows are deleted afterwards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import app.db.base  # noqa: E402, F401 — registers all models
+from app.models.base import uuid7  # noqa: E402
+from app.models.credit_ledger import CreditLedgerEntry  # noqa: E402
+from app.models.credit_profile import CreditProfile  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.repositories.credit_repo import CreditRepository, InsufficientCreditError  # noqa: E402
+from sqlalchemy import delete, func, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+
+async def _checkout(
+    factory: async_sessionmaker[AsyncSession], user_id, amount: Decimal, hold: float  # type: ignore[no-untyped-def]
+) -> float | None:
+    """Latency in ms, or None if the charge didn't fit."""
+    t0 = time.perf_counter()
+    async with factory() as session:
+        try:
+            await CreditRepository(session).reserve_credit(user_id, amount, order_id=uuid7())
+        except InsufficientCreditError:
+            await session.rollback()
+            return None
+        await asyncio.sleep(hold)
+        await session.commit()
+    return (time.perf_counter() - t0) * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True, help="PostgreSQL URL (postgresql+asyncpg://...), migrated to 0013")
+    parser.add_argument("--checkouts", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--limit", type=Decimal, default=Decimal("5000.00"))
+    parser.add_argument("--amount", type=Decimal, default=Decimal("30.00"))
+    parser.add_argument("--hold-ms", type=float, default=2.0, help="Rest of the order transaction after charging.")
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url, pool_size=args.concurrency, max_overflow=0)
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("Contention needs row locks; pass a postgresql+asyncpg URL.")
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        kiosk = User(phone=f"+2519{uuid7().int % 10**8:08d}", role=UserRole.KIOSK_OWNER)
+        session.add(kiosk)
+        await session.flush()
+        profile = CreditProfile(user_id=kiosk.id, credit_limit=args.limit, current_balance=Decimal("0.00"))
+        session.add(profile)
+        await session.commit()
+    gate = asyncio.Semaphore(args.concurrency)
+
+    async def one() -> float | None:
+        async with gate:
+            return await _checkout(factory, kiosk.id, args.amount, args.hold_ms / 1000)
+
+    try:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(one() for _ in range(args.checkouts)))
+        elapsed = time.perf_counter() - start
+        timings = [r for r in results if r is not None]
+
+        async with factory() as session:
+            balance = (
+                await session.execute(select(CreditProfile.current_balance).where(CreditProfile.id == profile.id))
+            ).scalar_one()
+            ledger = (
+                await session.execute(
+                    select(func.coalesce(func.sum(CreditLedgerEntry.amount), 0)).where(
+                        CreditLedgerEntry.profile_id == profile.id
+                    )
+                )
+            ).scalar_one()
+        expected = min(args.checkouts, int(args.limit // args.amount))
+        consistent = len(timings) == expected and balance == ledger == args.amount * len(timings) <= args.limit
+        p99 = statistics.quantiles(timings, n=100)[-1] if len(timings) > 1 else timings[0]
+        print(f"{args.checkouts} checkouts of {args.amount} against {args.limit}, {args.concurrency} concurrent")
+        print(f"{'ok':>6}{'refused':>9}{'per s':>9}{'p50 ms':>9}{'p99 ms':>9}{'balance':>11}{'no overdraft':>14}")
+        print(
+            f"{len(timings):>6}{len(results) - len(timings):>9}{len(results) / elapsed:>9.0f}"
+            f"{statistics.median(timings):>9.1f}{p99:>9.1f}{balance!s:>11}{str(consistent):>14}"
+        )
+    finally:
+        async with factory() as session:
+            await session.execute(delete(CreditLedgerEntry).where(CreditLedgerEntry.profile_id == profile.id))
+            await session.execute(delete(CreditProfile).where(CreditProfile.id == profile.id))
+            await session.execute(delete(User).where(User.id == kiosk.id))
+            await session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
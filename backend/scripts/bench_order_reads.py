@@ -0,0 +1,113 @@
+"""Benchmark: ORM vs projection read path for order listings.
+
+Seeds an in-memory SQLite database (or ``--url``) and reports, per request,
+the number of SQL statements, wall time and peak Python allocations for
+``GET /orders``-equivalent work on both paths.
+
+    python scripts/bench_order_reads.py --orders 2000 --per-page 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import app.db.base  # noqa: E402, F401 — registers all models
+from app.api.routers.orders import _order_to_response  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.order import Order, OrderItem, OrderStatus  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.repositories.order_read_repo import OrderReadRepository  # noqa: E402
+from app.repositories.order_repo import OrderRepository  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+
+async def _seed(factory: async_sessionmaker[AsyncSession], n_orders: int) -> User:
+    async with factory() as session:
+        distributor = User(phone="+251911000001", role=UserRole.DISTRIBUTOR)
+        kiosks = [User(phone=f"+2519120{i:05d}", role=UserRole.KIOSK_OWNER) for i in range(20)]
+        session.add_all([distributor, *kiosks])
+        await session.flush()
+        products = [
+            Product(name=f"Product {i}", price=Decimal("10.00") + i, distributor_id=distributor.id)
+            for i in range(50)
+        ]
+        session.add_all(products)
+        await session.flush()
+        for i in range(n_orders):
+            lines = [products[(i + k) % len(products)] for k in range(3)]
+            session.add(
+                Order(
+                    user_id=kiosks[i % len(kiosks)].id,
+                    distributor_id=distributor.id,
+                    status=OrderStatus.PENDING,
+                    total=sum(p.price for p in lines),
+                    items=[OrderItem(product_id=p.id, quantity=1, unit_price=p.price) for p in lines],
+                )
+            )
+        await session.commit()
+        return distributor
+
+
+async def _orm_path(session: AsyncSession, distributor_id, per_page: int) -> int:  # type: ignore[no-untyped-def]
+    orders, _ = await OrderRepository(session).list_orders(distributor_id=distributor_id, per_page=per_page)
+    return len([_order_to_response(o) for o in orders])
+
+
+async def _projection_path(session: AsyncSession, distributor_id, per_page: int) -> int:  # type: ignore[no-untyped-def]
+    items, _ = await OrderReadRepository(session).list_orders(distributor_id=distributor_id, per_page=per_page)
+    return len(items)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    distributor = await _seed(factory, args.orders)
+
+    statements = 0
+
+    def _count(*_args) -> None:  # type: ignore[no-untyped-def]
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _count)
+
+    print(f"{args.orders} orders, per_page={args.per_page}, {args.repeat} requests per path")
+    print(f"{'path':<12}{'stmts/req':>10}{'ms/req':>10}{'peak KiB':>10}")
+    for name, path in (("orm", _orm_path), ("projection", _projection_path)):
+        statements = 0
+        peak = 0
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            # Fresh session per request, as in the API.
+            async with factory() as session:
+                tracemalloc.start()
+                await path(session, distributor.id, args.per_page)
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+        elapsed_ms = (time.perf_counter() - start) * 1000 / args.repeat
+        print(f"{name:<12}{statements / args.repeat:>10.1f}{elapsed_ms:>10.2f}{peak / 1024:>10.0f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
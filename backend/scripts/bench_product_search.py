@@ -0,0 +1,130 @@
+"""Benchmark: legacy ILIKE vs full-text + trigram product search on PostgreSQL.
+
+Needs a database migrated to 0008. Seeds ``--products`` products (default
+1M) under a throwaway distributor, with names drawn from a mixed
+Ge'ez/Latin vocabulary, ANALYZEs, then times ``--repeat`` runs of each
+query on both paths and reports p50/p95 latency and hit counts.
+
+    python scripts/bench_product_search.py --url postgresql+asyncpg://... --products 1000000
+
+The seeded rows are deleted afterwards unless ``--keep`` is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import app.db.base  # noqa: E402, F401 — registers all models
+from app.core.transliteration import fold  # noqa: E402
+from app.models.base import uuid7  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.repositories.product_repo import ProductRepository  # noqa: E402
+from sqlalchemy import delete, func, insert, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+_WORDS = (
+    "ጤፍ", "Teff", "ቡና", "Buna", "Coffee", "ስኳር", "Sukkar", "Sugar", "ዘይት", "Zeyit", "Oil", "ሳሙና", "Samuna",
+    "Soap", "ሻይ", "Shai", "Tea", "ዱቄት", "Flour", "ሩዝ", "Rice", "ፓስታ", "Pasta", "ወተት", "Milk", "ውሃ", "Water",
+    "Coca-Cola", "Pepsi", "Ambo", "Highland", "Biscuit", "ብስኩት", "Shampoo", "Omo", "Kolo", "ቆሎ", "Berbere", "በርበሬ",
+)
+_SIZES = ("250g", "500g", "1kg", "5kg", "330ml", "500ml", "1L", "2L", "x6", "x12")
+_QUERIES = ("teff", "ቡና", "sukar", "zeyit 1L", "samuna", "coca cola", "berbere 1kg", "shampo", "ambo water")
+
+
+def _name(rng: random.Random) -> str:
+    return f"{rng.choice(_WORDS)} {rng.choice(_WORDS)} {rng.choice(_SIZES)}"
+
+
+async def _seed(factory: async_sessionmaker[AsyncSession], n: int, batch: int) -> User:
+    rng = random.Random(38)
+    async with factory() as session:
+        distributor = User(phone=f"+2519{rng.randrange(10**8):08d}", role=UserRole.DISTRIBUTOR)
+        session.add(distributor)
+        await session.commit()
+        done = 0
+        while done < n:
+            rows = []
+            for _ in range(min(batch, n - done)):
+                name = _name(rng)
+                rows.append(
+                    {
+                        "id": uuid7(),
+                        "name": name,
+                        "name_folded": fold(name),
+                        "price": Decimal(rng.randrange(500, 50000)) / 100,
+                        "category": rng.choice(("beverages", "grains", "household", "personal-care")),
+                        "distributor_id": distributor.id,
+                        "is_active": True,
+                    }
+                )
+            await session.execute(insert(Product), rows)
+            await session.commit()
+            done += len(rows)
+        await session.execute(text("ANALYZE products"))
+        await session.commit()
+    return distributor
+
+
+async def _legacy(session: AsyncSession, q: str) -> int:
+    base = select(Product).where(Product.is_active.is_(True), Product.name.ilike(f"%{q}%"))
+    total = (await session.execute(select(func.count()).select_from(base.subquery()))).scalar_one()
+    await session.execute(base.order_by(Product.created_at.desc()).limit(20))
+    return total
+
+
+async def _search(session: AsyncSession, q: str) -> int:
+    _, total = await ProductRepository(session).list_products(search=q)
+    return total
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True, help="PostgreSQL URL (postgresql+asyncpg://...), migrated to 0008")
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded products.")
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("Search uses pg_trgm and tsvector; pass a postgresql+asyncpg URL.")
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    start = time.perf_counter()
+    distributor = await _seed(factory, args.products, args.batch)
+    print(f"Seeded {args.products} products in {time.perf_counter() - start:.0f}s")
+
+    print(f"{'query':<14}{'path':<8}{'hits':>9}{'p50 ms':>9}{'p95 ms':>9}")
+    for q in _QUERIES:
+        for name, path in (("ilike", _legacy), ("search", _search)):
+            timings = []
+            hits = 0
+            for _ in range(args.repeat):
+                async with factory() as session:
+                    t0 = time.perf_counter()
+                    hits = await path(session, q)
+                    timings.append((time.perf_counter() - t0) * 1000)
+            p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+            print(f"{q:<14}{name:<8}{hits:>9}{statistics.median(timings):>9.1f}{p95:>9.1f}")
+
+    if not args.keep:
+        async with factory() as session:
+            await session.execute(delete(Product).where(Product.distributor_id == distributor.id))
+            await session.execute(delete(User).where(User.id == distributor.id))
+            await session.commit()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
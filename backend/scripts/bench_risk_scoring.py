@@ -0,0 +1,94 @@
+"""Benchmark: risk scoring for a million kiosks on one core, arrays vs a per-kiosk loop.
+
+Generates synthetic per-kiosk history, then times, page by page as the
+nightly job does: scattering the aggregate rows into arrays, and
+``app.core.risk.score``. For comparison, the same model is evaluated with a
+plain Python loop over a sample and extrapolated. Database time is not
+included: on PostgreSQL it is the two aggregate range scans and one
+``UPDATE ... FROM unnest(...)`` per page.
+
+    python scripts/bench_risk_scoring.py --kiosks 1000000 --page-size 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np  # noqa: E402
+from app.core import risk  # noqa: E402
+
+
+def _loop_score(orders: float, spend: float, days: float, due: float, repaid: float) -> tuple[float, float]:
+    """The model one kiosk at a time, as it would be written without arrays."""
+    months = risk.WINDOW_DAYS / 30
+    basket = spend / orders if orders else 0.0
+    on_time = min(max((repaid + 0.7 * 500) / (due + 500), 0.0), 1.0)
+    recency = 0.0 if math.isnan(days) else math.exp(-days / 30)
+    standing = (
+        0.25 * (1 - math.exp(-(orders / months) / 4))
+        + 0.20 * (1 - math.exp(-basket / 1000))
+        + 0.35 * on_time
+        + 0.20 * recency
+    )
+    if not orders:
+        return round(1 - standing, 4), float(risk.DEFAULT_CREDIT_LIMIT)
+    limit = min(max(spend / months * 2 * standing, risk.MIN_LIMIT), risk.MAX_LIMIT)
+    return round(1 - standing, 4), math.floor(limit / risk.LIMIT_STEP) * risk.LIMIT_STEP
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kiosks", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=20000)
+    parser.add_argument("--loop-sample", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    n = args.kiosks
+    orders = rng.poisson(8, n).astype(float)
+    spend = orders * rng.uniform(100, 5000, n)
+    days = np.where(orders > 0, rng.uniform(0, 180, n), np.nan)
+    due = rng.uniform(0, 5000, n)
+    repaid = due * rng.uniform(0, 1.2, n)
+    # What the aggregate queries hand back: one tuple per kiosk with activity.
+    rows = list(zip(range(n), orders.tolist(), spend.tolist(), days.tolist()))
+
+    start = time.perf_counter()
+    for lo in range(0, n, args.page_size):
+        page = rows[lo : lo + args.page_size]
+        size = len(page)
+        page_orders, page_spend, page_days = np.zeros(size), np.zeros(size), np.full(size, np.nan)
+        ids, counts, totals, latest = zip(*page)
+        at = np.fromiter(ids, dtype=np.intp, count=size) - lo
+        page_orders[at], page_spend[at], page_days[at] = counts, totals, latest
+        risk.score(
+            risk.RiskInputs(page_orders, page_spend, page_days, due[lo : lo + size], repaid[lo : lo + size])
+        ).limit.tolist()
+    arrays = time.perf_counter() - start
+
+    sample = min(args.loop_sample, n)
+    start = time.perf_counter()
+    for i in range(sample):
+        _loop_score(orders[i], spend[i], days[i], due[i], repaid[i])
+    loop = (time.perf_counter() - start) * n / sample
+
+    expected = risk.score(risk.RiskInputs(orders[:1000], spend[:1000], days[:1000], due[:1000], repaid[:1000]))
+    looped = [_loop_score(orders[i], spend[i], days[i], due[i], repaid[i]) for i in range(1000)]
+    agree = np.allclose(expected.limit, [limit for _, limit in looped]) and np.allclose(
+        expected.risk, [r for r, _ in looped], atol=1e-4
+    )
+
+    print(f"{n} kiosks, pages of {args.page_size}")
+    print(f"  arrays:  {arrays:8.2f} s  (scatter + score + tolist)")
+    print(f"  loop:    {loop:8.2f} s  (extrapolated from {sample})")
+    print(f"  speedup: {loop / arrays:8.1f}x   results agree: {agree}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Benchmark: concurrent checkouts of one hot product, by number of stock stripes.
+
+Needs a PostgreSQL database migrated to head. Seeds one product and, for
+each ``--stripes`` value, stocks it with exactly enough for ``--checkouts``
+orders, then fires them ``--concurrency`` at a time. Each checkout is the
+real one: ``OrderRepository.create_order`` and commit, in its own
+transaction, so whatever else checkout writes is what keeps a stripe
+locked. One stripe is the plain ``stock = stock - n`` counter every
+checkout queues behind.
+
+Reports throughput, p50/p99 latency and a consistency check: every unit
+is either still available or held, none oversold.
+
+    python scripts/bench_stock_reservations.py --url postgresql+asyncpg://... --checkouts 500 --concurrency 200
+
+The seeded rows, orders and their outbox messages are deleted afterwards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import app.db.base  # noqa: E402, F401 — registers all models
+from app.models.base import uuid7  # noqa: E402
+from app.models.order import Order, OrderItem  # noqa: E402
+from app.models.outbox import OutboxMessage  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.models.stock import StockLevel, StockReservation  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.repositories.order_repo import OrderRepository  # noqa: E402
+from app.repositories.stock_repo import InsufficientStockError, StockRepository  # noqa: E402
+from app.schemas.order import OrderCreate, OrderItemCreate  # noqa: E402
+from app.services.worker_lease import order_code_worker  # noqa: E402
+from sqlalchemy import delete, func, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+
+async def _seed(factory: async_sessionmaker[AsyncSession]) -> tuple[User, User, Product]:
+    async with factory() as session:
+        distributor = User(phone=f"+2519{uuid7().int % 10**8:08d}", role=UserRole.DISTRIBUTOR)
+        kiosk = User(phone=f"+2519{uuid7().int % 10**8:08d}", role=UserRole.KIOSK_OWNER)
+        session.add_all([distributor, kiosk])
+        await session.flush()
+        product = Product(name="Coca-Cola 300ml", price=Decimal("15.00"), distributor_id=distributor.id)
+        session.add(product)
+        await session.commit()
+        return distributor, kiosk, product
+
+
+async def _checkout(
+    factory: async_sessionmaker[AsyncSession], kiosk: User, product: Product, data: OrderCreate
+) -> float | None:
+    """Latency in ms, or None if stock ran out."""
+    t0 = time.perf_counter()
+    async with factory() as session:
+        try:
+            await OrderRepository(session).create_order(kiosk.id, data, {product.id: product})
+        except InsufficientStockError:
+            await session.rollback()
+            return None
+        await session.commit()
+    return (time.perf_counter() - t0) * 1000
+
+
+async def _delete_orders(session: AsyncSession, kiosk: User) -> None:
+    order_ids = select(Order.id).where(Order.user_id == kiosk.id)
+    await session.execute(delete(StockReservation).where(StockReservation.order_id.in_(order_ids)))
+    await session.execute(
+        delete(OutboxMessage).where(OutboxMessage.payload["user_id"].as_string() == str(kiosk.id))
+    )
+    await session.execute(delete(OrderItem).where(OrderItem.order_id.in_(order_ids)))
+    await session.execute(delete(Order).where(Order.user_id == kiosk.id))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True, help="PostgreSQL URL (postgresql+asyncpg://...), migrated to head")
+    parser.add_argument("--checkouts", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--quantity", type=int, default=1)
+    parser.add_argument("--stripes", default="1,4,16,32", help="Comma-separated stripe counts to compare.")
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url, pool_size=args.concurrency, max_overflow=0)
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("Contention needs row locks; pass a postgresql+asyncpg URL.")
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    distributor, kiosk, product = await _seed(factory)
+    data = OrderCreate(
+        distributor_id=distributor.id, items=[OrderItemCreate(product_id=product.id, quantity=args.quantity)]
+    )
+    gate = asyncio.Semaphore(args.concurrency)
+
+    async def one() -> float | None:
+        async with gate:
+            return await _checkout(factory, kiosk, product, data)
+
+    print(f"{args.checkouts} checkouts of {args.quantity}, {args.concurrency} concurrent, via create_order")
+    print(f"{'stripes':>8}{'ok':>6}{'rejected':>10}{'per s':>9}{'p50 ms':>9}{'p99 ms':>9}{'consistent':>12}")
+    try:
+        for stripes in (int(s) for s in args.stripes.split(",")):
+            stock = args.checkouts * args.quantity
+            async with factory() as session:
+                await _delete_orders(session, kiosk)
+                await StockRepository(session).set_stock(product.id, stock, stripes=stripes)
+                await session.commit()
+                # set_stock turned tracking on; create_order reads it off the product.
+                tracked = await session.get(Product, product.id, populate_existing=True)
+                assert tracked is not None
+                product = tracked
+
+            start = time.perf_counter()
+            results = await asyncio.gather(*(one() for _ in range(args.checkouts)))
+            elapsed = time.perf_counter() - start
+            timings = [r for r in results if r is not None]
+
+            async with factory() as session:
+                left = (
+                    await session.execute(
+                        select(func.sum(StockLevel.available)).where(StockLevel.product_id == product.id)
+                    )
+                ).scalar_one()
+                held = (
+                    await session.execute(
+                        select(func.coalesce(func.sum(StockReservation.quantity), 0)).where(
+                            StockReservation.product_id == product.id
+                        )
+                    )
+                ).scalar_one()
+            consistent = left >= 0 and left + held == stock and held == len(timings) * args.quantity
+            p99 = statistics.quantiles(timings, n=100)[-1] if len(timings) > 1 else timings[0]
+            print(
+                f"{stripes:>8}{len(timings):>6}{len(results) - len(timings):>10}{len(timings) / elapsed:>9.0f}"
+                f"{statistics.median(timings):>9.1f}{p99:>9.1f}{str(consistent):>12}"
+            )
+    finally:
+        async with factory() as session:
+            await _delete_orders(session, kiosk)
+            await session.execute(delete(StockLevel).where(StockLevel.product_id == product.id))
+            await session.execute(delete(Product).where(Product.id == product.id))
+            await session.execute(delete(User).where(User.id.in_([distributor.id, kiosk.id])))
+            await session.commit()
+        await engine.dispose()
+
+
+async def _run() -> None:
+    # Order codes need a worker id: ORDER_CODE_WORKER_ID, or a lease from Redis.
+    async with order_code_worker():
+        await main()
+
+
+if __name__ == "__main__":
+    asyncio.run(_run())
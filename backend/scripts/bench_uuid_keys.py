@@ -0,0 +1,90 @@
+"""Benchmark: UUIDv4 vs UUIDv7 primary keys on PostgreSQL.
+
+Creates two scratch tables shaped like ``order_items`` (uuid PK plus a few
+columns), inserts ``--rows`` rows into each in ``--batch`` sized multi-row
+INSERTs, and reports throughput plus primary-key index size. With the
+``pgstattuple`` extension available it also reports leaf density, which is
+where random keys hurt: page splits leave v4 leaves roughly half full.
+
+    python scripts/bench_uuid_keys.py --url postgresql+asyncpg://... --rows 10000000
+
+The scratch tables are dropped afterwards unless ``--keep`` is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.models.base import uuid7  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine  # noqa: E402
+
+_GENERATORS = {"v4": uuid.uuid4, "v7": uuid7}
+
+
+async def _run(conn: AsyncConnection, name: str, rows: int, batch: int) -> dict[str, float]:
+    table = f"bench_pk_{name}"
+    await conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    await conn.execute(
+        text(
+            f"CREATE TABLE {table} (id uuid PRIMARY KEY, order_id uuid NOT NULL, "
+            "quantity integer NOT NULL, unit_price numeric(10, 2) NOT NULL)"
+        )
+    )
+    await conn.commit()
+
+    new_id = _GENERATORS[name]
+    insert = text(f"INSERT INTO {table} (id, order_id, quantity, unit_price) VALUES (:id, :order_id, 1, 9.99)")
+    start = time.perf_counter()
+    done = 0
+    while done < rows:
+        n = min(batch, rows - done)
+        await conn.execute(insert, [{"id": new_id(), "order_id": new_id()} for _ in range(n)])
+        await conn.commit()
+        done += n
+    elapsed = time.perf_counter() - start
+
+    index_bytes = (await conn.execute(text(f"SELECT pg_relation_size('{table}_pkey')"))).scalar_one()
+    density = None
+    if (await conn.execute(text("SELECT count(*) FROM pg_extension WHERE extname = 'pgstattuple'"))).scalar_one():
+        density = (
+            await conn.execute(text(f"SELECT avg_leaf_density FROM pgstatindex('{table}_pkey')"))
+        ).scalar_one()
+    return {"rows_per_s": rows / elapsed, "index_mib": index_bytes / 2**20, "leaf_density": density}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True, help="PostgreSQL URL (postgresql+asyncpg://...)")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=5_000)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch tables for inspection.")
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("This benchmark measures PostgreSQL B-tree behaviour; pass a postgresql+asyncpg URL.")
+
+    print(f"{args.rows} rows per table, batches of {args.batch}")
+    print(f"{'key':<6}{'rows/s':>12}{'pk MiB':>10}{'leaf %':>10}")
+    async with engine.connect() as conn:
+        for name in _GENERATORS:
+            result = await _run(conn, name, args.rows, args.batch)
+            density = f"{result['leaf_density']:.1f}" if result["leaf_density"] is not None else "n/a"
+            print(f"{name:<6}{result['rows_per_s']:>12.0f}{result['index_mib']:>10.1f}{density:>10}")
+        if not args.keep:
+            for name in _GENERATORS:
+                await conn.execute(text(f"DROP TABLE bench_pk_{name}"))
+            await conn.commit()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 import pytest
+from app.core import snowflake
 from app.main import app
 from httpx import ASGITransport, AsyncClient
 
+# The app leases a worker id in its lifespan, which ASGITransport never runs.
+snowflake.configure(0)
+
 
 @pytest.fixture
 async def client():
@@ -0,0 +1,180 @@
+"""Query instrumentation for endpoint budget tests.
+
+``QueryRecorder`` hooks the engine's cursor events and ORM instance loads,
+so a test can measure what one request costs: statements sent, time spent
+in the driver and ORM objects hydrated.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+import app.db.base  # noqa: F401 — registers all models
+import pytest
+from app.api.deps import get_db
+from app.core.security import create_access_token
+from app.core.snowflake import format_code
+from app.main import app
+from app.models.base import Base
+from app.models.tenant import Tenant
+from app.models.user import User, UserRole
+from app.repositories.order_repo import OrderRepository
+from app.repositories.product_repo import ProductRepository
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.schemas.product import ProductCreate
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+SEED_PRODUCTS = 60
+SEED_ORDERS = 30
+SEED_LINES = 3
+_CATEGORIES = ("beverages", "snacks", "household", "staples")
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    seconds: float = 0.0
+    hydrated: int = 0
+    sql: list[str] = field(default_factory=list)
+
+    @property
+    def ms(self) -> float:
+        return self.seconds * 1000
+
+    def __str__(self) -> str:
+        lines = "\n".join(f"  {i}. {s}" for i, s in enumerate(self.sql, 1))
+        return f"{self.statements} statement(s), {self.ms:.1f} ms, {self.hydrated} hydrated:\n{lines}"
+
+
+class QueryRecorder:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine.sync_engine
+        self._current: QueryStats | None = None
+
+    def _before(self, conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        conn.info["query_started"] = time.perf_counter()
+
+    def _after(self, conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        if self._current is None:
+            return
+        self._current.statements += 1
+        self._current.seconds += time.perf_counter() - conn.info.pop("query_started")
+        self._current.sql.append(" ".join(statement.split())[:200])
+
+    def _loaded(self, target: Any, context: Any) -> None:
+        if self._current is not None:
+            self._current.hydrated += 1
+
+    def install(self) -> None:
+        event.listen(self._engine, "before_cursor_execute", self._before)
+        event.listen(self._engine, "after_cursor_execute", self._after)
+        event.listen(Base, "load", self._loaded, propagate=True)
+
+    def remove(self) -> None:
+        event.remove(self._engine, "before_cursor_execute", self._before)
+        event.remove(self._engine, "after_cursor_execute", self._after)
+        event.remove(Base, "load", self._loaded)
+
+    @contextmanager
+    def measure(self) -> Iterator[QueryStats]:
+        self._current = stats = QueryStats()
+        try:
+            yield stats
+        finally:
+            self._current = None
+
+
+@dataclass
+class SeededApp:
+    client: AsyncClient
+    recorder: QueryRecorder
+    tokens: dict[str, str]
+    ids: dict[str, Any]
+
+
+async def _seed(factory: async_sessionmaker[AsyncSession]) -> tuple[dict[str, User], dict[str, Any]]:
+    async with factory() as session:
+        tenant = Tenant(name="Addis", slug="addis")
+        session.add(tenant)
+        await session.flush()
+        users = {
+            "distributor": User(phone="+251911000001", role=UserRole.DISTRIBUTOR, tenant_id=tenant.id),
+            "kiosk_owner": User(phone="+251911000002", role=UserRole.KIOSK_OWNER, tenant_id=tenant.id),
+            "admin": User(phone="+251911000003", role=UserRole.ADMIN, tenant_id=tenant.id),
+        }
+        session.add_all(users.values())
+        await session.flush()
+        distributor, kiosk = users["distributor"], users["kiosk_owner"]
+
+        repo = ProductRepository(session)
+        written = await repo.upsert_products(
+            [
+                ProductCreate(
+                    name=f"Product {i}",
+                    price=Decimal(10 + i),
+                    category=_CATEGORIES[i % len(_CATEGORIES)],
+                    sku=f"SKU-{i:03d}",
+                    distributor_id=distributor.id,
+                )
+                for i in range(SEED_PRODUCTS)
+            ]
+        )
+        by_id = await repo.get_active_products([pid for pid, _ in written.values()])
+        products = list(by_id.values())
+        orders = OrderRepository(session)
+        for n in range(SEED_ORDERS):
+            lines = [products[(n + k) % SEED_PRODUCTS] for k in range(SEED_LINES)]
+            data = OrderCreate(
+                distributor_id=distributor.id,
+                items=[OrderItemCreate(product_id=p.id, quantity=k + 1) for k, p in enumerate(lines)],
+            )
+            order = await orders.create_order(kiosk.id, data, by_id)
+        await session.commit()
+    ids = {
+        "distributor_id": distributor.id,
+        "tenant_id": tenant.id,
+        "product_id": products[0].id,
+        "order_id": order.id,
+        "order_code": format_code(order.code),
+    }
+    return users, ids
+
+
+@pytest.fixture
+async def seeded_app():
+    """The app on a seeded in-memory SQLite database, with a ``QueryRecorder`` attached."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    users, ids = await _seed(factory)
+
+    async def _db():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _db
+    recorder = QueryRecorder(engine)
+    recorder.install()
+    tokens = {role: create_access_token(str(u.id), extra={"role": role}) for role, u in users.items()}
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            yield SeededApp(client, recorder, tokens, ids)
+    finally:
+        recorder.remove()
+        app.dependency_overrides.clear()
+        await engine.dispose()
@@ -0,0 +1,55 @@
+"""Per-endpoint database budgets, enforced by test_query_budgets.py.
+
+Each entry is one request against the dataset seeded in conftest.py (60
+products in 4 categories, 30 orders of 3 lines). ``path`` and ``json`` take
+``$placeholders`` from ``SeededApp.ids``; ``as`` picks the caller's role.
+
+    statements  SQL statements sent, authentication included
+    hydrated    ORM instances loaded (projections hydrate nothing)
+    ms          time spent in the driver; generous, it only catches blowups
+
+Measured on SQLite. When a change brings a number down, lower the budget in
+the same change; raising one needs a reason in the commit message.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+MS = 250
+
+BUDGETS: dict[str, dict[str, Any]] = {
+    "GET /products": {"path": "/products?per_page=20", "statements": 2, "hydrated": 20},
+    "GET /products?category": {"path": "/products?category=snacks&per_page=20", "statements": 2, "hydrated": 15},
+    "GET /products?search": {"path": "/products?search=product", "statements": 2, "hydrated": 20},
+    "GET /products/{id}": {"path": "/products/$product_id", "statements": 1, "hydrated": 1},
+    "GET /products/facets": {"path": "/products/facets", "statements": 1, "hydrated": 0},
+    "GET /products/changes": {"path": "/products/changes?limit=100", "statements": 2, "hydrated": 0},
+    "GET /orders": {"path": "/orders?per_page=20", "as": "kiosk_owner", "statements": 2, "hydrated": 1},
+    "GET /orders/{id}": {"path": "/orders/$order_id", "as": "kiosk_owner", "statements": 2, "hydrated": 1},
+    "GET /orders/by-code/{code}": {
+        "path": "/orders/by-code/$order_code",
+        "as": "kiosk_owner",
+        "statements": 2,
+        "hydrated": 1,
+    },
+    "POST /orders": {
+        "method": "POST",
+        "path": "/orders",
+        "as": "kiosk_owner",
+        "json": '{"distributor_id": "$distributor_id", "items": [{"product_id": "$product_id", "quantity": 2}]}',
+        # Includes the price tier scan: with no Redis here the price book is never cached.
+        "statements": 13,
+        "hydrated": 2,
+    },
+    "PUT /orders/{id}/status": {
+        "method": "PUT",
+        "path": "/orders/$order_id/status",
+        "as": "distributor",
+        "json": '{"status": "confirmed"}',
+        "statements": 9,
+        "hydrated": 8,
+    },
+    "GET /analytics/kpis": {"path": "/analytics/kpis", "as": "distributor", "statements": 3, "hydrated": 1},
+    "GET /users/me": {"path": "/users/me", "as": "kiosk_owner", "statements": 1, "hydrated": 1},
+}
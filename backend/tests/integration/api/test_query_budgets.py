@@ -0,0 +1,32 @@
+"""Endpoint query budgets: statement count, DB time and ORM hydration per request.
+
+Budgets live in ``query_budgets.py``; an N+1 or an eager-loading cascade
+shows up here as a statement or hydration count over budget.
+"""
+
+from __future__ import annotations
+
+import json
+from string import Template
+
+import pytest
+from app.core.config import settings
+
+from tests.integration.api.query_budgets import BUDGETS, MS
+
+
+@pytest.mark.parametrize("name", list(BUDGETS))
+async def test_endpoint_within_budget(seeded_app, name: str) -> None:
+    budget = BUDGETS[name]
+    ids = {key: str(value) for key, value in seeded_app.ids.items()}
+    path = settings.API_PREFIX + Template(budget["path"]).substitute(ids)
+    body = json.loads(Template(budget["json"]).substitute(ids)) if "json" in budget else None
+    headers = {"Authorization": f"Bearer {seeded_app.tokens[budget['as']]}"} if "as" in budget else {}
+
+    with seeded_app.recorder.measure() as stats:
+        resp = await seeded_app.client.request(budget.get("method", "GET"), path, json=body, headers=headers)
+
+    assert resp.status_code < 300, resp.text
+    assert stats.statements <= budget["statements"], f"{name}: over statement budget, {stats}"
+    assert stats.hydrated <= budget["hydrated"], f"{name}: over hydration budget, {stats}"
+    assert stats.ms <= budget.get("ms", MS), f"{name}: over time budget, {stats}"
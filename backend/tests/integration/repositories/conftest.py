@@ -0,0 +1,19 @@
+"""Fixtures for repository tests against an in-memory SQLite database."""
+
+from __future__ import annotations
+
+import app.db.base  # noqa: F401 — registers all models
+import pytest
+from app.models.base import Base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+
+@pytest.fixture
+async def db_session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        yield session
+    await engine.dispose()
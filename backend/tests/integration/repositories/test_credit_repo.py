@@ -0,0 +1,279 @@
+"""Integration tests for the credit ledger, BNPL reservations, checkpoints and risk scoring, against SQLite."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import os
+from decimal import Decimal
+
+import pytest
+from app.core.exceptions import ValidationError
+from app.models.base import Base, uuid7
+from app.models.credit_ledger import CreditBalanceCheckpoint, CreditLedgerEntry, LedgerKind
+from app.models.credit_profile import CreditProfile
+from app.models.order import Order
+from app.models.user import User, UserRole
+from app.repositories.credit_repo import CheckpointResult, CreditRepository, InsufficientCreditError
+from app.repositories.order_repo import OrderRepository
+from app.repositories.product_repo import ProductRepository
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.services.risk_scoring import score_page
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+
+async def _profile(db_session, phone: str = "+251911000010") -> CreditProfile:
+    kiosk = User(phone=phone, role=UserRole.KIOSK_OWNER)
+    db_session.add(kiosk)
+    await db_session.flush()
+    return await CreditRepository(db_session).create_default_profile(kiosk.id)
+
+
+async def _snapshot(db_session, profile: CreditProfile) -> tuple[Decimal, int, int]:
+    stmt = select(CreditProfile.current_balance, CreditProfile.ledger_seq, CreditProfile.checkpoint_seq).where(
+        CreditProfile.id == profile.id
+    )
+    return tuple((await db_session.execute(stmt)).one())
+
+
+async def test_entries_move_the_snapshot(db_session) -> None:
+    profile = await _profile(db_session)
+    repo = CreditRepository(db_session)
+
+    charge = await repo.post_entry(profile.id, LedgerKind.CHARGE, Decimal("300.00"))
+    repayment = await repo.post_entry(profile.id, LedgerKind.REPAYMENT, Decimal("120.50"), note="Cash")
+    adjustment = await repo.post_entry(profile.id, LedgerKind.ADJUSTMENT, Decimal("-9.50"))
+
+    assert [(e.seq, e.amount, e.balance_after) for e in (charge, repayment, adjustment)] == [
+        (1, Decimal("300.00"), Decimal("300.00")),
+        (2, Decimal("-120.50"), Decimal("179.50")),
+        (3, Decimal("-9.50"), Decimal("170.00")),
+    ]
+    assert await _snapshot(db_session, profile) == (Decimal("170.00"), 3, 0)
+
+
+async def test_post_entry_rejects_wrong_signs(db_session) -> None:
+    profile = await _profile(db_session)
+    repo = CreditRepository(db_session)
+
+    with pytest.raises(ValidationError):
+        await repo.post_entry(profile.id, LedgerKind.REPAYMENT, Decimal("-5.00"))
+    with pytest.raises(ValidationError):
+        await repo.post_entry(profile.id, LedgerKind.ADJUSTMENT, Decimal("0"))
+
+
+async def test_list_entries_pages_newest_first(db_session) -> None:
+    profile = await _profile(db_session)
+    repo = CreditRepository(db_session)
+    for _ in range(5):
+        await repo.post_entry(profile.id, LedgerKind.CHARGE, Decimal("10.00"))
+
+    first = await repo.list_entries(profile.id, limit=3)
+    rest = await repo.list_entries(profile.id, before=first[-1].seq, limit=3)
+
+    assert [e.seq for e in first] == [5, 4, 3]
+    assert [e.seq for e in rest] == [2, 1]
+
+
+async def test_checkpoint_verifies_and_repairs_drift(db_session) -> None:
+    steady = await _profile(db_session, "+251911000011")
+    drifted = await _profile(db_session, "+251911000012")
+    repo = CreditRepository(db_session)
+    await repo.post_entry(steady.id, LedgerKind.CHARGE, Decimal("40.00"))
+    await repo.post_entry(drifted.id, LedgerKind.CHARGE, Decimal("25.00"))
+
+    assert await repo.checkpoint_balances() == CheckpointResult(2, 0)
+    assert await _snapshot(db_session, steady) == (Decimal("40.00"), 1, 1)
+
+    # Only the entries since the checkpoint are summed; the snapshot is then knocked off.
+    await repo.post_entry(drifted.id, LedgerKind.REPAYMENT, Decimal("5.00"))
+    await db_session.execute(
+        update(CreditProfile)
+        .where(CreditProfile.id == drifted.id)
+        .values(current_balance=Decimal("99.00"))
+        .execution_options(synchronize_session=False)
+    )
+
+    assert await repo.checkpoint_balances() == CheckpointResult(1, 1)
+    assert await _snapshot(db_session, drifted) == (Decimal("20.00"), 2, 2)
+    checkpoints = (
+        await db_session.execute(
+            select(CreditBalanceCheckpoint.seq, CreditBalanceCheckpoint.balance)
+            .where(CreditBalanceCheckpoint.profile_id == drifted.id)
+            .order_by(CreditBalanceCheckpoint.seq)
+        )
+    ).all()
+    assert checkpoints == [(1, Decimal("25.00")), (2, Decimal("20.00"))]
+    assert await repo.checkpoint_balances() == CheckpointResult(0, 0)
+
+
+async def test_reserve_credit_only_within_limit(db_session) -> None:
+    profile = await _profile(db_session)
+    repo = CreditRepository(db_session)
+
+    await repo.reserve_credit(profile.user_id, Decimal("450.00"))
+    with pytest.raises(InsufficientCreditError):
+        await repo.reserve_credit(profile.user_id, Decimal("50.01"))
+    entry = await repo.reserve_credit(profile.user_id, Decimal("50.00"))
+
+    assert (entry.seq, entry.balance_after) == (2, Decimal("500.00"))
+    assert await _snapshot(db_session, profile) == (Decimal("500.00"), 2, 0)
+
+
+async def test_reserve_credit_refused_on_inactive_profile(db_session) -> None:
+    profile = await _profile(db_session)
+    profile.is_active = False
+    await db_session.flush()
+
+    with pytest.raises(InsufficientCreditError):
+        await CreditRepository(db_session).reserve_credit(profile.user_id, Decimal("1.00"))
+
+
+async def test_release_orders_reverses_outstanding_charges_once(db_session) -> None:
+    profile = await _profile(db_session)
+    repo = CreditRepository(db_session)
+    cancelled, kept = uuid7(), uuid7()
+    await repo.reserve_credit(profile.user_id, Decimal("80.00"), order_id=cancelled)
+    await repo.reserve_credit(profile.user_id, Decimal("30.00"), order_id=kept)
+
+    assert await repo.release_orders([cancelled]) == 1
+    assert await repo.release_orders([cancelled]) == 0
+    assert await _snapshot(db_session, profile) == (Decimal("30.00"), 3, 0)
+
+
+async def test_concurrent_reservations_never_overdraw(tmp_path) -> None:
+    """Many checkouts for one kiosk at once, each in its own transaction and connection."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'credit.db'}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        profile = await _profile(session)
+        await session.commit()
+
+    async def checkout() -> bool:
+        async with factory() as session:
+            try:
+                await CreditRepository(session).reserve_credit(profile.user_id, Decimal("30.00"))
+            except InsufficientCreditError:
+                return False
+            await session.commit()
+            return True
+
+    try:
+        results = await asyncio.gather(*(checkout() for _ in range(40)))
+        async with factory() as session:
+            balance, seq, _ = await _snapshot(session, profile)
+            charged = (
+                await session.execute(
+                    select(func.sum(CreditLedgerEntry.amount)).where(CreditLedgerEntry.profile_id == profile.id)
+                )
+            ).scalar_one()
+    finally:
+        await engine.dispose()
+
+    # 500 / 30: sixteen fit, every later one is refused.
+    assert results.count(True) == 16
+    assert balance == charged == Decimal("480.00")
+    assert seq == 16
+
+
+@pytest.mark.postgres
+@pytest.mark.skipif(not os.environ.get("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set")
+async def test_concurrent_bnpl_checkouts_never_overdraw_on_postgres() -> None:
+    """BNPL orders through create_order, racing on real row locks; the database must be a scratch one."""
+    engine = create_async_engine(os.environ["TEST_POSTGRES_URL"], pool_size=20)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with factory() as session:
+            profile = await _profile(session)
+            distributor = User(phone="+251911000030", role=UserRole.DISTRIBUTOR)
+            session.add(distributor)
+            await session.flush()
+            product = await ProductRepository(session).create_product(
+                name="Oil", price=Decimal("30.00"), distributor_id=distributor.id
+            )
+            await session.commit()
+        data = OrderCreate(
+            distributor_id=distributor.id,
+            items=[OrderItemCreate(product_id=product.id, quantity=1)],
+            payment_method="bnpl",
+        )
+
+        async def checkout() -> bool:
+            async with factory() as session:
+                try:
+                    await OrderRepository(session).create_order(profile.user_id, data, {product.id: product})
+                except InsufficientCreditError:
+                    return False
+                await session.commit()
+                return True
+
+        results = await asyncio.gather(*(checkout() for _ in range(40)))
+        async with factory() as session:
+            balance, seq, _ = await _snapshot(session, profile)
+            orders = set((await session.execute(select(Order.id).where(Order.payment_method == "bnpl"))).scalars())
+            charged = dict(
+                (await session.execute(select(CreditLedgerEntry.order_id, CreditLedgerEntry.amount))).all()
+            )
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+    # 500 / 30: sixteen fit, and each charge belongs to the order it paid for.
+    assert results.count(True) == 16
+    assert (balance, seq) == (Decimal("480.00"), 16)
+    assert set(charged) == orders
+    assert sum(charged.values()) == balance
+
+
+async def test_risk_scoring_pages_through_active_profiles(db_session) -> None:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    distributor = User(phone="+251911000020", role=UserRole.DISTRIBUTOR)
+    db_session.add(distributor)
+    await db_session.flush()
+    steady = await _profile(db_session, "+251911000021")
+    newcomer = await _profile(db_session, "+251911000022")
+    # Set by hand; no orders in the window, so scoring must not reset it.
+    newcomer.credit_limit = Decimal("2000.00")
+    dormant = await _profile(db_session, "+251911000023")
+    dormant.is_active = False
+    for days_ago in (3, 20, 40, 70):
+        db_session.add(
+            Order(
+                user_id=steady.user_id,
+                distributor_id=distributor.id,
+                total=Decimal("1500.00"),
+                created_at=now - datetime.timedelta(days=days_ago),
+            )
+        )
+    # Outside the window: ignored.
+    db_session.add(
+        Order(
+            user_id=newcomer.user_id,
+            distributor_id=distributor.id,
+            total=Decimal("9000.00"),
+            created_at=now - datetime.timedelta(days=400),
+        )
+    )
+    await db_session.flush()
+    await CreditRepository(db_session).reserve_credit(steady.user_id, Decimal("200.00"), order_id=uuid7())
+    await CreditRepository(db_session).post_entry(steady.id, LedgerKind.REPAYMENT, Decimal("200.00"))
+
+    first = await score_page(db_session, None, 1, now)
+    second = await score_page(db_session, first.last_user_id, 5, now)
+
+    assert first.scored + second.scored == 2
+    assert first.updated + second.updated == 1
+    await db_session.refresh(steady)
+    await db_session.refresh(newcomer)
+    await db_session.refresh(dormant)
+    assert newcomer.credit_limit == Decimal("2000.00")
+    assert newcomer.risk_score is None
+    assert steady.risk_score is not None
+    assert steady.credit_limit % 50 == 0 and steady.credit_limit != Decimal("500.00")
+    assert dormant.risk_score is None
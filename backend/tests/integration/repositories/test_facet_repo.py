@@ -0,0 +1,54 @@
+"""Integration tests for product facets kept in step with product writes, against SQLite."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from app.models.tenant import Tenant
+from app.models.user import User, UserRole
+from app.repositories.facet_repo import ProductFacetRepository
+from app.repositories.product_repo import ProductRepository
+from app.schemas.product import ProductChange, ProductCreate
+
+
+def _facets(facets) -> dict:
+    return {f.category: (f.count, f.min_price, f.max_price) for f in facets}
+
+
+async def test_facets_follow_product_writes(db_session) -> None:
+    tenant = Tenant(name="Addis", slug="addis")
+    db_session.add(tenant)
+    await db_session.flush()
+    abebe = User(phone="+251911000001", role=UserRole.DISTRIBUTOR, tenant_id=tenant.id)
+    chala = User(phone="+251911000002", role=UserRole.DISTRIBUTOR)
+    db_session.add_all([abebe, chala])
+    await db_session.flush()
+    repo = ProductRepository(db_session)
+    facets = ProductFacetRepository(db_session)
+
+    tea = await repo.create_product(name="Tea", price=Decimal("10.00"), distributor_id=abebe.id, category="drinks")
+    await repo.create_product(name="Cola", price=Decimal("25.00"), distributor_id=abebe.id, category="drinks")
+    soap = await repo.create_product(name="Soap", price=Decimal("30.00"), distributor_id=abebe.id)
+    await repo.upsert_products(
+        [ProductCreate(name="Juice", price=Decimal("40.00"), sku="J-1", category="drinks", distributor_id=chala.id)]
+    )
+    assert _facets(await facets.list_facets()) == {
+        None: (1, Decimal("30.00"), Decimal("30.00")),
+        "drinks": (3, Decimal("10.00"), Decimal("40.00")),
+    }
+
+    # The cheapest drink leaves its category, then gets pricier.
+    await repo.update_product(tea.id, {"category": "hot drinks"})
+    await repo.bulk_update_products([ProductChange(id=tea.id, price=Decimal("12.00"))])
+    await repo.delete_product(soap.id)
+    assert _facets(await facets.list_facets(distributor_id=abebe.id)) == {
+        "drinks": (1, Decimal("25.00"), Decimal("25.00")),
+        "hot drinks": (1, Decimal("12.00"), Decimal("12.00")),
+    }
+    assert _facets(await facets.list_facets(tenant_id=tenant.id)) == {
+        "drinks": (1, Decimal("25.00"), Decimal("25.00")),
+        "hot drinks": (1, Decimal("12.00"), Decimal("12.00")),
+    }
+
+    await repo.adjust_prices(Decimal("10"), category="drinks")
+    assert _facets(await facets.list_facets())["drinks"] == (2, Decimal("27.50"), Decimal("44.00"))
@@ -0,0 +1,47 @@
+"""Integration tests for the idempotency key table against SQLite."""
+
+from __future__ import annotations
+
+from app.repositories.idempotency_repo import IdempotencyRepository
+
+
+async def test_lock_is_exclusive_until_released(db_session) -> None:
+    repo = IdempotencyRepository(db_session)
+
+    assert await repo.lock("u:k", "fp", ttl_seconds=30) is True
+    assert await repo.lock("u:k", "fp", ttl_seconds=30) is False
+    row = await repo.get("u:k")
+    assert row is not None and row.status_code is None
+
+    await repo.release("u:k")
+    assert await repo.get("u:k") is None
+    assert await repo.lock("u:k", "fp", ttl_seconds=30) is True
+
+
+async def test_saved_response_survives_release(db_session) -> None:
+    repo = IdempotencyRepository(db_session)
+    await repo.lock("u:k", "fp", ttl_seconds=30)
+    await repo.save(
+        "u:k",
+        status_code=201,
+        body='{"id": 1}',
+        content_type="application/json",
+        headers=[("location", "/orders/1")],
+        ttl_seconds=60,
+    )
+
+    await repo.release("u:k")
+    row = await repo.get("u:k")
+
+    assert row is not None
+    assert (row.status_code, row.response_body, row.response_headers) == (201, '{"id": 1}', [["location", "/orders/1"]])
+
+
+async def test_expired_lock_can_be_taken_over(db_session) -> None:
+    repo = IdempotencyRepository(db_session)
+    await repo.lock("u:k", "stale", ttl_seconds=-1)
+
+    assert await repo.get("u:k") is None
+    assert await repo.lock("u:k", "fresh", ttl_seconds=30) is True
+    assert (await repo.get("u:k")).fingerprint == "fresh"
+    assert await repo.purge_expired() == 0
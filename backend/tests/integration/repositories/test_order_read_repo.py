@@ -0,0 +1,137 @@
+"""Integration tests for the ORM-free order read model against SQLite."""
+
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+
+from app.core.snowflake import format_code
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.user import User, UserRole
+from app.repositories.order_read_repo import OrderReadRepository
+from sqlalchemy import event, update
+
+
+async def _seed(session, n_orders: int = 3) -> tuple[User, User, list[Order]]:
+    distributor = User(phone="+251911000001", role=UserRole.DISTRIBUTOR)
+    kiosk = User(phone="+251911000002", role=UserRole.KIOSK_OWNER)
+    session.add_all([distributor, kiosk])
+    await session.flush()
+    cola = Product(name="Coca-Cola 300ml", price=Decimal("25.00"), distributor_id=distributor.id)
+    teff = Product(name="Teff Flour 1kg", price=Decimal("120.10"), distributor_id=distributor.id)
+    session.add_all([cola, teff])
+    await session.flush()
+    orders = []
+    for _ in range(n_orders):
+        order = Order(
+            user_id=kiosk.id,
+            distributor_id=distributor.id,
+            status=OrderStatus.PENDING,
+            total=Decimal("170.10"),
+            items=[
+                OrderItem(product_id=cola.id, quantity=2, unit_price=cola.price),
+                OrderItem(product_id=teff.id, quantity=1, unit_price=teff.price),
+            ],
+        )
+        session.add(order)
+        orders.append(order)
+    await session.commit()
+    return distributor, kiosk, orders
+
+
+async def test_list_orders_single_statement(db_session) -> None:
+    _, kiosk, _ = await _seed(db_session)
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, *args):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _count)
+    try:
+        items, total = await OrderReadRepository(db_session).list_orders(user_id=kiosk.id, per_page=2)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _count)
+
+    assert len(statements) == 1
+    assert total == 3
+    assert len(items) == 2
+    lines = {i.product_name: i for i in items[0].items}
+    assert lines["Teff Flour 1kg"].unit_price == Decimal("120.10")
+    assert lines["Coca-Cola 300ml"].quantity == 2
+
+
+async def test_list_orders_past_last_page_still_counts(db_session) -> None:
+    await _seed(db_session)
+    items, total = await OrderReadRepository(db_session).list_orders(page=5, per_page=2)
+    assert items == []
+    assert total == 3
+
+
+async def test_get_order(db_session) -> None:
+    _, _, orders = await _seed(db_session, n_orders=1)
+    repo = OrderReadRepository(db_session)
+
+    view = await repo.get_order(orders[0].id)
+
+    assert view is not None
+    assert view.id == orders[0].id
+    assert view.status == "pending"
+    assert len(view.items) == 2
+    assert await repo.get_order(uuid.uuid4()) is None
+
+
+async def test_stream_order_lines_in_partitions(db_session) -> None:
+    distributor, _, _ = await _seed(db_session, n_orders=3)
+    repo = OrderReadRepository(db_session)
+
+    partitions = [p async for p in repo.stream_order_lines(distributor_id=distributor.id, batch_size=4)]
+
+    assert [len(p) for p in partitions] == [4, 2]
+    row = partitions[0][0]
+    assert row["product_name"] in {"Coca-Cola 300ml", "Teff Flour 1kg"}
+    assert row["status"] == OrderStatus.PENDING
+    assert [p async for p in repo.stream_order_lines(user_id=uuid.uuid4())] == []
+
+
+async def test_last_order_template_uses_newest_order(db_session) -> None:
+    _, kiosk, orders = await _seed(db_session, n_orders=2)
+    # Lines share their order's created_at (the partition key), so they move with it.
+    newer = orders[0].created_at.replace(year=orders[0].created_at.year + 1)
+    await db_session.execute(update(OrderItem).where(OrderItem.order_id == orders[1].id).values(created_at=newer))
+    orders[1].created_at = newer
+    await db_session.commit()
+    repo = OrderReadRepository(db_session)
+
+    template = await repo.last_order_template(kiosk.id)
+
+    assert template is not None
+    assert template.order_id == orders[1].id
+    assert sorted(i.quantity for i in template.items) == [1, 2]
+    assert await repo.last_order_template(uuid.uuid4()) is None
+
+
+async def test_keyset_pages_by_code(db_session) -> None:
+    _, kiosk, orders = await _seed(db_session, n_orders=5)
+    repo = OrderReadRepository(db_session)
+    newest_first = sorted(orders, key=lambda o: o.code, reverse=True)
+
+    first, _ = await repo.list_orders(user_id=kiosk.id, per_page=2, before_code=newest_first[0].code + 1)
+    second, remaining = await repo.list_orders(user_id=kiosk.id, per_page=2, before_code=newest_first[1].code)
+
+    assert [o.id for o in first] == [o.id for o in newest_first[:2]]
+    assert [o.id for o in second] == [o.id for o in newest_first[2:4]]
+    assert remaining == 3
+
+
+async def test_get_order_by_code(db_session) -> None:
+    _, kiosk, orders = await _seed(db_session, n_orders=2)
+    repo = OrderReadRepository(db_session)
+
+    view = await repo.get_order_by_code(orders[1].code, user_id=kiosk.id)
+
+    assert view is not None
+    assert view.id == orders[1].id
+    assert view.code == format_code(orders[1].code)
+    assert await repo.get_order_by_code(orders[1].code, user_id=uuid.uuid4()) is None
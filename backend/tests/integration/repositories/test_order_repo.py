@@ -0,0 +1,115 @@
+"""Integration tests for OrderRepository against SQLite."""
+
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+
+import pytest
+from app.models.credit_ledger import LedgerKind
+from app.models.order import Order, OrderStatus
+from app.models.product import Product
+from app.models.user import User, UserRole
+from app.repositories.credit_repo import CreditRepository, InsufficientCreditError
+from app.repositories.order_repo import OrderRepository
+from app.schemas.order import OrderCreate, OrderItemCreate
+from sqlalchemy.exc import InvalidRequestError
+
+
+async def _seed(session, statuses: list[OrderStatus]) -> tuple[User, list[Order]]:
+    distributor = User(phone="+251911000001", role=UserRole.DISTRIBUTOR)
+    kiosk = User(phone="+251911000002", role=UserRole.KIOSK_OWNER)
+    session.add_all([distributor, kiosk])
+    await session.flush()
+    orders = [
+        Order(user_id=kiosk.id, distributor_id=distributor.id, status=st, total=Decimal("10.00"))
+        for st in statuses
+    ]
+    session.add_all(orders)
+    await session.flush()
+    return distributor, orders
+
+
+async def test_bulk_update_respects_state_machine(db_session) -> None:
+    _, orders = await _seed(
+        db_session, [OrderStatus.PENDING, OrderStatus.PENDING, OrderStatus.DELIVERED]
+    )
+    missing = uuid.uuid4()
+    repo = OrderRepository(db_session)
+
+    updated, rejected = await repo.bulk_update_order_status(
+        [o.id for o in orders] + [missing], "confirmed"
+    )
+
+    assert {change.id for change in updated} == {orders[0].id, orders[1].id}
+    assert all(change.status == "confirmed" for change in updated)
+    reasons = dict(rejected)
+    assert reasons[orders[2].id] == "Cannot transition from delivered to confirmed"
+    assert reasons[missing] == "Order not found"
+
+
+async def test_bulk_update_scoped_to_distributor(db_session) -> None:
+    _, orders = await _seed(db_session, [OrderStatus.PENDING])
+    repo = OrderRepository(db_session)
+
+    updated, rejected = await repo.bulk_update_order_status(
+        [orders[0].id], "confirmed", distributor_id=uuid.uuid4()
+    )
+
+    assert updated == []
+    assert rejected == [(orders[0].id, "Order not found")]
+
+
+async def test_orders_load_only_their_lines(db_session) -> None:
+    distributor, _ = await _seed(db_session, [])
+    kiosk = User(phone="+251911000003")
+    db_session.add(kiosk)
+    await db_session.flush()
+    tea = Product(name="Tea", price=Decimal("5.00"), distributor_id=distributor.id)
+    db_session.add(tea)
+    await db_session.flush()
+    repo = OrderRepository(db_session)
+    data = OrderCreate(distributor_id=distributor.id, items=[OrderItemCreate(product_id=tea.id, quantity=2)])
+
+    created = await repo.create_order(kiosk.id, data, {tea.id: tea})
+    confirmed = await repo.update_order_status(created.id, "confirmed")
+
+    assert [(i.quantity, i.product.name) for i in confirmed.items] == [(2, "Tea")]
+    # Anything the response doesn't read stays unloaded, and says so instead of querying.
+    with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+        _ = confirmed.user
+    with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+        _ = tea.order_items
+
+
+async def test_bnpl_orders_charge_credit_and_cancelling_releases_it(db_session) -> None:
+    distributor, _ = await _seed(db_session, [])
+    kiosk = User(phone="+251911000004", role=UserRole.KIOSK_OWNER)
+    db_session.add(kiosk)
+    await db_session.flush()
+    tea = Product(name="Tea", price=Decimal("100.00"), distributor_id=distributor.id)
+    db_session.add(tea)
+    await db_session.flush()
+    credit = CreditRepository(db_session)
+    profile = await credit.create_default_profile(kiosk.id)
+    repo = OrderRepository(db_session)
+
+    def bnpl(quantity: int) -> OrderCreate:
+        return OrderCreate(
+            distributor_id=distributor.id,
+            items=[OrderItemCreate(product_id=tea.id, quantity=quantity)],
+            payment_method="bnpl",
+        )
+
+    first = await repo.create_order(kiosk.id, bnpl(3), {tea.id: tea})
+    assert first.payment_method == "bnpl"
+    with pytest.raises(InsufficientCreditError):
+        await repo.create_order(kiosk.id, bnpl(3), {tea.id: tea})
+
+    await repo.update_order_status(first.id, "cancelled")
+    await db_session.refresh(profile)
+    assert profile.current_balance == Decimal("0.00")
+    assert [(e.kind, e.amount, e.order_id) for e in await credit.list_entries(profile.id)] == [
+        (LedgerKind.ADJUSTMENT, Decimal("-300.00"), first.id),
+        (LedgerKind.CHARGE, Decimal("300.00"), first.id),
+    ]
@@ -0,0 +1,107 @@
+"""Integration tests for OutboxRepository against SQLite."""
+
+from __future__ import annotations
+
+import datetime
+import uuid
+from decimal import Decimal
+
+from app.models.order import OrderStatus
+from app.models.outbox import ORDER_CREATED, ORDER_STATUS_CHANGED, OutboxMessage
+from app.models.product import Product
+from app.models.user import User, UserRole
+from app.repositories.order_repo import OrderRepository
+from app.repositories.outbox_repo import OutboxRepository
+from app.schemas.order import OrderCreate, OrderItemCreate
+from sqlalchemy import select
+
+
+async def _messages(session) -> list[OutboxMessage]:
+    return list((await session.execute(select(OutboxMessage).order_by(OutboxMessage.id))).scalars())
+
+
+async def test_claim_leases_in_enqueue_order(db_session) -> None:
+    repo = OutboxRepository(db_session)
+    ids = [uuid.uuid4() for _ in range(3)]
+    for order_id in ids:
+        repo.add(ORDER_CREATED, {"order_id": order_id, "total": Decimal("1.50")})
+    await db_session.flush()
+
+    claimed = await repo.claim(limit=2, lease_seconds=60, max_attempts=5)
+
+    assert [m.payload["order_id"] for m in claimed] == [str(ids[0]), str(ids[1])]
+    assert claimed[0].payload["total"] == "1.50"
+    assert all(m.attempts == 1 for m in claimed)
+    # Leased messages are not due again until the lease runs out.
+    rest = await repo.claim(limit=10, lease_seconds=60, max_attempts=5)
+    assert [m.payload["order_id"] for m in rest] == [str(ids[2])]
+    assert await repo.claim(limit=10, lease_seconds=60, max_attempts=5) == []
+
+
+async def test_reschedule_and_mark_processed(db_session) -> None:
+    repo = OutboxRepository(db_session)
+    repo.add(ORDER_CREATED, {"n": 1})
+    repo.add(ORDER_CREATED, {"n": 2})
+    await db_session.flush()
+    first, second = await repo.claim(limit=10, lease_seconds=60, max_attempts=5)
+
+    await repo.mark_processed([first.id])
+    await repo.reschedule(second.id, error="RedisError('down')", delay_seconds=0)
+
+    retried = await repo.claim(limit=10, lease_seconds=60, max_attempts=5)
+    assert [(m.id, m.attempts) for m in retried] == [(second.id, 2)]
+    rows = {m.id: m for m in await _messages(db_session)}
+    assert rows[first.id].processed_at is not None
+    assert rows[second.id].last_error == "RedisError('down')"
+
+
+async def test_claim_skips_exhausted_messages(db_session) -> None:
+    repo = OutboxRepository(db_session)
+    repo.add(ORDER_CREATED, {"n": 1})
+    await db_session.flush()
+    (message,) = await repo.claim(limit=10, lease_seconds=60, max_attempts=1)
+    await repo.reschedule(message.id, error="boom", delay_seconds=0)
+
+    assert await repo.claim(limit=10, lease_seconds=60, max_attempts=1) == []
+
+
+async def test_purge_processed(db_session) -> None:
+    repo = OutboxRepository(db_session)
+    repo.add(ORDER_CREATED, {"n": 1})
+    repo.add(ORDER_CREATED, {"n": 2})
+    await db_session.flush()
+    done, _ = await repo.claim(limit=10, lease_seconds=60, max_attempts=5)
+    await repo.mark_processed([done.id])
+
+    assert await repo.purge_processed(datetime.timedelta(seconds=-1)) == 1
+    assert len(await _messages(db_session)) == 1
+
+
+async def test_order_writes_enqueue_in_same_transaction(db_session) -> None:
+    distributor = User(phone="+251911000001", role=UserRole.DISTRIBUTOR)
+    kiosk = User(phone="+251911000002", role=UserRole.KIOSK_OWNER)
+    db_session.add_all([distributor, kiosk])
+    await db_session.flush()
+    product = Product(name="Sugar 1kg", price=Decimal("80.00"), distributor_id=distributor.id)
+    db_session.add(product)
+    await db_session.flush()
+    repo = OrderRepository(db_session)
+
+    order = await repo.create_order(
+        user_id=kiosk.id,
+        data=OrderCreate(
+            distributor_id=distributor.id, items=[OrderItemCreate(product_id=product.id, quantity=2)]
+        ),
+        products={product.id: product},
+    )
+    await repo.bulk_update_order_status([order.id], "confirmed")
+
+    created, changed = await _messages(db_session)
+    assert created.topic == ORDER_CREATED
+    assert created.payload["order_id"] == str(order.id)
+    assert created.payload["items"] == [{"product_id": str(product.id), "quantity": 2}]
+    assert changed.topic == ORDER_STATUS_CHANGED
+    assert changed.payload["status"] == OrderStatus.CONFIRMED.value
+
+    await db_session.rollback()
+    assert await _messages(db_session) == []
@@ -0,0 +1,76 @@
+"""Integration tests for price lists and tiered order pricing, against SQLite."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from app.core.exceptions import ValidationError
+from app.core.pricing import PriceBook
+from app.models.user import User, UserRole
+from app.repositories.order_repo import OrderRepository
+from app.repositories.price_list_repo import PriceListRepository
+from app.repositories.product_repo import ProductRepository
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.schemas.price_list import PriceListCreate, PriceListUpdate, PriceTierIn
+
+
+async def test_tiers_price_orders(db_session) -> None:
+    distributor = User(phone="+251911000001", role=UserRole.DISTRIBUTOR)
+    rival = User(phone="+251911000002", role=UserRole.DISTRIBUTOR)
+    kiosk = User(phone="+251911000003", role=UserRole.KIOSK_OWNER)
+    db_session.add_all([distributor, rival, kiosk])
+    await db_session.flush()
+    products = ProductRepository(db_session)
+    tea = await products.create_product(name="Tea", price=Decimal("10.00"), distributor_id=distributor.id)
+    cola = await products.create_product(name="Cola", price=Decimal("20.00"), distributor_id=rival.id)
+    repo = PriceListRepository(db_session)
+
+    volume = await repo.create_price_list(
+        distributor.id,
+        PriceListCreate(name="Volume", tiers=[PriceTierIn(product_id=tea.id, min_quantity=10, unit_price="9.00")]),
+    )
+    await repo.create_price_list(
+        distributor.id,
+        PriceListCreate(
+            name="Wholesale",
+            segment="wholesale",
+            tiers=[PriceTierIn(product_id=tea.id, min_quantity=10, unit_price="8.50")],
+        ),
+    )
+    assert [(t.min_quantity, t.unit_price) for t in volume.tiers] == [(10, Decimal("9.00"))]
+    with pytest.raises(ValidationError):
+        await repo.create_price_list(
+            distributor.id,
+            PriceListCreate(name="Theirs", tiers=[PriceTierIn(product_id=cola.id, unit_price="1.00")]),
+        )
+
+    book = PriceBook.compile(await repo.active_tiers(distributor.id))
+    orders = OrderRepository(db_session)
+    # Quantity breaks count the product across lines: 6 + 6 reaches the 10+ tier.
+    data = OrderCreate(
+        distributor_id=distributor.id,
+        items=[OrderItemCreate(product_id=tea.id, quantity=6), OrderItemCreate(product_id=tea.id, quantity=6)],
+    )
+    order = await orders.create_order(kiosk.id, data, {tea.id: tea}, prices=book)
+    assert [i.unit_price for i in order.items] == [Decimal("9.00"), Decimal("9.00")]
+    assert order.total == Decimal("108.00")
+    order = await orders.create_order(kiosk.id, data, {tea.id: tea}, prices=book, segment="wholesale")
+    assert order.total == Decimal("102.00")
+
+    # Deactivating and replacing tiers reach the next compiled book.
+    volume = await repo.update_price_list(volume, PriceListUpdate(is_active=False))
+    assert book.unit_price(tea.id, 12, tea.price) == Decimal("9.00")
+    book = PriceBook.compile(await repo.active_tiers(distributor.id))
+    assert book.unit_price(tea.id, 12, tea.price) == Decimal("10.00")
+    assert book.unit_price(tea.id, 12, tea.price, "wholesale") == Decimal("8.50")
+
+    await repo.update_price_list(
+        volume, PriceListUpdate(is_active=True, tiers=[PriceTierIn(product_id=tea.id, unit_price="9.50")])
+    )
+    book = PriceBook.compile(await repo.active_tiers(distributor.id))
+    assert book.unit_price(tea.id, 1, tea.price) == Decimal("9.50")
+
+    await repo.delete_price_list(volume)
+    assert [p.name for p in await repo.list_price_lists(distributor.id)] == ["Wholesale"]
+    assert len(await repo.active_tiers(distributor.id)) == 1
@@ -0,0 +1,259 @@
+"""Integration tests for ProductRepository against SQLite."""
+
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import settings
+from app.models.user import User, UserRole
+from app.repositories.product_repo import ProductRepository
+from app.schemas.product import ProductChange
+from app.services.product_import import import_products
+from sqlalchemy.exc import DBAPIError
+
+
+async def _seed(session, *names: str) -> User:
+    distributor = User(phone="+251911000001", role=UserRole.DISTRIBUTOR)
+    session.add(distributor)
+    await session.flush()
+    repo = ProductRepository(session)
+    for name in names:
+        await repo.create_product(name=name, price=Decimal("10.00"), distributor_id=distributor.id)
+    return distributor
+
+
+async def test_search_folds_script_and_ranks(db_session) -> None:
+    await _seed(db_session, "ጤፍ ነጭ 5kg", "Teff flour 1kg", "Sukkar 1kg", "Soap")
+    repo = ProductRepository(db_session)
+
+    products, total = await repo.list_products(search="teff")
+    assert total == 2
+    assert {p.name for p in products} == {"ጤፍ ነጭ 5kg", "Teff flour 1kg"}
+
+    products, total = await repo.list_products(search="sukar")
+    assert [p.name for p in products] == ["Sukkar 1kg"]
+
+
+async def test_search_pages_and_respects_filters(db_session) -> None:
+    distributor = await _seed(db_session, "Buna 250g", "Buna 500g", "Buna 1kg")
+    repo = ProductRepository(db_session)
+    products, _ = await repo.list_products(search="buna")
+    await repo.delete_product(products[0].id)
+
+    first, total = await repo.list_products(search="ቡና", per_page=1, distributor_id=distributor.id)
+    second, _ = await repo.list_products(search="ቡና", per_page=1, page=2, distributor_id=distributor.id)
+    assert total == 2
+    assert first[0].id != second[0].id
+    assert products[0].id not in {first[0].id, second[0].id}
+
+
+async def test_export_search_matches_list_search(db_session) -> None:
+    distributor = await _seed(db_session, "ጤፍ ነጭ 5kg", "Teff flour 1kg", "Sukkar 1kg", "Soap")
+    repo = ProductRepository(db_session)
+
+    # "teff" also finds the Amharic name and "sukar" the misspelt one, which a substring match would miss.
+    for search, expected in (("teff", 2), ("sukar", 1)):
+        listed, _ = await repo.list_products(search=search, distributor_id=distributor.id)
+        stream = repo.stream_products(search=search, distributor_id=distributor.id)
+        exported = [row async for rows in stream for row in rows]
+        assert len(exported) == expected
+        assert {r["id"] for r in exported} == {p.id for p in listed}
+
+
+async def test_update_refolds_name(db_session) -> None:
+    await _seed(db_session, "Soap")
+    repo = ProductRepository(db_session)
+    (product,), _ = await repo.list_products(search="soap")
+
+    await repo.update_product(product.id, {"name": "ሳሙና"})
+
+    assert (await repo.list_products(search="samuna"))[1] == 1
+    assert (await repo.list_products(search="soap"))[1] == 0
+
+
+async def _records(*rows: dict):  # type: ignore[no-untyped-def]
+    for line, row in enumerate(rows, start=2):
+        yield line, row, None
+
+
+async def test_import_upserts_by_sku_and_reports_errors(db_session) -> None:
+    distributor = await _seed(db_session)
+    other = User(phone="+251911000009", role=UserRole.DISTRIBUTOR)
+    db_session.add(other)
+    await db_session.flush()
+    await ProductRepository(db_session).create_product(
+        name="Theirs", price=Decimal("5.00"), distributor_id=other.id, sku="TAKEN"
+    )
+    await ProductRepository(db_session).create_product(
+        name="Old tea", price=Decimal("5.00"), distributor_id=distributor.id, sku="TEA"
+    )
+
+    with (
+        patch("app.services.catalog_cache.bump", new_callable=AsyncMock),
+        patch.object(settings, "PRODUCT_IMPORT_BATCH_SIZE", 2),
+    ):
+        report = await import_products(
+            db_session,
+            _records(
+                {"name": "Tea", "price": "9.99", "sku": "TEA"},
+                {"name": "ቡና", "price": "120.00", "sku": "BUN"},
+                {"name": "Nope", "price": "-1", "sku": "NEG"},
+                {"name": "No SKU", "price": "1.00"},
+                {"name": "Stolen", "price": "1.00", "sku": "TAKEN"},
+                {"name": "Buna 1kg", "price": "130.00", "sku": "BUN"},
+            ),
+            distributor_id=distributor.id,
+            restrict_to=distributor.id,
+        )
+
+    assert (report.received, report.inserted, report.updated, report.failed) == (6, 1, 2, 3)
+    assert [(e.line, e.sku) for e in report.errors] == [(4, "NEG"), (5, None), (6, "TAKEN")]
+    assert report.errors[0].message.startswith("price:")
+    by_sku = {p.sku: p for p in (await ProductRepository(db_session).list_products(per_page=10))[0]}
+    assert by_sku["TEA"].name == "Tea"
+    assert by_sku["TEA"].price == Decimal("9.99")
+    assert by_sku["BUN"].name == "Buna 1kg"
+    assert by_sku["TAKEN"].name == "Theirs"
+    assert (await ProductRepository(db_session).list_products(search="buna"))[1] == 1
+
+
+async def test_import_counts_a_repeated_sku_once_per_batch(db_session) -> None:
+    distributor = await _seed(db_session)
+
+    with patch("app.services.catalog_cache.bump", new_callable=AsyncMock):
+        report = await import_products(
+            db_session,
+            _records(
+                {"name": "Tea", "price": "9.99", "sku": "TEA"},
+                {"name": "Tea 250g", "price": "10.50", "sku": "TEA"},
+            ),
+            distributor_id=distributor.id,
+        )
+
+    assert (report.received, report.inserted, report.updated, report.failed) == (2, 1, 0, 0)
+    products, total = await ProductRepository(db_session).list_products(per_page=10)
+    assert total == 1
+    assert products[0].name == "Tea 250g"
+
+
+async def test_import_reports_unknown_distributors_and_rejected_batches(db_session) -> None:
+    distributor = await _seed(db_session)
+    await db_session.commit()
+    upsert = ProductRepository.upsert_products
+    calls = 0
+
+    async def _failing_second(self, products):  # type: ignore[no-untyped-def]
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise DBAPIError("INSERT INTO products ...", {}, Exception("deadlock detected"))
+        return await upsert(self, products)
+
+    with (
+        patch("app.services.catalog_cache.bump", new_callable=AsyncMock),
+        patch.object(settings, "PRODUCT_IMPORT_BATCH_SIZE", 2),
+        patch.object(ProductRepository, "upsert_products", _failing_second),
+    ):
+        report = await import_products(
+            db_session,
+            _records(
+                {"name": "Tea", "price": "9.99", "sku": "TEA"},
+                {"name": "Ghost", "price": "1.00", "sku": "GHO", "distributor_id": str(uuid.uuid4())},
+                {"name": "Buna", "price": "120.00", "sku": "BUN"},
+                {"name": "Sugar", "price": "60.00", "sku": "SUG"},
+                {"name": "Salt", "price": "15.00", "sku": "SAL"},
+                {"name": "Soap", "price": "30.00", "sku": "SOA"},
+            ),
+            distributor_id=distributor.id,
+        )
+
+    assert (report.received, report.inserted, report.failed) == (6, 3, 3)
+    assert [(e.line, e.sku, e.message) for e in report.errors] == [
+        (3, "GHO", "distributor_id: no such distributor"),
+        (4, "BUN", "rejected by the database"),
+        (5, "SUG", "rejected by the database"),
+    ]
+    products, _ = await ProductRepository(db_session).list_products(per_page=10)
+    assert {p.sku for p in products} == {"TEA", "SAL", "SOA"}
+
+
+async def test_bulk_update_by_id_and_sku(db_session) -> None:
+    distributor = await _seed(db_session)
+    repo = ProductRepository(db_session)
+    tea = await repo.create_product(name="Tea", price=Decimal("10.00"), distributor_id=distributor.id, sku="TEA")
+    soap = await repo.create_product(name="Soap", price=Decimal("20.00"), distributor_id=distributor.id, sku="SOAP")
+    theirs = await repo.create_product(name="Theirs", price=Decimal("5.00"), distributor_id=uuid.uuid4(), sku="X")
+
+    rows, not_found = await repo.bulk_update_products(
+        [
+            ProductChange(id=tea.id, price=Decimal("11.00")),
+            ProductChange(sku="SOAP", is_active=False),
+            ProductChange(sku="X", price=Decimal("1.00")),
+            ProductChange(sku="MISSING", price=Decimal("1.00")),
+        ],
+        distributor_id=distributor.id,
+    )
+
+    assert {(r.sku, r.price, r.is_active) for r in rows} == {
+        ("TEA", Decimal("11.00"), True),
+        ("SOAP", Decimal("20.00"), False),
+    }
+    assert not_found == ["X", "MISSING"]
+    await db_session.refresh(theirs)
+    assert theirs.price == Decimal("5.00")
+    assert soap.id in {r.id for r in rows}
+
+
+async def test_bulk_update_merges_changes_to_the_same_product(db_session) -> None:
+    distributor = await _seed(db_session)
+    repo = ProductRepository(db_session)
+    tea = await repo.create_product(name="Tea", price=Decimal("10.00"), distributor_id=distributor.id, sku="TEA")
+
+    # The same product by id and by SKU: one UPDATE row, fields overlaid in order.
+    rows, not_found = await repo.bulk_update_products(
+        [
+            ProductChange(id=tea.id, price=Decimal("11.00")),
+            ProductChange(sku="TEA", is_active=False),
+            ProductChange(id=tea.id, price=Decimal("12.00")),
+        ],
+        distributor_id=distributor.id,
+    )
+
+    assert [(r.id, r.price, r.is_active) for r in rows] == [(tea.id, Decimal("12.00"), False)]
+    assert not_found == []
+
+
+async def test_adjust_prices_by_category(db_session) -> None:
+    distributor = await _seed(db_session)
+    repo = ProductRepository(db_session)
+    await repo.create_product(name="Tea", price=Decimal("10.00"), distributor_id=distributor.id, category="drinks")
+    await repo.create_product(name="Soap", price=Decimal("20.00"), distributor_id=distributor.id, category="home")
+
+    rows = await repo.adjust_prices(Decimal("7.5"), category="drinks", distributor_id=distributor.id)
+
+    assert [r.price for r in rows] == [Decimal("10.75")]
+
+
+async def test_changes_since_pages_and_tombstones(db_session) -> None:
+    distributor = await _seed(db_session, "Tea", "Soap", "Salt")
+    repo = ProductRepository(db_session)
+
+    rows, has_more, _ = await repo.changes_since(None, distributor_id=distributor.id, limit=2)
+    assert has_more and len(rows) == 2
+    rest, has_more, watermark = await repo.changes_since((rows[-1].change_seq, rows[-1].id), limit=2)
+    assert not has_more
+    assert {r.name for r in [*rows, *rest]} == {"Tea", "Soap", "Salt"}
+
+    # Caught up: nothing new until something changes.
+    assert (await repo.changes_since((watermark, None)))[0] == []
+    await repo.delete_product(rows[0].id)
+    await repo.update_product(rows[1].id, {"price": Decimal("12.00")})
+
+    changed, _, _ = await repo.changes_since((watermark, None))
+    assert [(r.id, r.is_active) for r in changed] == [(rows[0].id, False), (rows[1].id, True)]
+
+    # An initial sync never ships tombstones.
+    initial, _, _ = await repo.changes_since(None)
+    assert rows[0].id not in {r.id for r in initial}
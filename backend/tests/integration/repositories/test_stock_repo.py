@@ -0,0 +1,62 @@
+"""Integration tests for striped stock reservations through the order lifecycle, against SQLite."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from app.models.order import OrderStatus
+from app.models.user import User, UserRole
+from app.repositories.order_repo import OrderRepository
+from app.repositories.product_repo import ProductRepository
+from app.repositories.stock_repo import InsufficientStockError, StockRepository
+from app.schemas.order import OrderCreate, OrderItemCreate
+
+
+async def test_reservations_hold_commit_and_release(db_session) -> None:
+    distributor = User(phone="+251911000001", role=UserRole.DISTRIBUTOR)
+    kiosk = User(phone="+251911000002", role=UserRole.KIOSK_OWNER)
+    db_session.add_all([distributor, kiosk])
+    await db_session.flush()
+    products = ProductRepository(db_session)
+    cola = await products.create_product(name="Cola", price=Decimal("15.00"), distributor_id=distributor.id)
+    salt = await products.create_product(name="Salt", price=Decimal("5.00"), distributor_id=distributor.id)
+    stock = StockRepository(db_session)
+    orders = OrderRepository(db_session)
+
+    assert await stock.set_stock(cola.id, 10, stripes=4) == (cola.id, 10, 0, 4)
+    await db_session.refresh(cola)
+    assert cola.track_stock and not salt.track_stock
+
+    async def order(quantity: int):  # type: ignore[no-untyped-def]
+        data = OrderCreate(
+            distributor_id=distributor.id,
+            items=[
+                OrderItemCreate(product_id=cola.id, quantity=quantity),
+                # Untracked: never checked, never reserved.
+                OrderItemCreate(product_id=salt.id, quantity=99),
+            ],
+        )
+        return await orders.create_order(kiosk.id, data, {cola.id: cola, salt.id: salt})
+
+    # Stripes hold 3, 3, 2, 2: two units fit one stripe, five have to span several.
+    small = await order(2)
+    large = await order(5)
+    assert await stock.get_stock(cola.id) == (cola.id, 3, 7, 4)
+    # The savepoint keeps the session usable, as the rolled-back request would leave it.
+    with pytest.raises(InsufficientStockError):
+        async with db_session.begin_nested():
+            await order(4)
+    assert await stock.get_stock(cola.id) == (cola.id, 3, 7, 4)
+
+    await orders.update_order_status(large.id, "cancelled")
+    assert await stock.get_stock(cola.id) == (cola.id, 8, 2, 4)
+    for status in ("confirmed", "shipped"):
+        await orders.update_order_status(small.id, status)
+    assert await stock.get_stock(cola.id) == (cola.id, 8, 0, 4)
+
+    # Re-striping keeps reservations; a release finds its way back.
+    held = await order(6)
+    await stock.set_stock(cola.id, 20, stripes=2)
+    await orders.bulk_update_order_status([held.id], OrderStatus.CANCELLED.value)
+    assert await stock.get_stock(cola.id) == (cola.id, 26, 0, 2)
@@ -0,0 +1,83 @@
+"""Unit tests for the analytics KPI endpoint."""
+
+from __future__ import annotations
+
+import datetime
+import uuid
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.core.security import create_access_token
+from app.main import app
+from app.models.user import User, UserRole
+from app.schemas.analytics import KPIResponse
+from httpx import ASGITransport, AsyncClient
+
+PREFIX = "/api/v1/analytics/kpis"
+
+
+def _make_user(role: UserRole) -> MagicMock:
+    user = MagicMock(spec=User)
+    user.id = uuid.uuid4()
+    user.role = role
+    user.tenant_id = uuid.uuid4()
+    user.is_active = True
+    return user
+
+
+@pytest.fixture(autouse=True)
+def _clear_overrides():
+    yield
+    app.dependency_overrides.clear()
+
+
+def _setup_auth(user: MagicMock) -> dict[str, str]:
+    from app.api.deps import get_current_user, get_db
+
+    async def _fake_current_user():
+        return user
+
+    async def _fake_db():
+        yield AsyncMock()
+
+    app.dependency_overrides[get_current_user] = _fake_current_user
+    app.dependency_overrides[get_db] = _fake_db
+    return {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+
+def _kpis(day: datetime.date) -> KPIResponse:
+    return KPIResponse(
+        date_from=day, date_to=day, gmv=Decimal("100.00"), order_count=2,
+        orders_by_status={"pending": 2}, top_products=[],
+    )
+
+
+async def test_distributor_is_scoped_to_self() -> None:
+    user = _make_user(UserRole.DISTRIBUTOR)
+    headers = _setup_auth(user)
+    day = datetime.date(2026, 1, 1)
+
+    with patch(
+        "app.repositories.analytics_repo.AnalyticsRepository.get_kpis", new_callable=AsyncMock
+    ) as mock_kpis:
+        mock_kpis.return_value = _kpis(day)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            resp = await ac.get(
+                PREFIX,
+                params={"date_from": "2026-01-01", "date_to": "2026-01-01", "distributor_id": str(uuid.uuid4())},
+                headers=headers,
+            )
+
+    assert resp.status_code == 200
+    assert resp.json()["order_count"] == 2
+    assert mock_kpis.call_args.kwargs["distributor_id"] == user.id
+
+
+async def test_rejects_inverted_range() -> None:
+    headers = _setup_auth(_make_user(UserRole.ADMIN))
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        resp = await ac.get(PREFIX, params={"date_from": "2026-02-01", "date_to": "2026-01-01"}, headers=headers)
+    assert resp.status_code == 422
@@ -10,6 +10,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from app.core.security import create_access_token
 from app.main import app
+from app.models.credit_ledger import CreditLedgerEntry, LedgerKind
 from app.models.credit_profile import CreditProfile
 from app.models.user import User, UserRole
 from httpx import ASGITransport, AsyncClient
@@ -175,3 +176,101 @@ async def test_credit_profile_forbidden_for_distributor() -> None:
         resp = await ac.get("/api/v1/credit/profile", headers=_auth_header(user))
 
     assert resp.status_code == 403
+
+
+def _make_entry(profile_id: uuid.UUID, seq: int, **overrides) -> MagicMock:
+    defaults = dict(
+        id=uuid.uuid4(),
+        profile_id=profile_id,
+        seq=seq,
+        kind=LedgerKind.CHARGE,
+        amount=Decimal("10.00"),
+        balance_after=Decimal("10.00") * seq,
+        order_id=None,
+        note=None,
+        created_at=datetime.now(timezone.utc),
+    )
+    defaults.update(overrides)
+    entry = MagicMock(spec=CreditLedgerEntry)
+    for k, v in defaults.items():
+        setattr(entry, k, v)
+    return entry
+
+
+async def test_get_credit_ledger_full_page_has_cursor() -> None:
+    user = _make_user()
+    profile = _make_profile(user.id)
+    entries = [_make_entry(profile.id, seq) for seq in (5, 4)]
+    _setup_overrides(user)
+
+    with (
+        patch(
+            "app.repositories.credit_repo.CreditRepository.get_credit_profile",
+            new_callable=AsyncMock,
+            return_value=profile,
+        ),
+        patch(
+            "app.repositories.credit_repo.CreditRepository.list_entries",
+            new_callable=AsyncMock,
+            return_value=entries,
+        ) as list_entries,
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            resp = await ac.get("/api/v1/credit/ledger?limit=2&before=6", headers=_auth_header(user))
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [i["seq"] for i in body["items"]] == [5, 4]
+    assert body["next_before"] == 4
+    list_entries.assert_awaited_once_with(profile.id, before=6, limit=2)
+
+
+async def test_post_credit_entry_as_admin() -> None:
+    admin = _make_user(role=UserRole.ADMIN)
+    kiosk_id = uuid.uuid4()
+    profile = _make_profile(kiosk_id)
+    entry = _make_entry(profile.id, 3, kind=LedgerKind.REPAYMENT, amount=Decimal("-50.00"))
+    mock_db = _setup_overrides(admin)
+
+    with (
+        patch(
+            "app.repositories.credit_repo.CreditRepository.get_credit_profile",
+            new_callable=AsyncMock,
+            return_value=profile,
+        ),
+        patch(
+            "app.repositories.credit_repo.CreditRepository.post_entry",
+            new_callable=AsyncMock,
+            return_value=entry,
+        ) as post_entry,
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            resp = await ac.post(
+                "/api/v1/credit/ledger",
+                json={"user_id": str(kiosk_id), "kind": "repayment", "amount": "50.00"},
+                headers=_auth_header(admin),
+            )
+
+    assert resp.status_code == 201
+    assert Decimal(resp.json()["amount"]) == Decimal("-50.00")
+    post_entry.assert_awaited_once_with(
+        profile.id, LedgerKind.REPAYMENT, Decimal("50.00"), order_id=None, note=None
+    )
+    mock_db.commit.assert_awaited_once()
+
+
+async def test_post_credit_entry_forbidden_for_kiosk() -> None:
+    user = _make_user()
+    _setup_overrides(user)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        resp = await ac.post(
+            "/api/v1/credit/ledger",
+            json={"user_id": str(user.id), "kind": "charge", "amount": "50.00"},
+            headers=_auth_header(user),
+        )
+
+    assert resp.status_code == 403
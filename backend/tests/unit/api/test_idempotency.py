@@ -0,0 +1,160 @@
+"""Unit tests for Idempotency-Key replay on write endpoints."""
+
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.core.security import create_access_token
+from app.main import app
+from app.models.product import Product
+from app.models.user import User, UserRole
+from app.services import idempotency
+from httpx import ASGITransport, AsyncClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+PREFIX = "/api/v1/products"
+PAYLOAD = {"name": "Test Product", "price": "25.50", "category": "beverages", "distributor_id": str(uuid.uuid4())}
+
+
+class _MemoryStore:
+    def __init__(self) -> None:
+        self.entries: dict[str, idempotency.StoredResponse] = {}
+
+    async def get(self, key):  # type: ignore[no-untyped-def]
+        return self.entries.get(key)
+
+    async def lock(self, key, fingerprint):  # type: ignore[no-untyped-def]
+        if key in self.entries:
+            return False
+        self.entries[key] = idempotency.StoredResponse(fingerprint)
+        return True
+
+    async def save(self, key, record):  # type: ignore[no-untyped-def]
+        self.entries[key] = record
+
+    async def release(self, key):  # type: ignore[no-untyped-def]
+        self.entries.pop(key, None)
+
+
+def _make_product() -> MagicMock:
+    product = MagicMock(spec=Product)
+    for k, v in dict(
+        id=uuid.uuid4(), name="Test Product", sku=None, price=Decimal("25.50"), category="beverages",
+        distributor_id=uuid.uuid4(), is_active=True,
+        created_at="2025-01-01T00:00:00+00:00", updated_at="2025-01-01T00:00:00+00:00",
+    ).items():
+        setattr(product, k, v)
+    return product
+
+
+@pytest.fixture
+def user() -> MagicMock:
+    from app.api.deps import get_current_user, get_db
+
+    user = MagicMock(spec=User)
+    user.id = uuid.uuid4()
+    user.role = UserRole.DISTRIBUTOR
+    user.is_active = True
+
+    async def _fake_current_user():
+        return user
+
+    async def _fake_db():
+        yield AsyncMock()
+
+    app.dependency_overrides[get_current_user] = _fake_current_user
+    app.dependency_overrides[get_db] = _fake_db
+    yield user
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def store():  # type: ignore[no-untyped-def]
+    memory = _MemoryStore()
+    with patch.object(idempotency, "redis_store", memory):
+        yield memory
+
+
+def _headers(user: MagicMock, key: str) -> dict[str, str]:
+    token = create_access_token(str(user.id), extra={"role": user.role.value})
+    return {"Authorization": f"Bearer {token}", "Idempotency-Key": key}
+
+
+async def _post(headers: dict[str, str], payload: dict = PAYLOAD):  # type: ignore[no-untyped-def]
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        return await ac.post(PREFIX, json=payload, headers=headers)
+
+
+async def test_retry_replays_without_reexecuting(user, store) -> None:
+    with patch("app.repositories.product_repo.ProductRepository.create_product", new_callable=AsyncMock) as create:
+        create.return_value = _make_product()
+        first = await _post(_headers(user, "k-1"))
+        second = await _post(_headers(user, "k-1"))
+
+    assert create.await_count == 1
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json()
+    assert second.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+
+
+async def test_key_reused_with_different_body_is_rejected(user, store) -> None:
+    with patch("app.repositories.product_repo.ProductRepository.create_product", new_callable=AsyncMock) as create:
+        create.return_value = _make_product()
+        await _post(_headers(user, "k-2"))
+        resp = await _post(_headers(user, "k-2"), {**PAYLOAD, "price": "30.00"})
+
+    assert resp.status_code == 422
+    assert create.await_count == 1
+
+
+async def test_in_flight_duplicate_conflicts(user, store) -> None:
+    await store.lock(f"{user.id}:k-3", idempotency.fingerprint("POST", PREFIX, b"{}"))
+
+    with patch("app.repositories.product_repo.ProductRepository.create_product", new_callable=AsyncMock) as create:
+        resp = await _post(_headers(user, "k-3"), {})
+
+    assert resp.status_code == 409
+    create.assert_not_awaited()
+
+
+async def test_falls_back_to_database_when_redis_is_down(user) -> None:
+    broken = AsyncMock()
+    broken.get.side_effect = RedisConnectionError("down")
+    fallback = _MemoryStore()
+
+    with (
+        patch.object(idempotency, "redis_store", broken),
+        patch.object(idempotency, "database_store", fallback),
+        patch("app.repositories.product_repo.ProductRepository.create_product", new_callable=AsyncMock) as create,
+    ):
+        create.return_value = _make_product()
+        await _post(_headers(user, "k-4"))
+        replay = await _post(_headers(user, "k-4"))
+
+    assert create.await_count == 1
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert fallback.entries[f"{user.id}:k-4"].status_code == 201
+
+
+async def test_replay_restores_original_headers(user, store) -> None:
+    fp = idempotency.fingerprint("POST", PREFIX, b"{}")
+    store.entries[f"{user.id}:k-9"] = idempotency.StoredResponse(
+        fp,
+        201,
+        "id,name\n",
+        "text/csv; charset=utf-8",
+        (("content-type", "text/csv; charset=utf-8"), ("location", f"{PREFIX}/42")),
+    )
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        resp = await ac.post(PREFIX, content=b"{}", headers=_headers(user, "k-9"))
+
+    assert resp.status_code == 201
+    assert resp.text == "id,name\n"
+    assert resp.headers["location"] == f"{PREFIX}/42"
+    assert resp.headers["content-type"] == "text/csv; charset=utf-8"
+    assert resp.headers["idempotent-replayed"] == "true"
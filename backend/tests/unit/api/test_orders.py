@@ -3,16 +3,23 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime, timezone
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from app.api.routers.orders import _order_to_response
 from app.core.exceptions import ValidationError
+from app.core.pricing import PriceBook
 from app.core.security import create_access_token
+from app.core.snowflake import format_code, next_order_code
 from app.main import app
 from app.models.order import Order, OrderItem, OrderStatus
 from app.models.product import Product
 from app.models.user import User, UserRole
+from app.repositories.order_repo import OrderStatusChange
+from app.repositories.stock_repo import InsufficientStockError
+from app.schemas.order import OrderItemCreate, OrderTemplate
 from httpx import ASGITransport, AsyncClient
 
 
@@ -27,6 +34,7 @@ def _make_user(role: UserRole = UserRole.KIOSK_OWNER) -> MagicMock:
     user.phone = "+251900000000"
     user.role = role
     user.is_active = True
+    user.price_segment = None
     return user
 
 
@@ -67,6 +75,7 @@ def _make_order(**overrides) -> MagicMock:
     item = _make_order_item()
     defaults = dict(
         id=uuid.uuid4(),
+        code=next_order_code(),
         user_id=uuid.uuid4(),
         distributor_id=uuid.uuid4(),
         status=OrderStatus.PENDING,
@@ -124,6 +133,7 @@ async def test_create_order() -> None:
     with (
         patch("app.repositories.product_repo.ProductRepository.get_product", new_callable=AsyncMock) as mock_get_prod,
         patch("app.repositories.order_repo.OrderRepository.create_order", new_callable=AsyncMock) as mock_create,
+        patch("app.services.pricing.price_book", new_callable=AsyncMock, return_value=PriceBook()),
     ):
         mock_get_prod.return_value = product
         mock_create.return_value = order
@@ -141,13 +151,37 @@ async def test_create_order() -> None:
     assert body["status"] == "pending"
 
 
+async def test_create_order_out_of_stock() -> None:
+    product = _make_product()
+    headers, _ = _setup_auth(_make_user())
+
+    with (
+        patch("app.repositories.product_repo.ProductRepository.get_product", new_callable=AsyncMock) as mock_get_prod,
+        patch("app.repositories.order_repo.OrderRepository.create_order", new_callable=AsyncMock) as mock_create,
+        patch("app.services.pricing.price_book", new_callable=AsyncMock, return_value=PriceBook()),
+    ):
+        mock_get_prod.return_value = product
+        mock_create.side_effect = InsufficientStockError(product.id)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            payload = {
+                "items": [{"product_id": str(product.id), "quantity": 2}],
+                "distributor_id": str(product.distributor_id),
+            }
+            resp = await ac.post(PREFIX, json=payload, headers=headers)
+
+    assert resp.status_code == 409
+    assert resp.json() == {"detail": f"Not enough stock for product {product.id}"}
+
 async def test_list_orders() -> None:
     order = _make_order()
     user = _make_user()
     headers, _ = _setup_auth(user)
 
-    with patch("app.repositories.order_repo.OrderRepository.list_orders", new_callable=AsyncMock) as mock_list:
-        mock_list.return_value = ([order], 1)
+    with patch(
+        "app.repositories.order_read_repo.OrderReadRepository.list_orders", new_callable=AsyncMock
+    ) as mock_list:
+        mock_list.return_value = ([_order_to_response(order)], 1)
         transport = ASGITransport(app=app)
         async with AsyncClient(transport=transport, base_url="http://test") as ac:
             resp = await ac.get(PREFIX, headers=headers)
@@ -163,8 +197,8 @@ async def test_get_order() -> None:
     user = _make_user()
     headers, _ = _setup_auth(user)
 
-    with patch("app.repositories.order_repo.OrderRepository.get_order", new_callable=AsyncMock) as mock_get:
-        mock_get.return_value = order
+    with patch("app.repositories.order_read_repo.OrderReadRepository.get_order", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = _order_to_response(order)
         transport = ASGITransport(app=app)
         async with AsyncClient(transport=transport, base_url="http://test") as ac:
             resp = await ac.get(f"{PREFIX}/{order.id}", headers=headers)
@@ -177,7 +211,7 @@ async def test_get_order_not_found() -> None:
     user = _make_user()
     headers, _ = _setup_auth(user)
 
-    with patch("app.repositories.order_repo.OrderRepository.get_order", new_callable=AsyncMock) as mock_get:
+    with patch("app.repositories.order_read_repo.OrderReadRepository.get_order", new_callable=AsyncMock) as mock_get:
         mock_get.return_value = None
         transport = ASGITransport(app=app)
         async with AsyncClient(transport=transport, base_url="http://test") as ac:
@@ -227,3 +261,138 @@ async def test_invalid_status_transition() -> None:
 
     assert resp.status_code == 422
     assert "Cannot transition" in resp.json()["detail"]
+
+
+async def test_bulk_update_order_status() -> None:
+    user = _make_user(role=UserRole.DISTRIBUTOR)
+    headers, _ = _setup_auth(user)
+    ok_id, bad_id = uuid.uuid4(), uuid.uuid4()
+
+    with patch(
+        "app.repositories.order_repo.OrderRepository.bulk_update_order_status",
+        new_callable=AsyncMock,
+    ) as mock_bulk:
+        mock_bulk.return_value = (
+            [
+                OrderStatusChange(
+                    ok_id, "confirmed", "pending", uuid.uuid4(), user.id,
+                    Decimal("20.00"), datetime(2025, 1, 1, tzinfo=timezone.utc),
+                )
+            ],
+            [(bad_id, "Cannot transition from delivered to confirmed")],
+        )
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            resp = await ac.post(
+                f"{PREFIX}/status:bulk",
+                json={"order_ids": [str(ok_id), str(bad_id)], "status": "confirmed"},
+                headers=headers,
+            )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["updated"] == [{"id": str(ok_id), "status": "confirmed"}]
+    assert body["rejected"][0]["id"] == str(bad_id)
+    assert mock_bulk.call_args.kwargs["distributor_id"] == user.id
+
+
+async def test_bulk_update_order_status_forbidden_for_kiosk() -> None:
+    user = _make_user()
+    headers, _ = _setup_auth(user)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        resp = await ac.post(
+            f"{PREFIX}/status:bulk",
+            json={"order_ids": [str(uuid.uuid4())], "status": "confirmed"},
+            headers=headers,
+        )
+
+    assert resp.status_code == 403
+
+
+async def test_reorder_reprices_and_skips_inactive() -> None:
+    user = _make_user()
+    headers, _ = _setup_auth(user)
+    product = _make_product(price=Decimal("12.00"))
+    gone = uuid.uuid4()
+    template = OrderTemplate(
+        order_id=uuid.uuid4(),
+        distributor_id=product.distributor_id,
+        items=[OrderItemCreate(product_id=product.id, quantity=3), OrderItemCreate(product_id=gone, quantity=1)],
+    )
+    order = _make_order(user_id=user.id)
+
+    with (
+        patch("app.services.reorder.last_template", new_callable=AsyncMock, return_value=template),
+        patch(
+            "app.repositories.product_repo.ProductRepository.get_active_products",
+            new_callable=AsyncMock,
+            return_value={product.id: product},
+        ) as mock_lookup,
+        patch("app.repositories.order_repo.OrderRepository.create_order", new_callable=AsyncMock) as mock_create,
+        patch("app.services.pricing.price_book", new_callable=AsyncMock, return_value=PriceBook()),
+    ):
+        mock_create.return_value = order
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            resp = await ac.post(f"{PREFIX}/reorder", headers=headers)
+
+    assert resp.status_code == 201
+    assert resp.json()["skipped_product_ids"] == [str(gone)]
+    mock_lookup.assert_awaited_once_with([product.id, gone])
+    data = mock_create.call_args.kwargs["data"]
+    assert [(i.product_id, i.quantity) for i in data.items] == [(product.id, 3)]
+    assert mock_create.call_args.kwargs["products"] == {product.id: product}
+
+
+async def test_reorder_without_history() -> None:
+    user = _make_user()
+    headers, _ = _setup_auth(user)
+
+    with patch("app.services.reorder.last_template", new_callable=AsyncMock, return_value=None):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            resp = await ac.post(f"{PREFIX}/reorder", headers=headers)
+
+    assert resp.status_code == 404
+
+
+async def test_get_order_by_code() -> None:
+    order = _make_order()
+    user = _make_user()
+    headers, _ = _setup_auth(user)
+
+    with patch(
+        "app.repositories.order_read_repo.OrderReadRepository.get_order_by_code", new_callable=AsyncMock
+    ) as mock_get:
+        mock_get.return_value = _order_to_response(order)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            resp = await ac.get(f"{PREFIX}/by-code/{format_code(order.code).lower()}", headers=headers)
+            bad = await ac.get(f"{PREFIX}/by-code/not-a-code!", headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.json()["code"] == format_code(order.code)
+    mock_get.assert_awaited_once_with(order.code, user_id=user.id)
+    assert bad.status_code == 422
+
+
+async def test_list_orders_keyset_cursor() -> None:
+    orders = [_make_order(), _make_order()]
+    user = _make_user()
+    headers, _ = _setup_auth(user)
+
+    with patch(
+        "app.repositories.order_read_repo.OrderReadRepository.list_orders", new_callable=AsyncMock
+    ) as mock_list:
+        mock_list.return_value = ([_order_to_response(o) for o in orders], 5)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            resp = await ac.get(
+                PREFIX, params={"per_page": 2, "cursor": format_code(orders[0].code + 10)}, headers=headers
+            )
+
+    assert resp.status_code == 200
+    assert resp.json()["next_cursor"] == format_code(orders[1].code)
+    assert mock_list.call_args.kwargs["before_code"] == orders[0].code + 10
@@ -0,0 +1,110 @@
+"""Unit tests for price list endpoints."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.core.security import create_access_token
+from app.main import app
+from app.models.price_list import PriceList
+from app.models.user import User, UserRole
+from httpx import ASGITransport, AsyncClient
+
+PREFIX = "/api/v1/price-lists"
+REPO = "app.repositories.price_list_repo.PriceListRepository"
+
+
+def _make_user(role: UserRole = UserRole.DISTRIBUTOR) -> MagicMock:
+    user = MagicMock(spec=User)
+    user.id = uuid.uuid4()
+    user.role = role
+    user.is_active = True
+    return user
+
+
+def _make_price_list(**overrides) -> MagicMock:
+    defaults = dict(
+        id=uuid.uuid4(),
+        distributor_id=uuid.uuid4(),
+        name="Volume",
+        segment=None,
+        is_active=True,
+        tiers=[],
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+    )
+    defaults.update(overrides)
+    price_list = MagicMock(spec=PriceList)
+    for k, v in defaults.items():
+        setattr(price_list, k, v)
+    return price_list
+
+
+@pytest.fixture(autouse=True)
+def _clear_overrides():
+    yield
+    app.dependency_overrides.clear()
+
+
+def _setup_auth(user: MagicMock) -> dict[str, str]:
+    from app.api.deps import get_current_user, get_db
+
+    async def _fake_current_user():
+        return user
+
+    async def _fake_db():
+        yield AsyncMock()
+
+    app.dependency_overrides[get_current_user] = _fake_current_user
+    app.dependency_overrides[get_db] = _fake_db
+    return {"Authorization": f"Bearer {create_access_token(str(user.id), extra={'role': user.role.value})}"}
+
+
+async def test_distributor_creates_own_price_list() -> None:
+    user = _make_user()
+    headers = _setup_auth(user)
+    product_id = uuid.uuid4()
+    body = {
+        "name": "Volume",
+        "distributor_id": str(uuid.uuid4()),
+        "tiers": [{"product_id": str(product_id), "min_quantity": 10, "unit_price": "9.00"}],
+    }
+
+    with (
+        patch(f"{REPO}.create_price_list", new_callable=AsyncMock) as mock_create,
+        patch("app.services.pricing.bump", new_callable=AsyncMock) as mock_bump,
+    ):
+        mock_create.return_value = _make_price_list(distributor_id=user.id)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            resp = await ac.post(PREFIX, json=body, headers=headers)
+
+    assert resp.status_code == 201
+    # Whatever the body says, a distributor only writes their own lists.
+    assert mock_create.call_args.args[0] == user.id
+    mock_bump.assert_awaited_once_with([user.id])
+
+
+async def test_admin_must_name_distributor() -> None:
+    headers = _setup_auth(_make_user(UserRole.ADMIN))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        resp = await ac.post(PREFIX, json={"name": "Volume"}, headers=headers)
+    assert resp.status_code == 422
+
+
+async def test_duplicate_tiers_rejected() -> None:
+    headers = _setup_auth(_make_user())
+    tier = {"product_id": str(uuid.uuid4()), "min_quantity": 10, "unit_price": "9.00"}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        resp = await ac.post(PREFIX, json={"name": "Volume", "tiers": [tier, tier]}, headers=headers)
+    assert resp.status_code == 422
+
+
+async def test_other_distributors_list_is_not_found() -> None:
+    headers = _setup_auth(_make_user())
+    with patch(f"{REPO}.get_price_list", new_callable=AsyncMock, return_value=_make_price_list()):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            resp = await ac.put(f"{PREFIX}/{uuid.uuid4()}", json={"is_active": False}, headers=headers)
+    assert resp.status_code == 404
@@ -11,6 +11,7 @@ from app.core.security import create_access_token
 from app.main import app
 from app.models.product import Product
 from app.models.user import User, UserRole
+from app.repositories.stock_repo import StockSummary
 from httpx import ASGITransport, AsyncClient
 
 
@@ -198,9 +199,315 @@ async def test_delete_product() -> None:
     headers = _setup_auth(user)
 
     with patch("app.repositories.product_repo.ProductRepository.delete_product", new_callable=AsyncMock) as mock_del:
-        mock_del.return_value = True
+        mock_del.return_value = uuid.uuid4()
         transport = ASGITransport(app=app)
         async with AsyncClient(transport=transport, base_url="http://test") as ac:
             resp = await ac.delete(f"{PREFIX}/{pid}", headers=headers)
 
     assert resp.status_code == 204
+
+
+async def test_export_products_csv() -> None:
+    user = _make_user()
+    headers = _setup_auth(user)
+    product_id = uuid.uuid4()
+
+    async def _stream(self, **kwargs):  # type: ignore[no-untyped-def]
+        assert kwargs == {"distributor_id": None, "category": "beverages", "search": "cola"}
+        yield [{"id": product_id, "sku": None, "name": "Cola", "category": "beverages", "price": Decimal("25.00"),
+                "distributor_id": user.id, "is_active": True, "created_at": None, "updated_at": None}]
+
+    with (
+        patch("app.api.routers.products.async_session_factory", MagicMock()),
+        patch("app.repositories.product_repo.ProductRepository.stream_products", _stream),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            resp = await ac.get(f"{PREFIX}/export", params={"category": "beverages", "search": "cola"}, headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    lines = resp.text.splitlines()
+    assert lines[0].startswith("id,sku,name,category,price")
+    assert lines[1].startswith(f"{product_id},,Cola,beverages,25.00")
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.data.get(key)
+
+    async def mget(self, *keys: str) -> list[str | None]:
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key: str, value: str, ex: int | None = None, nx: bool = False) -> None:
+        if not (nx and key in self.data):
+            self.data[key] = value
+
+    def pipeline(self, transaction: bool = True) -> _FakeRedis:
+        return self
+
+    async def __aenter__(self) -> _FakeRedis:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    def incr(self, key: str) -> None:
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+
+    async def execute(self) -> None:
+        return None
+
+
+async def test_list_products_conditional_get_and_page_cache() -> None:
+    from app.api.deps import get_db
+    from app.services import catalog_cache
+
+    product = _make_product()
+    mock_db = AsyncMock()
+
+    async def _fake_db():
+        yield mock_db
+
+    app.dependency_overrides[get_db] = _fake_db
+    fake = _FakeRedis()
+
+    with (
+        patch.object(catalog_cache, "redis_client", fake),
+        patch(
+            "app.repositories.product_repo.ProductRepository.list_products",
+            new_callable=AsyncMock,
+            return_value=([product], 1),
+        ) as mock_list,
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            first = await ac.get(PREFIX, params={"category": "beverages"})
+            tag = first.headers["ETag"]
+            revalidated = await ac.get(PREFIX, params={"category": "beverages"}, headers={"If-None-Match": tag})
+            cached = await ac.get(PREFIX, params={"category": "beverages"})
+
+            await catalog_cache.advance([product.id], [product.distributor_id])
+            changed = await ac.get(PREFIX, params={"category": "beverages"}, headers={"If-None-Match": tag})
+
+    assert first.status_code == 200
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == tag
+    assert cached.json() == first.json()
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != tag
+    assert mock_list.await_count == 2
+    mock_db.execute.assert_not_called()
+
+
+async def test_catalog_etag_survives_a_redis_flush() -> None:
+    from app.services import catalog_cache
+
+    fake = _FakeRedis()
+    with patch.object(catalog_cache, "redis_client", fake):
+        before = await catalog_cache.revision(catalog_cache.CATALOG)
+        assert before == await catalog_cache.revision(catalog_cache.CATALOG)
+        fake.data.clear()
+        after = await catalog_cache.revision(catalog_cache.CATALOG)
+
+    assert before is not None and after is not None
+    assert before.endswith(".0") and after.endswith(".0")
+    assert catalog_cache.etag(catalog_cache.CATALOG, before, "") != catalog_cache.etag(catalog_cache.CATALOG, after, "")
+
+
+async def test_get_product_not_modified_skips_lookup() -> None:
+    from app.api.deps import get_db
+    from app.services import catalog_cache
+
+    product = _make_product()
+
+    async def _fake_db():
+        yield AsyncMock()
+
+    app.dependency_overrides[get_db] = _fake_db
+
+    with (
+        patch.object(catalog_cache, "redis_client", _FakeRedis()),
+        patch(
+            "app.repositories.product_repo.ProductRepository.get_product",
+            new_callable=AsyncMock,
+            return_value=product,
+        ) as mock_get,
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            tag = (await ac.get(f"{PREFIX}/{product.id}")).headers["ETag"]
+            resp = await ac.get(f"{PREFIX}/{product.id}", headers={"If-None-Match": f'W/{tag}, "other"'})
+
+    assert resp.status_code == 304
+    mock_get.assert_awaited_once()
+
+
+async def test_import_products_streams_body_and_scopes_to_caller() -> None:
+    from app.schemas.product import ProductImportResponse
+
+    user = _make_user()
+    headers = _setup_auth(user)
+    seen: list = []
+
+    async def _fake_import(db, records, *, distributor_id, restrict_to):  # type: ignore[no-untyped-def]
+        seen.extend([r async for r in records])
+        assert distributor_id == restrict_to == user.id
+        return ProductImportResponse(
+            received=len(seen), inserted=len(seen), updated=0, failed=0, errors=[],
+            errors_truncated=False, elapsed_ms=1.0, rows_per_second=1000.0,
+        )
+
+    with patch("app.services.product_import.import_products", _fake_import):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            resp = await ac.post(
+                f"{PREFIX}/import",
+                content=b'{"name": "Tea", "price": "9.99", "sku": "T-1"}\n',
+                headers={**headers, "Content-Type": "application/x-ndjson"},
+            )
+
+    assert resp.status_code == 200
+    assert resp.json()["inserted"] == 1
+    assert seen == [(1, {"name": "Tea", "price": "9.99", "sku": "T-1"}, None)]
+
+
+async def test_bulk_update_products_scopes_to_distributor() -> None:
+    from app.repositories.product_repo import ProductRepository
+
+    user = _make_user()
+    headers = _setup_auth(user)
+    pid = uuid.uuid4()
+    row = MagicMock(id=pid, sku="TEA", price=Decimal("11.00"), is_active=True, distributor_id=user.id)
+
+    with (
+        patch.object(
+            ProductRepository, "bulk_update_products", new_callable=AsyncMock, return_value=([row], ["GONE"])
+        ) as mock_bulk,
+        patch("app.services.catalog_cache.bump", new_callable=AsyncMock) as mock_bump,
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            resp = await ac.patch(
+                f"{PREFIX}:bulk",
+                json={"changes": [{"id": str(pid), "price": "11.00"}, {"sku": "GONE", "is_active": False}]},
+                headers=headers,
+            )
+            forbidden = await ac.patch(
+                f"{PREFIX}:bulk",
+                json={"adjust": {"percent": "5", "distributor_id": str(uuid.uuid4())}},
+                headers=headers,
+            )
+            invalid = await ac.patch(f"{PREFIX}:bulk", json={"changes": [{"sku": "TEA"}]}, headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "updated": [{"id": str(pid), "sku": "TEA", "price": "11.00", "is_active": True}],
+        "not_found": ["GONE"],
+    }
+    assert mock_bulk.call_args.kwargs["distributor_id"] == user.id
+    mock_bump.assert_awaited_once_with([pid], {user.id})
+    assert forbidden.status_code == 403
+    assert invalid.status_code == 422
+
+
+async def test_product_changes_tokens_and_tombstones() -> None:
+    from app.api.deps import get_db
+
+    async def _fake_db():
+        yield AsyncMock()
+
+    app.dependency_overrides[get_db] = _fake_db
+    live = _make_product(change_seq=0x10)
+    gone = _make_product(change_seq=0x11, is_active=False)
+
+    with patch(
+        "app.repositories.product_repo.ProductRepository.changes_since", new_callable=AsyncMock
+    ) as mock_changes:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            mock_changes.return_value = ([live, gone], True, 0x20)
+            page = await ac.get(f"{PREFIX}/changes", params={"since": "a", "limit": 2})
+            mock_changes.return_value = ([], False, 0x20)
+            caught_up = await ac.get(f"{PREFIX}/changes", params={"since": page.json()["next_token"]})
+            invalid = await ac.get(f"{PREFIX}/changes", params={"since": "zz"})
+
+    body = page.json()
+    assert [p["id"] for p in body["upserted"]] == [str(live.id)]
+    assert body["deleted"] == [str(gone.id)]
+    assert body["next_token"] == f"11.{gone.id.hex}"
+    assert mock_changes.call_args_list[0].args == ((0xA, None),)
+    assert mock_changes.call_args_list[1].args == ((0x11, gone.id),)
+    assert caught_up.json() == {"upserted": [], "deleted": [], "next_token": "20", "has_more": False}
+    assert invalid.status_code == 422
+
+
+async def test_product_facets() -> None:
+    from app.api.deps import get_db
+    from app.schemas.product import ProductFacetResponse
+
+    async def _fake_db():
+        yield AsyncMock()
+
+    app.dependency_overrides[get_db] = _fake_db
+    tenant_id = uuid.uuid4()
+    facet = ProductFacetResponse(category="beverages", count=3, min_price=Decimal("15.00"), max_price=Decimal("45.00"))
+
+    with patch(
+        "app.repositories.facet_repo.ProductFacetRepository.list_facets", new_callable=AsyncMock, return_value=[facet]
+    ) as mock_facets:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            resp = await ac.get(f"{PREFIX}/facets", params={"tenant_id": str(tenant_id)})
+
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "items": [{"category": "beverages", "count": 3, "min_price": "15.00", "max_price": "45.00"}]
+    }
+    mock_facets.assert_awaited_once_with(distributor_id=None, tenant_id=tenant_id)
+
+
+async def test_set_stock_only_on_own_products() -> None:
+    user = _make_user()
+    headers = _setup_auth(user)
+    mine, theirs = _make_product(distributor_id=user.id), _make_product()
+
+    with (
+        patch("app.repositories.product_repo.ProductRepository.get_product", new_callable=AsyncMock) as mock_get,
+        patch("app.repositories.stock_repo.StockRepository.set_stock", new_callable=AsyncMock) as mock_set,
+    ):
+        mock_get.side_effect = [mine, theirs]
+        mock_set.return_value = StockSummary(mine.id, 100, 0, 8)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            ok = await ac.put(f"{PREFIX}/{mine.id}/stock", json={"available": 100, "stripes": 8}, headers=headers)
+            denied = await ac.put(f"{PREFIX}/{theirs.id}/stock", json={"available": 100}, headers=headers)
+
+    assert ok.status_code == 200
+    assert ok.json() == {"product_id": str(mine.id), "available": 100, "held": 0, "stripes": 8}
+    mock_set.assert_awaited_once_with(mine.id, 100, stripes=8)
+    assert denied.status_code == 403
+
+
+async def test_get_stock_only_on_own_products() -> None:
+    user = _make_user()
+    headers = _setup_auth(user)
+    mine, theirs = _make_product(distributor_id=user.id), _make_product()
+
+    with (
+        patch("app.repositories.product_repo.ProductRepository.get_product", new_callable=AsyncMock) as mock_get,
+        patch("app.repositories.stock_repo.StockRepository.get_stock", new_callable=AsyncMock) as mock_stock,
+    ):
+        mock_get.side_effect = [mine, theirs]
+        mock_stock.return_value = StockSummary(mine.id, 40, 2, 4)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            ok = await ac.get(f"{PREFIX}/{mine.id}/stock", headers=headers)
+            denied = await ac.get(f"{PREFIX}/{theirs.id}/stock", headers=headers)
+
+    assert ok.json() == {"product_id": str(mine.id), "available": 40, "held": 2, "stripes": 4}
+    mock_stock.assert_awaited_once_with(mine.id)
+    assert denied.status_code == 403
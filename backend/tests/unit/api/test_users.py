@@ -23,6 +23,7 @@ def _make_user(**overrides) -> MagicMock:
         telegram_chat_id=123456,
         distributor_id=None,
         tenant_id=None,
+        price_segment=None,
         is_active=True,
         created_at=datetime.now(timezone.utc),
         updated_at=datetime.now(timezone.utc),
@@ -0,0 +1,59 @@
+"""Unit tests for compiled price books."""
+
+from __future__ import annotations
+
+import timeit
+import uuid
+from decimal import Decimal
+
+from app.core.pricing import PriceBook, Tier
+
+
+def test_breaks_segments_and_list_price_cap() -> None:
+    tea, soap, salt = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    book = PriceBook.compile(
+        [
+            Tier(None, tea, 10, Decimal("9.00")),
+            Tier(None, tea, 50, Decimal("8.00")),
+            Tier("wholesale", tea, 20, Decimal("8.50")),
+            # Dominated: dearer than the 10+ break it follows.
+            Tier(None, tea, 30, Decimal("9.50")),
+            Tier("wholesale", soap, 1, Decimal("28.00")),
+            # Above the list price; never applied.
+            Tier(None, salt, 1, Decimal("99.00")),
+        ]
+    )
+    list_price = Decimal("10.00")
+
+    assert book.unit_price(tea, 9, list_price) == Decimal("10.00")
+    assert book.unit_price(tea, 10, list_price) == Decimal("9.00")
+    assert book.unit_price(tea, 35, list_price) == Decimal("9.00")
+    assert book.unit_price(tea, 50, list_price) == Decimal("8.00")
+    # A segment gets its own breaks and the general ones, whichever is cheaper.
+    assert book.unit_price(tea, 20, list_price, "wholesale") == Decimal("8.50")
+    assert book.unit_price(tea, 50, list_price, "wholesale") == Decimal("8.00")
+    assert book.unit_price(tea, 10, list_price, "retail") == Decimal("9.00")
+    assert book.unit_price(soap, 1, Decimal("30.00"), "wholesale") == Decimal("28.00")
+    assert book.unit_price(soap, 1, Decimal("30.00")) == Decimal("30.00")
+    assert book.unit_price(salt, 5, Decimal("12.00")) == Decimal("12.00")
+    assert book.unit_price(uuid.uuid4(), 5, list_price) == list_price
+
+
+def test_fifty_line_order_prices_in_microseconds() -> None:
+    products = [uuid.uuid4() for _ in range(2000)]
+    book = PriceBook.compile(
+        Tier(segment, pid, qty, Decimal(100 - qty))
+        for pid in products
+        for segment in (None, "wholesale")
+        for qty in (1, 10, 25, 50)
+    )
+    lines = [(products[i * 37], i + 1) for i in range(50)]
+    list_price = Decimal("100.00")
+
+    def price_order() -> None:
+        for pid, qty in lines:
+            book.unit_price(pid, qty, list_price, "wholesale")
+
+    per_order = min(timeit.repeat(price_order, number=100, repeat=3)) / 100
+    # Generous for slow CI; typically tens of microseconds.
+    assert per_order < 0.002
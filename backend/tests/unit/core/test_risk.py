@@ -0,0 +1,83 @@
+"""Unit tests for vectorized credit risk scoring."""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+from app.core import risk
+
+
+def _inputs(**columns: list[float]) -> risk.RiskInputs:
+    n = len(next(iter(columns.values())))
+    defaults = {
+        "orders": [0.0] * n,
+        "spend": [0.0] * n,
+        "days_since_order": [np.nan] * n,
+        "due": [0.0] * n,
+        "repaid": [0.0] * n,
+    }
+    defaults.update(columns)
+    return risk.RiskInputs(**{k: np.array(v, dtype=float) for k, v in defaults.items()})
+
+
+def test_no_history_keeps_default_limit() -> None:
+    scores = risk.score(_inputs(orders=[0.0]))
+
+    assert scores.limit.tolist() == [float(risk.DEFAULT_CREDIT_LIMIT)]
+    # Only the repayment prior contributes.
+    assert scores.risk.tolist() == [round(1 - 0.35 * 0.7, 4)]
+
+
+def test_repayment_and_recency_order_the_scores() -> None:
+    scores = risk.score(
+        _inputs(
+            orders=[24.0, 24.0, 24.0],
+            spend=[36000.0, 36000.0, 36000.0],
+            days_since_order=[2.0, 2.0, 90.0],
+            due=[3000.0, 3000.0, 3000.0],
+            repaid=[3000.0, 300.0, 3000.0],
+        )
+    )
+
+    good, defaulter, lapsed = scores.risk
+    # Repaying a tenth of what came due costs more than three months without ordering.
+    assert good < lapsed < defaulter
+    assert scores.limit[0] > scores.limit[2] > scores.limit[1]
+    assert np.all(scores.limit % risk.LIMIT_STEP == 0)
+
+
+def test_limits_are_clipped() -> None:
+    scores = risk.score(_inputs(orders=[1.0, 600.0], spend=[1.0, 1e9], days_since_order=[179.0, 0.0]))
+
+    assert scores.limit.tolist() == [risk.MIN_LIMIT, risk.MAX_LIMIT]
+
+
+def test_features_stay_in_unit_range() -> None:
+    rng = np.random.default_rng(7)
+    n = 10_000
+    orders = rng.poisson(10, n).astype(float)
+    inputs = risk.RiskInputs(
+        orders=orders,
+        spend=orders * rng.uniform(100, 5000, n),
+        days_since_order=np.where(orders > 0, rng.uniform(0, 180, n), np.nan),
+        due=rng.uniform(0, 5000, n),
+        repaid=rng.uniform(0, 6000, n),
+    )
+
+    matrix = risk.features(inputs)
+    assert matrix.shape == (n, 4)
+    assert np.all((matrix >= 0) & (matrix <= 1))
+
+
+def test_a_million_kiosks_score_in_well_under_a_second() -> None:
+    n = 1_000_000
+    inputs = risk.RiskInputs(np.full(n, 12.0), np.full(n, 18000.0), np.full(n, 3.0), np.full(n, 900.0), np.zeros(n))
+
+    start = time.perf_counter()
+    scores = risk.score(inputs)
+    elapsed = time.perf_counter() - start
+
+    assert scores.risk.shape == scores.limit.shape == (n,)
+    # Generous: the arrays themselves take a few hundred milliseconds on one core.
+    assert elapsed < 5.0
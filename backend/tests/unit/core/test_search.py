@@ -0,0 +1,39 @@
+"""Unit tests for transliteration folding and the fallback trigram index."""
+
+from __future__ import annotations
+
+import uuid
+
+from app.core.search import TrigramIndex, trigrams
+from app.core.transliteration import fold, romanize
+
+
+def test_fold_merges_scripts_and_spellings() -> None:
+    assert fold("ጤፍ 1kg") == fold("Teff 1KG") == "tef 1kg"
+    assert fold("ቡና") == fold("Buna")
+    assert fold("ሻይ") == fold("Shai")
+    assert fold("Café") == fold("kafe")
+    assert fold("Coca-Cola 500ml") == "koka kola 500ml"
+
+
+def test_romanize_labialized_and_vowel_rows() -> None:
+    assert romanize("ኳ") == "kwa"
+    assert romanize("አበበ") == "abebe"
+    assert romanize("abc") == "abc"
+
+
+def test_trigrams_match_pg_trgm_padding() -> None:
+    assert trigrams("cat") == {"  c", " ca", "cat", "at "}
+
+
+def test_index_ranks_and_tolerates_typos() -> None:
+    teff, sugar, soap = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    index = TrigramIndex([(teff, fold("ጤፍ ነጭ 5kg")), (sugar, fold("Sukkar 1kg")), (soap, fold("Soap"))])
+
+    assert [doc for doc, _ in index.search("teff")] == [teff]
+    assert [doc for doc, _ in index.search("sukar")] == [sugar]
+    assert [doc for doc, _ in index.search("sugar")] == []
+
+    index.discard(teff)
+    assert index.search("teff") == []
+    assert len(index) == 2
@@ -0,0 +1,68 @@
+"""Unit tests for Snowflake order codes."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from app.core import snowflake
+from app.core.snowflake import SnowflakeGenerator, format_code, parse_code, timestamp_of
+
+
+def test_codes_are_unique_and_monotonic() -> None:
+    gen = SnowflakeGenerator(worker_id=7)
+    codes = [gen.next_id() for _ in range(10_000)]
+    assert codes == sorted(codes)
+    assert len(set(codes)) == len(codes)
+    assert [format_code(c) for c in codes] == sorted(format_code(c) for c in codes)
+
+
+def test_clock_going_backwards_keeps_order() -> None:
+    gen = SnowflakeGenerator(worker_id=1)
+    with patch.object(snowflake.time, "time", return_value=1_800_000_000.0):
+        first = gen.next_id()
+    with patch.object(snowflake.time, "time", return_value=1_799_999_999.0):
+        second = gen.next_id()
+    assert second > first
+
+
+def test_sequence_overflow_borrows_next_millisecond() -> None:
+    gen = SnowflakeGenerator(worker_id=1)
+    with patch.object(snowflake.time, "time", return_value=1_800_000_000.0):
+        codes = [gen.next_id() for _ in range(4097)]
+    assert timestamp_of(codes[-1]) > timestamp_of(codes[0])
+    assert len(set(codes)) == 4097
+
+
+def test_worker_ids_never_collide() -> None:
+    with patch.object(snowflake.time, "time", return_value=1_800_000_000.0):
+        a = SnowflakeGenerator(worker_id=1).next_id()
+        b = SnowflakeGenerator(worker_id=2).next_id()
+    assert a != b
+    assert timestamp_of(a) == timestamp_of(b)
+
+
+def test_format_and_parse_round_trip() -> None:
+    code = SnowflakeGenerator(worker_id=3).next_id()
+    text = format_code(code)
+    assert text.startswith("SS-") and len(text) == 16
+    assert parse_code(text) == code
+    assert parse_code(text.lower().replace("0", "o")) == code
+
+
+@pytest.mark.parametrize("bad", ["", "SS-", "SS-U000", "SS-" + "Z" * 14, "SS-" + "Z" * 13])
+def test_parse_rejects_garbage(bad: str) -> None:
+    with pytest.raises(ValueError):
+        parse_code(bad)
+
+
+def test_unconfigured_process_refuses_to_mint() -> None:
+    previous = snowflake._generator
+    try:
+        snowflake.configure(None)
+        with pytest.raises(RuntimeError):
+            snowflake.next_order_code()
+        snowflake.configure(5)
+        assert (snowflake.next_order_code() >> 12) & snowflake.MAX_WORKER_ID == 5
+    finally:
+        snowflake._generator = previous
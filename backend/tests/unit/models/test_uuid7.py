@@ -0,0 +1,32 @@
+"""Unit tests for the UUIDv7 primary-key default."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+from app.models import base
+from app.models.base import uuid7
+
+
+def test_uuid7_layout() -> None:
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+    assert before <= value.int >> 80 <= after
+
+
+def test_uuid7_is_monotonic_within_a_millisecond() -> None:
+    with patch.object(base.time, "time_ns", return_value=1_800_000_000_000_000_000):
+        values = [uuid7() for _ in range(5000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_primary_keys_default_to_uuid7() -> None:
+    from app.models.order import Order
+
+    assert Order.__table__.c.id.default.arg(None).version == 7
@@ -2,7 +2,20 @@
 
 from __future__ import annotations
 
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import app.db.base  # noqa: F401 — registers all models
+from app.models.base import Base
+from app.models.credit_ledger import CreditLedgerEntry
+from app.models.user import User, UserRole
+from app.repositories.credit_repo import CreditRepository
+from app.repositories.order_read_repo import OrderReadRepository
+from app.repositories.product_repo import ProductRepository
+from app.services import bot_handler
 from app.services.conversation import ConversationStep, get_state, reset_state
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 
 class TestConversationState:
@@ -57,3 +70,151 @@ class TestCopyLocalization:
         result = t("order_confirmed", "en", order_id="SS-TEST-001", window="Tomorrow")
         assert "SS-TEST-001" in result
         assert "Tomorrow" in result
+
+
+async def test_category_menu_comes_from_facets() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        distributor = User(phone="+251911000001", role=UserRole.DISTRIBUTOR)
+        session.add(distributor)
+        await session.flush()
+        repo = ProductRepository(session)
+        tea = await repo.create_product(name="Tea", price=Decimal("10"), distributor_id=distributor.id, category="tea")
+        await repo.create_product(name="Soap", price=Decimal("30"), distributor_id=distributor.id, category="home")
+        await repo.create_product(name="Broom", price=Decimal("90"), distributor_id=distributor.id, category="home")
+        await session.commit()
+
+    chat_id = 99990
+    reset_state(chat_id)
+    state = get_state(chat_id)
+    state.step = ConversationStep.REGISTERED
+    with (
+        patch("app.services.bot_handler.async_session_factory", factory),
+        patch("app.services.telegram_bot.send_message", new_callable=AsyncMock) as send,
+    ):
+        await bot_handler._handle_text(chat_id, "order")
+        assert "1. home (2)\n2. tea (1)" in send.call_args.args[1]
+
+        await bot_handler._handle_text(chat_id, "2")
+        assert state.step == ConversationStep.BROWSING_PRODUCTS
+        await bot_handler._handle_text(chat_id, "1")
+        await bot_handler._handle_text(chat_id, "1")
+    await engine.dispose()
+
+    # Adding the same product again raises its quantity instead of adding a line.
+    line = {"product_id": str(tea.id), "name": "Tea", "price": Decimal("10.00"), "distributor_id": str(distributor.id)}
+    assert state.cart == [{**line, "qty": 2}]
+
+
+async def _kiosk_with_tea(factory, chat_id: int) -> tuple[User, dict]:
+    """A linked kiosk with the default credit profile, and a cart line for ETB 200 tea."""
+    async with factory() as session:
+        distributor = User(phone=f"+2519{chat_id}1", role=UserRole.DISTRIBUTOR)
+        kiosk = User(phone=f"+2519{chat_id}2", role=UserRole.KIOSK_OWNER, telegram_chat_id=chat_id)
+        session.add_all([distributor, kiosk])
+        await session.flush()
+        await CreditRepository(session).create_default_profile(kiosk.id)
+        tea = await ProductRepository(session).create_product(
+            name="Tea", price=Decimal("200.00"), distributor_id=distributor.id
+        )
+        await session.commit()
+    line = {"product_id": str(tea.id), "name": "Tea", "price": tea.price, "distributor_id": str(distributor.id)}
+    return kiosk, line
+
+
+async def test_checkout_stores_the_order() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    chat_id = 99992
+    kiosk, line = await _kiosk_with_tea(factory, chat_id)
+
+    reset_state(chat_id)
+    state = get_state(chat_id)
+    state.step = ConversationStep.AWAITING_PAYMENT_CHOICE
+    state.cart = [{**line, "qty": 2}]
+    with (
+        patch("app.services.bot_handler.async_session_factory", factory),
+        patch("app.services.telegram_bot.send_message", new_callable=AsyncMock) as send,
+    ):
+        await bot_handler._handle_text(chat_id, "1")
+    assert state.step == ConversationStep.REGISTERED
+
+    async with factory() as session:
+        orders, total = await OrderReadRepository(session).list_orders(user_id=kiosk.id)
+    await engine.dispose()
+    assert total == 1
+    assert orders[0].payment_method == "pay_now"
+    assert orders[0].total == Decimal("400.00")
+    assert f"#{orders[0].code} confirmed" in send.call_args.args[1]
+
+
+async def test_checkout_rejects_carts_it_cannot_store() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    chat_id = 99993
+    _, line = await _kiosk_with_tea(factory, chat_id)
+
+    reset_state(chat_id)
+    state = get_state(chat_id)
+    with (
+        patch("app.services.bot_handler.async_session_factory", factory),
+        patch("app.services.telegram_bot.send_message", new_callable=AsyncMock) as send,
+    ):
+        # Sample products from the empty-catalog menu have no product id.
+        state.step = ConversationStep.AWAITING_PAYMENT_CHOICE
+        state.cart = [{"name": "Oil", "price": Decimal("200.00"), "qty": 1}]
+        await bot_handler._handle_text(chat_id, "1")
+        assert "aren't available" in send.call_args.args[1]
+        assert state.cart == []
+
+        # A chat no kiosk account is linked to.
+        reset_state(chat_id + 1)
+        other = get_state(chat_id + 1)
+        other.step = ConversationStep.AWAITING_PAYMENT_CHOICE
+        other.cart = [{**line, "qty": 1}]
+        await bot_handler._handle_text(chat_id + 1, "1")
+        assert "isn't linked" in send.call_args.args[1]
+    await engine.dispose()
+
+
+async def test_bnpl_checks_credit_before_confirming() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    chat_id = 99991
+    kiosk, line = await _kiosk_with_tea(factory, chat_id)
+
+    reset_state(chat_id)
+    state = get_state(chat_id)
+    with (
+        patch("app.services.bot_handler.async_session_factory", factory),
+        patch("app.services.telegram_bot.send_message", new_callable=AsyncMock) as send,
+    ):
+        # ETB 600 against the default 500 limit: declined, and Pay Now is still on offer.
+        state.step = ConversationStep.AWAITING_PAYMENT_CHOICE
+        state.cart = [{**line, "qty": 3}]
+        await bot_handler._handle_text(chat_id, "2")
+        assert state.step == ConversationStep.AWAITING_PAYMENT_CHOICE
+        assert "Not enough credit" in send.call_args.args[1]
+
+        state.cart = [{**line, "qty": 2}]
+        await bot_handler._handle_text(chat_id, "2")
+        assert state.step == ConversationStep.REGISTERED
+
+    async with factory() as session:
+        balance = (await CreditRepository(session).get_credit_profile(kiosk.id)).current_balance
+        orders, _ = await OrderReadRepository(session).list_orders(user_id=kiosk.id)
+        charged = (await session.execute(select(CreditLedgerEntry.order_id))).scalars().all()
+    await engine.dispose()
+    assert balance == Decimal("400.00")
+    assert [o.payment_method for o in orders] == ["bnpl"]
+    # The charge is tied to the order it paid for, so cancelling it releases the credit.
+    assert charged == [orders[0].id]
@@ -0,0 +1,59 @@
+"""Tests for the streaming export encoders."""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from app.models.order import OrderStatus
+from app.services.export import encode_csv, encode_ndjson, export_response, gzip_chunks
+
+FIELDS = ("id", "status", "total", "created_at")
+ROW_ID = uuid.uuid4()
+ROWS = [
+    {"id": ROW_ID, "status": OrderStatus.PENDING, "total": Decimal("170.10"),
+     "created_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)},
+    {"id": ROW_ID, "status": OrderStatus.DELIVERED, "total": Decimal("0.50"), "created_at": None},
+]
+
+
+async def _partitions():  # type: ignore[no-untyped-def]
+    yield ROWS[:1]
+    yield ROWS[1:]
+
+
+async def _collect(chunks) -> bytes:  # type: ignore[no-untyped-def]
+    return b"".join([c async for c in chunks])
+
+
+async def test_encode_csv_header_and_rows() -> None:
+    body = (await _collect(encode_csv(_partitions(), FIELDS))).decode()
+    rows = list(csv.reader(io.StringIO(body)))
+    assert rows[0] == list(FIELDS)
+    assert rows[1] == [str(ROW_ID), "pending", "170.10", "2026-01-02T03:04:05+00:00"]
+    assert rows[2] == [str(ROW_ID), "delivered", "0.50", ""]
+
+
+async def test_encode_ndjson_one_object_per_line() -> None:
+    body = (await _collect(encode_ndjson(_partitions(), FIELDS))).decode()
+    lines = [json.loads(line) for line in body.splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["total"] == "170.10"
+    assert lines[1]["created_at"] is None
+
+
+async def test_gzip_chunks_round_trip() -> None:
+    plain = await _collect(encode_ndjson(_partitions(), FIELDS))
+    compressed = await _collect(gzip_chunks(encode_ndjson(_partitions(), FIELDS)))
+    assert gzip.decompress(compressed) == plain
+
+
+def test_export_response_headers() -> None:
+    response = export_response(_partitions(), FIELDS, basename="orders", fmt="ndjson", compress=True)
+    assert response.media_type == "application/gzip"
+    assert response.headers["content-disposition"] == 'attachment; filename="orders.ndjson.gz"'
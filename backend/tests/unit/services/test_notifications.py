@@ -0,0 +1,84 @@
+"""Unit tests for kiosk-owner order status notifications."""
+
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import app.db.base  # noqa: F401 — registers all models
+from app.models.base import Base
+from app.models.order import Order, OrderStatus
+from app.models.user import User, UserRole
+from app.services import notifications
+from app.services.notifications import StatusNotice, collect, render
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+
+def _payload(order_id: uuid.UUID, status: str) -> dict:
+    return {"order_id": str(order_id), "status": status}
+
+
+def test_render_single_and_coalesced() -> None:
+    one = render("en", [StatusNotice(1, "en", "SS-A", "shipped")])
+    assert one == "\U0001f514 Order SS-A — \U0001f69a on its way"
+
+    many = render("am", [StatusNotice(1, "am", "SS-A", "shipped"), StatusNotice(1, "am", "SS-B", "delivered")])
+    assert many.startswith("\U0001f514 2 ")
+    assert "SS-A" in many and "SS-B" in many
+
+
+async def test_collect_groups_by_chat_at_latest_status() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        distributor = User(phone="+251911000001", role=UserRole.DISTRIBUTOR)
+        kiosk = User(phone="+251911000002", telegram_chat_id=42, language_pref="om")
+        offline = User(phone="+251911000003")
+        session.add_all([distributor, kiosk, offline])
+        await session.flush()
+        orders = [
+            Order(user_id=owner.id, distributor_id=distributor.id, status=OrderStatus.PENDING, total=Decimal("1"))
+            for owner in (kiosk, kiosk, offline)
+        ]
+        session.add_all(orders)
+        await session.flush()
+
+        by_chat = await collect(
+            session,
+            [
+                _payload(orders[0].id, "shipped"),
+                _payload(orders[1].id, "confirmed"),
+                _payload(orders[0].id, "delivered"),
+                _payload(orders[2].id, "delivered"),
+            ],
+        )
+    await engine.dispose()
+
+    assert list(by_chat) == [42]
+    assert [(n.status, n.lang) for n in by_chat[42]] == [("confirmed", "om"), ("delivered", "om")]
+
+
+async def test_collect_ignores_pending() -> None:
+    session = AsyncMock()
+    assert await collect(session, [_payload(uuid.uuid4(), "pending")]) == {}
+    session.execute.assert_not_called()
+
+
+async def test_notify_sends_one_message_per_chat() -> None:
+    by_chat = {
+        1: [StatusNotice(1, "en", "SS-A", "shipped"), StatusNotice(1, "en", "SS-B", "shipped")],
+        2: [StatusNotice(2, "am", "SS-C", "delivered")],
+    }
+    with (
+        patch.object(notifications, "async_session_factory"),
+        patch.object(notifications, "collect", new_callable=AsyncMock, return_value=by_chat),
+        patch.object(notifications.telegram_bot, "send_message", new_callable=AsyncMock) as send,
+    ):
+        await notifications.notify_status_changes([])
+
+    assert sorted(call.args[0] for call in send.await_args_list) == [1, 2]
+    texts = {call.args[0]: call.args[1] for call in send.await_args_list}
+    assert "2 orders updated" in texts[1]
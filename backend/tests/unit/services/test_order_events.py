@@ -0,0 +1,64 @@
+"""Unit tests for the order event stream."""
+
+from __future__ import annotations
+
+import uuid
+from unittest.mock import AsyncMock, patch
+
+from app.services import order_events
+
+
+def _fields(user_id: uuid.UUID, distributor_id: uuid.UUID) -> dict[str, str]:
+    return {
+        "type": "order.created",
+        "order_id": str(uuid.uuid4()),
+        "user_id": str(user_id),
+        "distributor_id": str(distributor_id),
+        "status": "pending",
+    }
+
+
+def test_visibility_follows_role_scope() -> None:
+    kiosk, dist = uuid.uuid4(), uuid.uuid4()
+    fields = _fields(kiosk, dist)
+
+    assert order_events.is_visible(fields)
+    assert order_events.is_visible(fields, user_id=kiosk)
+    assert order_events.is_visible(fields, distributor_id=dist)
+    assert not order_events.is_visible(fields, user_id=uuid.uuid4())
+    assert not order_events.is_visible(fields, distributor_id=uuid.uuid4())
+
+
+def test_format_sse() -> None:
+    frame = order_events.format_sse("1-0", {"type": "order.created"})
+    assert frame.startswith("id: 1-0\nevent: order.created\ndata: ")
+    assert frame.endswith("\n\n")
+
+
+async def test_subscribe_resumes_filters_and_heartbeats() -> None:
+    kiosk, dist = uuid.uuid4(), uuid.uuid4()
+    mine, other = _fields(kiosk, dist), _fields(uuid.uuid4(), dist)
+    fake_redis = AsyncMock()
+    fake_redis.xread.side_effect = [
+        [("stream", [("5-0", mine), ("6-0", other)])],
+        [],
+    ]
+    disconnected = AsyncMock(side_effect=[False, False, True])
+
+    with patch.object(order_events, "redis_client", fake_redis):
+        frames = [
+            f
+            async for f in order_events.subscribe(
+                is_disconnected=disconnected, last_event_id="4-0", user_id=kiosk
+            )
+        ]
+
+    assert frames[0].startswith("retry: ")
+    assert frames[1].startswith("id: 5-0\n")
+    assert frames[2] == ": heartbeat\n\n"
+    assert len(frames) == 3
+    first_cursor = fake_redis.xread.call_args_list[0].args[0]
+    second_cursor = fake_redis.xread.call_args_list[1].args[0]
+    assert list(first_cursor.values()) == ["4-0"]
+    assert list(second_cursor.values()) == ["6-0"]
+    fake_redis.xrevrange.assert_not_called()
@@ -0,0 +1,57 @@
+"""Unit tests for streaming product import parsing."""
+
+from __future__ import annotations
+
+import gzip
+
+import pytest
+from app.core.exceptions import ValidationError
+from app.services.product_import import csv_records, gunzip_chunks, ndjson_records
+
+
+async def _chunks(data: bytes, size: int):  # type: ignore[no-untyped-def]
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+async def _collect(records):  # type: ignore[no-untyped-def]
+    return [record async for record in records]
+
+
+async def test_csv_records_across_chunk_boundaries() -> None:
+    data = (
+        "﻿Name,Price,SKU,Category\r\n"
+        'ቡና,120.00,BUN-1,\r\n'
+        '"Sugar, ""white""\n1kg",80.50,SUG-1,grains\r\n'
+        "\r\n"
+        "broken,1.00\r\n"
+    ).encode()
+
+    records = await _collect(csv_records(_chunks(data, 3)))
+
+    assert records[0] == (2, {"name": "ቡና", "price": "120.00", "sku": "BUN-1", "category": None}, None)
+    assert records[1][0] == 3
+    assert records[1][1]["name"] == 'Sugar, "white"\n1kg'
+    assert records[2] == (6, None, "expected 4 columns, got 2")
+
+
+async def test_csv_unterminated_quote_is_reported() -> None:
+    records = await _collect(csv_records(_chunks(b'name,price\n"Tea,1.00\n', 64)))
+    assert records == [(2, None, "unterminated quoted field")]
+
+
+async def test_ndjson_records() -> None:
+    data = b'{"name": "Tea", "price": "9.99", "sku": "T-1"}\n\nnot json\n[1]\n'
+    records = await _collect(ndjson_records(_chunks(data, 5)))
+
+    assert records[0] == (1, {"name": "Tea", "price": "9.99", "sku": "T-1"}, None)
+    assert records[1][0] == 3 and records[1][2].startswith("invalid JSON")
+    assert records[2] == (4, None, "expected a JSON object")
+
+
+async def test_gunzip_chunks() -> None:
+    data = gzip.compress(b"name,price\n" * 100)
+    assert b"".join([c async for c in gunzip_chunks(_chunks(data, 7))]) == b"name,price\n" * 100
+
+    with pytest.raises(ValidationError):
+        await _collect(gunzip_chunks(_chunks(b"not gzip", 4)))
@@ -0,0 +1,107 @@
+"""Unit tests for last-order templates and the bot's one-tap reorder."""
+
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.pricing import PriceBook, Tier
+from app.schemas.order import OrderItemCreate, OrderTemplate
+from app.services import pricing, reorder
+from app.services.conversation import ConversationStep, get_state, reset_state
+
+
+def _template(*product_ids: uuid.UUID) -> OrderTemplate:
+    return OrderTemplate(
+        order_id=uuid.uuid4(),
+        distributor_id=uuid.uuid4(),
+        items=[OrderItemCreate(product_id=pid, quantity=2) for pid in product_ids],
+    )
+
+
+async def test_last_template_prefers_cache() -> None:
+    template = _template(uuid.uuid4())
+    with (
+        patch.object(reorder, "redis_client") as redis,
+        patch("app.repositories.order_read_repo.OrderReadRepository.last_order_template") as from_db,
+    ):
+        redis.get = AsyncMock(return_value=template.model_dump_json())
+        assert await reorder.last_template(AsyncMock(), uuid.uuid4()) == template
+    from_db.assert_not_called()
+
+
+async def test_last_template_miss_reads_db_and_warms_cache() -> None:
+    template = _template(uuid.uuid4())
+    user_id = uuid.uuid4()
+    with (
+        patch.object(reorder, "redis_client") as redis,
+        patch(
+            "app.repositories.order_read_repo.OrderReadRepository.last_order_template",
+            new_callable=AsyncMock,
+            return_value=template,
+        ),
+    ):
+        redis.get = AsyncMock(side_effect=ConnectionError("down"))
+        redis.set = AsyncMock()
+        assert await reorder.last_template(AsyncMock(), user_id) == template
+    redis.set.assert_awaited_once()
+    assert redis.set.call_args.args[0] == f"souksync:last-order:{user_id}"
+
+
+async def test_reprice_skips_unavailable_products() -> None:
+    kept, gone = uuid.uuid4(), uuid.uuid4()
+    product = MagicMock(id=kept, price=Decimal("9.50"))
+    with patch(
+        "app.repositories.product_repo.ProductRepository.get_active_products",
+        new_callable=AsyncMock,
+        return_value={kept: product},
+    ):
+        repriced = await reorder.reprice(AsyncMock(), _template(kept, gone))
+
+    assert [i.product_id for i in repriced.order.items] == [kept]
+    assert repriced.skipped == [gone]
+
+
+async def test_bot_reorder_fills_cart_at_current_prices() -> None:
+    from app.services import bot_handler
+
+    chat_id = 4242
+    reset_state(chat_id)
+    state = get_state(chat_id)
+    state.step = ConversationStep.REGISTERED
+    pid = uuid.uuid4()
+    template = _template(pid)
+    product = MagicMock(price=Decimal("15.00"))
+    product.name = "Coca-Cola 300ml"
+    repriced = reorder.RepricedOrder(
+        order=reorder.OrderCreate(items=template.items, distributor_id=template.distributor_id),
+        products={pid: product},
+    )
+    # Two or more carry a tier price.
+    book = PriceBook.compile([Tier(None, pid, 2, Decimal("14.00"))])
+
+    with (
+        patch.object(bot_handler, "async_session_factory", MagicMock()),
+        patch.object(reorder, "user_id_for_chat", new_callable=AsyncMock, return_value=uuid.uuid4()),
+        patch.object(reorder, "last_template", new_callable=AsyncMock, return_value=template),
+        patch.object(reorder, "reprice", new_callable=AsyncMock, return_value=repriced),
+        patch.object(pricing, "segment_for_chat", new_callable=AsyncMock, return_value=None),
+        patch.object(pricing, "price_book", new_callable=AsyncMock, return_value=book),
+        patch.object(bot_handler.tg, "send_message", new_callable=AsyncMock) as send,
+    ):
+        await bot_handler.handle_update({"message": {"chat": {"id": chat_id}, "text": "Reorder"}})
+
+    assert state.step == ConversationStep.CART_REVIEW
+    assert state.cart == [
+        {
+            "product_id": str(pid),
+            "name": "Coca-Cola 300ml",
+            "price": Decimal("15.00"),
+            "distributor_id": str(template.distributor_id),
+            "qty": 2,
+            "unit_price": Decimal("14.00"),
+        }
+    ]
+    assert "ETB 28.00" in send.call_args.args[1]
+    reset_state(chat_id)
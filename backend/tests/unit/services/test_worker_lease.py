@@ -0,0 +1,71 @@
+"""Unit tests for order-code worker id leases."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from app.core import snowflake
+from app.services import worker_lease
+
+
+class _FakeRedis:
+    """SET NX and the two token-checked scripts, keyed like the real thing."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    async def set(self, key: str, value: str, *, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    async def eval(self, script: str, numkeys: int, key: str, token: str, *args: object) -> int:
+        if self.values.get(key) != token:
+            return 0
+        if script == worker_lease._RELEASE:
+            del self.values[key]
+        return 1
+
+
+@pytest.fixture(autouse=True)
+def _restore_generator():
+    previous = snowflake._generator
+    yield
+    snowflake._generator = previous
+
+
+async def test_acquire_skips_leased_ids() -> None:
+    fake = _FakeRedis()
+    with patch.object(worker_lease, "redis_client", fake):
+        assert await worker_lease.acquire("a") == 0
+        assert await worker_lease.acquire("b") == 1
+        assert await worker_lease.renew(0, "a")
+        assert not await worker_lease.renew(0, "b")
+
+
+async def test_lease_configures_minting_and_releases_on_exit() -> None:
+    fake = _FakeRedis()
+    fake.values["souksync:order-code-worker:0"] = "someone-else"
+    with (
+        patch.object(worker_lease, "redis_client", fake),
+        patch.object(worker_lease.settings, "ORDER_CODE_WORKER_ID", None),
+    ):
+        async with worker_lease.order_code_worker():
+            assert (snowflake.next_order_code() >> 12) & snowflake.MAX_WORKER_ID == 1
+        with pytest.raises(RuntimeError):
+            snowflake.next_order_code()
+    assert list(fake.values) == ["souksync:order-code-worker:0"]
+
+
+async def test_exhausted_ids_fail_startup() -> None:
+    fake = _FakeRedis()
+    fake.values = {f"souksync:order-code-worker:{n}": "taken" for n in range(snowflake.MAX_WORKER_ID)}
+    with (
+        patch.object(worker_lease, "redis_client", fake),
+        patch.object(worker_lease.settings, "ORDER_CODE_WORKER_ID", None),
+        pytest.raises(worker_lease.WorkerIdsExhaustedError),
+    ):
+        async with worker_lease.order_code_worker():
+            pass
@@ -0,0 +1,161 @@
+"""Unit tests for the outbox dispatcher."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import app.db.base  # noqa: F401 — registers all models
+import pytest
+from app.core.config import settings
+from app.models.base import Base
+from app.models.outbox import OutboxMessage
+from app.repositories.outbox_repo import OutboxRepository
+from app.tasks import outbox
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+
+@pytest.fixture
+async def factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    with patch("app.tasks.outbox.async_session_factory", session_factory):
+        yield session_factory
+    await engine.dispose()
+
+
+@pytest.fixture
+def handlers():
+    with patch.dict(outbox._handlers, clear=True), patch.dict(outbox._batch_handlers, clear=True):
+        yield outbox._handlers
+
+
+async def _enqueue(factory, topic: str, *payloads: dict) -> None:
+    async with factory() as session:
+        OutboxRepository(session).add_many(topic, list(payloads))
+        await session.commit()
+
+
+async def test_dispatch_runs_every_handler_for_topic(factory, handlers) -> None:
+    seen: list[tuple[str, int]] = []
+
+    @outbox.register("test.topic")
+    async def first(payload):  # type: ignore[no-untyped-def]
+        seen.append(("first", payload["n"]))
+
+    @outbox.register("test.topic")
+    async def second(payload):  # type: ignore[no-untyped-def]
+        seen.append(("second", payload["n"]))
+
+    await _enqueue(factory, "test.topic", {"n": 1}, {"n": 2})
+    await _enqueue(factory, "other.topic", {"n": 3})
+
+    assert await outbox.dispatch_batch() == 3
+    assert seen == [("first", 1), ("second", 1), ("first", 2), ("second", 2)]
+    async with factory() as session:
+        rows = (await session.execute(select(OutboxMessage))).scalars().all()
+    assert all(row.processed_at is not None for row in rows)
+    assert await outbox.dispatch_batch() == 0
+
+
+async def test_failed_handler_is_retried_after_backoff(factory, handlers) -> None:
+    calls = 0
+
+    @outbox.register("test.topic")
+    async def flaky(payload):  # type: ignore[no-untyped-def]
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ConnectionError("redis down")
+
+    await _enqueue(factory, "test.topic", {"n": 1})
+
+    with patch("app.tasks.outbox.backoff_seconds", return_value=0):
+        assert await outbox.dispatch_batch() == 1
+        async with factory() as session:
+            row = (await session.execute(select(OutboxMessage))).scalar_one()
+        assert row.processed_at is None
+        assert "redis down" in row.last_error
+
+        assert await outbox.dispatch_batch() == 1
+    async with factory() as session:
+        row = (await session.execute(select(OutboxMessage))).scalar_one()
+    assert calls == 2
+    assert row.attempts == 2
+    assert row.processed_at is not None
+
+
+def test_backoff_is_capped() -> None:
+    assert settings.OUTBOX_BACKOFF_BASE_SECONDS / 2 <= outbox.backoff_seconds(1) <= settings.OUTBOX_BACKOFF_BASE_SECONDS
+    assert outbox.backoff_seconds(50) <= settings.OUTBOX_BACKOFF_MAX_SECONDS
+
+
+async def test_batch_handler_sees_whole_batch_and_failure_retries_all(factory, handlers) -> None:
+    batches: list[list[int]] = []
+
+    @outbox.register_batch("test.topic")
+    async def coalesce(payloads):  # type: ignore[no-untyped-def]
+        batches.append([p["n"] for p in payloads])
+        if len(batches) == 1:
+            raise ConnectionError("telegram down")
+
+    await _enqueue(factory, "test.topic", {"n": 1}, {"n": 2})
+
+    with patch("app.tasks.outbox.backoff_seconds", return_value=0):
+        assert await outbox.dispatch_batch() == 2
+        assert await outbox.dispatch_batch() == 2
+    assert batches == [[1, 2], [1, 2]]
+    assert await outbox.dispatch_batch() == 0
+
+
+async def test_retry_skips_the_handlers_that_succeeded(factory, handlers) -> None:
+    seen: list[str] = []
+
+    @outbox.register("test.topic")
+    async def flaky(payload):  # type: ignore[no-untyped-def]
+        seen.append("flaky")
+        if seen.count("flaky") == 1:
+            raise ConnectionError("redis down")
+
+    @outbox.register("test.topic")
+    async def steady(payload):  # type: ignore[no-untyped-def]
+        seen.append("steady")
+
+    await _enqueue(factory, "test.topic", {"n": 1})
+
+    with patch("app.tasks.outbox.backoff_seconds", return_value=0):
+        assert await outbox.dispatch_batch() == 1
+        assert await outbox.dispatch_batch() == 1
+    # A failure doesn't stop the message's other handlers, and a retry doesn't repeat them.
+    assert seen == ["flaky", "steady", "flaky"]
+    assert await outbox.dispatch_batch() == 0
+
+
+async def test_retry_runs_only_the_handlers_that_failed(factory, handlers) -> None:
+    streamed: list[int] = []
+    notified: list[list[int]] = []
+
+    @outbox.register("test.topic")
+    async def stream(payload):  # type: ignore[no-untyped-def]
+        streamed.append(payload["n"])
+
+    @outbox.register_batch("test.topic")
+    async def notify(payloads):  # type: ignore[no-untyped-def]
+        notified.append([p["n"] for p in payloads])
+        if len(notified) == 1:
+            raise ConnectionError("telegram down")
+
+    await _enqueue(factory, "test.topic", {"n": 1}, {"n": 2})
+
+    with patch("app.tasks.outbox.backoff_seconds", return_value=0):
+        assert await outbox.dispatch_batch() == 2
+        async with factory() as session:
+            rows = (await session.execute(select(OutboxMessage))).scalars().all()
+        assert {tuple(row.handled) for row in rows} == {(outbox.handler_name(stream),)}
+        assert await outbox.dispatch_batch() == 2
+    # The stream append succeeded the first time and is not repeated.
+    assert streamed == [1, 2]
+    assert notified == [[1, 2], [1, 2]]
+    assert await outbox.dispatch_batch() == 0
@@ -0,0 +1,51 @@
+"""Unit tests for partition maintenance helpers."""
+
+from __future__ import annotations
+
+import datetime
+import uuid
+from decimal import Decimal
+
+from app.models.order import Order
+from app.repositories.partition_repo import add_months, month_start, partition_name
+from app.tasks.partitions import coerce_row, read_archive, write_archive
+
+
+def test_month_arithmetic() -> None:
+    assert month_start(datetime.date(2026, 10, 19)) == datetime.date(2026, 10, 1)
+    assert add_months(datetime.date(2026, 11, 1), 2) == datetime.date(2027, 1, 1)
+    assert add_months(datetime.date(2026, 1, 1), -24) == datetime.date(2024, 1, 1)
+    assert partition_name("orders", datetime.date(2026, 3, 1)) == "orders_p2026_03"
+
+
+async def test_archive_round_trip(tmp_path) -> None:
+    row = {
+        "id": uuid.uuid4(),
+        "user_id": uuid.uuid4(),
+        "distributor_id": uuid.uuid4(),
+        "status": "DELIVERED",
+        "total": Decimal("170.10"),
+        "delivery_fee": Decimal("0.00"),
+        "payment_method": None,
+        "notes": "ቡና",
+        "created_at": datetime.datetime(2024, 3, 5, 8, 0, tzinfo=datetime.timezone.utc),
+        "updated_at": datetime.datetime(2024, 3, 6, 9, 0, tzinfo=datetime.timezone.utc),
+    }
+
+    async def _partitions():  # type: ignore[no-untyped-def]
+        yield [row, row]
+        yield [row]
+
+    path = tmp_path / "orders" / "2024-03.ndjson.gz"
+    await write_archive(path, _partitions(), list(row))
+
+    assert path.exists()
+    assert not path.with_suffix(".tmp").exists()
+    batches = list(read_archive(path, Order.__table__, batch_size=2))
+    assert [len(b) for b in batches] == [2, 1]
+    assert batches[0][0] == row
+
+
+def test_coerce_row_keeps_nulls() -> None:
+    out = coerce_row(Order.__table__, {"id": None, "total": "1.50", "status": "PENDING"})
+    assert out == {"id": None, "total": Decimal("1.50"), "status": "PENDING"}